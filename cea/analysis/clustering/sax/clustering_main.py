@@ -18,6 +18,7 @@ import time
 import pandas as pd
 
 import cea.config
+from cea.demand import demand_reader
 from cea.analysis.clustering.sax.sax import SAX
 from cea.analysis.clustering.sax.sax_optimization import sax_optimization
 from cea.analysis.mcda import mcda_cluster_main
@@ -127,8 +128,8 @@ def demand_CEA_reader(locator, building_name, building_load, type="simulated"):
     # import data
     #location of data
     if type == 'simulation':
-        data = pd.read_csv(locator.get_demand_results_file(building_name),
-                           usecols=['DATE', building_load], index_col='DATE')
+        data = demand_reader.read_hourly_demand(locator, building_name,
+                                                columns=['DATE', building_load]).set_index('DATE')
     elif type== 'measured':
         data = pd.read_csv(locator.get_demand_measured_file(building_name),
                            usecols=['DATE', building_load], index_col='DATE')
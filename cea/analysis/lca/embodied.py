@@ -14,6 +14,7 @@ import cea.globalvar
 import cea.inputlocator
 import cea.config
 from cea.constants import SERVICE_LIFE_OF_BUILDINGS, SERVICE_LIFE_OF_TECHNICAL_SYSTEMS, CONVERSION_AREA_TO_FLOOR_AREA_RATIO
+from cea.utilities.database_catalog import read_database
 
 __author__ = "Jimeno A. Fonseca"
 __copyright__ = "Copyright 2015, Architecture and Building Systems - ETH Zurich"
@@ -182,7 +183,7 @@ def calculate_contributions(archetype, cat_df, config, locator, year_to_calculat
     :rtype result: DataFrame
     """
     # get archetype properties from the database
-    database_df = pd.read_excel(locator.get_life_cycle_inventory_building_systems(config.region), archetype)
+    database_df = read_database(locator.get_life_cycle_inventory_building_systems(config.region), archetype)
     database_df['Code'] = database_df.apply(lambda x: calc_code(x['building_use'], x['year_start'],
                                                                         x['year_end'], x['standard']), axis=1)
 
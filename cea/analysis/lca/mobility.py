@@ -8,6 +8,7 @@ import os
 import pandas as pd
 from geopandas import GeoDataFrame as gpdf
 import cea.inputlocator
+from cea.utilities.database_catalog import read_database
 
 __author__ = "Martin Mosteiro Romero"
 __copyright__ = "Copyright 2016, Architecture and Building Systems - ETH Zurich"
@@ -59,7 +60,8 @@ def lca_mobility(locator, config):
     # local files
     demand = pd.read_csv(locator.get_total_demand())
     prop_occupancy = gpdf.from_file(locator.get_building_occupancy()).drop('geometry', axis=1)#.set_index('Name')
-    factors_mobility = pd.read_excel(locator.get_data_benchmark(config.region), sheet_name='MOBILITY').drop('Description', axis=1).set_index("code")
+    factors_mobility = read_database(locator.get_data_benchmark(config.region), 'MOBILITY')
+    factors_mobility = factors_mobility.drop('Description', axis=1).set_index("code")
 
     # calculate total_LCA_mobility: .csv
     occupancy_type = prop_occupancy.drop('Name', axis=1).columns.values
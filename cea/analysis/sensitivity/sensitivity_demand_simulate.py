@@ -22,6 +22,7 @@ from geopandas import GeoDataFrame as Gdf
 import cea.demand.demand_writers
 import cea.globalvar
 from cea.demand import demand_main
+from cea.demand import demand_reader
 from cea.inputlocator import InputLocator
 import cea.config
 
@@ -129,7 +130,8 @@ def simulate_demand_sample(locator, config, output_parameters):
     config.demand.override_variables = True
 
     # force simulation to be sequential
-    totals, time_series = demand_main.demand_calculation(locator, config)
+    totals = demand_main.demand_calculation(locator, config)
+    time_series = [demand_reader.read_hourly_demand(locator, building_name) for building_name in totals['Name']]
     return totals[output_parameters], time_series
 
 
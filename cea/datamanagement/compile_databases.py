@@ -0,0 +1,66 @@
+"""
+Compile the Excel databases of the selected region into binary catalogs (see
+:py:mod:`cea.utilities.database_catalog`).
+
+The catalogs are also compiled automatically the first time a database is read after it was copied to the scenario or
+modified, but compiling them in advance saves that time in the first run of each script (and its worker processes).
+"""
+from __future__ import division
+from __future__ import print_function
+
+import os
+
+import cea.config
+import cea.inputlocator
+from cea.utilities import database_catalog
+
+__author__ = "Daren Thomas"
+__copyright__ = "Copyright 2019, Architecture and Building Systems - ETH Zurich"
+__credits__ = ["Daren Thomas"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Daren Thomas"
+__email__ = "cea@arch.ethz.ch"
+__status__ = "Production"
+
+
+def compile_databases(locator, region):
+    """Compile the catalog of each Excel database of the region in the scenario.
+
+    :param cea.inputlocator.InputLocator locator: The locator to use
+    :param str region: The region of the databases
+    """
+    locator_methods = [
+        locator.get_archetypes_properties,
+        locator.get_archetypes_schedules,
+        locator.get_archetypes_system_controls,
+        locator.get_supply_systems,
+        locator.get_life_cycle_inventory_supply_systems,
+        locator.get_life_cycle_inventory_building_systems,
+        locator.get_technical_emission_systems,
+        locator.get_envelope_systems,
+        locator.get_thermal_networks,
+        locator.get_data_benchmark,
+    ]
+    for method in locator_methods:
+        database_path = method(region)
+        catalog = database_catalog.compile_database(database_path)
+        print("Compiled %i sheets of %s" % (len(catalog['sheets']), database_path))
+
+
+def main(config):
+    """
+    This is the main entry point to the script.
+
+    :param config:
+    :type config: cea.config.Configuration
+
+    :return:
+    """
+    assert os.path.exists(config.scenario), 'Scenario not found: %s' % config.scenario
+    locator = cea.inputlocator.InputLocator(config.scenario)
+    compile_databases(locator, config.region)
+
+
+if __name__ == '__main__':
+    main(cea.config.Configuration())
@@ -8,12 +8,19 @@ Classes of building properties
 
 from __future__ import division
 
+import hashlib
+import multiprocessing
+import os
+
 import numpy as np
 import pandas as pd
 from geopandas import GeoDataFrame as Gdf
 
 from cea.demand import constants
+from cea.resources.radiation_daysim import radiation_store
 from cea.utilities.dbf import dbf_to_dataframe
+from cea.utilities.database_catalog import read_database
+from cea.utilities.file_cache import new_key, update_key_with_file, update_key_with_file_stat, write_atomically
 
 # import constants
 H_F = constants.H_F
@@ -26,6 +33,9 @@ H_IS = constants.H_IS
 B_F = constants.B_F
 LAMBDA_AT = constants.LAMBDA_AT
 
+# increase when changing the calculation of the building properties to invalidate the cached tables
+BUILDING_PROPERTIES_CACHE_VERSION = 1
+
 
 class BuildingProperties(object):
     """
@@ -35,10 +45,15 @@ class BuildingProperties(object):
     G. Happle   BuildingPropsThermalLoads   27.05.2016
     """
 
-    def __init__(self, locator, use_daysim_radiation, region, override_variables=False):
+    def __init__(self, locator, use_daysim_radiation, region, override_variables=False, number_of_processes=1,
+                 use_cache=True):
         """
         Read building properties from input shape files and construct a new BuildingProperties object.
 
+        The resolved tables are cached (see :py:meth:`cea.inputlocator.InputLocator.get_building_properties_cache`),
+        each under a hash of the input files and settings it depends on, so only the tables affected by a changed input
+        are calculated again.
+
         :param locator: an InputLocator for locating the input files
         :type locator: cea.inputlocator.InputLocator
 
@@ -51,50 +66,85 @@ class BuildingProperties(object):
         :param override_variables: override_variables from config
         :type override_variables: str
 
+        :param number_of_processes: number of processes to calculate the solar gains of the buildings with
+        :type number_of_processes: int
+
+        :param use_cache: read the tables from (and write them to) the cache
+        :type use_cache: bool
+
         :returns: BuildingProperties
         :rtype: BuildingProperties
         """
 
         print("read input files")
-        prop_geometry = Gdf.from_file(locator.get_zone_geometry())
-        prop_geometry['footprint'] = prop_geometry.area
-        prop_geometry['perimeter'] = prop_geometry.length
-        prop_geometry['Blength'], prop_geometry['Bwidth'] = self.calc_bounding_box_geom(locator.get_zone_geometry())
-        prop_geometry = prop_geometry.drop('geometry', axis=1).set_index('Name')
-        prop_hvac = dbf_to_dataframe(locator.get_building_hvac())
-        prop_occupancy_df = dbf_to_dataframe(locator.get_building_occupancy()).set_index('Name')
-        prop_occupancy_df.fillna(value=0.0, inplace=True)  # fix badly formatted occupancy file...
-        prop_occupancy = prop_occupancy_df.loc[:, (prop_occupancy_df != 0).any(axis=0)]
-        prop_architectures = dbf_to_dataframe(locator.get_building_architecture())
-        prop_age = dbf_to_dataframe(locator.get_building_age()).set_index('Name')
-        prop_comfort = dbf_to_dataframe(locator.get_building_comfort()).set_index('Name')
-        prop_internal_loads = dbf_to_dataframe(locator.get_building_internal()).set_index('Name')
-        prop_supply_systems_building = dbf_to_dataframe(locator.get_building_supply())
+        cached = lambda table, key, calculate: read_or_calculate_building_properties(locator, table, key, calculate,
+                                                                                      use_cache)
+
+        # the key of each table hashes the content of its input files, so changing an input file only recalculates
+        # the tables that depend on it
+        zone_geometry = locator.get_zone_geometry()
+        geometry_key = calc_building_properties_cache_key(
+            paths=[os.path.splitext(zone_geometry)[0] + extension for extension in ('.shp', '.shx', '.dbf', '.prj')])
+        prop_geometry = cached('geometry', geometry_key, lambda: self.read_geometry(zone_geometry))
+
+        occupancy_key = calc_building_properties_cache_key(paths=[locator.get_building_occupancy()])
+        prop_occupancy = cached('occupancy', occupancy_key, lambda: read_occupancy(locator))
+        age_key = calc_building_properties_cache_key(paths=[locator.get_building_age()])
+        prop_age = cached('age', age_key, lambda: dbf_to_dataframe(locator.get_building_age()).set_index('Name'))
+        comfort_key = calc_building_properties_cache_key(paths=[locator.get_building_comfort()])
+        prop_comfort = cached('comfort', comfort_key,
+                              lambda: dbf_to_dataframe(locator.get_building_comfort()).set_index('Name'))
+        internal_loads_key = calc_building_properties_cache_key(paths=[locator.get_building_internal()])
+        prop_internal_loads = cached('internal-loads', internal_loads_key,
+                                     lambda: dbf_to_dataframe(locator.get_building_internal()).set_index('Name'))
 
         # GET SYSTEMS EFFICIENCIES
-        prop_supply_systems = get_properties_supply_sytems(locator, prop_supply_systems_building, region).set_index(
-            'Name')
+        supply_systems_key = calc_building_properties_cache_key(
+            paths=[locator.get_building_supply(), locator.get_life_cycle_inventory_supply_systems(region)],
+            dependencies=[region])
+        prop_supply_systems = cached('supply-systems', supply_systems_key, lambda: get_properties_supply_sytems(
+            locator, dbf_to_dataframe(locator.get_building_supply()), region).set_index('Name'))
 
         # get temperatures of operation
-        prop_HVAC_result = get_properties_technical_systems(locator, prop_hvac, region).set_index('Name')
+        hvac_key = calc_building_properties_cache_key(
+            paths=[locator.get_building_hvac(), locator.get_technical_emission_systems(region),
+                   locator.get_archetypes_system_controls(region)],
+            dependencies=[region])
+        prop_HVAC_result = cached('hvac', hvac_key, lambda: get_properties_technical_systems(
+            locator, dbf_to_dataframe(locator.get_building_hvac()), region).set_index('Name'))
 
         # get envelope properties
-        prop_envelope = get_envelope_properties(locator, prop_architectures, region).set_index('Name')
+        envelope_key = calc_building_properties_cache_key(
+            paths=[locator.get_building_architecture(), locator.get_envelope_systems(region)],
+            dependencies=[region])
+        prop_envelope = cached('envelope', envelope_key, lambda: get_envelope_properties(
+            locator, dbf_to_dataframe(locator.get_building_architecture()), region).set_index('Name'))
 
         # apply overrides
+        overrides_key = 'no-overrides'
         if override_variables:
+            overrides_key = calc_building_properties_cache_key(paths=[locator.get_building_overrides()])
             self._overrides = pd.read_csv(locator.get_building_overrides()).set_index('Name')
             prop_envelope = self.apply_overrides(prop_envelope)
             prop_internal_loads = self.apply_overrides(prop_internal_loads)
             prop_comfort = self.apply_overrides(prop_comfort)
             prop_HVAC_result = self.apply_overrides(prop_HVAC_result)
 
-        # get properties of rc demand model
-        prop_rc_model = self.calc_prop_rc_model(locator, prop_occupancy, prop_envelope,
-                                                prop_geometry, prop_HVAC_result, use_daysim_radiation)
+        # get properties of rc demand model (this adds the wall, window and roof areas to the envelope)
+        radiation_paths = get_radiation_paths(locator, prop_geometry.index, use_daysim_radiation)
+        rc_model_key = calc_building_properties_cache_key(
+            dependencies=[occupancy_key, envelope_key, geometry_key, hvac_key, overrides_key, use_daysim_radiation],
+            stat_paths=radiation_paths)
+        prop_rc_model, prop_envelope = cached('rc-model', rc_model_key, lambda: (
+            self.calc_prop_rc_model(locator, prop_occupancy, prop_envelope, prop_geometry, prop_HVAC_result,
+                                    use_daysim_radiation), prop_envelope))
 
         # get solar properties
-        solar = get_prop_solar(locator, prop_rc_model, prop_envelope, use_daysim_radiation, region).set_index('Name')
+        solar_key = calc_building_properties_cache_key(dependencies=[rc_model_key, region],
+                                                       stat_paths=radiation_paths)
+        solar = cached('solar', solar_key, lambda: get_prop_solar(
+            locator, prop_rc_model, prop_envelope, use_daysim_radiation, region,
+            number_of_processes).set_index('Name'))
 
         # df_windows = geometry_reader.create_windows(surface_properties, prop_envelope)
         # TODO: to check if the Win_op and height of window is necessary.
@@ -113,6 +163,14 @@ class BuildingProperties(object):
         self._solar = solar
         self._prop_RC_model = prop_rc_model
 
+    def read_geometry(self, zone_geometry):
+        """:return: the geometry of the buildings in the zone shapefile, with footprint, perimeter and bounding box"""
+        prop_geometry = Gdf.from_file(zone_geometry)
+        prop_geometry['footprint'] = prop_geometry.area
+        prop_geometry['perimeter'] = prop_geometry.length
+        prop_geometry['Blength'], prop_geometry['Bwidth'] = self.calc_bounding_box_geom(zone_geometry)
+        return pd.DataFrame(prop_geometry.drop('geometry', axis=1)).set_index('Name')
+
     def calc_bounding_box_geom(self, geometry_shapefile):
         import shapefile
         sf = shapefile.Reader(geometry_shapefile)
@@ -480,6 +538,19 @@ class BuildingProperties(object):
         else:
             return 3.2
 
+    def get_fingerprint(self, name_building):
+        """
+        :return: the properties of a building (its rows in all tables and its solar gains) as a string that changes
+                 whenever one of them changes, see :py:mod:`cea.demand.demand_manifest`
+        :rtype: str
+        """
+        tables = [self._prop_supply_systems, self._prop_geometry, self._prop_envelope, self._prop_occupancy,
+                  self._prop_HVAC_result, self._prop_comfort, self._prop_internal_loads, self._prop_age,
+                  self._prop_RC_model]
+        rows = [repr(sorted(table.loc[name_building].to_dict().items())) for table in tables]
+        I_sol = np.asarray(self._solar.loc[name_building, 'I_sol'], dtype=np.float64)
+        return '|'.join(rows) + '|' + hashlib.sha1(I_sol.tobytes()).hexdigest()
+
     def __getitem__(self, building_name):
         """return a (read-only) BuildingPropertiesRow for the building"""
         return BuildingPropertiesRow(name=building_name,
@@ -700,11 +771,67 @@ class SolarProperties(object):
         self.I_sol = solar['I_sol']
 
 
+def read_occupancy(locator):
+    """:return: the occupancy types of the buildings, without the types that no building uses"""
+    prop_occupancy_df = dbf_to_dataframe(locator.get_building_occupancy()).set_index('Name')
+    prop_occupancy_df.fillna(value=0.0, inplace=True)  # fix badly formatted occupancy file...
+    return prop_occupancy_df.loc[:, (prop_occupancy_df != 0).any(axis=0)]
+
+
+def get_radiation_paths(locator, building_names, use_daysim_radiation):
+    """:return: the results of the radiation script that the RC model and solar properties are calculated from"""
+    if use_daysim_radiation:
+        paths = []
+        for building_name in building_names:
+            paths.append(locator.get_radiation_metadata(building_name))
+            paths.append(radiation_store.get_radiation_path(locator, building_name))
+        return paths
+    return [locator.get_radiation(), locator.get_surface_properties()]
+
+
+def calc_building_properties_cache_key(paths=(), dependencies=(), stat_paths=()):
+    """
+    :param paths: input files, the key depends on their content
+    :param dependencies: settings and keys of other tables the table is calculated from
+    :param stat_paths: large result files (e.g. the radiation of each building), the key depends on their path, size
+        and modification time to avoid reading them
+    :return: hash of everything a table of the building properties depends on (and the version of CEA)
+    :rtype: str
+    """
+    key = new_key(BUILDING_PROPERTIES_CACHE_VERSION, *dependencies)
+    for path in paths:
+        update_key_with_file(key, path)
+    for path in stat_paths:
+        update_key_with_file_stat(key, path)
+    return key.hexdigest()
+
+
+def read_or_calculate_building_properties(locator, table, key, calculate, use_cache=True):
+    """
+    :param table: name of the table (part of the name of the cache file)
+    :param key: the key of the table, see :py:func:`calc_building_properties_cache_key`
+    :param calculate: function without arguments that calculates the table if it is not in the cache
+    :return: the cached table, or the return value of ``calculate`` (which is cached)
+    """
+    if not use_cache:
+        return calculate()
+    cache_file = locator.get_building_properties_cache(table, key)
+    if os.path.exists(cache_file):
+        try:
+            return pd.read_pickle(cache_file)
+        except Exception as e:
+            # e.g. a cache file left incomplete by a crash or written by another version of pandas: calculate again
+            print('Ignoring corrupt building properties cache %s: %s' % (cache_file, e))
+    value = calculate()
+    write_atomically(cache_file, lambda path: pd.to_pickle(value, path))
+    return value
+
+
 def get_properties_supply_sytems(locator, properties_supply, region):
-    supply_heating = pd.read_excel(locator.get_life_cycle_inventory_supply_systems(region), "HEATING")
-    supply_cooling = pd.read_excel(locator.get_life_cycle_inventory_supply_systems(region), "COOLING")
-    supply_dhw = pd.read_excel(locator.get_life_cycle_inventory_supply_systems(region), "DHW")
-    supply_electricity = pd.read_excel(locator.get_life_cycle_inventory_supply_systems(region), "ELECTRICITY")
+    supply_heating = read_database(locator.get_life_cycle_inventory_supply_systems(region), "HEATING")
+    supply_cooling = read_database(locator.get_life_cycle_inventory_supply_systems(region), "COOLING")
+    supply_dhw = read_database(locator.get_life_cycle_inventory_supply_systems(region), "DHW")
+    supply_electricity = read_database(locator.get_life_cycle_inventory_supply_systems(region), "ELECTRICITY")
 
     df_emission_heating = properties_supply.merge(supply_heating, left_on='type_hs', right_on='code')
     df_emission_cooling = properties_supply.merge(supply_cooling, left_on='type_cs', right_on='code')
@@ -788,11 +915,12 @@ def get_properties_technical_systems(locator, prop_HVAC, region):
 
     """
 
-    prop_emission_heating = pd.read_excel(locator.get_technical_emission_systems(region), 'heating')
-    prop_emission_cooling = pd.read_excel(locator.get_technical_emission_systems(region), 'cooling')
-    prop_emission_dhw = pd.read_excel(locator.get_technical_emission_systems(region), 'dhw')
-    prop_emission_control_heating_and_cooling = pd.read_excel(locator.get_technical_emission_systems(region), 'controller')
-    prop_ventilation_system_and_control = pd.read_excel(locator.get_technical_emission_systems(region), 'ventilation')
+    prop_emission_heating = read_database(locator.get_technical_emission_systems(region), 'heating')
+    prop_emission_cooling = read_database(locator.get_technical_emission_systems(region), 'cooling')
+    prop_emission_dhw = read_database(locator.get_technical_emission_systems(region), 'dhw')
+    prop_emission_control_heating_and_cooling = read_database(locator.get_technical_emission_systems(region),
+                                                              'controller')
+    prop_ventilation_system_and_control = read_database(locator.get_technical_emission_systems(region), 'ventilation')
 
     df_emission_heating = prop_HVAC.merge(prop_emission_heating, left_on='type_hs', right_on='code')
     df_emission_cooling = prop_HVAC.merge(prop_emission_cooling, left_on='type_cs', right_on='code')
@@ -849,12 +977,12 @@ def get_envelope_properties(locator, prop_architecture, region):
     :rtype: DataFrame
 
     """
-    prop_roof = pd.read_excel(locator.get_envelope_systems(region), 'ROOF')
-    prop_wall = pd.read_excel(locator.get_envelope_systems(region), 'WALL')
-    prop_win = pd.read_excel(locator.get_envelope_systems(region), 'WINDOW')
-    prop_shading = pd.read_excel(locator.get_envelope_systems(region), 'SHADING')
-    prop_construction = pd.read_excel(locator.get_envelope_systems(region), 'CONSTRUCTION')
-    prop_leakage = pd.read_excel(locator.get_envelope_systems(region), 'LEAKAGE')
+    prop_roof = read_database(locator.get_envelope_systems(region), 'ROOF')
+    prop_wall = read_database(locator.get_envelope_systems(region), 'WALL')
+    prop_win = read_database(locator.get_envelope_systems(region), 'WINDOW')
+    prop_shading = read_database(locator.get_envelope_systems(region), 'SHADING')
+    prop_construction = read_database(locator.get_envelope_systems(region), 'CONSTRUCTION')
+    prop_leakage = read_database(locator.get_envelope_systems(region), 'LEAKAGE')
 
     df_construction = prop_architecture.merge(prop_construction, left_on='type_cons', right_on='code')
     df_leakage = prop_architecture.merge(prop_leakage, left_on='type_leak', right_on='code')
@@ -879,7 +1007,7 @@ def get_envelope_properties(locator, prop_architecture, region):
     return envelope_prop
 
 
-def get_prop_solar(locator, prop_rc_model, prop_envelope, use_daysim_radiation, region):
+def get_prop_solar(locator, prop_rc_model, prop_envelope, use_daysim_radiation, region, number_of_processes=1):
     """
     Gets the sensible solar gains from calc_Isol_daysim and stores in a dataframe containing building 'Name' and
     I_sol (incident solar gains).
@@ -888,6 +1016,7 @@ def get_prop_solar(locator, prop_rc_model, prop_envelope, use_daysim_radiation,
     :param prop_rc_model: RC model properties of a building by name.
     :param prop_envelope: dataframe containing the building envelope properties.
     :param bool use_daysim_radiation: use the DaySim radiation data as opposed to the ArcGIS version.
+    :param int number_of_processes: number of processes to calculate the DaySim solar gains of the buildings with.
     :return: dataframe containing the sensible solar gains for each building by name called result.
     :rtype: Dataframe
     """
@@ -901,16 +1030,19 @@ def get_prop_solar(locator, prop_rc_model, prop_envelope, use_daysim_radiation,
 
     if use_daysim_radiation:
 
-        # create result data frame
-        list_Isol = []
-
-        # for every building
-        for building_name in locator.get_zone_building_names():
-            I_sol = calc_Isol_daysim(building_name, locator, prop_envelope, prop_rc_model, thermal_resistance_surface,
-                                     window_frame_fraction)
-            list_Isol.append(I_sol)
+        # for every building (only the rows of the building are sent to the worker processes)
+        building_names = list(locator.get_zone_building_names())
+        args = [(building_name, locator, prop_envelope.loc[[building_name]], prop_rc_model.loc[[building_name]],
+                 thermal_resistance_surface, window_frame_fraction) for building_name in building_names]
+        if number_of_processes > 1 and len(building_names) > 1:
+            pool = multiprocessing.Pool(min(number_of_processes, len(building_names)))
+            list_Isol = pool.map(calc_Isol_daysim_wrapper, args)
+            pool.close()
+            pool.join()
+        else:
+            list_Isol = map(calc_Isol_daysim_wrapper, args)
 
-        result = pd.DataFrame({'Name': list(locator.get_zone_building_names()), 'I_sol': list_Isol})
+        result = pd.DataFrame({'Name': building_names, 'I_sol': list_Isol})
 
     elif not use_daysim_radiation:
 
@@ -933,6 +1065,12 @@ def get_prop_solar(locator, prop_rc_model, prop_envelope, use_daysim_radiation,
     return result
 
 
+def calc_Isol_daysim_wrapper(args):
+    """Wrap calc_Isol_daysim to accept a tuple of args because multiprocessing.Pool.map only accepts one argument for
+    the function"""
+    return calc_Isol_daysim(*args)
+
+
 def calc_Isol_daysim(building_name, locator, prop_envelope, prop_rc_model, thermal_resistance_surface,
                      window_frame_fraction):
     """
@@ -951,56 +1089,44 @@ def calc_Isol_daysim(building_name, locator, prop_envelope, prop_rc_model, therm
 
     """
 
-    # read daysim geometry
-    geometry_data = pd.read_csv(locator.get_radiation_metadata(building_name)).set_index('SURFACE')
-    geometry_data_roofs = geometry_data[geometry_data.TYPE == 'roofs']
-    geometry_data_walls = geometry_data[geometry_data.TYPE == 'walls']
+    # read daysim geometry and radiation (one row per sensor)
+    geometry_data, radiation_data = radiation_store.read_sensors(locator, building_name)
+    is_roof = (geometry_data.TYPE == 'roofs').values
+    is_wall = (geometry_data.TYPE == 'walls').values
+    area_m2 = geometry_data.AREA_m2.values
 
     # do this in case the daysim radiation file did not included window
     if 'windows' in geometry_data.TYPE.values:
-        geometry_data_windows = geometry_data[geometry_data.TYPE == 'windows']
+        is_window = (geometry_data.TYPE == 'windows').values
         multiplier_wall = 1
         multiplier_win = 1
     else:
-        geometry_data_windows = geometry_data[geometry_data.TYPE == 'walls']
+        is_window = is_wall
         multiplier_win = 0.25 * (
                 prop_envelope.ix[building_name, 'wwr_south'] + prop_envelope.ix[building_name, 'wwr_east'] +
                 prop_envelope.ix[
                     building_name, 'wwr_north'] + prop_envelope.ix[building_name, 'wwr_west'])
         multiplier_wall = 1 - multiplier_win
 
-    # read daysim radiation
-    radiation_data = pd.read_json(locator.get_radiation_building(building_name))
-    # sum wall
-    # solar incident on all walls [W]
-    I_sol_wall = np.array(
-        [geometry_data_walls.ix[surface, 'AREA_m2'] * multiplier_wall * radiation_data[surface] for surface in
-         geometry_data_walls.index]).sum(axis=0)
-    # sensible gain on all walls [W]
-    I_sol_wall = I_sol_wall * prop_envelope.ix[building_name, 'a_wall'] * thermal_resistance_surface * \
-                 prop_rc_model.ix[building_name, 'U_wall']
-    # sum roof
-
-    # solar incident on all roofs [W]
-    I_sol_roof = np.array([geometry_data_roofs.ix[surface, 'AREA_m2'] * radiation_data[surface] for surface in
-                           geometry_data_roofs.index]).sum(axis=0)
-    # sensible gain on all roofs [W]
-    I_sol_roof = I_sol_roof * prop_envelope.ix[building_name, 'a_roof'] * thermal_resistance_surface * \
-                 prop_rc_model.ix[building_name, 'U_roof']
+    # sensible gain of each wall and roof sensor per unit of radiation [m2]
+    weight_opaque = np.zeros(len(geometry_data))
+    weight_opaque[is_wall] = area_m2[is_wall] * multiplier_wall * prop_envelope.ix[building_name, 'a_wall'] * \
+                             thermal_resistance_surface * prop_rc_model.ix[building_name, 'U_wall']
+    weight_opaque[is_roof] = area_m2[is_roof] * prop_envelope.ix[building_name, 'a_roof'] * \
+                             thermal_resistance_surface * prop_rc_model.ix[building_name, 'U_roof']
+    # sensible gain on all walls and roofs [W]
+    I_sol_opaque = np.dot(weight_opaque, radiation_data)
+
     # sum window, considering shading
     from cea.technologies import blinds
-    Fsh_win = [np.vectorize(blinds.calc_blinds_activation)(radiation_data[surface],
-                                                           prop_envelope.ix[building_name, 'G_win'],
-                                                           prop_envelope.ix[building_name, 'rf_sh']) for surface
-               in geometry_data_windows.index]
-
-    I_sol_win = [geometry_data_windows.ix[surface, 'AREA_m2'] * multiplier_win * radiation_data[surface]
-                 for surface in geometry_data_windows.index]
-
-    I_sol_win = np.array([x * y * (1 - window_frame_fraction) for x, y in zip(I_sol_win, Fsh_win)]).sum(axis=0)
+    radiation_win = radiation_data[is_window]
+    Fsh_win = blinds.calc_blinds_activation(radiation_win, prop_envelope.ix[building_name, 'G_win'],
+                                            prop_envelope.ix[building_name, 'rf_sh'])
+    weight_win = area_m2[is_window] * multiplier_win * (1 - window_frame_fraction)
+    I_sol_win = np.dot(weight_win, radiation_win * Fsh_win)
 
     # sum
-    I_sol = I_sol_wall + I_sol_roof + I_sol_win
+    I_sol = I_sol_opaque + I_sol_win
 
     return I_sol
 
@@ -1018,7 +1144,7 @@ def calc_Isol_arcgis(I_sol_average, prop_rc_model, prop_envelope, window_frame_f
 
     """
     from cea.technologies import blinds
-    Fsh_win = np.vectorize(blinds.calc_blinds_activation)(I_sol_average, prop_envelope.G_win, prop_envelope.rf_sh)
+    Fsh_win = blinds.calc_blinds_activation(I_sol_average, prop_envelope.G_win, prop_envelope.rf_sh)
 
     Asol_wall = prop_rc_model['Aop_sup'] * prop_envelope.a_wall * thermal_resistance_surface * prop_rc_model['U_wall']
     Asol_roof = prop_rc_model['Aroof'] * prop_envelope.a_roof * thermal_resistance_surface * prop_rc_model['U_roof']
@@ -10,6 +10,7 @@ import pandas as pd
 import cea
 import numpy as np
 from cea.demand import demand_main
+from cea.demand import demand_reader
 from cea.demand.calibration import latin_sampler
 from geopandas import GeoDataFrame as Gdf
 
@@ -116,8 +117,9 @@ def simulate_demand_sample(locator, building_name, building_load, config):
     config.demand.temperatures_output = ["Tww_sys_sup"] # give one entry so it doe snot plot all ( it saves memory)
     config.demand.format_output = "csv"
 
-    _ , time_series = demand_main.demand_calculation(locator, config)
-    return time_series[0][building_load+"_kWh"].values
+    demand_main.demand_calculation(locator, config)
+    return demand_reader.read_hourly_demand(locator, building_name, columns=[building_load + "_kWh"])[
+        building_load + "_kWh"].values
 
 def calc_cv_rmse(prediction, target):
     """
@@ -193,8 +193,8 @@ def cooling_system_is_active(bpr, tsd, t):
     :rtype: bool
     """
 
-    if not np.isnan(tsd['ta_cs_set'][t]) and not tsd['T_int'][t - 1] <= np.max([bpr.hvac['Tc_sup_air_ahu_C'],
-                                                                               bpr.hvac['Tc_sup_air_aru_C']]):
+    if not np.isnan(tsd['ta_cs_set'][t]) \
+            and not tsd['T_int'][t - 1] <= get_control_profile(bpr).t_cooling_supply_air_max:
         # system has set point according to schedule of operation & internal temperature is not below the set point
         return True
     else:
@@ -238,6 +238,70 @@ def convert_date_to_hour(date):
     return int(delta.total_seconds() / SECONDS_PER_HOUR)
 
 
+HOURS_IN_YEAR = 8760
+
+
+class ControlProfile(object):
+    """
+    The heating / cooling control of a building that does not change during the simulation, calculated once before
+    the hourly loop (see :py:func:`get_control_profile`): the heating and cooling seasons as boolean arrays over the
+    hours of the year and the type of the heating / cooling systems.
+    """
+
+    def __init__(self, bpr):
+        self.heating_season = calc_season(bpr.hvac['has-heating-season'], bpr.hvac.get('heating-season-start'),
+                                          bpr.hvac.get('heating-season-end'))
+        self.cooling_season = calc_season(bpr.hvac['has-cooling-season'], bpr.hvac.get('cooling-season-start'),
+                                          bpr.hvac.get('cooling-season-end'))
+        # exclusive seasons, as used by the hourly procedure (hours in both seasons are simulated without loads)
+        self.heating_only = self.heating_season & ~self.cooling_season
+        self.cooling_only = self.cooling_season & ~self.heating_season
+
+        self.has_heating_system = has_heating_system(bpr)
+        self.has_radiator_or_floor_heating_system = has_radiator_heating_system(bpr) or has_floor_heating_system(bpr)
+        self.has_central_ac_heating_system = has_central_ac_heating_system(bpr)
+
+        self.has_cooling_system = has_cooling_system(bpr)
+        self.has_local_ac_cooling_system = has_local_ac_cooling_system(bpr)
+        self.has_central_ac_cooling_system = has_central_ac_cooling_system(bpr)
+        self.has_3for2_cooling_system = has_3for2_cooling_system(bpr)
+        self.has_ceiling_cooling_system = has_ceiling_cooling_system(bpr)
+        # cooling_system_is_active: the system is off if the zone is colder than the supply air
+        self.t_cooling_supply_air_max = max(bpr.hvac['Tc_sup_air_ahu_C'], bpr.hvac['Tc_sup_air_aru_C'])
+
+
+def get_control_profile(bpr):
+    """
+    :return: the control profile of the building, calculated on first use and kept with the building properties
+    :rtype: ControlProfile
+    """
+    control_profile = getattr(bpr, 'control_profile', None)
+    if control_profile is None:
+        control_profile = bpr.control_profile = ControlProfile(bpr)
+    return control_profile
+
+
+def calc_season(has_season, season_start, season_end):
+    """
+    :param has_season: False, if the building has no such season
+    :param season_start: first day of the season in 'MM-DD' format
+    :param season_end: last day of the season in 'MM-DD' format
+    :return: True for each hour of the year that is part of the season (seasons can span the end of the year)
+    :rtype: ndarray[bool]
+    """
+    if not has_season:
+        return np.zeros(HOURS_IN_YEAR, dtype=bool)
+    start = convert_date_to_hour(season_start)
+    end = convert_date_to_hour(season_end) + 23  # end at the last hour of the day
+    hours = np.arange(HOURS_IN_YEAR)
+    if start < end:
+        # season in the middle of the year
+        return (start <= hours) & (hours <= end)
+    else:
+        # season over the year end
+        return (start <= hours) | (hours <= end)
+
+
 def is_heating_season(t, bpr):
     """
     checks if time step is part of the heating season for the building
@@ -250,30 +314,7 @@ def is_heating_season(t, bpr):
     :rtype: bool
     """
 
-    if bpr.hvac['has-heating-season']:
-
-        heating_start = convert_date_to_hour(bpr.hvac['heating-season-start'])
-        heating_end = convert_date_to_hour(bpr.hvac['heating-season-end']) + 23  # end at the last hour of the day
-
-        # check if heating season is at the end of the year (north hemisphere) or in the middle of the year (south)
-        if heating_start < heating_end and \
-                heating_start <= t <= heating_end:
-
-            # heating season time on south hemisphere
-            return True
-
-        elif heating_start > heating_end and \
-                (heating_start <= t <= 8760 or 0 <= t <= heating_end):
-            # heating season over the year end (north hemisphere)
-            return True
-
-        else:
-            # not time of heating season
-            return False
-
-    elif not bpr.hvac['has-heating-season']:
-        # no heating season
-        return False
+    return get_control_profile(bpr).heating_season[t]
 
 
 def is_cooling_season(t, bpr):
@@ -288,30 +329,7 @@ def is_cooling_season(t, bpr):
     :rtype: bool
         """
 
-    if bpr.hvac['has-cooling-season']:
-
-        cooling_start = convert_date_to_hour(bpr.hvac['cooling-season-start'])
-        cooling_end = convert_date_to_hour(bpr.hvac['cooling-season-end']) + 23  # end at the last hour of the day
-
-        # check if cooling season is at the end of the year (south hemisphere) or in the middle of the year (norht)
-        if cooling_start < cooling_end and \
-                cooling_start <= t <= cooling_end:
-
-            # cooling season time on north hemisphere
-            return True
-
-        elif cooling_start > cooling_end and \
-                (cooling_start <= t <= 8760 or 0 <= t <= cooling_end):
-            # cooling season around the year end (south hemisphere)
-            return True
-
-        else:
-            # not time of cooling season
-            return False
-
-    elif not bpr.hvac['has-cooling-season']:
-        # no cooling season
-        return False
+    return get_control_profile(bpr).cooling_season[t]
 
 # temperature controllers
 
@@ -328,12 +346,47 @@ def calc_simple_temp_control(tsd, bpr, weekday):
     :rtype: dict
     """
 
-    tsd['ta_hs_set'] = np.vectorize(get_heating_system_set_point)(tsd['people'], range(8760), bpr, weekday)
-    tsd['ta_cs_set'] = np.vectorize(get_cooling_system_set_point)(tsd['people'], range(8760), bpr, weekday)
+    tsd['ta_hs_set'], tsd['ta_cs_set'] = calc_set_points(tsd['people'], bpr, weekday)
 
     return tsd
 
 
+def calc_set_points(people, bpr, weekday):
+    """
+    Heating and cooling system set points of every hour of the year - the same as calling
+    :py:func:`get_heating_system_set_point` and :py:func:`get_cooling_system_set_point` for each hour, but calculated
+    from the season masks of the control profile in a few array operations.
+
+    :param people: number of people in the building in each hour
+    :type people: ndarray
+    :param bpr: BuildingPropertiesRow
+    :type bpr: cea.demand.building_properties.BuildingPropertiesRow
+    :param weekday: day of the week of each hour (Monday = 0)
+    :type weekday: ndarray
+    :return: heating and cooling system set point temperatures [°C], nan where the system is off
+    :rtype: (ndarray, ndarray)
+    """
+    control_profile = get_control_profile(bpr)
+    is_occupied = np.asarray(people) != 0
+    weekday = np.asarray(weekday)
+    is_weekend = (5 <= weekday) & (weekday <= 6)  # system is off on the weekend
+    ta_hs_set = calc_set_point(control_profile.heating_season, is_occupied, is_weekend, bpr.comfort['Ths_set_C'],
+                               bpr.comfort['Ths_setb_C'])
+    ta_cs_set = calc_set_point(control_profile.cooling_season, is_occupied, is_weekend, bpr.comfort['Tcs_set_C'],
+                               bpr.comfort['Tcs_setb_C'])
+    return ta_hs_set, ta_cs_set
+
+
+def calc_set_point(season, is_occupied, is_weekend, set_point, set_back):
+    """
+    :return: the set point in occupied hours of the season, the set back temperature in unoccupied hours of the season
+             (except on the weekend) and nan (system off) otherwise
+    :rtype: ndarray
+    """
+    set_points = np.where(is_occupied, set_point, np.where(is_weekend, np.nan, set_back))
+    return np.where(season, set_points, np.nan)
+
+
 def get_heating_system_set_point(people, t, bpr, weekday):
     """
 
@@ -3,20 +3,30 @@
 Analytical energy demand model algorithm
 """
 from __future__ import division
+from __future__ import print_function
 
+import ctypes
 import multiprocessing as mp
 import os
 import time
 
+import numpy as np
 import pandas as pd
 
 import cea.config
 import cea.globalvar
 import cea.inputlocator
+import cea.utilities.jit
+import demand_scheduler
 import demand_writers
+from cea.demand import demand_manifest
+from cea.demand import demand_timing
 from cea.demand import occupancy_model
 from cea.demand import thermal_loads
+from cea.demand import thermal_loads_batch
 from cea.demand.building_properties import BuildingProperties
+from cea.demand.set_point_from_predefined_file import read_predefined_set_points
+from cea.resources.radiation_daysim import radiation_store
 from cea.utilities import epwreader
 import warnings
 warnings.filterwarnings("ignore")
@@ -40,6 +50,10 @@ def demand_calculation(locator, config):
     Produces a demand file per building and a total demand file for the whole zone of interest:
       - a csv file for every building with hourly demand data.
       - ``Total_demand.csv``, csv file of yearly demand data per building.
+      - ``Total_demand_hourly.csv``, csv file of the hourly loads summed up over the buildings.
+
+    With the ``demand:incremental`` parameter, only the buildings whose inputs changed since the last calculation are
+    simulated (see :py:mod:`cea.demand.demand_manifest`).
 
 
     :param locator: An InputLocator to locate input files
@@ -49,7 +63,7 @@ def demand_calculation(locator, config):
     :type weather_path: str
 
     :param use_dynamic_infiltration_calculation: Set this to ``True`` if the (slower) dynamic infiltration
-        calculation method (:py:func:`cea.demand.ventilation_air_flows_detailed.calc_air_flows`) should be used instead
+        calculation method (:py:func:`cea.demand.ventilation_air_flows_detailed.calc_air_flows_root`) should be used instead
         of the standard.
     :type use_dynamic_infiltration_calculation: bool
 
@@ -57,8 +71,9 @@ def demand_calculation(locator, config):
         calculations by making use of multiple cores.
     :type multiprocessing: bool
 
-    :returns: None
-    :rtype: NoneType
+    :returns: the yearly totals of the buildings (the rows of ``Total_demand.csv``). The hourly results of the buildings
+        are not read back, use :py:func:`cea.demand.demand_reader.read_hourly_demand` where they are needed.
+    :rtype: pandas.DataFrame
 
     .. [Fonseca2015] Fonseca, Jimeno A., and Arno Schlueter. “Integrated Model for Characterization of
         Spatiotemporal Building Energy Consumption Patterns in Neighborhoods and City Districts.”
@@ -67,6 +82,7 @@ def demand_calculation(locator, config):
 
     # INITIALIZE TIMER
     t0 = time.clock()
+    demand_timing.enable(config.demand.write_timing)
 
     # LOCAL VARIABLES
     multiprocessing = config.multiprocessing
@@ -83,13 +99,15 @@ def demand_calculation(locator, config):
     override_variables = config.demand.override_variables
     write_detailed_output = config.demand.write_detailed_output
     debug = config.debug
-    weather_data = epwreader.epw_reader(config.weather)[['year', 'drybulb_C', 'wetbulb_C',
-                                                         'relhum_percent', 'windspd_ms', 'skytemp_C']]
+    with demand_timing.phase(demand_timing.ZONE, 'weather'):
+        weather_data = epwreader.epw_reader(config.weather)[['year', 'drybulb_C', 'wetbulb_C',
+                                                             'relhum_percent', 'windspd_ms', 'skytemp_C']]
     year = weather_data['year'][0]
 
     # CALCULATE OBJECT WITH PROPERTIES OF ALL BUILDINGS
     building_properties, schedules_dict, date = properties_and_schedule(locator, region, year, use_daysim_radiation,
-                                                                        override_variables)
+                                                                        override_variables,
+                                                                        config.get_number_of_processes())
 
     # SPECIFY NUMBER OF BUILDINGS TO SIMULATE
     if not list_building_names:
@@ -98,44 +116,84 @@ def demand_calculation(locator, config):
     else:
         print('Running demand calculation for the next buildings=%s' % list_building_names)
 
+    # SPECIFY THE BUILDINGS WITH CHANGED INPUTS (all buildings, unless the calculation is incremental)
+    with demand_timing.phase(demand_timing.ZONE, 'incremental calculation'):
+        settings_key, building_keys, buildings_to_calculate, unchanged_totals = \
+            demand_manifest.plan_incremental_calculation(locator, config, building_properties, list_building_names,
+                                                         schedules_dict)
+
+    # READ THE PREDEFINED SET POINTS OF ALL BUILDINGS AT ONCE
+    predefined_set_points = None
+    if config.demand.predefined_hourly_setpoints:
+        with demand_timing.phase(demand_timing.ZONE, 'predefined set points'):
+            predefined_set_points = read_predefined_set_points(locator, buildings_to_calculate)
+
     # DEMAND CALCULATION
-    if multiprocessing and mp.cpu_count() > 1:
-        calc_demand_multiprocessing(building_properties, date, locator, list_building_names,
-                                    schedules_dict, weather_data, use_dynamic_infiltration, use_stochastic_occupancy,
-                                    resolution_output, loads_output, massflows_output, temperatures_output,
-                                    format_output, config, region,  write_detailed_output, debug)
-    else:
-        calc_demand_singleprocessing(building_properties, date, locator, list_building_names, schedules_dict,
-                                     weather_data, use_dynamic_infiltration, use_stochastic_occupancy,
-                                     resolution_output, loads_output, massflows_output, temperatures_output,
-                                     format_output, config, region,  write_detailed_output, debug)
+    with demand_timing.phase(demand_timing.ZONE, 'buildings'):
+        if not buildings_to_calculate:
+            demand_totals = demand_writers.DemandTotals()
+        elif multiprocessing and mp.cpu_count() > 1:
+            demand_totals = calc_demand_multiprocessing(building_properties, date, locator, buildings_to_calculate,
+                                                        schedules_dict, weather_data, use_dynamic_infiltration,
+                                                        use_stochastic_occupancy, resolution_output, loads_output,
+                                                        massflows_output, temperatures_output, format_output,
+                                                        config, region, write_detailed_output, debug,
+                                                        predefined_set_points)
+        else:
+            demand_totals = calc_demand_singleprocessing(building_properties, date, locator, buildings_to_calculate,
+                                                         schedules_dict, weather_data, use_dynamic_infiltration,
+                                                         use_stochastic_occupancy, resolution_output, loads_output,
+                                                         massflows_output, temperatures_output, format_output,
+                                                         config, region, write_detailed_output, debug,
+                                                         predefined_set_points)
+    building_timings = demand_totals.timings
+    demand_totals.timings = {}  # the timings of this run are not part of the manifest
+    if unchanged_totals is not None:
+        demand_totals.update(unchanged_totals)
 
     # WRITE TOTAL YEARLY VALUES
-    writer_totals = demand_writers.YearlyDemandWriter(loads_output, massflows_output, temperatures_output)
-    if format_output == 'csv':
-        totals, time_series = writer_totals.write_to_csv(list_building_names, locator)
-    elif format_output == 'hdf5':
-        totals, time_series = writer_totals.write_to_hdf5(list_building_names, locator)
-    else:
-        raise Exception('error')
+    with demand_timing.phase(demand_timing.ZONE, 'write totals'):
+        writer_totals = demand_writers.YearlyDemandWriter(loads_output, massflows_output, temperatures_output)
+        if format_output == 'csv':
+            totals = writer_totals.write_to_csv(demand_totals, list_building_names, date, locator)
+        elif format_output == 'hdf5':
+            totals = writer_totals.write_to_hdf5(demand_totals, list_building_names, date, locator)
+        elif format_output == 'columnar':
+            totals = writer_totals.write_to_columnar(demand_totals, list_building_names, date, locator)
+        else:
+            raise Exception('error')
+        if settings_key is not None:
+            demand_manifest.write_demand_manifest(locator, demand_manifest.DemandManifest(settings_key, building_keys,
+                                                                                          demand_totals))
+
+    # WRITE THE TIME SPENT IN EACH PHASE OF THE CALCULATION
+    if demand_timing.is_enabled():
+        building_timings[demand_timing.ZONE] = demand_timing.pop_timings(demand_timing.ZONE)
+        demand_timing.write_timings(locator, building_timings, list(list_building_names) + [demand_timing.ZONE])
+        demand_timing.enable(False)
 
     time_elapsed = time.clock() - t0
     print('done - time elapsed: %d.2f seconds' % time_elapsed)
 
-    return totals, time_series
+    return totals
 
 
-def properties_and_schedule(locator, region, year, use_daysim_radiation, override_variables=False):
+def properties_and_schedule(locator, region, year, use_daysim_radiation, override_variables=False,
+                            number_of_processes=1):
     # this script is called from the Neural network please do not mess with it!
 
     date = pd.date_range(str(year) + '/01/01', periods=8760, freq='H')
     # building properties model
 
-    building_properties = BuildingProperties(locator, use_daysim_radiation, region, override_variables)
+    with demand_timing.phase(demand_timing.ZONE, 'building properties'):
+        building_properties = BuildingProperties(locator, use_daysim_radiation, region, override_variables,
+                                                 number_of_processes)
 
     # schedules model
     list_uses = list(building_properties._prop_occupancy.columns)
-    archetype_schedules, archetype_values = occupancy_model.schedule_maker(region, date, locator, list_uses)
+    with demand_timing.phase(demand_timing.ZONE, 'archetype schedules'):
+        archetype_schedules, archetype_values = occupancy_model.schedule_maker(region, date, locator, list_uses,
+                                                                               report=print)
 
     schedules_dict = {'list_uses': list_uses, 'archetype_schedules': archetype_schedules, 'occupancy_densities':
         archetype_values['people'], 'archetype_values': archetype_values}
@@ -145,38 +203,232 @@ def properties_and_schedule(locator, region, year, use_daysim_radiation, overrid
 def calc_demand_singleprocessing(building_properties, date, locator, list_building_names, usage_schedules,
                                  weather_data, use_dynamic_infiltration_calculation, use_stochastic_occupancy,
                                  resolution_outputs, loads_output, massflows_output, temperatures_output,
-                                 format_output, config, region,  write_detailed_output, debug):
+                                 format_output, config, region,  write_detailed_output, debug,
+                                 predefined_set_points=None):
     num_buildings = len(list_building_names)
+    demand_totals = demand_writers.DemandTotals()
+    if config.demand.hourly_procedure == 'batch':
+        num_completed = 0
+        for batch in split_into_batches(list_building_names, config.demand.batch_size):
+            bprs = [building_properties[building] for building in batch]
+            batch_totals = thermal_loads_batch.calc_thermal_loads_batch(batch, bprs, weather_data, usage_schedules,
+                                                                        date, locator, use_stochastic_occupancy,
+                                                                        use_dynamic_infiltration_calculation,
+                                                                        resolution_outputs, loads_output,
+                                                                        massflows_output, temperatures_output,
+                                                                        format_output, config, region,
+                                                                        write_detailed_output, debug,
+                                                                        predefined_set_points)
+            demand_totals.update(batch_totals)
+            num_completed += len(batch)
+            print('Buildings No. %i completed out of %i: %s' % (num_completed, num_buildings, ', '.join(batch)))
+        return demand_totals
     for i, building in enumerate(list_building_names):
         bpr = building_properties[building]
-        thermal_loads.calc_thermal_loads(building, bpr, weather_data, usage_schedules, date, locator,
-                                         use_stochastic_occupancy, use_dynamic_infiltration_calculation,
-                                         resolution_outputs, loads_output, massflows_output, temperatures_output,
-                                         format_output, config, region,  write_detailed_output, debug)
+        building_totals = thermal_loads.calc_thermal_loads(building, bpr, weather_data, usage_schedules, date,
+                                                           locator, use_stochastic_occupancy,
+                                                           use_dynamic_infiltration_calculation, resolution_outputs,
+                                                           loads_output, massflows_output, temperatures_output,
+                                                           format_output, config, region, write_detailed_output,
+                                                           debug, predefined_set_points)
+        demand_totals.update(building_totals)
         print('Building No. %i completed out of %i: %s' % (i + 1, num_buildings, building))
+    return demand_totals
 
 
 def calc_demand_multiprocessing(building_properties, date, locator, list_building_names, usage_schedules,
                                 weather_data, use_dynamic_infiltration_calculation, use_stochastic_occupancy,
                                 resolution_outputs, loads_output, massflows_output, temperatures_output, format_output,
-                                config, region,  write_detailed_output, debug):
+                                config, region,  write_detailed_output, debug, predefined_set_points=None):
     number_of_processes = config.get_number_of_processes()
     print("Using %i CPU's" % number_of_processes)
-    pool = mp.Pool(number_of_processes)
-    joblist = []
-    num_buildings = len(list_building_names)
-    for building in list_building_names:
-        bpr = building_properties[building]
-        job = pool.apply_async(thermal_loads.calc_thermal_loads,
-                               [building, bpr, weather_data, usage_schedules, date, locator,
-                                use_stochastic_occupancy, use_dynamic_infiltration_calculation,
-                                resolution_outputs, loads_output, massflows_output, temperatures_output,
-                                format_output, config, region,  write_detailed_output, debug])
-        joblist.append(job)
-    for i, job in enumerate(joblist):
-        job.get(240)
-        print('Building No. %i completed out of %i' % (i + 1, num_buildings))
-    pool.close()
+    # the inputs common to all buildings are published to the workers once (weather data and archetype schedules in
+    # shared memory), the tasks only carry the names of the buildings to simulate
+    worker_inputs = {'building_properties': building_properties,
+                     'weather_data': share_dataframe(weather_data),
+                     'usage_schedules': share_usage_schedules(usage_schedules),
+                     'date': date, 'locator': locator, 'use_stochastic_occupancy': use_stochastic_occupancy,
+                     'use_dynamic_infiltration_calculation': use_dynamic_infiltration_calculation,
+                     'resolution_outputs': resolution_outputs, 'loads_output': loads_output,
+                     'massflows_output': massflows_output, 'temperatures_output': temperatures_output,
+                     'format_output': format_output, 'config': config, 'region': region,
+                     'write_detailed_output': write_detailed_output, 'debug': debug,
+                     'predefined_set_points': predefined_set_points}
+    pool = mp.Pool(number_of_processes, initializer=initialize_worker, initargs=(worker_inputs,))
+
+    costs = dict((building, demand_scheduler.estimate_building_cost(building_properties, building,
+                                                                    use_dynamic_infiltration_calculation))
+                 for building in list_building_names)
+    if config.demand.hourly_procedure == 'batch':
+        max_chunk_size = config.demand.batch_size
+    else:
+        max_chunk_size = demand_scheduler.MAX_CHUNK_SIZE
+    # the totals of each chunk are summed up as the chunks complete
+    demand_totals = demand_writers.DemandTotals()
+    report = demand_scheduler.schedule_demand(pool, number_of_processes, calc_demand_chunk_worker,
+                                              list_building_names, costs, config.demand.hourly_procedure,
+                                              max_chunk_size, config.demand.timeout_per_building,
+                                              config.demand.max_retries, reduce_result=demand_totals.update)
+    report.to_csv(locator.get_demand_report())
+    print('Calculation time and status of each building written to %s' % locator.get_demand_report())
+
+    failed = report[report.status != 'completed']
+    if len(failed):
+        raise Exception('Demand calculation failed for buildings %s (see %s)' % (
+            ', '.join(failed.index), locator.get_demand_report()))
+    return demand_totals
+
+
+# inputs of the demand calculation common to all buildings, set in each worker process by `initialize_worker`
+_worker_inputs = {}
+
+
+def initialize_worker(worker_inputs):
+    """
+    Initializer of the worker processes of :py:func:`calc_demand_multiprocessing`: attach to the shared memory and
+    keep the inputs common to all buildings for the tasks run by this worker.
+
+    :param worker_inputs: the inputs of :py:func:`cea.demand.thermal_loads.calc_thermal_loads` except for the building,
+        with ``weather_data`` and ``usage_schedules`` as created by :py:func:`share_dataframe` and
+        :py:func:`share_usage_schedules`
+    :type worker_inputs: dict
+    """
+    _worker_inputs.clear()
+    _worker_inputs.update(worker_inputs)
+    demand_timing.enable(worker_inputs['config'].demand.write_timing)
+    _worker_inputs['weather_data'] = attach_dataframe(worker_inputs['weather_data'])
+    _worker_inputs['usage_schedules'] = attach_usage_schedules(worker_inputs['usage_schedules'])
+
+
+def calc_demand_chunk_worker(chunk, hourly_procedure):
+    """
+    Run the demand calculation of a chunk of buildings in a worker process (see :py:mod:`demand_scheduler`)
+
+    :return: the yearly totals and hourly loads of the buildings in the chunk, summed up
+    :rtype: cea.demand.demand_writers.DemandTotals
+    """
+    if hourly_procedure == 'batch':
+        return calc_thermal_loads_batch_worker(chunk)
+    demand_totals = demand_writers.DemandTotals()
+    for building in chunk:
+        demand_totals.update(calc_thermal_loads_worker(building))
+    return demand_totals
+
+
+def calc_thermal_loads_worker(building):
+    """Run :py:func:`cea.demand.thermal_loads.calc_thermal_loads` in a worker process for a single building"""
+    inputs = _worker_inputs
+    return thermal_loads.calc_thermal_loads(building, inputs['building_properties'][building],
+                                            inputs['weather_data'], inputs['usage_schedules'], inputs['date'],
+                                            inputs['locator'], inputs['use_stochastic_occupancy'],
+                                            inputs['use_dynamic_infiltration_calculation'],
+                                            inputs['resolution_outputs'],
+                                            inputs['loads_output'], inputs['massflows_output'],
+                                            inputs['temperatures_output'], inputs['format_output'], inputs['config'],
+                                            inputs['region'], inputs['write_detailed_output'], inputs['debug'],
+                                            inputs['predefined_set_points'])
+
+
+def calc_thermal_loads_batch_worker(batch):
+    """Run :py:func:`cea.demand.thermal_loads_batch.calc_thermal_loads_batch` in a worker process for a batch"""
+    inputs = _worker_inputs
+    bprs = [inputs['building_properties'][building] for building in batch]
+    return thermal_loads_batch.calc_thermal_loads_batch(batch, bprs, inputs['weather_data'],
+                                                        inputs['usage_schedules'], inputs['date'], inputs['locator'],
+                                                        inputs['use_stochastic_occupancy'],
+                                                        inputs['use_dynamic_infiltration_calculation'],
+                                                        inputs['resolution_outputs'], inputs['loads_output'],
+                                                        inputs['massflows_output'], inputs['temperatures_output'],
+                                                        inputs['format_output'], inputs['config'], inputs['region'],
+                                                        inputs['write_detailed_output'], inputs['debug'],
+                                                        inputs['predefined_set_points'])
+
+
+def to_shared_memory(array):
+    """
+    Copy a float array to shared memory. The result can be passed to the worker processes of a pool (as ``initargs``)
+    without copying the data and is turned back into an array with :py:func:`from_shared_memory`.
+
+    :param array: array to share
+    :type array: np.ndarray
+    :return: the shared memory block and the shape of the array
+    :rtype: tuple
+    """
+    array = np.asarray(array, dtype=np.float64)
+    shared = mp.RawArray(ctypes.c_double, max(array.size, 1))
+    np.frombuffer(shared, dtype=np.float64, count=array.size)[:] = array.ravel()
+    return shared, array.shape
+
+
+def from_shared_memory(shared_array):
+    """
+    Read-only view of an array created with :py:func:`to_shared_memory` (writing to it would change the inputs of
+    all the other workers).
+    """
+    shared, shape = shared_array
+    array = np.frombuffer(shared, dtype=np.float64, count=int(np.prod(shape))).reshape(shape)
+    array.flags.writeable = False
+    return array
+
+
+def share_dataframe(df):
+    """
+    Copy the float columns of a DataFrame to a single (rows x columns) block of shared memory, see
+    :py:func:`attach_dataframe`. The other columns are passed as they are.
+    """
+    float_columns = [column for column in df.columns if df[column].dtype == np.float64]
+    return {'index': df.index,
+            'float_columns': float_columns,
+            'float_values': to_shared_memory(df[float_columns].values),
+            'other_columns': [(column, df[column].values) for column in df.columns if column not in float_columns]}
+
+
+def attach_dataframe(shared_df):
+    """
+    :return: a DataFrame backed by the shared memory block of :py:func:`share_dataframe` (the float columns are views,
+        not copies)
+    """
+    df = pd.DataFrame(from_shared_memory(shared_df['float_values']), index=shared_df['index'],
+                      columns=shared_df['float_columns'], copy=False)
+    for column, values in shared_df['other_columns']:
+        df[column] = values
+    return df
+
+
+def share_usage_schedules(usage_schedules):
+    """
+    Copy the yearly archetype schedules (occupancy, electricity, hot water and processes for each use) to shared
+    memory, see :py:func:`attach_usage_schedules`.
+    """
+    shared_usage_schedules = dict(usage_schedules)
+    shared_usage_schedules['archetype_schedules'] = to_shared_memory(usage_schedules['archetype_schedules'])
+    return shared_usage_schedules
+
+
+def attach_usage_schedules(shared_usage_schedules):
+    """
+    :return: the ``usage_schedules`` as created by :py:func:`properties_and_schedule`, with the archetype schedules as
+        an array of shape (uses, schedules, hours) instead of nested lists
+    """
+    usage_schedules = dict(shared_usage_schedules)
+    usage_schedules['archetype_schedules'] = from_shared_memory(shared_usage_schedules['archetype_schedules'])
+    return usage_schedules
+
+
+def split_into_batches(list_building_names, batch_size):
+    """
+    Split the list of buildings into batches of (at most) ``batch_size`` buildings for the batch hourly procedure
+    (see :py:mod:`cea.demand.thermal_loads_batch`).
+
+    :param list_building_names: names of the buildings to simulate
+    :type list_building_names: list[str]
+    :param batch_size: maximum number of buildings per batch
+    :type batch_size: int
+    :return: list of batches of building names
+    :rtype: list[list[str]]
+    """
+    batch_size = max(1, batch_size)
+    return [list_building_names[i:i + batch_size] for i in range(0, len(list_building_names), batch_size)]
 
 
 def main(config):
@@ -190,10 +442,17 @@ def main(config):
     print('Running demand calculation with multiprocessing=%s' % config.multiprocessing)
     print('Running demand calculation with daysim radiation=%s' % config.demand.use_daysim_radiation)
     print('Running demand calculation with stochastic occupancy=%s' % config.demand.use_stochastic_occupancy)
+    print('Running demand calculation with hourly procedure=%s' % config.demand.hourly_procedure)
+    print('Running demand calculation with representative days=%s' % config.demand.representative_days)
+    if config.demand.write_timing:
+        print('Running demand calculation with write timing=%s' % config.demand.write_timing)
+    print('Running demand calculation with incremental=%s' % config.demand.incremental)
     if config.demand.write_detailed_output:
         print('Running demand calculation with write detailed output=%s' % config.demand.write_detailed_output)
     if config.debug:
         print('Running demand in debug mode: Instant visulaization of tsd activated.')
+    cea.utilities.jit.configure(config.use_jit)
+    cea.utilities.jit.print_report()
 
 
     if not radiation_files_exist(config, locator):
@@ -204,12 +463,9 @@ def main(config):
 
 def radiation_files_exist(config, locator):
     # verify that the necessary radiation files exist
-    def daysim_results_exist(building_name):
-        return os.path.exists(locator.get_radiation_metadata(building_name)) and os.path.exists(
-            locator.get_radiation_building(building_name))
-
     if config.demand.use_daysim_radiation:
-        return all(daysim_results_exist(building_name) for building_name in locator.get_zone_building_names())
+        return all(radiation_store.radiation_exists(locator, building_name)
+                   for building_name in locator.get_zone_building_names())
     else:
         return os.path.exists(locator.get_radiation()) and os.path.exists(locator.get_surface_properties())
 
@@ -0,0 +1,232 @@
+"""
+Incremental demand calculation: the manifest of the last demand calculation of a scenario.
+
+The manifest (:py:meth:`cea.inputlocator.InputLocator.get_demand_manifest`) stores a fingerprint of the inputs of each
+building (the rows of the building in the building properties, its solar gains and predefined set points), a
+fingerprint of the inputs common to all buildings (weather file, databases, archetype schedules and the parameters of
+the demand script) and the results written to ``Total_demand.csv`` and ``Total_demand_hourly.csv``.
+
+With the ``incremental`` parameter of the demand script, only the buildings whose fingerprint changed are simulated
+again and the totals of the zone are patched: the yearly totals of the unchanged buildings are taken from the
+manifest, and the hourly loads of the recalculated buildings are exchanged in the hourly loads of the zone (the old
+hourly loads are read back from their result files, or from the full precision copy written next to the rounded csv
+files, see :py:meth:`cea.inputlocator.InputLocator.get_demand_hourly_loads`). Everything is recalculated if the
+common fingerprint, the list of buildings or the manifest itself changed.
+"""
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import os
+
+import numpy as np
+import pandas as pd
+
+import cea.utilities.columnar
+from cea.demand import demand_writers
+from cea.utilities.file_cache import new_key, update_key_with_file, write_atomically
+
+__author__ = "Daren Thomas"
+__copyright__ = "Copyright 2019, Architecture and Building Systems - ETH Zurich"
+__credits__ = ["Daren Thomas"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Daren Thomas"
+__email__ = "cea@arch.ethz.ch"
+__status__ = "Production"
+
+# increase when changing the format of the manifest or the demand calculation in a way that changes the results
+DEMAND_MANIFEST_VERSION = 2
+
+# parameters of the demand script that don't change the results
+PARAMETERS_WITHOUT_EFFECT = {'buildings', 'hourly-procedure', 'batch-size', 'timeout-per-building', 'max-retries',
+                             'incremental', 'write-timing'}
+
+
+class DemandManifest(object):
+    """The fingerprints and totals of the last demand calculation of a scenario"""
+
+    def __init__(self, settings_key, building_keys, demand_totals):
+        """
+        :param settings_key: fingerprint of the inputs common to all buildings (see :py:func:`calc_settings_key`)
+        :type settings_key: str
+        :param building_keys: fingerprint of the inputs of each building (see :py:func:`calc_building_key`), in the
+            order of the buildings in ``Total_demand.csv``
+        :type building_keys: collections.OrderedDict
+        :param demand_totals: the yearly totals of the buildings and the hourly loads of the zone
+        :type demand_totals: cea.demand.demand_writers.DemandTotals
+        """
+        self.version = DEMAND_MANIFEST_VERSION
+        self.settings_key = settings_key
+        self.building_keys = building_keys
+        self.demand_totals = demand_totals
+
+    def get_changed_buildings(self, settings_key, building_keys):
+        """
+        :return: the buildings whose fingerprint changed, or None if all buildings need to be calculated
+        :rtype: list[str]
+        """
+        if (self.version != DEMAND_MANIFEST_VERSION or self.settings_key != settings_key
+                or list(self.building_keys.keys()) != list(building_keys.keys())):
+            return None
+        return [building for building, key in building_keys.items() if self.building_keys[building] != key]
+
+    def get_unchanged_totals(self, changed_buildings, locator, format_output):
+        """
+        :return: the totals of the unchanged buildings, or None if the old hourly loads of a changed building can't be
+            read from its result file
+        :rtype: cea.demand.demand_writers.DemandTotals
+        """
+        totals = demand_writers.DemandTotals(self.demand_totals.hourly_columns)
+        totals.yearly_columns = self.demand_totals.yearly_columns
+        totals.yearly = dict((building, data) for building, data in self.demand_totals.yearly.items()
+                             if building not in changed_buildings)
+        totals.hourly = np.array(self.demand_totals.hourly, dtype=np.float64)
+        for building in changed_buildings:
+            try:
+                totals.hourly -= read_hourly_loads(locator, building, format_output, totals.hourly_columns)
+            except Exception as e:
+                print('Could not read the previous results of building %s: %s' % (building, e))
+                return None
+        return totals
+
+
+def calc_settings_key(locator, config, weather_path, usage_schedules):
+    """
+    :return: fingerprint of the inputs common to all buildings: the weather file, the databases, the archetype
+        schedules and the parameters of the demand script
+    :rtype: str
+    """
+    key = new_key(DEMAND_MANIFEST_VERSION, config.region)
+    parameters = config.sections['demand'].parameters
+    for name in sorted(parameters.keys()):
+        if name not in PARAMETERS_WITHOUT_EFFECT:
+            key.update(('|%s=%r' % (name, parameters[name].get())).encode('utf-8'))
+    databases = [locator.get_archetypes_properties(config.region),
+                 locator.get_archetypes_system_controls(config.region),
+                 locator.get_supply_systems(config.region),
+                 locator.get_life_cycle_inventory_supply_systems(config.region),
+                 locator.get_technical_emission_systems(config.region),
+                 locator.get_envelope_systems(config.region)]
+    for path in [weather_path] + databases:
+        update_key_with_file(key, path)
+    key.update(np.asarray(usage_schedules['archetype_schedules'], dtype=np.float64).tobytes())
+    key.update(repr(sorted(usage_schedules['archetype_values'].items())).encode('utf-8'))
+    key.update(repr(list(usage_schedules['list_uses'])).encode('utf-8'))
+    return key.hexdigest()
+
+
+def calc_building_key(building_properties, building_name, locator, config):
+    """
+    :return: fingerprint of the inputs of a building: its rows in the building properties (after applying the
+        overrides), its solar gains and its predefined set points
+    :rtype: str
+    """
+    key = new_key(DEMAND_MANIFEST_VERSION)
+    key.update(building_properties.get_fingerprint(building_name).encode('utf-8'))
+    if config.demand.predefined_hourly_setpoints:
+        for type_of_district_network in ['space-heating', 'space-cooling']:
+            update_key_with_file(key, locator.get_predefined_hourly_setpoints(building_name,
+                                                                              type_of_district_network))
+    return key.hexdigest()
+
+
+def read_hourly_loads(locator, building_name, format_output, hourly_columns):
+    """
+    :return: the hourly loads of a building, as summed up in ``Total_demand_hourly.csv``, read from its hourly
+        result file (at full precision, the csv files are rounded)
+    :rtype: np.ndarray
+    """
+    if format_output == 'csv':
+        path = locator.get_demand_hourly_loads(building_name)
+        hourly_loads = np.load(path)
+        if len(hourly_loads) != len(hourly_columns):
+            raise ValueError('%s does not contain the hourly loads %s' % (path, ', '.join(hourly_columns)))
+        return hourly_loads
+    path = locator.get_demand_results_file(building_name, format_output)
+    if format_output == 'hdf5':
+        hourly_data = pd.read_hdf(path, key='dataset')
+    else:
+        hourly_data = cea.utilities.columnar.read_dataframe(path, hourly_columns)
+    return hourly_data[hourly_columns].values.T
+
+
+def read_demand_manifest(locator):
+    """:return: the manifest of the last demand calculation of the scenario, or None if there is none"""
+    manifest_file = locator.get_demand_manifest()
+    if not os.path.exists(manifest_file):
+        return None
+    try:
+        return pd.read_pickle(manifest_file)
+    except Exception as e:
+        print('Ignoring corrupt demand manifest %s: %s' % (manifest_file, e))
+        return None
+
+
+def remove_demand_manifest(locator):
+    """Remove the manifest - the results of the buildings are about to change"""
+    if os.path.exists(locator.get_demand_manifest()):
+        os.remove(locator.get_demand_manifest())
+
+
+def write_demand_manifest(locator, manifest):
+    """Write the manifest (see :py:func:`cea.utilities.file_cache.write_atomically`)"""
+    write_atomically(locator.get_demand_manifest(), lambda path: pd.to_pickle(manifest, path))
+
+
+def remove_stale_hourly_loads(locator, building_names):
+    """Remove the full precision hourly loads of the buildings that are not in ``building_names``"""
+    folder = locator.get_demand_hourly_loads_folder()
+    if not os.path.isdir(folder):
+        return
+    building_names = set(building_names)
+    for file_name in os.listdir(folder):
+        building_name, extension = os.path.splitext(file_name)
+        if extension == '.npy' and building_name not in building_names:
+            os.remove(os.path.join(folder, file_name))
+
+
+def is_incremental(config):
+    """:return: True if the manifest is kept (only for the incremental calculation, which needs hourly results)"""
+    return config.demand.incremental and config.demand.resolution_output == 'hourly'
+
+
+def plan_incremental_calculation(locator, config, building_properties, list_building_names, usage_schedules):
+    """
+    Find the buildings to calculate with the ``incremental`` parameter of the demand script (which needs the hourly
+    results of the last calculation). The manifest is removed, as the results of the buildings are about to change.
+    Without the ``incremental`` parameter, the inputs are not fingerprinted and the full precision hourly loads of the
+    last incremental calculation are removed as well.
+
+    :return: the fingerprints of the inputs (settings key and building keys, None if the calculation is not
+        incremental), the buildings to calculate and the totals of the other buildings (None if all buildings are
+        calculated)
+    :rtype: (str, collections.OrderedDict, list[str], cea.demand.demand_writers.DemandTotals)
+    """
+    if not is_incremental(config):
+        remove_demand_manifest(locator)
+        remove_stale_hourly_loads(locator, [])
+        return None, None, list(list_building_names), None
+    remove_stale_hourly_loads(locator, building_properties.list_building_names())
+
+    settings_key = calc_settings_key(locator, config, config.weather, usage_schedules)
+    building_keys = collections.OrderedDict((building_name, calc_building_key(building_properties, building_name,
+                                                                              locator, config))
+                                            for building_name in list_building_names)
+    manifest = read_demand_manifest(locator)
+    remove_demand_manifest(locator)
+
+    if manifest is None:
+        return settings_key, building_keys, list(list_building_names), None
+    changed_buildings = manifest.get_changed_buildings(settings_key, building_keys)
+    if changed_buildings is None:
+        print('Inputs common to all buildings changed since the last demand calculation, calculating all buildings')
+        return settings_key, building_keys, list(list_building_names), None
+    if len(changed_buildings) == len(list_building_names):
+        return settings_key, building_keys, list(list_building_names), None
+    unchanged_totals = manifest.get_unchanged_totals(changed_buildings, locator, config.demand.format_output)
+    if unchanged_totals is None:
+        return settings_key, building_keys, list(list_building_names), None
+    print('Inputs of %i out of %i buildings changed since the last demand calculation' % (
+        len(changed_buildings), len(list_building_names)))
+    return settings_key, building_keys, changed_buildings, unchanged_totals
@@ -0,0 +1,90 @@
+"""
+Read the hourly demand results of a building (or of the whole zone), independent of the ``demand:format-output`` they
+were written with (``csv`` or ``columnar``, see :py:mod:`cea.demand.demand_writers`).
+
+If both a ``.csv`` and a ``.h5`` file exist for a building (e.g. after switching the output format), the most recent
+one is read.
+"""
+from __future__ import division
+
+import os
+
+import pandas as pd
+
+import cea.utilities.columnar
+
+__author__ = "Daren Thomas"
+__copyright__ = "Copyright 2019, Architecture and Building Systems - ETH Zurich"
+__credits__ = ["Daren Thomas"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Daren Thomas"
+__email__ = "cea@arch.ethz.ch"
+__status__ = "Production"
+
+READABLE_FORMATS = ['columnar', 'csv']
+
+
+def get_demand_results_format(locator, building_name):
+    """
+    :return: the format of the (most recent) hourly demand results of the building or ``None`` if there are none
+    :rtype: str
+    """
+    return most_recent_format(lambda format: locator.get_demand_results_file(building_name, format))
+
+
+def most_recent_format(get_path):
+    """
+    :param get_path: function returning the path of the file for a format
+    :return: the format of the most recently written file or ``None`` if none exists
+    """
+    existing = [(os.path.getmtime(get_path(format)), format) for format in READABLE_FORMATS
+                if os.path.exists(get_path(format))]
+    if not existing:
+        return None
+    return max(existing)[1]
+
+
+def demand_results_exist(locator, building_name):
+    """True, if the demand results of the building exist in one of the readable formats"""
+    return get_demand_results_format(locator, building_name) is not None
+
+
+def read_hourly_demand(locator, building_name, columns=None):
+    """
+    Read the hourly demand results of a building. With the ``columnar`` format, only the requested columns are read
+    from disk.
+
+    :param locator: the locator of the scenario
+    :type locator: cea.inputlocator.InputLocator
+    :param building_name: name of the building
+    :type building_name: str
+    :param columns: the columns to read (e.g. ``['DATE', 'Qhs_sys_kWh']``), default: all columns
+    :type columns: list[str]
+    :return: the hourly demand results, with the same columns as the ``.csv`` file (``DATE`` is a column, not the
+        index)
+    :rtype: pd.DataFrame
+    """
+    format = get_demand_results_format(locator, building_name)
+    if format == 'columnar':
+        return cea.utilities.columnar.read_dataframe(locator.get_demand_results_file(building_name, format), columns)
+    # fall back to reading the csv file (raising the usual error if it does not exist)
+    return pd.read_csv(locator.get_demand_results_file(building_name, 'csv'), usecols=columns)
+
+
+def total_hourly_demand_exists(locator):
+    """True, if the summed up hourly loads of the zone exist in one of the readable formats"""
+    return most_recent_format(locator.get_total_demand_hourly) is not None
+
+
+def read_total_hourly_demand(locator, columns=None):
+    """
+    Read the hourly loads summed up over the buildings of the last demand calculation (``Total_demand_hourly``).
+
+    :return: the hourly loads with ``DATE`` as a column (like :py:func:`read_hourly_demand`)
+    :rtype: pd.DataFrame
+    """
+    format = most_recent_format(locator.get_total_demand_hourly)
+    if format == 'columnar':
+        return cea.utilities.columnar.read_dataframe(locator.get_total_demand_hourly(format), columns)
+    return pd.read_csv(locator.get_total_demand_hourly('csv'), usecols=columns)
@@ -0,0 +1,221 @@
+"""
+Load-balanced scheduling of the demand calculation on a multiprocessing pool.
+
+The buildings are sorted by their estimated calculation cost (most expensive first) and dispatched in chunks whose
+size adapts to the remaining work: the expensive buildings are sent alone, the cheap ones at the end of the list are
+grouped, so that the pool stays busy until the end without one slow building holding up a large chunk. At most one
+chunk per process is in flight, results are collected as they complete, chunks exceeding their time limit and
+buildings that raised an error are retried (one building per chunk) and a timing / failure report is written for
+each building. The result returned by each completed chunk is passed to a ``reduce_result`` function in the parent
+process (e.g. to sum up the yearly totals of the buildings).
+"""
+from __future__ import division
+from __future__ import print_function
+
+import Queue
+import time
+import traceback
+
+import pandas as pd
+
+__author__ = "Daren Thomas"
+__copyright__ = "Copyright 2019, Architecture and Building Systems - ETH Zurich"
+__credits__ = ["Daren Thomas"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Daren Thomas"
+__email__ = "cea@arch.ethz.ch"
+__status__ = "Production"
+
+# maximum number of buildings per chunk for the per-building hourly procedure (the batch hourly procedure uses the
+# batch-size parameter)
+MAX_CHUNK_SIZE = 10
+
+# seconds to wait for a result before checking the time limits of the chunks in flight
+POLLING_INTERVAL = 1.0
+
+
+def estimate_building_cost(building_properties, building, use_dynamic_infiltration_calculation):
+    """
+    Estimate the relative calculation time of a building (1.0 being a building with hydronic heating and cooling
+    systems). Used only to order and group the buildings, so it does not need to be exact.
+
+    :param building_properties: the building properties of the zone
+    :type building_properties: cea.demand.building_properties.BuildingProperties
+    :param building: name of the building
+    :type building: str
+    :param use_dynamic_infiltration_calculation: the dynamic infiltration calculation solves the air flows every hour
+    :type use_dynamic_infiltration_calculation: bool
+    :return: estimated cost
+    :rtype: float
+    """
+    if building_properties.get_prop_rc_model(building)['Af'] <= 0.0:
+        # no conditioned floor area: the hourly heating / cooling procedure is skipped
+        return 0.2
+    hvac = building_properties.get_prop_hvac(building)
+    cost = 0.5
+    for system in [hvac['type_hs'], hvac['type_cs']]:
+        if system == 'T3':
+            # air-based systems (AHU / ARU / SHU) calculate the air flows and temperatures of each unit
+            cost += 1.0
+        elif system != 'T0':
+            cost += 0.25
+    if use_dynamic_infiltration_calculation:
+        cost *= 3.0
+    return cost
+
+
+def next_chunk(buildings, costs, number_of_processes, max_chunk_size):
+    """
+    Take the next chunk from the head of ``buildings`` (sorted by decreasing cost): buildings are added to the chunk
+    until it holds a share of ``1 / (2 * number_of_processes)`` of the remaining cost.
+
+    :param buildings: remaining buildings, sorted by decreasing cost - the chunk is removed from this list
+    :type buildings: list[str]
+    :param costs: estimated cost of each building
+    :type costs: dict[str, float]
+    :param number_of_processes: number of worker processes
+    :type number_of_processes: int
+    :param max_chunk_size: maximum number of buildings in a chunk
+    :type max_chunk_size: int
+    :return: the next chunk
+    :rtype: list[str]
+    """
+    target_cost = sum(costs[building] for building in buildings) / (2 * number_of_processes)
+    chunk = [buildings.pop(0)]
+    chunk_cost = costs[chunk[0]]
+    while buildings and len(chunk) < max_chunk_size and chunk_cost + costs[buildings[0]] <= target_cost:
+        chunk_cost += costs[buildings[0]]
+        chunk.append(buildings.pop(0))
+    return chunk
+
+
+def run_chunk(calc_chunk, chunk, hourly_procedure):
+    """
+    Run ``calc_chunk(chunk, hourly_procedure)`` in a worker process and return one status per building. Exceptions are
+    caught here, since ``apply_async`` only reports results (not errors) through the callback.
+
+    :return: list of (building, status, seconds, error) tuples with status being either "completed" or "failed" and
+        the result of ``calc_chunk`` (``None`` if it failed)
+    :rtype: tuple
+    """
+    t0 = time.time()
+    try:
+        result = calc_chunk(chunk, hourly_procedure)
+    except Exception:
+        seconds = (time.time() - t0) / len(chunk)
+        return [(building, 'failed', seconds, traceback.format_exc()) for building in chunk], None
+    seconds = (time.time() - t0) / len(chunk)
+    return [(building, 'completed', seconds, '') for building in chunk], result
+
+
+def schedule_demand(pool, number_of_processes, calc_chunk, list_building_names, costs, hourly_procedure,
+                    max_chunk_size, timeout_per_building, max_retries, reduce_result=None):
+    """
+    Run the demand calculation of the buildings on ``pool`` (see module docstring). The pool is closed (or terminated,
+    if workers are blocked by timed out chunks) at the end.
+
+    :param pool: the pool of worker processes (with the demand inputs already published to the workers)
+    :type pool: multiprocessing.Pool
+    :param number_of_processes: number of processes in the pool
+    :type number_of_processes: int
+    :param calc_chunk: function to run in the workers as ``calc_chunk(list_building_names, hourly_procedure)``
+    :param list_building_names: the buildings to simulate
+    :type list_building_names: list[str]
+    :param costs: estimated cost of each building (see :py:func:`estimate_building_cost`)
+    :type costs: dict[str, float]
+    :param hourly_procedure: ``building`` or ``batch`` (retries always use ``building``)
+    :type hourly_procedure: str
+    :param max_chunk_size: maximum number of buildings in a chunk
+    :type max_chunk_size: int
+    :param timeout_per_building: time limit of a chunk in seconds, per building in the chunk
+    :type timeout_per_building: int
+    :param max_retries: number of times a failed or timed out building is calculated again
+    :type max_retries: int
+    :param reduce_result: function called in this process with the result of each completed chunk (results of chunks
+        that timed out are discarded, their buildings are calculated again)
+    :return: the report with a row per building: estimated cost, number of attempts, status (completed, failed or
+        timeout), calculation time in seconds and the error of the last attempt
+    :rtype: pd.DataFrame
+    """
+    num_buildings = len(list_building_names)
+    pending = sorted(list_building_names, key=lambda building: costs[building], reverse=True)
+    retries = []
+    report = pd.DataFrame({'estimated_cost': [costs[building] for building in list_building_names],
+                           'attempts': 0, 'status': 'pending', 'time_s': 0.0, 'error': ''},
+                          index=pd.Index(list_building_names, name='Name'),
+                          columns=['estimated_cost', 'attempts', 'status', 'time_s', 'error'])
+
+    results = Queue.Queue()
+    in_flight = {}  # chunk id -> (chunk, deadline)
+    capacity = number_of_processes  # workers not blocked by a timed out chunk
+    next_chunk_id = 0
+    num_completed = 0
+    while pending or retries or in_flight:
+        # keep one chunk per available worker in flight
+        while (pending or retries) and len(in_flight) < capacity:
+            if retries:
+                chunk, procedure = [retries.pop(0)], 'building'
+            else:
+                chunk, procedure = next_chunk(pending, costs, number_of_processes, max_chunk_size), \
+                                   hourly_procedure
+            report.loc[chunk, 'attempts'] += 1
+            in_flight[next_chunk_id] = (chunk, time.time() + timeout_per_building * len(chunk))
+            pool.apply_async(run_chunk, [calc_chunk, chunk, procedure],
+                             callback=lambda result, chunk_id=next_chunk_id: results.put((chunk_id, result)))
+            next_chunk_id += 1
+        if not in_flight:
+            # all workers are blocked by timed out chunks
+            for building in pending + retries:
+                report.loc[building, ['status', 'error']] = ['failed', 'no worker left (all timed out)']
+            break
+
+        try:
+            chunk_id, (statuses, result) = results.get(timeout=POLLING_INTERVAL)
+        except Queue.Empty:
+            chunk_id, statuses, result = None, [], None
+
+        if chunk_id is not None and chunk_id not in in_flight:
+            # late result of a timed out chunk: the worker is available again, but the buildings have already been
+            # rescheduled or reported
+            capacity += 1
+            continue
+        if chunk_id is not None:
+            del in_flight[chunk_id]
+        if result is not None and reduce_result is not None:
+            reduce_result(result)
+        for building, status, seconds, error in statuses:
+            report.loc[building, ['status', 'time_s', 'error']] = [status, seconds, error]
+            if status == 'completed':
+                num_completed += 1
+                print('Building No. %i completed out of %i: %s (%.1f seconds)' % (num_completed, num_buildings,
+                                                                                  building, seconds))
+            elif report.loc[building, 'attempts'] <= max_retries:
+                print('Building %s failed, retrying:\n%s' % (building, error))
+                retries.append(building)
+            else:
+                print('Building %s failed:\n%s' % (building, error))
+
+        # time limits
+        now = time.time()
+        for chunk_id, (chunk, deadline) in in_flight.items():
+            if now > deadline:
+                del in_flight[chunk_id]
+                capacity -= 1
+                for building in chunk:
+                    report.loc[building, ['status', 'time_s', 'error']] = [
+                        'timeout', float(timeout_per_building), 'no result after %i seconds' % (
+                            timeout_per_building * len(chunk))]
+                    if report.loc[building, 'attempts'] <= max_retries:
+                        print('Building %s timed out, retrying' % building)
+                        retries.append(building)
+                    else:
+                        print('Building %s timed out' % building)
+
+    if capacity < number_of_processes:
+        # some workers are still busy with timed out chunks
+        pool.terminate()
+    else:
+        pool.close()
+    pool.join()
+    return report
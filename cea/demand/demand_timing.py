@@ -0,0 +1,140 @@
+"""
+Time the phases of the demand calculation.
+
+With the ``write-timing`` parameter of the demand script, the time spent in each phase of the calculation of each
+building (schedules, hourly procedure, hot water, writing the results...) is measured and written to
+``demand_timing.csv`` next to the demand results (see :py:meth:`cea.inputlocator.InputLocator.get_demand_timing`),
+together with the phases common to all buildings (weather, building properties, totals...) in the row ``ZONE``.
+
+The phases are measured with::
+
+    with demand_timing.phase(building_name, 'hot water'):
+        ...
+
+The timings are collected per process: the timings of a building are moved to the
+:py:class:`cea.demand.demand_writers.DemandTotals` returned by its calculation (see :py:func:`pop_timings`), so they
+travel back from the worker processes with the results. When timing is off, :py:func:`phase` returns a shared no-op
+context manager, so the instrumentation costs a function call per phase and building.
+"""
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import time
+
+import pandas as pd
+
+__author__ = "Daren Thomas"
+__copyright__ = "Copyright 2019, Architecture and Building Systems - ETH Zurich"
+__credits__ = ["Daren Thomas"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Daren Thomas"
+__email__ = "cea@arch.ethz.ch"
+__status__ = "Production"
+
+# name of the row with the phases common to all buildings
+ZONE = 'ZONE'
+
+# timings collected by this process: {building name: {phase: seconds}}, None if timing is off
+_timings = None
+
+
+class Phase(object):
+    """Context manager adding the time spent in its block to the timings of a building"""
+
+    def __init__(self, building_timings, phase_name):
+        self.building_timings = building_timings
+        self.phase_name = phase_name
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        seconds = time.time() - self.start
+        self.building_timings[self.phase_name] = self.building_timings.get(self.phase_name, 0.0) + seconds
+        return False
+
+
+class NoTiming(object):
+    """Context manager doing nothing, used when timing is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+NO_TIMING = NoTiming()
+
+
+def enable(enabled=True):
+    """Switch timing on (or off) for this process, discarding the timings collected so far"""
+    global _timings
+    _timings = collections.OrderedDict() if enabled else None
+
+
+def is_enabled():
+    return _timings is not None
+
+
+def phase(building_name, phase_name):
+    """
+    :return: a context manager measuring the time spent in its block as phase ``phase_name`` of the building
+    """
+    if _timings is None:
+        return NO_TIMING
+    return Phase(get_building_timings(building_name), phase_name)
+
+
+def add_time(building_name, phase_name, seconds):
+    """Add time measured elsewhere (e.g. a share of the batched hourly procedure) to a phase of the building"""
+    if _timings is not None:
+        building_timings = get_building_timings(building_name)
+        building_timings[phase_name] = building_timings.get(phase_name, 0.0) + seconds
+
+
+def get_building_timings(building_name):
+    if building_name not in _timings:
+        _timings[building_name] = collections.OrderedDict()
+    return _timings[building_name]
+
+
+def pop_timings(building_name):
+    """
+    :return: the timings of the building collected by this process (removed from the process), or None if timing
+        is off or nothing was measured for the building
+    :rtype: collections.OrderedDict
+    """
+    if _timings is None:
+        return None
+    return _timings.pop(building_name, None)
+
+
+def timings_to_dataframe(timings, building_names):
+    """
+    :param timings: {building name: {phase: seconds}}
+    :type timings: dict
+    :param building_names: the order of the rows - buildings without timings are left out
+    :type building_names: list[str]
+    :return: the timing table: a row per building, a column per phase (in the order they were first measured) and
+        the total time of the building
+    :rtype: pd.DataFrame
+    """
+    rows = [name for name in building_names if name in timings]
+    phases = []
+    for name in rows:
+        phases.extend(phase_name for phase_name in timings[name] if phase_name not in phases)
+    table = pd.DataFrame([[timings[name].get(phase_name, 0.0) for phase_name in phases] for name in rows],
+                         index=pd.Index(rows, name='Name'), columns=phases)
+    table['total'] = table.sum(axis=1)
+    return table
+
+
+def write_timings(locator, timings, building_names):
+    """Write the timing table (see :py:func:`timings_to_dataframe`) to ``demand_timing.csv``"""
+    timings_to_dataframe(timings, building_names).to_csv(locator.get_demand_timing(), float_format='%.6f')
+    print('Time spent in each phase of the demand calculation written to %s' % locator.get_demand_timing())
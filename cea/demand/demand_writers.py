@@ -9,9 +9,64 @@ from __future__ import division
 import numpy as np
 import pandas as pd
 
+import cea.utilities.columnar
+from cea.demand import time_series_data
+
 # index into the `vars_to_print` structure, that corresponds to `gv.demand_building_csv_columns`
 FLOAT_FORMAT = '%.3f'
 
+# default time series written to the hourly results (the `tsd` keys, without the unit suffix)
+LOAD_VARS = ['PV', 'GRID', 'E_sys', 'Eal', 'Edata', 'Epro', 'Eaux',
+             'E_ww', 'E_hs', 'E_cs', 'E_cre', 'E_cdata',
+             'Qhs_sen_shu', 'Qhs_sen_ahu', 'Qhs_lat_ahu',
+             'Qhs_sen_aru', 'Qhs_lat_aru', 'Qhs_sen_sys',
+             'Qhs_lat_sys', 'Qhs_em_ls', 'Qhs_dis_ls',
+             'Qhs_sys_shu', 'Qhs_sys_ahu', 'Qhs_sys_aru',
+             'Qcs_sys_scu', 'Qcs_sys_ahu', 'Qcs_sys_aru',
+             'DH_hs', 'Qhs_sys', 'Qhs',
+             'DH_ww', 'Qww_sys', 'Qww',
+             'DC_cs', 'Qcs_sys', 'Qcs',
+             'DC_cre', 'Qcre_sys', 'Qcre',
+             'DC_cdata', 'Qcdata_sys', 'Qcdata',
+             'NG_hs',
+             'COAL_hs',
+             'OIL_hs',
+             'WOOD_hs',
+             'SOLAR_hs',
+             'NG_ww',
+             'COAL_ww',
+             'OIL_ww',
+             'WOOD_ww',
+             'SOLAR_ww',
+             'Qcs_sen_scu', 'Qcs_sen_ahu',
+             'Qcs_lat_ahu', 'Qcs_sen_aru', 'Qcs_lat_aru',
+             'Qcs_sen_sys', 'Qcs_lat_sys', 'Qcs_em_ls',
+             'Qcs_dis_ls', 'Qhpro_sys',
+             'QH_sys', 'QC_sys']
+
+MASS_FLOW_VARS = ['mcpww_sys',
+                  'mcptw',
+                  'mcpcs_sys',
+                  'mcphs_sys',
+                  'mcpcs_sys_ahu',
+                  'mcpcs_sys_aru',
+                  'mcpcs_sys_scu',
+                  'mcphs_sys_ahu',
+                  'mcphs_sys_aru',
+                  'mcphs_sys_shu',
+                  'mcpcre_sys',
+                  'mcpcdata_sys']
+
+TEMPERATURE_VARS = ['T_int', 'T_ext', 'theta_o',
+                    'Tww_sys_sup', 'Tww_sys_re',
+                    'Tcre_sys_re', 'Tcre_sys_sup',
+                    'Tcdata_sys_re', 'Tcdata_sys_sup',
+                    'Ths_sys_sup_aru', 'Ths_sys_sup_ahu', 'Ths_sys_sup_shu',
+                    'Ths_sys_re_aru', 'Ths_sys_re_ahu', 'Ths_sys_re_shu',
+                    'Tcs_sys_sup_aru', 'Tcs_sys_sup_ahu', 'Tcs_sys_sup_scu',
+                    'Tcs_sys_re_aru', 'Tcs_sys_re_ahu', 'Tcs_sys_re_scu',
+                    'Ths_sys_sup', 'Ths_sys_re', 'Tcs_sys_sup', 'Tcs_sys_re']
+
 
 class DemandWriter(object):
     """
@@ -27,65 +82,19 @@ class DemandWriter(object):
         from cea.demand.thermal_loads import TSD_KEYS_ENERGY_BALANCE_DASHBOARD, TSD_KEYS_SOLAR
 
         if not loads:
-            self.load_vars = ['PV', 'GRID', 'E_sys', 'Eal', 'Edata', 'Epro', 'Eaux',
-                              'E_ww', 'E_hs', 'E_cs', 'E_cre', 'E_cdata',
-                              'Qhs_sen_shu', 'Qhs_sen_ahu', 'Qhs_lat_ahu',
-                              'Qhs_sen_aru', 'Qhs_lat_aru', 'Qhs_sen_sys',
-                              'Qhs_lat_sys', 'Qhs_em_ls', 'Qhs_dis_ls',
-                              'Qhs_sys_shu', 'Qhs_sys_ahu', 'Qhs_sys_aru',
-                              'Qcs_sys_scu', 'Qcs_sys_ahu', 'Qcs_sys_aru',
-                              'DH_hs', 'Qhs_sys', 'Qhs',
-                              'DH_ww', 'Qww_sys', 'Qww',
-                              'DC_cs', 'Qcs_sys', 'Qcs',
-                              'DC_cre', 'Qcre_sys', 'Qcre',
-                              'DC_cdata', 'Qcdata_sys', 'Qcdata',
-                              'NG_hs',
-                              'COAL_hs',
-                              'OIL_hs',
-                              'WOOD_hs',
-                              'SOLAR_hs',
-                              'NG_ww',
-                              'COAL_ww',
-                              'OIL_ww',
-                              'WOOD_ww',
-                              'SOLAR_ww',
-                              'Qcs_sen_scu', 'Qcs_sen_ahu',
-                              'Qcs_lat_ahu', 'Qcs_sen_aru', 'Qcs_lat_aru',
-                              'Qcs_sen_sys', 'Qcs_lat_sys', 'Qcs_em_ls',
-                              'Qcs_dis_ls', 'Qhpro_sys',
-                              'QH_sys', 'QC_sys']
-
+            self.load_vars = list(LOAD_VARS)
         else:
             self.load_vars = loads
 
         self.load_plotting_vars = TSD_KEYS_ENERGY_BALANCE_DASHBOARD + TSD_KEYS_SOLAR
 
         if not massflows:
-            self.mass_flow_vars = ['mcpww_sys',
-                                   'mcptw',
-                                   'mcpcs_sys',
-                                   'mcphs_sys',
-                                   'mcpcs_sys_ahu',
-                                   'mcpcs_sys_aru',
-                                   'mcpcs_sys_scu',
-                                   'mcphs_sys_ahu',
-                                   'mcphs_sys_aru',
-                                   'mcphs_sys_shu',
-                                   'mcpcre_sys',
-                                   'mcpcdata_sys']
+            self.mass_flow_vars = list(MASS_FLOW_VARS)
         else:
             self.mass_flow_vars = massflows
 
         if not temperatures:
-            self.temperature_vars = ['T_int', 'T_ext', 'theta_o',
-                                     'Tww_sys_sup', 'Tww_sys_re',
-                                     'Tcre_sys_re', 'Tcre_sys_sup',
-                                     'Tcdata_sys_re', 'Tcdata_sys_sup',
-                                     'Ths_sys_sup_aru', 'Ths_sys_sup_ahu', 'Ths_sys_sup_shu',
-                                     'Ths_sys_re_aru', 'Ths_sys_re_ahu', 'Ths_sys_re_shu',
-                                     'Tcs_sys_sup_aru', 'Tcs_sys_sup_ahu', 'Tcs_sys_sup_scu',
-                                     'Tcs_sys_re_aru', 'Tcs_sys_re_ahu', 'Tcs_sys_re_scu',
-                                     'Ths_sys_sup', 'Ths_sys_re', 'Tcs_sys_sup', 'Tcs_sys_re']
+            self.temperature_vars = list(TEMPERATURE_VARS)
         else:
             self.temperature_vars = temperatures
 
@@ -95,36 +104,46 @@ class DemandWriter(object):
         columns, hourly_data = self.calc_hourly_dataframe(building_name, date, tsd)
         self.write_to_hdf5(building_name, columns, hourly_data, locator)
 
-        # save total for the year
-        columns, data = self.calc_yearly_dataframe(bpr, building_name, tsd)
-        # save to disc
-        partial_total_data = pd.DataFrame(data, index=[0])
-        partial_total_data.drop('Name', inplace=True, axis=1)
-        partial_total_data.to_hdf(
-            locator.get_temporary_file('%(building_name)sT.hdf' % locals()),
-            key='dataset')
+        # return the totals for the year (written to Total_demand by the `YearlyDemandWriter`)
+        return self.calc_demand_totals(bpr, building_name, tsd)
 
     def results_to_csv(self, tsd, bpr, locator, date, building_name):
         # save hourly data
         columns, hourly_data = self.calc_hourly_dataframe(building_name, date, tsd)
         self.write_to_csv(building_name, columns, hourly_data, locator)
 
-        # save total for the year
+        # return the totals for the year (written to Total_demand by the `YearlyDemandWriter`)
+        return self.calc_demand_totals(bpr, building_name, tsd)
+
+    def results_to_columnar(self, tsd, bpr, locator, date, building_name):
+        # save hourly data
+        columns, hourly_data = self.calc_hourly_dataframe(building_name, date, tsd)
+        self.write_to_columnar(building_name, columns, hourly_data, locator)
+
+        # return the totals for the year (written to Total_demand by the `YearlyDemandWriter`)
+        return self.calc_demand_totals(bpr, building_name, tsd)
+
+    def calc_demand_totals(self, bpr, building_name, tsd):
+        """
+        :return: the yearly totals of the building and its hourly loads (to be summed up for the zone)
+        :rtype: DemandTotals
+        """
         columns, data = self.calc_yearly_dataframe(bpr, building_name, tsd)
-        # save to disc
-        pd.DataFrame(data, index=[0]).to_csv(
-            locator.get_temporary_file('%(building_name)sT.csv' % locals()),
-            index=False, columns=columns, float_format='%.3f')
+        hourly_loads = np.nan_to_num(time_series_data.get_array(tsd, self.load_vars + self.load_plotting_vars))
+        hourly_loads /= 1000
+        totals = DemandTotals([x + '_kWh' for x in self.load_vars + self.load_plotting_vars])
+        totals.add_building(building_name, columns, data, hourly_loads)
+        return totals
 
     def calc_yearly_dataframe(self, bpr, building_name, tsd):
         # if printing total values is necessary
         # treating timeseries data from W to MWh
-        data = dict((x + '_MWhyr', tsd[x].sum() / 1000000) for x in self.load_vars)
-        data.update(dict((x + '0_kW', tsd[x].max() / 1000) for x in self.load_vars))
+        loads = time_series_data.get_array(tsd, self.load_vars)
+        data = dict((x + '_MWhyr', total) for x, total in zip(self.load_vars, loads.sum(axis=1) / 1000000))
+        data.update(dict((x + '0_kW', peak) for x, peak in zip(self.load_vars, loads.max(axis=1) / 1000)))
         # get order of columns
         keys = data.keys()
-        columns = self.OTHER_VARS
-        columns.extend(keys)
+        columns = self.OTHER_VARS + keys
         # add other default elements
         data.update({'Name': building_name, 'Af_m2': bpr.rc_model['Af'], 'Aroof_m2': bpr.rc_model['Aroof'],
                      'GFA_m2': bpr.rc_model['GFA_m2'], 'NFA_m2': bpr.rc_model['NFA_m2'],
@@ -132,36 +151,40 @@ class DemandWriter(object):
         return columns, data
 
     def calc_hourly_dataframe(self, building_name, date, tsd):
-        # treating time series data of loads from W to kW
-        data = dict((x + '_kWh', np.nan_to_num(tsd[x]) / 1000) for x in
-                    self.load_vars)  # TODO: convert nan to num at the very end.
-        # treating time series data of loads from W to kW
-        data.update(dict((x + '_kWh', np.nan_to_num(tsd[x]) / 1000) for x in
-                         self.load_plotting_vars))  # TODO: convert nan to num at the very end.
-        # treating time series data of mass_flows from W/C to kW/C
-        data.update(dict((x + '_kWperC', np.nan_to_num(tsd[x]) / 1000) for x in
-                         self.mass_flow_vars))  # TODO: convert nan to num at the very end.
-        # treating time series data of temperatures from W/C to kW/C
-        data.update(dict((x + '_C', np.nan_to_num(tsd[x])) for x in
-                         self.temperature_vars))  # TODO: convert nan to num at the very end.
+        # all the time series in one array (a view of the tsd, if possible), converted in one go
+        keys = self.load_vars + self.load_plotting_vars + self.mass_flow_vars + self.temperature_vars
+        hourly = np.nan_to_num(time_series_data.get_array(tsd, keys))  # TODO: convert nan to num at the very end.
+        # treating time series data of loads from W to kW and of mass_flows from W/C to kW/C
+        hourly[:len(keys) - len(self.temperature_vars)] /= 1000
         # get order of columns
-        columns = ['Name', 'people', 'x_int']
-        columns.extend([x + '_kWh' for x in self.load_vars])
-        columns.extend([x + '_kWh' for x in self.load_plotting_vars])
-        columns.extend([x + '_kWperC' for x in self.mass_flow_vars])
-        columns.extend([x + '_C' for x in self.temperature_vars])
+        data_columns = [x + '_kWh' for x in self.load_vars]
+        data_columns.extend([x + '_kWh' for x in self.load_plotting_vars])
+        data_columns.extend([x + '_kWperC' for x in self.mass_flow_vars])
+        data_columns.extend([x + '_C' for x in self.temperature_vars])
+        columns = ['Name', 'people', 'x_int'] + data_columns
+        # create dataframe with hourly values of selected data (without copying the array)
+        hourly_data = pd.DataFrame(hourly.T, index=pd.Index(date, name='DATE'), columns=data_columns)
         # add other default elements
-        data.update({'DATE': date, 'Name': building_name, 'people': tsd['people'], 'x_int': tsd['x_int'] * 1000})
-        # create dataframe with hourly values of selected data
-        hourly_data = pd.DataFrame(data).set_index('DATE')
+        hourly_data['Name'] = building_name
+        hourly_data['people'] = tsd['people']
+        hourly_data['x_int'] = tsd['x_int'] * 1000
         return columns, hourly_data
 
 
 class HourlyDemandWriter(DemandWriter):
     """Write out the hourly demand results"""
 
-    def __init__(self, loads, massflows, temperatures):
+    def __init__(self, loads, massflows, temperatures, keep_hourly_loads=False):
         super(HourlyDemandWriter, self).__init__(loads, massflows, temperatures)
+        self.keep_hourly_loads = keep_hourly_loads
+
+    def results_to_csv(self, tsd, bpr, locator, date, building_name):
+        demand_totals = super(HourlyDemandWriter, self).results_to_csv(tsd, bpr, locator, date, building_name)
+        if self.keep_hourly_loads:
+            # the csv file is rounded, the incremental calculation subtracts the loads of the building at full
+            # precision (see :py:mod:`cea.demand.demand_manifest`)
+            np.save(locator.get_demand_hourly_loads(building_name), demand_totals.hourly)
+        return demand_totals
 
     def write_to_csv(self, building_name, columns, hourly_data, locator):
         hourly_data.to_csv(locator.get_demand_results_file(building_name, 'csv'), columns=columns,
@@ -172,6 +195,10 @@ class HourlyDemandWriter(DemandWriter):
         hourly_data.drop('Name', inplace=True, axis=1)
         hourly_data.to_hdf(locator.get_demand_results_file(building_name, 'hdf'), key='dataset')
 
+    def write_to_columnar(self, building_name, columns, hourly_data, locator):
+        cea.utilities.columnar.write_dataframe(locator.get_demand_results_file(building_name, 'columnar'),
+                                               hourly_data[columns])
+
 
 class MonthlyDemandWriter(DemandWriter):
     """Write out the monthly demand results"""
@@ -192,6 +219,12 @@ class MonthlyDemandWriter(DemandWriter):
         monthly_data_new = self.calc_monthly_dataframe(building_name, hourly_data)
         monthly_data_new.to_hdf(locator.get_demand_results_file(building_name, 'hdf'), key=building_name)
 
+    def write_to_columnar(self, building_name, columns, hourly_data, locator):
+        # get monthly totals and rename to MWhyr
+        monthly_data_new = self.calc_monthly_dataframe(building_name, hourly_data)
+        cea.utilities.columnar.write_dataframe(locator.get_demand_results_file(building_name, 'columnar'),
+                                               monthly_data_new)
+
     def calc_monthly_dataframe(self, building_name, hourly_data):
         monthly_data = hourly_data[[x + '_kWh' for x in self.load_vars]].groupby(
             by=[hourly_data.index.month]).sum() / 1000
@@ -212,41 +245,82 @@ class MonthlyDemandWriter(DemandWriter):
 
 
 class YearlyDemandWriter(DemandWriter):
-    """Write out the hourly demand results"""
+    """Write out the yearly demand results (``Total_demand``) and the hourly loads of the zone"""
 
     def __init__(self, loads, massflows, temperatures):
         super(YearlyDemandWriter, self).__init__(loads, massflows, temperatures)
 
-    def write_to_csv(self, list_buildings, locator):
-        """read in the temporary results files and append them to the Totals.csv file."""
-        df = None
-        for name in list_buildings:
-            temporary_file = locator.get_temporary_file('%(name)sT.csv' % locals())
-            if df is None:
-                df = pd.read_csv(temporary_file)
-            else:
-                df = df.append(pd.read_csv(temporary_file), ignore_index=True)
+    def write_to_csv(self, demand_totals, list_buildings, date, locator):
+        """write the totals returned by the building calculations to the Total_demand.csv file."""
+        df = demand_totals.yearly_dataframe(list_buildings)
         df.to_csv(locator.get_total_demand('csv'), index=False, float_format='%.3f')
-
-        """read saved data of monthly values and return as totals"""
-        monthly_data_buildings = [pd.read_csv(locator.get_demand_results_file(building_name, 'csv')) for building_name
-                                  in
-                                  list_buildings]
-        return df, monthly_data_buildings
-
-    def write_to_hdf5(self, list_buildings, locator):
-        """read in the temporary results files and append them to the Totals.csv file."""
-        df = None
-        for name in list_buildings:
-            temporary_file = locator.get_temporary_file('%(name)sT.hdf' % locals())
-            if df is None:
-                df = pd.read_hdf(temporary_file, key='dataset')
-            else:
-                df = df.append(pd.read_hdf(temporary_file, key='dataset'))
+        demand_totals.hourly_dataframe(date).to_csv(locator.get_total_demand_hourly('csv'),
+                                                    float_format=FLOAT_FORMAT)
+        return df
+
+    def write_to_columnar(self, demand_totals, list_buildings, date, locator):
+        """write the totals returned by the building calculations to the Total_demand.csv file."""
+        # Total_demand is always written as csv, it is small
+        df = demand_totals.yearly_dataframe(list_buildings)
+        df.to_csv(locator.get_total_demand('csv'), index=False, float_format='%.3f')
+        cea.utilities.columnar.write_dataframe(locator.get_total_demand_hourly('columnar'),
+                                               demand_totals.hourly_dataframe(date))
+        return df
+
+    def write_to_hdf5(self, demand_totals, list_buildings, date, locator):
+        """write the totals returned by the building calculations to the Total_demand.hdf file."""
+        df = demand_totals.yearly_dataframe(list_buildings)
+        df.drop('Name', inplace=True, axis=1)
         df.to_hdf(locator.get_total_demand('hdf'), key='dataset')
+        demand_totals.hourly_dataframe(date).to_hdf(locator.get_total_demand_hourly('hdf5'), key='dataset')
+        return df
+
 
-        """read saved data of monthly values and return as totals"""
-        monthly_data_buildings = [pd.read_hdf(locator.get_demand_results_file(building_name, 'hdf'), key=building_name)
-                                  for building_name in
-                                  list_buildings]
-        return df, monthly_data_buildings
+class DemandTotals(object):
+    """
+    The yearly totals of each building and the hourly loads summed up over the buildings. The building calculations
+    return the totals of the buildings they calculated, which are reduced with `update` (first in the worker process
+    for each chunk of buildings, then in the parent process), so the `YearlyDemandWriter` does not need to read them
+    back from disk. The timings of the buildings (see :py:mod:`cea.demand.demand_timing`) travel along.
+    """
+
+    def __init__(self, hourly_columns=None):
+        self.hourly_columns = hourly_columns
+        self.yearly_columns = None
+        self.yearly = {}  # building name -> dict of yearly values
+        self.hourly = None  # array of shape (len(hourly_columns), hours)
+        self.timings = {}  # building name -> {phase: seconds}, if timing is on
+
+    def __len__(self):
+        return len(self.yearly)
+
+    def add_building(self, building_name, yearly_columns, yearly_data, hourly_loads):
+        self.yearly_columns = yearly_columns
+        self.yearly[building_name] = yearly_data
+        self.add_hourly(hourly_loads)
+
+    def add_hourly(self, hourly_loads):
+        if self.hourly is None:
+            self.hourly = np.array(hourly_loads, dtype=np.float64)
+        else:
+            self.hourly += hourly_loads
+
+    def update(self, other):
+        """add the totals of other buildings (the buildings must not overlap)"""
+        if not len(other):
+            return
+        self.hourly_columns = other.hourly_columns
+        self.yearly_columns = other.yearly_columns
+        self.yearly.update(other.yearly)
+        self.timings.update(other.timings)
+        self.add_hourly(other.hourly)
+
+    def yearly_dataframe(self, list_buildings):
+        """:return: the yearly totals with a row per building, in the order of ``list_buildings``"""
+        return pd.DataFrame([self.yearly[building_name] for building_name in list_buildings],
+                            columns=self.yearly_columns)
+
+    def hourly_dataframe(self, date):
+        """:return: the hourly loads of the buildings, summed up"""
+        return pd.DataFrame(dict(zip(self.hourly_columns, self.hourly)), index=pd.Index(date, name='DATE'),
+                            columns=self.hourly_columns)
@@ -334,28 +334,12 @@ def calc_DH_ww_with_tank_losses(T_ext_C, T_int_C, Qww, Vww, Qww_dis_ls_r, Qww_di
     :type Qww_dis_ls_nr: ndarray
     :return:
     """
-    Qww_sys = np.zeros(8760)
-    Qww_st_ls = np.zeros(8760)
-    Tww_tank_C = np.zeros(8760)
-    Qd = np.zeros(8760)
     # calculate DHW tank size [in m3] based on the peak DHW demand in the building
     V_tank_m3 = Vww.max()  # size the tank with the highest flow rate
-    T_tank_start_C = TWW_SETPOINT  # assume the tank temperature at timestep 0 is at the dhw set point
-
-    if V_tank_m3 > 0:
-        for k in range(8760):
-            area_tank_surface_m2 = storage_tank.calc_tank_surface_area(V_tank_m3)
-            Q_tank_discharged_W = Qww[k] + Qww_dis_ls_r[k] + Qww_dis_ls_nr[k]
-            Qww_st_ls[k], Qd[k], Qww_sys[k] = storage_tank.calc_dhw_tank_heat_balance(T_int_C[k], T_ext_C[k],
-                                                                                   T_tank_start_C, V_tank_m3,
-                                                                                   Q_tank_discharged_W,
-                                                                                   area_tank_surface_m2)
-            Tww_tank_C[k] = storage_tank.calc_tank_temperature(T_tank_start_C, Qww_st_ls[k], Qd[k], Qww_sys[k], V_tank_m3,
-                                                               'hot_water')
-            T_tank_start_C = Tww_tank_C[k]  # update the tank temperature at the beginning of the next time step
-    else:
-        for k in range(8760):
-            Tww_tank_C[k] = np.nan
+    Q_tank_discharged_W = Qww + Qww_dis_ls_r + Qww_dis_ls_nr
+    # assume the tank temperature at timestep 0 is at the dhw set point
+    Tww_tank_C, Qww_st_ls, Qww_sys = storage_tank.calc_dhw_tank(T_int_C, T_ext_C, Q_tank_discharged_W, V_tank_m3,
+                                                                TWW_SETPOINT)
     return Tww_tank_C, Qww_sys
 
 
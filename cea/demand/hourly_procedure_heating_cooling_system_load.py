@@ -31,23 +31,24 @@ def calc_heating_cooling_loads(bpr, tsd, t):
     :return:
     """
 
+    # seasons and systems of the building (calculated once, before the first hour)
+    control_profile = control_heating_cooling_systems.get_control_profile(bpr)
+
     # first check for season
-    if control_heating_cooling_systems.is_heating_season(t, bpr)\
-            and not control_heating_cooling_systems.is_cooling_season(t, bpr):
+    if control_profile.heating_only[t]:
 
         # +++++++++++++++++++++++++++++++++++++++++++
         # HEATING
         # +++++++++++++++++++++++++++++++++++++++++++
 
         # check system
-        if not control_heating_cooling_systems.has_heating_system(bpr) \
+        if not control_profile.has_heating_system \
                 or not control_heating_cooling_systems.heating_system_is_active(tsd, t):
 
             # no system = no loads
             rc_model_temperatures = calc_rc_no_loads(bpr, tsd, t)
 
-        elif control_heating_cooling_systems.has_radiator_heating_system(bpr)\
-                or control_heating_cooling_systems.has_floor_heating_system(bpr):
+        elif control_profile.has_radiator_or_floor_heating_system:
 
             # radiator or floor heating
             rc_model_temperatures = calc_heat_loads_radiator(bpr, t, tsd)
@@ -57,7 +58,7 @@ def calc_heating_cooling_loads(bpr, tsd, t):
         # elif has_local_ac_heating_system:
             # TODO: here could be a heating system using the mini-split unit ("T5")
 
-        elif control_heating_cooling_systems.has_central_ac_heating_system(bpr):
+        elif control_profile.has_central_ac_heating_system:
 
             rc_model_temperatures = calc_heat_loads_central_ac(bpr, t, tsd)
 
@@ -74,33 +75,32 @@ def calc_heating_cooling_loads(bpr, tsd, t):
         # for dashboard
         detailed_thermal_balance_to_tsd(tsd, bpr, t, rc_model_temperatures)
 
-    elif control_heating_cooling_systems.is_cooling_season(t, bpr) \
-            and not control_heating_cooling_systems.is_heating_season(t, bpr):
+    elif control_profile.cooling_only[t]:
 
         # +++++++++++++++++++++++++++++++++++++++++++
         # COOLING
         # +++++++++++++++++++++++++++++++++++++++++++
 
         # check system
-        if not control_heating_cooling_systems.has_cooling_system(bpr)\
+        if not control_profile.has_cooling_system\
                 or not control_heating_cooling_systems.cooling_system_is_active(bpr, tsd, t):
 
             # no system = no loads
             rc_model_temperatures = calc_rc_no_loads(bpr, tsd, t)
 
-        elif control_heating_cooling_systems.has_local_ac_cooling_system(bpr):
+        elif control_profile.has_local_ac_cooling_system:
 
             rc_model_temperatures = calc_cool_loads_mini_split_ac(bpr, t, tsd)
 
-        elif control_heating_cooling_systems.has_central_ac_cooling_system(bpr):
+        elif control_profile.has_central_ac_cooling_system:
 
             rc_model_temperatures = calc_cool_loads_central_ac(bpr, t, tsd)
 
-        elif control_heating_cooling_systems.has_3for2_cooling_system(bpr):
+        elif control_profile.has_3for2_cooling_system:
 
             rc_model_temperatures = calc_cool_loads_3for2(bpr, t, tsd)
 
-        elif control_heating_cooling_systems.has_ceiling_cooling_system(bpr):
+        elif control_profile.has_ceiling_cooling_system:
 
             rc_model_temperatures = calc_cool_loads_radiator(bpr, t, tsd)
 
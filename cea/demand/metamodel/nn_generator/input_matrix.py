@@ -15,6 +15,7 @@ from cea.demand.demand_main import properties_and_schedule
 from cea.demand.thermal_loads import initialize_inputs
 from cea.utilities.dbf import dbf_to_dataframe
 from cea.demand import control_heating_cooling_systems
+from cea.demand import demand_reader
 from cea.utilities import epwreader
 from cea.demand.sensible_loads import calc_I_sol
 import numpy as np
@@ -119,7 +120,7 @@ def get_cea_outputs(building_name,locator, target_parameters):
     :return: array of raw CEA outputs (demands) for a single building (raw_nn_targets)
     '''
     #   locate the saved CEA outputs
-    raw_nn_targets = pd.read_csv(locator.get_demand_results_file(building_name), usecols=target_parameters)
+    raw_nn_targets = demand_reader.read_hourly_demand(locator, building_name, columns=target_parameters)
     #   import the CEA outputs
     raw_nn_targets = np.array(raw_nn_targets)
     return raw_nn_targets
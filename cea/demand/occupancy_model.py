@@ -1,10 +1,13 @@
 from __future__ import division
+import hashlib
+import os
 import pandas as pd
 import numpy as np
-import random
 import cea.globalvar
 import cea.inputlocator
 import cea.config
+from cea.utilities.database_catalog import read_database
+from cea.utilities.file_cache import new_key, update_key_with_file, write_atomically
 
 __author__ = "Jimeno A. Fonseca"
 __copyright__ = "Copyright 2015, Architecture and Building Systems - ETH Zurich"
@@ -15,8 +18,17 @@ __maintainer__ = "Daren Thomas"
 __email__ = "cea@arch.ethz.ch"
 __status__ = "Production"
 
+# increase when changing the calculation of the yearly archetype schedules to invalidate the cached schedules
+SCHEDULE_CACHE_VERSION = 1
 
-def calc_schedules(list_uses, archetype_schedules, bpr, archetype_values, stochastic_occupancy):
+# mobility parameters of the stochastic occupancy model (Sandoval et al., 2017)
+MOBILITY_PARAMETERS = np.array([0.18, 0.33, 0.54, 0.67, 0.82, 1.22, 1.50, 3.0, 5.67])
+
+# keys of the ``archetype_values`` returned by `schedule_maker`
+ARCHETYPE_VALUES = ['people', 'Qs', 'X', 'Ea', 'El', 'Epro', 'Qcre', 'Ed', 'Vww', 'Vw', 've', 'Qhpro']
+
+
+def calc_schedules(list_uses, archetype_schedules, bpr, archetype_values, stochastic_occupancy, random_state=None):
     """
     Given schedule data for archetypal building uses, `calc_schedule` calculates the schedule for a building
     with possibly a mixed schedule as defined in `building_uses` using a weighted average approach. The schedules are
@@ -54,6 +66,10 @@ def calc_schedules(list_uses, archetype_schedules, bpr, archetype_values, stocha
         deterministic one (False) should be used
     :type stochastic_occupancy: Boolean
 
+    :param random_state: random number generator of the stochastic occupancy model (see :py:func:`get_random_state`),
+        default: a generator seeded from the operating system
+    :type random_state: np.random.RandomState
+
     :returns schedules: a dictionary containing the weighted average schedules for: occupancy; ventilation demand;
         sensible heat and moisture gains due to occupancy; electricity demand for appliances, lighting, processes,
         refrigeration and data centers; demand for water and domestic hot water
@@ -68,8 +84,10 @@ def calc_schedules(list_uses, archetype_schedules, bpr, archetype_values, stocha
     # no need to calculate occupancy if people_per_square_meter == 0
     if people_per_square_meter > 0:
         if stochastic_occupancy:
+            if random_state is None:
+                random_state = np.random.RandomState()
             schedules = calc_stochastic_schedules(archetype_schedules, archetype_values, bpr, list_uses,
-                                                  people_per_square_meter)
+                                                  people_per_square_meter, random_state)
         else:
             schedules = calc_deterministic_schedules(archetype_schedules, archetype_values, bpr, list_uses,
                                                      people_per_square_meter)
@@ -171,7 +189,8 @@ def calc_deterministic_schedules(archetype_schedules, archetype_values, bpr, lis
     return schedules
 
 
-def calc_stochastic_schedules(archetype_schedules, archetype_values, bpr, list_uses, people_per_square_meter):
+def calc_stochastic_schedules(archetype_schedules, archetype_values, bpr, list_uses, people_per_square_meter,
+                              random_state):
     """
     Calculate the profile of random occupancy for each occupant in each type of use in the building. Each profile is
     calculated individually with a randomly-selected mobility parameter mu.
@@ -187,6 +206,7 @@ def calc_stochastic_schedules(archetype_schedules, archetype_values, bpr, list_u
     :param list_uses: defined in calc_schedules
     :param bpr: defined in calc_schedules
     :param people_per_square_meter: defined in calc_schedules
+    :param random_state: defined in calc_schedules
 
     :return schedules: dict containing the stochastic schedules for occupancy, humidity gains, ventilation and heat
         gains due to occupants for a given building with single or mixed uses
@@ -213,25 +233,20 @@ def calc_stochastic_schedules(archetype_schedules, archetype_values, bpr, list_u
         schedules[schedule] = np.zeros(8760)
         normalizing_values[schedule] = 0.0
 
-    # vector of mobility parameters
-    mu_v = [0.18, 0.33, 0.54, 0.67, 0.82, 1.22, 1.50, 3.0, 5.67]
-    len_mu_v = len(mu_v)
+    # simulate the occupants of all uses of the building at once
+    occupants_per_use = [int(archetype_values['people'][num] * bpr.occupancy[list_uses[num]] * bpr.rc_model['NFA_m2'])
+                         if bpr.occupancy[list_uses[num]] > 0 else 0 for num in range(len(list_uses))]
+    stochastic_occupancy = calc_stochastic_occupancy([use_schedules[0] for use_schedules in archetype_schedules],
+                                                     occupants_per_use, random_state)
 
     for num in range(len(list_uses)):
         current_share_of_use = bpr.occupancy[list_uses[num]]
-        current_stochastic_schedule = np.zeros(8760)
         if current_share_of_use > 0:
-            occupants_in_current_use = int(
-                archetype_values['people'][num] * current_share_of_use * bpr.rc_model['NFA_m2'])
-            archetype_schedule = archetype_schedules[num][0]
-            for occupant in range(occupants_in_current_use):
-                mu = mu_v[int(len_mu_v * random.random())]
-                occupant_pattern = calc_individual_occupant_schedule(mu, archetype_schedule)
-                current_stochastic_schedule += occupant_pattern
-                schedules['people'] += occupant_pattern
-                for label in occupant_schedules:
-                    schedules[label] = np.vectorize(calc_average)(schedules[label], occupant_pattern,
-                                                                  archetype_values[label][num])
+            occupants_in_current_use = occupants_per_use[num]
+            current_stochastic_schedule = stochastic_occupancy[num]
+            schedules['people'] += current_stochastic_schedule
+            for label in occupant_schedules:
+                schedules[label] += current_stochastic_schedule * archetype_values[label][num]
 
             for label in occupant_schedules:
                 current_archetype_values = archetype_values[label]
@@ -242,7 +257,7 @@ def calc_stochastic_schedules(archetype_schedules, archetype_values, bpr, list_u
             # for all other schedules, the database schedule is normalized by the schedule for people and then 
             # multiplied by the number of people from the stochastic calculation
             if occupants_in_current_use > 0:
-                current_stochastic_schedule /= occupants_in_current_use
+                current_stochastic_schedule = current_stochastic_schedule / occupants_in_current_use
             unoccupied_times = np.array([i == 0 for i in archetype_schedules[num][schedule_codes['people']]])
             normalized_schedule = make_normalized_stochastic_schedule(current_stochastic_schedule,
                                                                       archetype_schedules[num][
@@ -281,42 +296,65 @@ def calc_stochastic_schedules(archetype_schedules, archetype_values, bpr, list_u
     return schedules
 
 
-def calc_individual_occupant_schedule(mu, archetype_schedule):
-    """
-    Calculates the stochastic occupancy pattern for an individual based on Page et al. (2007).
-
-    :param mu: parameter of mobility
-    :type mu: float
-    :param archetype_schedule: schedule of occupancy for the corresponding archetype
-    :type archetype_schedule: list[float]
-
-    :return pattern: yearly occupancy pattern for a given occupant in a given occupancy type
-    :rtype pattern: list[int]
+def calc_stochastic_occupancy(archetype_occupancy_schedules, occupants_per_use, random_state):
     """
+    Simulates the presence of the occupants of a building with the Markov chain of Page et al. (2007): all occupants
+    (of all uses) are stepped through the year at once, each one with a mobility parameter mu chosen at random from the
+    mobility parameters of Sandoval et al. (2017).
 
-    # assign initial state: assume equal to the archetypal occupancy schedule at t = 0
-    state = archetype_schedule[0]
-
-    # start list of occupancy states throughout the year
-    pattern = [state]
+    The initial state of each occupant is the archetypal occupancy schedule at t = 0. An occupant is present at t + 1
+    with the probability T11 (if present at t) or T01 (if absent at t), resolved to 1% as in the original model.
 
-    # calculate probability of presence for each hour of the year
-    for i in range(len(archetype_schedule[:-1])):
-        # get probability of presence at t and t+1 from archetypal schedule
-        p_0 = archetype_schedule[i]
-        p_1 = archetype_schedule[i + 1]
-        # calculate probability of transition from absence to presence (T01) and from presence to presence (T11)
-        T01, T11 = calculate_transition_probabilities(mu, p_0, p_1)
+    :param archetype_occupancy_schedules: archetypal occupancy schedule of each use
+    :type archetype_occupancy_schedules: list[ndarray[float]]
+    :param occupants_per_use: number of occupants to simulate for each use
+    :type occupants_per_use: list[int]
+    :param random_state: random number generator (see :py:func:`get_random_state`)
+    :type random_state: np.random.RandomState
 
-        if state == 1:
-            next = get_random_presence(T11)
-        else:
-            next = get_random_presence(T01)
-
-        pattern.append(next)
-        state = next
-
-    return pattern
+    :return: number of occupants present at each hour for each use, array of shape (uses, hours)
+    :rtype: ndarray[float]
+    """
+    archetype_occupancy_schedules = np.asarray(archetype_occupancy_schedules, dtype=np.float64)
+    number_of_uses, hours = archetype_occupancy_schedules.shape
+    occupants_per_use = np.asarray(occupants_per_use, dtype=int)
+    use_of_occupant = np.repeat(np.arange(number_of_uses), occupants_per_use)
+    mu_of_occupant = random_state.randint(len(MOBILITY_PARAMETERS), size=len(use_of_occupant))
+
+    # transition probabilities for each use, mobility parameter and hour - shape (uses, mobility parameters, hours - 1)
+    T01, T11 = calculate_transition_probabilities(MOBILITY_PARAMETERS[np.newaxis, :, np.newaxis],
+                                                  archetype_occupancy_schedules[:, np.newaxis, :-1],
+                                                  archetype_occupancy_schedules[:, np.newaxis, 1:])
+    T01 = np.trunc(T01 * 100) / 100
+    T11 = np.trunc(T11 * 100) / 100
+
+    occupancy = np.empty((number_of_uses, hours))
+    occupancy[:, 0] = archetype_occupancy_schedules[:, 0] * occupants_per_use
+    present = archetype_occupancy_schedules[use_of_occupant, 0] == 1
+    for hour in range(hours - 1):
+        probability_of_presence = np.where(present, T11[use_of_occupant, mu_of_occupant, hour],
+                                           T01[use_of_occupant, mu_of_occupant, hour])
+        present = random_state.random_sample(len(use_of_occupant)) < probability_of_presence
+        occupancy[:, hour + 1] = np.bincount(use_of_occupant, weights=present, minlength=number_of_uses)
+    return occupancy
+
+
+def get_random_state(seed, building_name):
+    """
+    Create the random number generator of the stochastic occupancy model for a building. With a seed, the generator
+    only depends on the seed and the building name, so the results are reproducible no matter in which order (or in
+    which process) the buildings are calculated.
+
+    :param seed: the ``demand:stochastic-occupancy-seed`` parameter (``None`` to seed from the operating system)
+    :type seed: int
+    :param building_name: name of the building
+    :type building_name: str
+    :rtype: np.random.RandomState
+    """
+    if seed is None:
+        return np.random.RandomState()
+    digest = hashlib.sha1(('%i|%s' % (seed, building_name)).encode('utf-8')).hexdigest()
+    return np.random.RandomState(int(digest[:8], 16))
 
 
 def calculate_transition_probabilities(mu, P0, P1):
@@ -325,6 +363,8 @@ def calculate_transition_probabilities(mu, P0, P1):
     These are the probability of arriving (T01) and the probability of staying in (T11) given the parameter of mobility
     mu, the probability of the present state (P0), and the probability of the next state t+1 (P1).
 
+    The parameters can also be arrays (broadcast against each other).
+
     :param mu: parameter of mobility
     :type mu: float
     :param P0: probability of presence at the current time step t
@@ -342,35 +382,11 @@ def calculate_transition_probabilities(mu, P0, P1):
     m = (mu - 1) / (mu + 1)
     # Calculate transition probability of arriving and transition probability of staying
     T01 = (m) * P0 + P1
-    if P0 != 0:
-        T11 = ((P0 - 1) / P0) * (m * P0 + P1) + P1 / P0
-    else:
-        T11 = 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        T11 = np.where(P0 != 0, ((P0 - 1) / P0) * (m * P0 + P1) + P1 / P0, 0)
 
     # For some instances of mu the probabilities are bigger than 1, so the min function is used in the return statement.
-    return min(1, T01), min(1, T11)
-
-
-def get_random_presence(p):
-    """
-    Get the current occupant state (presence=1 or absence=0) at the current time step given a probability p.
-
-    :param p: A probability (e.g. T01, T11)
-    :type p: float
-
-    Returns the randomly-chosen state (0 or 1).
-    """
-
-    # Calculate probability of presence
-    P1 = int(p * 100)
-    # Calculate probability of absence
-    P0 = 100 - P1
-
-    # Create population of possible values and choose one value
-    weighted_choices = [(1, P1), (0, P0)]
-    population = [val for val, cnt in weighted_choices for i in range(cnt)]
-
-    return random.choice(population)
+    return np.minimum(1, T01), np.minimum(1, T11)
 
 
 def calc_remaining_schedules_deterministic(archetype_schedules, archetype_values, list_uses, occupancy, schedule_code,
@@ -585,12 +601,106 @@ def read_schedules(use, x):
     return occ, el, dhw, pro, month, area_per_occupant
 
 
-# read schedules and archetypal values from excel file
-def schedule_maker(region, dates, locator, list_uses):
+def schedule_maker(region, dates, locator, list_uses, use_cache=True, report=None):
     """
     Reads schedules from the archetype schedule Excel file along with the corresponding internal loads and ventilation
     demands.
 
+    The yearly schedules and archetype values are cached (see :py:meth:`InputLocator.get_archetype_schedules_cache`)
+    keyed by the content of the archetype databases, the dates and the occupancy types, so repeated runs (e.g. the
+    samples of the sensitivity analysis) skip reading the Excel files and expanding the schedules to the whole year.
+
+    :param dates: dates and times throughout the year
+    :type dates: DatetimeIndex
+    :param locator: an instance of InputLocator set to the scenario
+    :type locator: InputLocator
+    :param list_uses: list of occupancy types used in the scenario
+    :type list_uses: list
+    :param use_cache: read the schedules from (and write them to) the cache
+    :type use_cache: bool
+    :param report: function called with a message if the cache is corrupt and replaced (e.g. ``print``)
+    :type report: callable
+
+    :return schedules: yearly schedule for each occupancy type used in the project - a tuple of arrays (occupancy,
+        electricity, domestic hot water, processes) per occupancy type
+    :rtype schedules: list[tuple]
+    :return archetype_values: dict containing the values for occupant density  (in people/m2) internal loads and
+        ventilation demand for each occupancy type used in the project
+    :rtype archetype_values: dict[list[float]]
+    """
+    cache_file = None
+    if use_cache:
+        cache_file = locator.get_archetype_schedules_cache(region, dates[0].year,
+                                                           calc_schedule_cache_key(region, dates, locator, list_uses))
+        if os.path.exists(cache_file):
+            try:
+                return read_schedule_cache(cache_file, list_uses)
+            except Exception as e:
+                # e.g. a cache file left incomplete by a crash: read the Excel files again
+                if report:
+                    report('Replacing corrupt schedule cache %s: %s' % (cache_file, e))
+
+    schedules, archetype_values = read_archetype_schedules(region, dates, locator, list_uses)
+    schedules = np.array(schedules, dtype=np.float64)
+    archetype_values = dict((key, np.array(archetype_values[key], dtype=np.float64)) for key in ARCHETYPE_VALUES)
+    if cache_file:
+        write_schedule_cache(cache_file, list_uses, schedules, archetype_values)
+    return schedules_from_arrays(schedules, archetype_values)
+
+
+def calc_schedule_cache_key(region, dates, locator, list_uses):
+    """
+    :return: hash of everything the yearly archetype schedules depend on: the content of the archetype databases,
+        the dates, the occupancy types and the version of the calculation
+    :rtype: str
+    """
+    key = new_key(SCHEDULE_CACHE_VERSION, region, *list_uses)
+    key.update(np.asarray(dates.values, dtype='datetime64[ns]').astype(np.int64).tobytes())
+    for path in [locator.get_archetypes_schedules(region), locator.get_archetypes_properties(region)]:
+        update_key_with_file(key, path)
+    return key.hexdigest()
+
+
+def write_schedule_cache(cache_file, list_uses, schedules, archetype_values):
+    """
+    Write the schedules to the cache (see :py:func:`cea.utilities.file_cache.write_atomically`).
+
+    :param schedules: yearly schedules, array of shape (uses, 4, hours)
+    :type schedules: ndarray
+    :param archetype_values: archetype values, array of shape (uses,) per key
+    :type archetype_values: dict[str, ndarray]
+    """
+    arrays = dict(('archetype_values_%s' % key, values) for key, values in archetype_values.items())
+
+    def write(path):
+        with open(path, 'wb') as f:
+            np.savez(f, list_uses=np.array(list_uses, dtype=np.string_), schedules=schedules, **arrays)
+
+    write_atomically(cache_file, write)
+
+
+def read_schedule_cache(cache_file, list_uses):
+    """:return: the ``(schedules, archetype_values)`` stored with :py:func:`write_schedule_cache`"""
+    with np.load(cache_file) as cache:
+        if [use.decode('utf-8') for use in cache['list_uses']] != list(list_uses):
+            raise ValueError('occupancy types differ')
+        schedules = cache['schedules']
+        archetype_values = dict((key, cache['archetype_values_%s' % key]) for key in ARCHETYPE_VALUES)
+    return schedules_from_arrays(schedules, archetype_values)
+
+
+def schedules_from_arrays(schedules, archetype_values):
+    """Convert the arrays of the cache to the return value of :py:func:`schedule_maker`"""
+    return ([tuple(use_schedules) for use_schedules in schedules],
+            dict((key, values.tolist()) for key, values in archetype_values.items()))
+
+
+# read schedules and archetypal values from excel file
+def read_archetype_schedules(region, dates, locator, list_uses):
+    """
+    Reads schedules from the archetype schedule Excel file along with the corresponding internal loads and ventilation
+    demands (without using the cache, see :py:func:`schedule_maker`).
+
     :param dates: dates and times throughout the year
     :type dates: DatetimeIndex
     :param locator: an instance of InputLocator set to the scenario
@@ -606,9 +716,9 @@ def schedule_maker(region, dates, locator, list_uses):
     """
 
     # get internal loads and indoor comfort from archetypes
-    archetypes_internal_loads = pd.read_excel(locator.get_archetypes_properties(region), 'INTERNAL_LOADS').set_index(
+    archetypes_internal_loads = read_database(locator.get_archetypes_properties(region), 'INTERNAL_LOADS').set_index(
         'Code')
-    archetypes_indoor_comfort = pd.read_excel(locator.get_archetypes_properties(region), 'INDOOR_COMFORT').set_index(
+    archetypes_indoor_comfort = read_database(locator.get_archetypes_properties(region), 'INDOOR_COMFORT').set_index(
         'Code')
 
     # create empty lists of archetypal schedules, occupant densities and each archetype's ventilation and internal loads
@@ -617,7 +727,7 @@ def schedule_maker(region, dates, locator, list_uses):
 
     for use in list_uses:
         # read from archetypes_schedules and properties
-        archetypes_schedules = pd.read_excel(locator.get_archetypes_schedules(region), use).T
+        archetypes_schedules = read_database(locator.get_archetypes_schedules(region), use).T
 
         # read lists of every daily profile
         occ_schedules, el_schedules, dhw_schedules, pro_schedules, month_schedule, area_per_occupant = read_schedules(
@@ -4,6 +4,7 @@
 from __future__ import division
 import numpy as np
 from cea.demand import constants
+from cea.utilities.jit import kernel
 
 __author__ = "Gabriel Happle"
 __copyright__ = "Copyright 2016, Architecture and Building Systems - ETH Zurich"
@@ -40,6 +41,7 @@ f_r_a = 0.2  # (-) section 2.1.4 in SIA 2044 / Korrigenda C1 zum Merkblatt SIA 2
 # 2.1.3
 # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+@kernel('f8(f8)')
 def calc_h_mc(a_m):
     """
     :param a_m: see ``bpr.rc_model['Am']``
@@ -56,6 +58,7 @@ def calc_h_mc(a_m):
     return h_mc
 
 
+@kernel('f8(f8)')
 def calc_h_ac(a_t):
     """
     :param a_t: equivalent to ``bpr.rc_model['Atot']``
@@ -71,6 +74,7 @@ def calc_h_ac(a_t):
     return h_ac
 
 
+@kernel('f8(f8)')
 def calc_h_op_m(Htr_op):
 
     # work around # TODO: to be addressed in issue #443
@@ -86,6 +90,7 @@ def calc_h_op_m(Htr_op):
     return h_op_m
 
 
+@kernel('f8(f8, f8)')
 def calc_h_em(h_op_m, h_mc):
 
     # (10) in SIA 2044 / Korrigenda C1 zum Merkblatt SIA 2044:2011 / Korrigenda C2 zum Mekblatt SIA 2044:2011
@@ -107,6 +112,7 @@ def calc_h_j_em():
     return None
 
 
+@kernel('f8(f8)')
 def calc_h_ec(Htr_w):
 
     # (12) in SIA 2044 / Korrigenda C1 zum Merkblatt SIA 2044:2011 / Korrigenda C2 zum Mekblatt SIA 2044:2011
@@ -120,6 +126,7 @@ def calc_h_ec(Htr_w):
     return h_ec
 
 
+@kernel('f8(f8, f8, f8)')
 def calc_h_ea(m_ve_mech, m_ve_window, m_ve_inf_simple):
     cp = 1.005 / 3.6  # (Wh/kg/K)
     # TODO: check units of air flow
@@ -141,6 +148,7 @@ def calc_h_ea(m_ve_mech, m_ve_window, m_ve_inf_simple):
 # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 
+@kernel('f8(f8, f8, f8, f8, f8)')
 def calc_phi_a(phi_hc_cv, phi_i_l, phi_i_a, phi_i_p, I_sol):
 
     # (14) in SIA 2044 / Korrigenda C1 zum Merkblatt SIA 2044:2011 / Korrigenda C2 zum Mekblatt SIA 2044:2011
@@ -165,6 +173,7 @@ def calc_phi_a(phi_hc_cv, phi_i_l, phi_i_a, phi_i_p, I_sol):
     return phi_a
 
 
+@kernel('f8(f8, f8, f8, f8, f8, f8, f8)')
 def calc_phi_c(phi_hc_r, phi_i_l, phi_i_a, phi_i_p, I_sol, f_ic, f_sc):
 
     # (15) in SIA 2044 / Korrigenda C1 zum Merkblatt SIA 2044:2011 / Korrigenda C2 zum Mekblatt SIA 2044:2011
@@ -193,12 +202,14 @@ def calc_phi_c(phi_hc_r, phi_i_l, phi_i_a, phi_i_p, I_sol, f_ic, f_sc):
     return phi_c
 
 
+@kernel('f8(f8)')
 def calc_phi_i_p(Qs): # _Wp, people):
     # # internal gains from people
     # phi_i_p = people * Qs_Wp
     return Qs # phi_i_p
 
 
+@kernel('f8(f8, f8)')
 def calc_phi_i_a(Eaf, Epro):
     # internal gains from appliances, factor of 0.9 taken from old method calc_Qgain_sen()
     # TODO make function and dynamic, check factor
@@ -206,6 +217,7 @@ def calc_phi_i_a(Eaf, Epro):
     return phi_i_a
 
 
+@kernel('f8(f8)')
 def calc_phi_i_l(Elf):
     # internal gains from lighting, factor of 0.9 taken from old method calc_Qgain_sen()
     # TODO make function and dynamic, check factor
@@ -213,6 +225,7 @@ def calc_phi_i_l(Elf):
     return phi_i_l
 
 
+@kernel('f8(f8, f8, f8, f8, f8, f8, f8)')
 def calc_phi_m(phi_hc_r, phi_i_l, phi_i_a, phi_i_p, I_sol, f_im, f_sm):
 
     # (16) in SIA 2044 / Korrigenda C1 zum Merkblatt SIA 2044:2011 / Korrigenda C2 zum Mekblatt SIA 2044:2011
@@ -240,6 +253,7 @@ def calc_phi_m(phi_hc_r, phi_i_l, phi_i_a, phi_i_p, I_sol, f_im, f_sm):
     return phi_m
 
 
+@kernel('f8(f8, f8, f8)')
 def calc_f_ic(a_t, a_m, h_ec):
     """
 
@@ -259,6 +273,7 @@ def calc_f_ic(a_t, a_m, h_ec):
     return f_ic
 
 
+@kernel('f8(f8, f8, f8, f8)')
 def calc_f_sc(a_t, a_m, a_w, h_ec):
     """
 
@@ -281,6 +296,7 @@ def calc_f_sc(a_t, a_m, a_w, h_ec):
     return f_sc
 
 
+@kernel('f8(f8, f8)')
 def calc_f_im(a_t, a_m):
     """
 
@@ -297,6 +313,7 @@ def calc_f_im(a_t, a_m):
     return f_im
 
 
+@kernel('f8(f8, f8, f8)')
 def calc_f_sm(a_t, a_m, a_w):
     """
     :param a_t: bpr.rc_model['Atot']
@@ -317,6 +334,7 @@ def calc_f_sm(a_t, a_m, a_w):
 # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 
+@kernel('f8(f8, f8, f8, f8, f8)')
 def calc_theta_ea(m_ve_mech, m_ve_window, m_ve_inf_simple, theta_ve_mech, T_ext):
 
     # get values
@@ -335,6 +353,7 @@ def calc_theta_ea(m_ve_mech, m_ve_window, m_ve_inf_simple, theta_ve_mech, T_ext)
     return theta_ea
 
 
+@kernel('f8(f8)')
 def calc_theta_ec(T_ext):
 
     # WORKAROUND
@@ -352,6 +371,7 @@ def calc_theta_ec(T_ext):
     return theta_ec
 
 
+@kernel('f8(f8)')
 def calc_theta_em(T_ext):
 
     # WORKAROUND
@@ -408,6 +428,7 @@ def calc_theta_e_star():
 # 2.1.6
 # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+@kernel('f8(f8, f8, f8, f8, f8)')
 def calc_theta_m_t(phi_m_tot, theta_m_t_1, h_em, h_3, c_m):
     # (25) in SIA 2044 / Korrigenda C1 zum Merkblatt SIA 2044:2011 / Korrigenda C2 zum Mekblatt SIA 2044:2011
     theta_m_t = (theta_m_t_1 * (c_m - 0.5 * (h_3 + h_em)) + phi_m_tot) / (c_m + 0.5 * (h_3 + h_em))
@@ -415,6 +436,7 @@ def calc_theta_m_t(phi_m_tot, theta_m_t_1, h_em, h_3, c_m):
     return theta_m_t
 
 
+@kernel('f8(f8, f8)')
 def calc_h_1(h_ea, h_ac):
 
     # get values
@@ -428,6 +450,7 @@ def calc_h_1(h_ea, h_ac):
     return h_1
 
 
+@kernel('f8(f8, f8)')
 def calc_h_2(h_1, h_ec):
     # (27) in SIA 2044 / Korrigenda C1 zum Merkblatt SIA 2044:2011 / Korrigenda C2 zum Mekblatt SIA 2044:2011
 
@@ -436,24 +459,28 @@ def calc_h_2(h_1, h_ec):
     return h_2
 
 
+@kernel('f8(f8, f8)')
 def calc_h_3(h_2, h_mc):
     # (28) in SIA 2044 / Korrigenda C1 zum Merkblatt SIA 2044:2011 / Korrigenda C2 zum Mekblatt SIA 2044:2011
     h_3 = 1.0 / (1.0 / h_2 + 1.0 / h_mc)
     return h_3
 
 
+@kernel('f8(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)')
 def calc_phi_m_tot(phi_m, phi_a, phi_c, theta_ea, theta_em, theta_ec, h_1, h_2, h_3, h_ec, h_ea, h_em):
     # (29) in SIA 2044 / Korrigenda C1 zum Merkblatt SIA 2044:2011 / Korrigenda C2 zum Mekblatt SIA 2044:2011
     phi_m_tot = phi_m + h_em * theta_em + (h_3 * (phi_c + h_ec * theta_ec + h_1 * (phi_a / h_ea + theta_ea))) / h_2
     return phi_m_tot
 
 
+@kernel('f8(f8, f8)')
 def calc_theta_m(theta_m_t, theta_m_t_1):
     # (30) in SIA 2044 / Korrigenda C1 zum Merkblatt SIA 2044:2011 / Korrigenda C2 zum Mekblatt SIA 2044:2011
     theta_m = (theta_m_t + theta_m_t_1) / 2
     return theta_m
 
 
+@kernel('f8(f8, f8, f8, f8, f8, f8, f8, f8, f8)')
 def calc_theta_c(phi_a, phi_c, theta_ea, theta_ec, theta_m, h_1, h_mc, h_ec, h_ea):
 
     # get values
@@ -468,12 +495,14 @@ def calc_theta_c(phi_a, phi_c, theta_ea, theta_ec, theta_m, h_1, h_mc, h_ec, h_e
     return theta_c
 
 
+@kernel('f8(f8, f8, f8, f8, f8)')
 def calc_T_int(phi_a, theta_ea, theta_c, h_ac, h_ea):
     # (32) in SIA 2044 / Korrigenda C1 zum Merkblatt SIA 2044:2011 / Korrigenda C2 zum Mekblatt SIA 2044:2011
     T_int = (h_ac * theta_c + h_ea * theta_ea + phi_a) / (h_ac + h_ea)
     return T_int
 
 
+@kernel('f8(f8, f8)')
 def calc_theta_o(T_int, theta_c):
     # (33) in SIA 2044 / Korrigenda C1 zum Merkblatt SIA 2044:2011 / Korrigenda C2 zum Mekblatt SIA 2044:2011
     theta_o = T_int * 0.31 + theta_c * 0.69
@@ -627,10 +656,11 @@ def calc_rc_model_temperatures(phi_hc_cv, phi_hc_r, bpr, tsd, t):
     return rc_model_temp
 
 
+@kernel('UniTuple(f8, 11)(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)')
 def _calc_rc_model_temperatures(Eaf, Elf, Epro, Htr_op, Htr_w, I_sol, Qs, T_ext, a_m, a_t, a_w, c_m,
                                 m_ve_inf_simple, m_ve_mech, m_ve_window, phi_hc_cv, phi_hc_r, theta_m_t_1,
                                 theta_ve_mech):
-    # numba_cc compatible calculation
+    # JIT-compiled (see cea.utilities.jit): only call kernels from here
     h_ec = calc_h_ec(Htr_w=Htr_w)
     h_ac = calc_h_ac(a_t)
     h_ea = calc_h_ea(m_ve_mech, m_ve_window, m_ve_inf_simple)
@@ -876,13 +906,3 @@ def lookup_f_hc_cv_cooling(bpr):
 
     return f_hc_cv
 
-
-# use the optimized (numba_cc) versions of the functions in this module if available
-try:
-    # import Numba AOT versions of the functions above, overwriting them
-    from rc_model_sia_cc import (calc_phi_m, calc_phi_c, calc_theta_c, calc_phi_m_tot, calc_phi_a, calc_theta_m,
-                                 calc_h_ea, calc_theta_m_t, calc_theta_ea, calc_h_em, calc_h_3)
-except ImportError:
-    # fall back to using the python version
-    # print('failed to import from rc_model_sia_cc.pyd, falling back to pure python functions')
-    pass
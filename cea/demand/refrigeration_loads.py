@@ -6,6 +6,7 @@ from __future__ import division
 import numpy as np
 import pandas as pd
 from cea.technologies import heatpumps
+from cea.utilities.database_catalog import read_database
 
 __author__ = "Jimeno A. Fonseca"
 __copyright__ = "Copyright 2016, Architecture and Building Systems - ETH Zurich"
@@ -56,7 +57,7 @@ def calc_Qref(locator, bpr, tsd, region):
     it calculates final loads
     """
     # GET SYSTEMS EFFICIENCIES
-    data_systems = pd.read_excel(locator.get_life_cycle_inventory_supply_systems(region), "COOLING").set_index('code')
+    data_systems = read_database(locator.get_life_cycle_inventory_supply_systems(region), "COOLING").set_index('code')
     type_system = bpr.supply['type_cs']
     energy_source = data_systems.loc[type_system, 'source_cs']
 
@@ -0,0 +1,197 @@
+"""
+Representative days of the demand calculation.
+
+The hourly heating / cooling procedure (:py:func:`cea.demand.thermal_loads.calc_Qhs_Qcs`) steps through every hour of
+the year and is the most expensive part of the demand calculation. With the ``representative-days`` parameter of the
+demand script, it only simulates a few days of the year and repeats their results for the days they represent:
+
+- the typical day of each group of days with the same month, day type (weekday, Saturday, Sunday - as in the
+  occupancy schedules) and heating / cooling season of the building. The typical day is the day whose hourly
+  temperature and solar gains are closest to the average of its group.
+- the coldest and the hottest day of the year (daily mean temperature), which are kept as they are to preserve the
+  peak loads.
+
+Each representative day is preceded by ``WARM_UP_HOURS`` hours of simulation to warm up the thermal mass of the
+building. The loads that don't depend on the hourly procedure (electricity, hot water, process heat...) are still
+calculated for every hour, so the results keep the format (and the 8760 hours) of a full calculation. The yearly
+totals are the sum of the representative days weighted by the number of days they represent -
+:py:func:`calc_errors` reports the error against a full calculation.
+"""
+from __future__ import division
+
+import numpy as np
+import pandas as pd
+
+from cea.demand import control_heating_cooling_systems, latent_loads
+
+__author__ = "Daren Thomas"
+__copyright__ = "Copyright 2019, Architecture and Building Systems - ETH Zurich"
+__credits__ = ["Daren Thomas"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Daren Thomas"
+__email__ = "cea@arch.ethz.ch"
+__status__ = "Production"
+
+HOURS_IN_DAY = 24
+DAYS_IN_YEAR = 365
+HOURS_IN_YEAR = HOURS_IN_DAY * DAYS_IN_YEAR
+WARM_UP_HOURS = 48  # hours simulated before each representative day, the results of these hours are overwritten
+
+# time series data written by the hourly procedure (per building and batched), repeated for the represented days
+TSD_KEYS_HOURLY_PROCEDURE = ['I_sol_and_I_rad', 'I_rad', 'I_sol', 'm_ve_mech', 'm_ve_window', 'm_ve_inf', 'm_ve_rec',
+                             'theta_ve_mech', 'x_ve_inf', 'x_ve_mech', 'g_hu_ld', 'g_dhu_ld', 'x_int', 'T_int',
+                             'theta_m', 'theta_c', 'theta_o',
+                             'Qhs_sen_rc', 'Qhs_sen_shu', 'Qhs_sen_ahu', 'Qhs_sen_aru', 'Qhs_lat_ahu', 'Qhs_lat_aru',
+                             'Qhs_sen_sys', 'Qhs_lat_sys', 'Qhs_em_ls', 'Ehs_lat_aux',
+                             'ma_sup_hs_ahu', 'ta_sup_hs_ahu', 'ta_re_hs_ahu', 'ma_sup_hs_aru', 'ta_sup_hs_aru',
+                             'ta_re_hs_aru',
+                             'Qcs_sen_rc', 'Qcs_sen_scu', 'Qcs_sen_ahu', 'Qcs_sen_aru', 'Qcs_lat_ahu', 'Qcs_lat_aru',
+                             'Qcs_sen_sys', 'Qcs_lat_sys', 'Qcs_em_ls',
+                             'ma_sup_cs_ahu', 'ta_sup_cs_ahu', 'ta_re_cs_ahu', 'ma_sup_cs_aru', 'ta_sup_cs_aru',
+                             'ta_re_cs_aru',
+                             'Q_gain_sen_light', 'Q_gain_sen_app', 'Q_gain_sen_pro', 'Q_gain_sen_data',
+                             'Q_gain_sen_peop', 'Q_gain_sen_wall', 'Q_gain_sen_base', 'Q_gain_sen_roof',
+                             'Q_gain_sen_wind', 'Q_gain_sen_vent',
+                             'sys_status_ahu', 'sys_status_aru', 'sys_status_sen']
+
+
+class RepresentativeDays(object):
+    """
+    The days of the year simulated by the hourly procedure and the representative day of each day of the year.
+
+    :param day_map: the representative day of each day of the year (a day represents itself if it is simulated)
+    :type day_map: ndarray[int]
+    """
+
+    def __init__(self, day_map):
+        self.day_map = np.asarray(day_map, dtype=int)
+        self.days = np.unique(self.day_map)
+        simulated = np.zeros(HOURS_IN_YEAR, dtype=bool)
+        for day in self.days:
+            simulated[np.arange(day * HOURS_IN_DAY - WARM_UP_HOURS, (day + 1) * HOURS_IN_DAY) % HOURS_IN_YEAR] = True
+        self.periods = get_periods(simulated)
+
+    def get_key(self):
+        """:return: a hashable key - buildings with the same key simulate the same hours"""
+        return tuple(self.day_map)
+
+    def get_weights(self):
+        """:return: the number of days represented by each representative day (in the order of ``days``)"""
+        return np.bincount(self.day_map, minlength=DAYS_IN_YEAR)[self.days]
+
+    def get_hours(self):
+        """Yield the hours to simulate, period by period (see :py:func:`initialize_periods`)"""
+        for period in self.periods:
+            for t in period:
+                yield t
+
+    def initialize_periods(self, state, T_ext, rh_ext):
+        """
+        Start each period of simulation like the simulation of the whole year: with the zone at the outdoor
+        temperature and moisture content in the hour before the period (the thermal mass and surface temperatures
+        are initialized from the outdoor temperature by the hourly procedure).
+
+        :param state: the time series data of a building, or the stacked time series data of a batch of buildings
+        :type state: dict
+        """
+        for period in self.periods:
+            t_prev = period[0] - 1
+            state['T_int'][t_prev] = T_ext[t_prev]
+            state['x_int'][t_prev] = latent_loads.convert_rh_to_moisture_content(rh_ext[t_prev], T_ext[t_prev])
+            state['theta_m'][t_prev] = np.nan
+            state['theta_c'][t_prev] = np.nan
+
+    def expand(self, tsd, keys=TSD_KEYS_HOURLY_PROCEDURE):
+        """Repeat the results of the hourly procedure of the representative days for the days they represent"""
+        hours = (self.day_map[:, np.newaxis] * HOURS_IN_DAY + np.arange(HOURS_IN_DAY)).ravel()
+        for key in keys:
+            if key in tsd:
+                values = tsd[key]
+                values[:] = values[hours]
+        return tsd
+
+
+def get_periods(simulated):
+    """
+    :param simulated: True for each hour of the year to simulate
+    :type simulated: ndarray[bool]
+    :return: the hours to simulate, split into periods of consecutive hours (periods can span the end of the year)
+    :rtype: list[ndarray[int]]
+    """
+    if simulated.all():
+        return [np.arange(HOURS_IN_YEAR)]
+    periods = []
+    for start in np.flatnonzero(simulated & ~np.roll(simulated, 1)):
+        length = 0
+        while simulated[(start + length) % HOURS_IN_YEAR]:
+            length += 1
+        periods.append((start + np.arange(length)) % HOURS_IN_YEAR)
+    return periods
+
+
+def select_representative_days(bpr, weather_data, date):
+    """
+    Select the days simulated by the hourly procedure of a building (see module docstring).
+
+    :param bpr: building properties row object
+    :type bpr: cea.demand.building_properties.BuildingPropertiesRow
+    :param weather_data: data from the .epw weather file
+    :type weather_data: pandas.DataFrame
+    :param date: the dates (hours) of the year (8760)
+    :type date: pandas.DatetimeIndex
+    :rtype: RepresentativeDays
+    """
+    T_ext = np.asarray(weather_data['drybulb_C'], dtype=float).reshape(DAYS_IN_YEAR, HOURS_IN_DAY)
+    I_sol = np.asarray(bpr.solar.I_sol, dtype=float).reshape(DAYS_IN_YEAR, HOURS_IN_DAY)
+    features = [T_ext / max(T_ext.std(), 1e-6)]
+    if I_sol.std() > 0.0:
+        features.append(I_sol / I_sol.std())
+    features = np.concatenate(features, axis=1)
+
+    control_profile = control_heating_cooling_systems.get_control_profile(bpr)
+    heating_season = control_profile.heating_season.reshape(DAYS_IN_YEAR, HOURS_IN_DAY).any(axis=1)
+    cooling_season = control_profile.cooling_season.reshape(DAYS_IN_YEAR, HOURS_IN_DAY).any(axis=1)
+    months = np.asarray(date.month[::HOURS_IN_DAY])
+    day_of_week = np.asarray(date.dayofweek[::HOURS_IN_DAY])
+    day_types = np.where(day_of_week < 5, 0, day_of_week)  # 0: weekday, 5: Saturday, 6: Sunday
+
+    daily_mean_temperature = T_ext.mean(axis=1)
+    peak_days = {int(np.argmin(daily_mean_temperature)), int(np.argmax(daily_mean_temperature))}
+
+    day_map = np.arange(DAYS_IN_YEAR)
+    groups = {}
+    for day in range(DAYS_IN_YEAR):
+        if day not in peak_days:
+            groups.setdefault((months[day], day_types[day], heating_season[day], cooling_season[day]),
+                              []).append(day)
+    for days in groups.values():
+        distance = ((features[days] - features[days].mean(axis=0)) ** 2).sum(axis=1)
+        day_map[days] = days[int(np.argmin(distance))]
+    return RepresentativeDays(day_map)
+
+
+def calc_errors(full_year, representative_days, columns):
+    """
+    Compare the hourly results of a calculation with representative days to the results of a full calculation.
+
+    :param full_year: hourly results of the full calculation (e.g. as read from the demand results file)
+    :type full_year: pandas.DataFrame
+    :param representative_days: hourly results of the calculation with representative days
+    :type representative_days: pandas.DataFrame
+    :param columns: the columns to compare
+    :type columns: list[str]
+    :return: the yearly totals and peaks of both calculations and their relative errors, a row per column
+    :rtype: pandas.DataFrame
+    """
+    errors = pd.DataFrame(index=pd.Index(columns, name='column'))
+    errors['total_full_year'] = full_year[columns].sum().values
+    errors['total_representative_days'] = representative_days[columns].sum().values
+    errors['peak_full_year'] = full_year[columns].abs().max().values
+    errors['peak_representative_days'] = representative_days[columns].abs().max().values
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for value in ['total', 'peak']:
+            full = errors['%s_full_year' % value].values
+            reduced = errors['%s_representative_days' % value].values
+            errors['%s_error' % value] = np.where(reduced == full, 0.0, (reduced - full) / np.abs(full))
+    return errors
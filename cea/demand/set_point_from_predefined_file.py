@@ -5,8 +5,7 @@ from __future__ import division
 import numpy as np
 import pandas as pd
 import os
-from cea.demand.control_heating_cooling_systems import get_heating_system_set_point
-from cea.demand.control_heating_cooling_systems import get_cooling_system_set_point
+from cea.demand.control_heating_cooling_systems import calc_set_points
 
 import datetime
 
@@ -19,8 +18,11 @@ __maintainer__ = "Daren Thomas"
 __email__ = "thomas@arch.ethz.ch"
 __status__ = "Production"
 
+# the subfolders of the predefined hourly set points and the set points they define
+PREDEFINED_SET_POINTS = [('space-heating', 'ta_hs_set'), ('space-cooling', 'ta_cs_set')]
 
-def calc_set_point_from_predefined_file(tsd, bpr, weekday, building_name, locator):
+
+def calc_set_point_from_predefined_file(tsd, bpr, weekday, building_name, locator, predefined_set_points=None):
     """
     This function is used to set the space cooling and space heating set points from a predefined hourly set points
     xlsx file. This will help in finding the building demand for a flexible building scenario.
@@ -41,21 +43,45 @@ def calc_set_point_from_predefined_file(tsd, bpr, weekday, building_name, locato
     :param bpr: BuildingPropertiesRow
     :type bpr: cea.demand.building_properties.BuildingPropertiesRow
     :param weekday:
+    :param predefined_set_points: the predefined set points of the zone (see :py:func:`read_predefined_set_points`),
+        read from the files of the building if None
+    :type predefined_set_points: dict
     :return: tsd with updated columns
     :rtype: dict
     """
-    if os.path.isfile(locator.get_predefined_hourly_setpoints(building_name, type_of_district_network='space-heating')):
-        predefined_set_temperatures_space_heating = pd.read_csv(locator.get_predefined_hourly_setpoints(building_name, type_of_district_network='space-heating'))
-        tsd['ta_hs_set'] = predefined_set_temperatures_space_heating['temperature'].values
-    else:
-        print ('predefined set points file for space heating is not provided. It is running with the default archetype set points')
-        tsd['ta_hs_set'] = np.vectorize(get_heating_system_set_point)(tsd['people'], range(8760), bpr, weekday)
-
-    if os.path.isfile(locator.get_predefined_hourly_setpoints(building_name, type_of_district_network='space-cooling')):
-        predefined_set_temperatures_space_cooling = pd.read_csv(locator.get_predefined_hourly_setpoints(building_name, type_of_district_network='space-cooling'))
-        tsd['ta_cs_set'] = predefined_set_temperatures_space_cooling['temperature'].values
-    else:
-        print ('predefined set points file for space cooling is not provided. It is running with the default archetype set points')
-        tsd['ta_cs_set'] = np.vectorize(get_cooling_system_set_point)(tsd['people'], range(8760), bpr, weekday)
-
-    return tsd
\ No newline at end of file
+    if predefined_set_points is None:
+        predefined_set_points = read_predefined_set_points(locator, [building_name])
+    archetype_set_points = dict(zip(['ta_hs_set', 'ta_cs_set'], calc_set_points(tsd['people'], bpr, weekday)))
+
+    for type_of_district_network, set_point in PREDEFINED_SET_POINTS:
+        if building_name in predefined_set_points[type_of_district_network]:
+            tsd[set_point] = predefined_set_points[type_of_district_network][building_name]
+        else:
+            print ('predefined set points file for %s is not provided. It is running with the default archetype set '
+                   'points' % type_of_district_network.replace('-', ' '))
+            tsd[set_point] = archetype_set_points[set_point]
+
+    return tsd
+
+
+def read_predefined_set_points(locator, building_names):
+    """
+    Read the predefined hourly set points of the buildings of a zone in one go.
+
+    :param locator: the locator of the scenario
+    :type locator: cea.inputlocator.InputLocator
+    :param building_names: the buildings to read the set points of
+    :type building_names: list[str]
+    :return: ``{'space-heating': {building_name: ndarray}, 'space-cooling': {building_name: ndarray}}`` with the
+        hourly set points [°C] of the buildings that have a predefined set points file
+    :rtype: dict
+    """
+    predefined_set_points = {}
+    for type_of_district_network, _ in PREDEFINED_SET_POINTS:
+        predefined_set_points[type_of_district_network] = {}
+        for building_name in building_names:
+            path = locator.get_predefined_hourly_setpoints(building_name, type_of_district_network)
+            if os.path.isfile(path):
+                predefined_set_points[type_of_district_network][building_name] = pd.read_csv(
+                    path, usecols=['temperature'])['temperature'].values
+    return predefined_set_points
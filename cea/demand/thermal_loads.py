@@ -7,20 +7,23 @@ from __future__ import division
 import numpy as np
 import pandas as pd
 
-from cea.demand import demand_writers
+from cea.demand import demand_writers, demand_timing
+from cea.demand.time_series_data import TimeSeriesData
 from cea.demand import latent_loads
 from cea.demand import occupancy_model, hourly_procedure_heating_cooling_system_load, ventilation_air_flows_simple
 from cea.demand import sensible_loads, electrical_loads, hotwater_loads, refrigeration_loads, datacenter_loads
 from cea.demand import ventilation_air_flows_detailed, control_heating_cooling_systems
 from cea.technologies import heatpumps
 from cea.demand.set_point_from_predefined_file import calc_set_point_from_predefined_file
+from cea.demand.representative_days import select_representative_days
 
 from cea.utilities import reporting
 
 
 def calc_thermal_loads(building_name, bpr, weather_data, usage_schedules, date, locator, use_stochastic_occupancy,
                        use_dynamic_infiltration_calculation, resolution_outputs, loads_output, massflows_output,
-                       temperatures_output, format_output, config, region, write_detailed_output, debug):
+                       temperatures_output, format_output, config, region, write_detailed_output, debug,
+                       predefined_set_points=None):
     """
     Calculate thermal loads of a single building with mechanical or natural ventilation.
     Calculation procedure follows the methodology of ISO 13790
@@ -41,17 +44,14 @@ def calc_thermal_loads(building_name, bpr, weather_data, usage_schedules, date,
       probability of use), with each element of the 4-tuple being a list of hourly values (8760 values).
 
 
-    Side effect include a number of files in two folders:
+    Side effect include a number of files in the folder:
 
     * ``scenario/outputs/data/demand``
 
       * ``${Name}.csv`` for each building
 
-    * temporary folder (as returned by ``tempfile.gettempdir()``)
-
-      * ``${Name}T.csv`` for each building
-
-    daren-thomas: as far as I can tell, these are the only side-effects.
+    The yearly totals of the building (a row of ``Total_demand.csv``) are returned instead of being written to disk,
+    see :py:class:`cea.demand.demand_writers.YearlyDemandWriter`.
 
     :param building_name: name of building
     :type building_name: str
@@ -72,23 +72,74 @@ def calc_thermal_loads(building_name, bpr, weather_data, usage_schedules, date,
     :param locator:
     :param use_dynamic_infiltration_calculation:
 
-    :returns: This function does not return anything
-    :rtype: NoneType
+    :param predefined_set_points: the predefined hourly set points of the zone, read once for all buildings with
+        :py:func:`cea.demand.set_point_from_predefined_file.read_predefined_set_points` (only used with
+        ``config.demand.predefined_hourly_setpoints``)
+    :type predefined_set_points: dict
+
+    :returns: the yearly totals and the hourly loads of the building
+    :rtype: cea.demand.demand_writers.DemandTotals
 
 """
-    schedules, tsd = initialize_inputs(bpr, usage_schedules, weather_data, use_stochastic_occupancy)
+    schedules, tsd = calc_loads_before_hourly_procedure(building_name, bpr, weather_data, usage_schedules, date,
+                                                        locator, use_stochastic_occupancy, config, region,
+                                                        predefined_set_points)
 
-    # CALCULATE ELECTRICITY LOADS
-    tsd = electrical_loads.calc_Eal_Epro(tsd, bpr, schedules)
+    #CALCULATE HEATING AND COOLING DEMAND
+    if not np.isclose(bpr.rc_model['Af'], 0.0):
+        with demand_timing.phase(building_name, 'hourly procedure'):
+            representative_days = None
+            if config.demand.representative_days:
+                representative_days = select_representative_days(bpr, weather_data, date)
+            #end-use demand latent and sensible + ventilation
+            tsd = calc_Qhs_Qcs(bpr, tsd, use_dynamic_infiltration_calculation, region, representative_days)
 
-    # CALCULATE REFRIGERATION LOADS
-    if refrigeration_loads.has_refrigeration_load(bpr):
-        tsd = refrigeration_loads.calc_Qcre_sys(bpr, tsd, schedules)
-        tsd = refrigeration_loads.calc_Qref(locator, bpr, tsd, region)
-    else:
-        tsd['DC_cre'] = tsd['Qcre_sys'] = tsd['Qcre'] = np.zeros(8760)
-        tsd['mcpcre_sys'] = tsd['Tcre_sys_re'] = tsd['Tcre_sys_sup'] = np.zeros(8760)
-        tsd['E_cre'] = np.zeros(8760)
+    tsd = calc_loads_after_hourly_procedure(bpr, tsd, schedules)
+
+    #WRITE SOLAR RESULTS
+    with demand_timing.phase(building_name, 'write results'):
+        demand_totals = write_results(bpr, building_name, date, format_output, loads_output, locator,
+                                      massflows_output, resolution_outputs, temperatures_output, tsd,
+                                      write_detailed_output, debug, config.demand.incremental)
+    add_timings(demand_totals, building_name)
+    return demand_totals
+
+
+def add_timings(demand_totals, building_name):
+    """Move the timings of the building to its totals (see :py:mod:`cea.demand.demand_timing`)"""
+    timings = demand_timing.pop_timings(building_name)
+    if timings is not None:
+        demand_totals.timings[building_name] = timings
+
+
+def calc_loads_before_hourly_procedure(building_name, bpr, weather_data, usage_schedules, date, locator,
+                                       use_stochastic_occupancy, config, region, predefined_set_points=None):
+    """
+    Calculate all loads of a building that do not depend on the hourly heating / cooling procedure (electricity,
+    refrigeration, process heat, data centers) and the set points for the hourly procedure.
+
+    :return schedules: schedules of the building
+    :return tsd: time series data dict
+    """
+    with demand_timing.phase(building_name, 'schedules'):
+        random_state = None
+        if use_stochastic_occupancy:
+            random_state = occupancy_model.get_random_state(config.demand.stochastic_occupancy_seed, building_name)
+        schedules, tsd = initialize_inputs(bpr, usage_schedules, weather_data, use_stochastic_occupancy,
+                                           random_state)
+
+    with demand_timing.phase(building_name, 'electricity and refrigeration'):
+        # CALCULATE ELECTRICITY LOADS
+        tsd = electrical_loads.calc_Eal_Epro(tsd, bpr, schedules)
+
+        # CALCULATE REFRIGERATION LOADS
+        if refrigeration_loads.has_refrigeration_load(bpr):
+            tsd = refrigeration_loads.calc_Qcre_sys(bpr, tsd, schedules)
+            tsd = refrigeration_loads.calc_Qref(locator, bpr, tsd, region)
+        else:
+            tsd['DC_cre'] = tsd['Qcre_sys'] = tsd['Qcre'] = np.zeros(8760)
+            tsd['mcpcre_sys'] = tsd['Tcre_sys_re'] = tsd['Tcre_sys_sup'] = np.zeros(8760)
+            tsd['E_cre'] = np.zeros(8760)
 
     if np.isclose(bpr.rc_model['Af'], 0.0):  # if building does not have conditioned area
 
@@ -97,65 +148,80 @@ def calc_thermal_loads(building_name, bpr, weather_data, usage_schedules, date,
 
     else:
 
-        #CALCULATE PROCESS HEATING
-        tsd['Qhpro_sys'][:] = schedules['Qhpro'] * bpr.internal_loads['Qhpro_Wm2']  # in kWh
+        with demand_timing.phase(building_name, 'process heat and data centers'):
+            #CALCULATE PROCESS HEATING
+            tsd['Qhpro_sys'][:] = schedules['Qhpro'] * bpr.internal_loads['Qhpro_Wm2']  # in kWh
 
-        # CALCULATE DATA CENTER LOADS
-        if datacenter_loads.has_data_load(bpr):
-            tsd = datacenter_loads.calc_Edata(bpr, tsd, schedules)  # end-use electricity
-            tsd = datacenter_loads.calc_Qcdata_sys(tsd)  # system need for cooling
-            tsd = datacenter_loads.calc_Qcdataf(locator, bpr, tsd, region)  # final need for cooling
-        else:
-            tsd['DC_cdata'] = tsd['Qcdata_sys'] = tsd['Qcdata'] = np.zeros(8760)
-            tsd['mcpcdata_sys'] = tsd['Tcdata_sys_re'] = tsd['Tcdata_sys_sup'] = np.zeros(8760)
-            tsd['Edata'] = tsd['E_cdata'] = np.zeros(8760)
-
-        #CALCULATE HEATING AND COOLING DEMAND
-        tsd = calc_set_points(bpr, date, tsd, building_name, config, locator)  # calculate the setpoints for every hour
-        tsd = calc_Qhs_Qcs(bpr, tsd, use_dynamic_infiltration_calculation, region)  #end-use demand latent and sensible + ventilation
-        tsd = sensible_loads.calc_Qhs_Qcs_loss(bpr, tsd) # losses
-        tsd = sensible_loads.calc_Qhs_sys_Qcs_sys(tsd) # system (incl. losses)
-        tsd = sensible_loads.calc_temperatures_emission_systems(bpr, tsd) # calculate temperatures
-        tsd = electrical_loads.calc_Eauxf_ve(tsd) #calc auxiliary loads ventilation
-        tsd = electrical_loads.calc_Eaux_Qhs_Qcs(tsd, bpr) #calc auxiliary loads heating and cooling
-
-        #SOME TRICKS FOR THE GRAPHS - see where to put this.
-        tsd = latent_loads.calc_latent_gains_from_people(tsd, bpr)
-        tsd['Qcs_lat_sys'] = abs(tsd['Qcs_lat_sys'])
-        tsd['DC_cs'] = abs(tsd['DC_cs'])
-        tsd['Qcs_sys'] = abs(tsd['Qcs_sys'])
-
-        tsd = calc_Qcs_sys(bpr, tsd) # final : including fuels and renewables
-        tsd = calc_Qhs_sys(bpr, tsd) # final : including fuels and renewables
+            # CALCULATE DATA CENTER LOADS
+            if datacenter_loads.has_data_load(bpr):
+                tsd = datacenter_loads.calc_Edata(bpr, tsd, schedules)  # end-use electricity
+                tsd = datacenter_loads.calc_Qcdata_sys(tsd)  # system need for cooling
+                tsd = datacenter_loads.calc_Qcdataf(locator, bpr, tsd, region)  # final need for cooling
+            else:
+                tsd['DC_cdata'] = tsd['Qcdata_sys'] = tsd['Qcdata'] = np.zeros(8760)
+                tsd['mcpcdata_sys'] = tsd['Tcdata_sys_re'] = tsd['Tcdata_sys_sup'] = np.zeros(8760)
+                tsd['Edata'] = tsd['E_cdata'] = np.zeros(8760)
+
+        with demand_timing.phase(building_name, 'set points'):
+            # calculate the setpoints for every hour
+            tsd = calc_set_points(bpr, date, tsd, building_name, config, locator, predefined_set_points)
+
+    return schedules, tsd
+
+
+def calc_loads_after_hourly_procedure(bpr, tsd, schedules):
+    """
+    Calculate the system and final loads of a building from the results of the hourly heating / cooling procedure
+    (:py:func:`calc_Qhs_Qcs`).
+
+    :return tsd: time series data dict
+    """
+    if not np.isclose(bpr.rc_model['Af'], 0.0):
+        with demand_timing.phase(bpr.name, 'system losses'):
+            tsd = sensible_loads.calc_Qhs_Qcs_loss(bpr, tsd) # losses
+            tsd = sensible_loads.calc_Qhs_sys_Qcs_sys(tsd) # system (incl. losses)
+        with demand_timing.phase(bpr.name, 'emission system temperatures'):
+            tsd = sensible_loads.calc_temperatures_emission_systems(bpr, tsd) # calculate temperatures
+        with demand_timing.phase(bpr.name, 'final heating and cooling loads'):
+            tsd = electrical_loads.calc_Eauxf_ve(tsd) #calc auxiliary loads ventilation
+            tsd = electrical_loads.calc_Eaux_Qhs_Qcs(tsd, bpr) #calc auxiliary loads heating and cooling
+
+            #SOME TRICKS FOR THE GRAPHS - see where to put this.
+            tsd = latent_loads.calc_latent_gains_from_people(tsd, bpr)
+            tsd['Qcs_lat_sys'] = abs(tsd['Qcs_lat_sys'])
+            tsd['DC_cs'] = abs(tsd['DC_cs'])
+            tsd['Qcs_sys'] = abs(tsd['Qcs_sys'])
+
+            tsd = calc_Qcs_sys(bpr, tsd) # final : including fuels and renewables
+            tsd = calc_Qhs_sys(bpr, tsd) # final : including fuels and renewables
 
         #CALCULATE HOT WATER LOADS
-        if hotwater_loads.has_hot_water_technical_system(bpr):
-            tsd = electrical_loads.calc_Eaux_fw(tsd, bpr, schedules)
-            tsd = hotwater_loads.calc_Qww(bpr, tsd, schedules) # end-use
-            tsd = hotwater_loads.calc_Qww_sys(bpr, tsd) # system (incl. losses)
-            tsd = electrical_loads.calc_Eaux_ww(tsd, bpr) #calc auxiliary loads
-            tsd = hotwater_loads.calc_Qwwf(bpr, tsd) #final
-        else:
-            tsd = electrical_loads.calc_Eaux_fw(tsd, bpr, schedules)
-            tsd['Qww'] = tsd['DH_ww'] = tsd['Qww_sys'] = np.zeros(8760)
-            tsd['mcpww_sys'] = tsd['Tww_sys_re'] = tsd['Tww_sys_sup'] = np.zeros(8760)
-            tsd['Eaux_ww'] = tsd['SOLAR_ww'] = np.zeros(8760)
-            tsd['NG_ww'] = tsd['COAL_ww'] = tsd['OIL_ww'] =  tsd['WOOD_ww'] = np.zeros(8760)
-            tsd['E_ww'] = np.zeros(8760)
+        with demand_timing.phase(bpr.name, 'hot water'):
+            if hotwater_loads.has_hot_water_technical_system(bpr):
+                tsd = electrical_loads.calc_Eaux_fw(tsd, bpr, schedules)
+                tsd = hotwater_loads.calc_Qww(bpr, tsd, schedules) # end-use
+                tsd = hotwater_loads.calc_Qww_sys(bpr, tsd) # system (incl. losses)
+                tsd = electrical_loads.calc_Eaux_ww(tsd, bpr) #calc auxiliary loads
+                tsd = hotwater_loads.calc_Qwwf(bpr, tsd) #final
+            else:
+                tsd = electrical_loads.calc_Eaux_fw(tsd, bpr, schedules)
+                tsd['Qww'] = tsd['DH_ww'] = tsd['Qww_sys'] = np.zeros(8760)
+                tsd['mcpww_sys'] = tsd['Tww_sys_re'] = tsd['Tww_sys_sup'] = np.zeros(8760)
+                tsd['Eaux_ww'] = tsd['SOLAR_ww'] = np.zeros(8760)
+                tsd['NG_ww'] = tsd['COAL_ww'] = tsd['OIL_ww'] =  tsd['WOOD_ww'] = np.zeros(8760)
+                tsd['E_ww'] = np.zeros(8760)
 
             # CALCULATE SUM OF HEATING AND COOLING LOADS
         tsd = calc_QH_sys_QC_sys(tsd)  # aggregated cooling and heating loads
 
     #CALCULATE ELECTRICITY LOADS PART 2/2 AUXILIARY LOADS + ENERGY GENERATION
-    tsd = electrical_loads.calc_Eaux(tsd) # auxiliary totals
-    tsd = electrical_loads.calc_E_sys(tsd) # system (incl. losses)
-    tsd = electrical_loads.calc_Ef(bpr, tsd)  # final (incl. self. generated)
+    with demand_timing.phase(bpr.name, 'final electricity loads'):
+        tsd = electrical_loads.calc_Eaux(tsd) # auxiliary totals
+        tsd = electrical_loads.calc_E_sys(tsd) # system (incl. losses)
+        tsd = electrical_loads.calc_Ef(bpr, tsd)  # final (incl. self. generated)
 
-    #WRITE SOLAR RESULTS
-    write_results(bpr, building_name, date, format_output, loads_output, locator, massflows_output,
-                  resolution_outputs, temperatures_output, tsd, write_detailed_output, debug)
+    return tsd
 
-    return
 
 def calc_QH_sys_QC_sys(tsd):
 
@@ -166,18 +232,21 @@ def calc_QH_sys_QC_sys(tsd):
 
 
 def write_results(bpr, building_name, date, format_output, loads_output, locator, massflows_output,
-                  resolution_outputs, temperatures_output, tsd, write_detailed_output, debug):
+                  resolution_outputs, temperatures_output, tsd, write_detailed_output, debug, incremental=False):
 
     if resolution_outputs == 'hourly':
-        writer = demand_writers.HourlyDemandWriter(loads_output, massflows_output, temperatures_output)
+        writer = demand_writers.HourlyDemandWriter(loads_output, massflows_output, temperatures_output,
+                                                   keep_hourly_loads=incremental)
     elif resolution_outputs == 'monthly':
         writer = demand_writers.MonthlyDemandWriter(loads_output, massflows_output, temperatures_output)
     else:
         raise Exception('error')
     if format_output == 'csv':
-        writer.results_to_csv(tsd, bpr, locator, date, building_name)
+        demand_totals = writer.results_to_csv(tsd, bpr, locator, date, building_name)
     elif format_output == 'hdf5':
-        writer.results_to_hdf5(tsd, bpr, locator, date, building_name)
+        demand_totals = writer.results_to_hdf5(tsd, bpr, locator, date, building_name)
+    elif format_output == 'columnar':
+        demand_totals = writer.results_to_columnar(tsd, bpr, locator, date, building_name)
     else:
         raise Exception('error')
 
@@ -190,6 +259,8 @@ def write_results(bpr, building_name, date, format_output, loads_output, locator
         print('Behavior can be changed in cea.utilities.reporting code.')
         reporting.quick_visualization_tsd(tsd, locator.get_demand_results_folder(), building_name)
 
+    return demand_totals
+
 
 def calc_Qcs_sys(bpr, tsd):
 
@@ -323,12 +394,13 @@ def calc_Qhs_sys(bpr, tsd):
         raise Exception('check potential error in input database of LCA infrastructure / HEATING')
     return tsd
 
-def calc_set_points(bpr, date, tsd, building_name, config, locator):
+def calc_set_points(bpr, date, tsd, building_name, config, locator, predefined_set_points=None):
     # get internal comfort properties
     # predefined set points for every given hour can be used to calculate the demand profile for a building
     # a config flag is used for this, it is present in the config.demand section
     if config.demand.predefined_hourly_setpoints:
-        tsd = calc_set_point_from_predefined_file(tsd, bpr, date.dayofweek, building_name, locator)
+        tsd = calc_set_point_from_predefined_file(tsd, bpr, date.dayofweek, building_name, locator,
+                                                  predefined_set_points)
     else:
         tsd = control_heating_cooling_systems.calc_simple_temp_control(tsd, bpr, date.dayofweek)
 
@@ -338,22 +410,46 @@ def calc_set_points(bpr, date, tsd, building_name, config, locator):
     return tsd
 
 
-def calc_Qhs_Qcs(bpr, tsd, use_dynamic_infiltration_calculation, region):
+def calc_Qhs_Qcs(bpr, tsd, use_dynamic_infiltration_calculation, region, representative_days=None):
+    """
+    The hourly heating / cooling procedure of a building, for every hour of the year or - if ``representative_days``
+    is given - for the representative days only (see :py:mod:`cea.demand.representative_days`).
+
+    :return tsd: time series data dict
+    """
     # get ventilation flows
     ventilation_air_flows_simple.calc_m_ve_required(bpr, tsd, region)
     ventilation_air_flows_simple.calc_m_ve_leakage_simple(bpr, tsd)
 
+    # the hourly procedure indexes the time series many times per hour: use a plain dict of the same arrays (a dict
+    # subclass like `TimeSeriesData` is slower to index) and write back the keys that were replaced after the loop
+    time_series = tsd
+    tsd = dict(time_series)
+
+    if use_dynamic_infiltration_calculation:
+        # the air flow paths of the building are the same for every hour
+        air_flow_paths = ventilation_air_flows_detailed.get_air_flow_paths(
+            ventilation_air_flows_detailed.get_properties_natural_ventilation(bpr))
+        u_wind = np.asarray(tsd['u_wind'], dtype=float)
+        p_zone = None
+
+    if representative_days is None:
+        hours = get_hours(bpr)
+    else:
+        representative_days.initialize_periods(tsd, tsd['T_ext'], tsd['rh_ext'])
+        hours = representative_days.get_hours()
+
     # end-use demand calculation
-    for t in get_hours(bpr):
+    for t in hours:
 
         # heat flows in [W]
         tsd = sensible_loads.calc_Qgain_sen(t, tsd, bpr)
 
         if use_dynamic_infiltration_calculation:
             # OVERWRITE STATIC INFILTRATION WITH DYNAMIC INFILTRATION RATE
-            dict_props_nat_vent = ventilation_air_flows_detailed.get_properties_natural_ventilation(bpr)
-            qm_sum_in, qm_sum_out = ventilation_air_flows_detailed.calc_air_flows(
-                tsd['T_int'][t - 1], tsd['u_wind'][t], tsd['T_ext'][t], dict_props_nat_vent)
+            # (the zone pressure of the previous hour is the initial guess for the mass balance)
+            qm_sum_in, qm_sum_out, p_zone = ventilation_air_flows_detailed.calc_air_flows_root(
+                tsd['T_int'][t - 1], u_wind[t], tsd['T_ext'][t], air_flow_paths, p_zone)
             # INFILTRATION IS FORCED NOT TO REACH ZERO IN ORDER TO AVOID THE RC MODEL TO FAIL
             tsd['m_ve_inf'][t] = max(qm_sum_in / 3600, 1 / 3600)
 
@@ -369,10 +465,13 @@ def calc_Qhs_Qcs(bpr, tsd, use_dynamic_infiltration_calculation, region):
         hourly_procedure_heating_cooling_system_load.calc_heating_cooling_loads(bpr, tsd, t)
 
         # END OF FOR LOOP
-    return tsd
+    if representative_days is not None:
+        representative_days.expand(tsd)
+    time_series.update(tsd)
+    return time_series
 
 
-def initialize_inputs(bpr, usage_schedules, weather_data, use_stochastic_occupancy):
+def initialize_inputs(bpr, usage_schedules, weather_data, use_stochastic_occupancy, random_state=None):
     """
     :param bpr: a collection of building properties for the building used for thermal loads calculation
     :type bpr: BuildingPropertiesRow
@@ -384,6 +483,8 @@ def initialize_inputs(bpr, usage_schedules, weather_data, use_stochastic_occupan
     :param use_stochastic_occupancy: Boolean specifying whether stochastic occupancy should be used. If False,
         deterministic schedules are used.
     :type use_stochastic_occupancy: Boolean
+    :param random_state: random number generator of the stochastic occupancy model
+    :type random_state: np.random.RandomState
 
     :return schedules:
     :rtype schedules:
@@ -399,7 +500,7 @@ def initialize_inputs(bpr, usage_schedules, weather_data, use_stochastic_occupan
     archetype_schedules = usage_schedules['archetype_schedules']
     archetype_values = usage_schedules['archetype_values']
     schedules = occupancy_model.calc_schedules(list_uses, archetype_schedules, bpr, archetype_values,
-                                               use_stochastic_occupancy)
+                                               use_stochastic_occupancy, random_state)
 
     # calculate occupancy schedule and occupant-related parameters
     tsd['people'] = np.floor(schedules['people'])
@@ -454,16 +555,9 @@ def initialize_timestep_data(bpr, weather_data):
     :type weather_data: pandas.DataFrame
 
     :return: returns the `tsd` variable, a dictionary of time step data mapping variable names to ndarrays for each hour of the year.
-    :rtype: dict
+    :rtype: TimeSeriesData
     """
 
-    # Initialize dict with weather variables
-    tsd = {'T_ext': weather_data.drybulb_C.values,
-           'T_ext_wetbulb': weather_data.wetbulb_C.values,
-           'rh_ext': weather_data.relhum_percent.values,
-           'T_sky': weather_data.skytemp_C.values,
-           'u_wind': weather_data.windspd_ms}
-
     # fill data with nan values
 
     nan_fields_electricity = ['Eaux', 'Eaux_ve', 'Eaux_hs', 'Eaux_cs', 'Eaux_ww', 'Eaux_fw', 'Ehs_lat_aux',
@@ -501,7 +595,19 @@ def initialize_timestep_data(bpr, weather_data):
     nan_fields.extend(nan_fields_electricity)
     nan_fields.extend(TSD_KEYS_PEOPLE)
 
-    tsd.update(dict((x, np.zeros(8760) * np.nan) for x in nan_fields))
+    # the default columns of the hourly results come first, in the order they are written (so they are passed to the
+    # demand writers without copying, see `TimeSeriesData.get_array`)
+    keys = unique(demand_writers.LOAD_VARS + TSD_KEYS_ENERGY_BALANCE_DASHBOARD + TSD_KEYS_SOLAR +
+                  demand_writers.MASS_FLOW_VARS + demand_writers.TEMPERATURE_VARS +
+                  ['T_ext_wetbulb', 'rh_ext', 'T_sky'] + nan_fields)
+    tsd = TimeSeriesData(HOURS_IN_YEAR, keys)
+
+    # weather variables
+    tsd['T_ext'] = weather_data.drybulb_C.values
+    tsd['T_ext_wetbulb'] = weather_data.wetbulb_C.values
+    tsd['rh_ext'] = weather_data.relhum_percent.values
+    tsd['T_sky'] = weather_data.skytemp_C.values
+    tsd['u_wind'] = weather_data.windspd_ms
 
     # initialize system status log
     tsd['sys_status_ahu'] = np.chararray(8760, itemsize=20)
@@ -514,6 +620,12 @@ def initialize_timestep_data(bpr, weather_data):
     return tsd
 
 
+def unique(keys):
+    """:return: the keys without duplicates, in the order of their first occurrence"""
+    seen = set()
+    return [key for key in keys if not (key in seen or seen.add(key))]
+
+
 def update_timestep_data_no_conditioned_area(tsd):
     """
     Update time step data with zeros for buildings without conditioned area
@@ -0,0 +1,616 @@
+# -*- coding: utf-8 -*-
+"""
+Batched demand model of thermal loads
+
+Steps a group of buildings through each hour of the year at once. The per-building time series data (tsd) of the
+group are stacked into arrays of shape (8760, number of buildings) and the RC-model, ventilation, moisture and
+emission loss equations are evaluated with numpy over all buildings of the group. The results are identical to
+:py:func:`cea.demand.thermal_loads.calc_Qhs_Qcs` (within floating point tolerance).
+
+Only buildings with radiative heating / cooling systems (or no systems) and the simple infiltration model are
+batched. Buildings with air-based systems (central AC heating, mini-split, central AC and 3for2 cooling) or with the
+dynamic infiltration calculation fall back to the per-building hourly procedure.
+"""
+from __future__ import division
+
+import time
+
+import numpy as np
+
+from cea.demand import demand_timing, thermal_loads, ventilation_air_flows_simple, control_heating_cooling_systems, \
+    control_ventilation_systems, space_emission_systems, latent_loads, sensible_loads, rc_model_SIA, constants
+from cea.demand.representative_days import select_representative_days
+
+__author__ = "Daren Thomas"
+__copyright__ = "Copyright 2018, Architecture and Building Systems - ETH Zurich"
+__credits__ = ["Daren Thomas", "Gabriel Happle"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Daren Thomas"
+__email__ = "cea@arch.ethz.ch"
+__status__ = "Production"
+
+
+# import constants
+ETA_REC = constants.ETA_REC
+B_F = constants.B_F
+RSE = constants.RSE
+T_WARNING_LOW = constants.T_WARNING_LOW
+T_WARNING_HIGH = constants.T_WARNING_HIGH
+TEMP_TOLERANCE = 0.001  # (°C) see rc_model_SIA.has_sensible_heating_demand
+TEMPERATURE_ZONE_CONTROL_NIGHT_FLUSHING = 26  # (°C) see control_ventilation_systems.is_night_flushing_active
+DELTA_T_NIGHT_FLUSHING = 2  # (°C) see control_ventilation_systems.is_night_flushing_active
+
+# heating and cooling systems supported by the batched procedure
+BATCH_HEATING_SYSTEMS = {'T0', 'T1', 'T2', 'T4'}
+BATCH_COOLING_SYSTEMS = {'T0', 'T1'}
+
+# time series data read by the batched hourly procedure
+TSD_KEYS_BATCH_INPUTS = ['El', 'Ea', 'Epro', 'Qs', 'w_int', 'ta_hs_set', 'ta_cs_set', 'm_ve_required', 'm_ve_inf',
+                         'Qcdata_sys', 'Qcre_sys']
+# time series data written by the batched hourly procedure
+TSD_KEYS_BATCH_OUTPUTS = ['I_sol_and_I_rad', 'I_rad', 'I_sol', 'm_ve_mech', 'm_ve_window', 'theta_ve_mech',
+                          'x_ve_inf', 'x_ve_mech', 'g_hu_ld', 'g_dhu_ld', 'x_int', 'T_int', 'theta_m', 'theta_c',
+                          'theta_o',
+                          'Qhs_sen_rc', 'Qhs_sen_shu', 'Qhs_sen_ahu', 'Qhs_sen_aru', 'Qhs_lat_ahu', 'Qhs_lat_aru',
+                          'Qhs_sen_sys', 'Qhs_lat_sys', 'Qhs_em_ls', 'Ehs_lat_aux',
+                          'ma_sup_hs_ahu', 'ta_sup_hs_ahu', 'ta_re_hs_ahu', 'ma_sup_hs_aru', 'ta_sup_hs_aru',
+                          'ta_re_hs_aru',
+                          'Qcs_sen_rc', 'Qcs_sen_scu', 'Qcs_sen_ahu', 'Qcs_sen_aru', 'Qcs_lat_ahu', 'Qcs_lat_aru',
+                          'Qcs_sen_sys', 'Qcs_lat_sys', 'Qcs_em_ls',
+                          'ma_sup_cs_ahu', 'ta_sup_cs_ahu', 'ta_re_cs_ahu', 'ma_sup_cs_aru', 'ta_sup_cs_aru',
+                          'ta_re_cs_aru',
+                          'Q_gain_sen_light', 'Q_gain_sen_app', 'Q_gain_sen_pro', 'Q_gain_sen_data',
+                          'Q_gain_sen_peop', 'Q_gain_sen_wall', 'Q_gain_sen_base', 'Q_gain_sen_roof',
+                          'Q_gain_sen_wind', 'Q_gain_sen_vent',
+                          'sys_status_ahu', 'sys_status_aru', 'sys_status_sen']
+
+
+def calc_thermal_loads_batch(building_names, bprs, weather_data, usage_schedules, date, locator,
+                             use_stochastic_occupancy, use_dynamic_infiltration_calculation, resolution_outputs,
+                             loads_output, massflows_output, temperatures_output, format_output, config, region,
+                             write_detailed_output, debug, predefined_set_points=None):
+    """
+    Calculate thermal loads of a group of buildings. Same as :py:func:`cea.demand.thermal_loads.calc_thermal_loads`,
+    but the hourly heating / cooling procedure of all buildings that support it is solved at once with
+    :py:func:`calc_Qhs_Qcs_batch`.
+
+    :param building_names: names of the buildings to simulate
+    :type building_names: list[str]
+
+    :param bprs: building properties of the buildings to simulate (same order as ``building_names``)
+    :type bprs: list[cea.demand.building_properties.BuildingPropertiesRow]
+
+    See :py:func:`cea.demand.thermal_loads.calc_thermal_loads` for the other parameters.
+
+    :returns: the yearly totals and the hourly loads of the buildings
+    :rtype: cea.demand.demand_writers.DemandTotals
+    """
+    schedules_and_tsds = [thermal_loads.calc_loads_before_hourly_procedure(building_name, bpr, weather_data,
+                                                                           usage_schedules, date, locator,
+                                                                           use_stochastic_occupancy, config, region,
+                                                                           predefined_set_points)
+                          for building_name, bpr in zip(building_names, bprs)]
+
+    # group the buildings that can be batched by the hours of their simulation (the first hour of the year, or the
+    # representative days), the others are simulated alone
+    batches = {}
+    for bpr, (schedules, tsd) in zip(bprs, schedules_and_tsds):
+        if np.isclose(bpr.rc_model['Af'], 0.0):
+            continue
+        representative_days = None
+        if config.demand.representative_days:
+            representative_days = select_representative_days(bpr, weather_data, date)
+        if is_batchable(bpr, use_dynamic_infiltration_calculation):
+            if representative_days is None:
+                batch_key = thermal_loads.get_hours(bpr).next()
+            else:
+                batch_key = representative_days.get_key()
+            batches.setdefault(batch_key, []).append((bpr, tsd, representative_days))
+        else:
+            with demand_timing.phase(bpr.name, 'hourly procedure'):
+                thermal_loads.calc_Qhs_Qcs(bpr, tsd, use_dynamic_infiltration_calculation, region,
+                                           representative_days)
+    for batch in batches.values():
+        batch_bprs, batch_tsds, batch_representative_days = zip(*batch)
+        t0 = time.time()
+        calc_Qhs_Qcs_batch(batch_bprs, batch_tsds, region, batch_representative_days[0])
+        # the buildings of a batch share the time of the batched hourly procedure equally
+        time_per_building = (time.time() - t0) / len(batch_bprs)
+        for bpr in batch_bprs:
+            demand_timing.add_time(bpr.name, 'hourly procedure', time_per_building)
+
+    demand_totals = None
+    for building_name, bpr, (schedules, tsd) in zip(building_names, bprs, schedules_and_tsds):
+        tsd = thermal_loads.calc_loads_after_hourly_procedure(bpr, tsd, schedules)
+        with demand_timing.phase(building_name, 'write results'):
+            building_totals = thermal_loads.write_results(bpr, building_name, date, format_output, loads_output,
+                                                          locator, massflows_output, resolution_outputs,
+                                                          temperatures_output, tsd, write_detailed_output, debug,
+                                                          config.demand.incremental)
+        thermal_loads.add_timings(building_totals, building_name)
+        if demand_totals is None:
+            demand_totals = building_totals
+        else:
+            demand_totals.update(building_totals)
+    return demand_totals
+
+
+def is_batchable(bpr, use_dynamic_infiltration_calculation):
+    """
+    Check if the hourly heating / cooling procedure of a building can be solved by :py:func:`calc_Qhs_Qcs_batch`.
+
+    :param bpr: building properties row object
+    :param use_dynamic_infiltration_calculation: the dynamic infiltration is only available per building
+    :return: True, if the building can be batched
+    :rtype: bool
+    """
+    return (not use_dynamic_infiltration_calculation
+            and bpr.hvac['type_hs'] in BATCH_HEATING_SYSTEMS
+            and bpr.hvac['type_cs'] in BATCH_COOLING_SYSTEMS)
+
+
+def calc_Qhs_Qcs_batch(bprs, tsds, region, representative_days=None):
+    """
+    Batched version of :py:func:`cea.demand.thermal_loads.calc_Qhs_Qcs` for buildings with radiative heating / cooling
+    systems (or no systems). All buildings need to share the same simulation hours (see
+    :py:func:`cea.demand.thermal_loads.get_hours`, or the same ``representative_days``). The results are written to
+    the ``tsds`` of the buildings.
+
+    :param bprs: building properties of the buildings
+    :type bprs: list[cea.demand.building_properties.BuildingPropertiesRow]
+    :param tsds: time series data dicts of the buildings (same order as ``bprs``)
+    :type tsds: list[dict]
+    :param region: region of the scenario
+    :type region: str
+    :param representative_days: the days to simulate, or None to simulate the whole year
+    :type representative_days: cea.demand.representative_days.RepresentativeDays
+    :return: the updated time series data dicts
+    :rtype: list[dict]
+    """
+    for bpr, tsd in zip(bprs, tsds):
+        # get ventilation flows
+        ventilation_air_flows_simple.calc_m_ve_required(bpr, tsd, region)
+        ventilation_air_flows_simple.calc_m_ve_leakage_simple(bpr, tsd)
+
+    prop = get_batch_properties(bprs)
+    inputs = stack_timestep_data(tsds, TSD_KEYS_BATCH_INPUTS)
+    batch = stack_timestep_data(tsds, TSD_KEYS_BATCH_OUTPUTS)
+    inputs['I_sol_gross'] = np.stack([bpr.solar.I_sol for bpr in bprs], axis=1)
+    m_ve_required_max = inputs['m_ve_required'].max(axis=0)
+
+    # weather data is the same for all buildings
+    T_ext = tsds[0]['T_ext']
+    T_sky = tsds[0]['T_sky']
+    rh_ext = tsds[0]['rh_ext']
+    x_ve = np.vectorize(latent_loads.convert_rh_to_moisture_content)(rh_ext, T_ext)
+
+    # last hour the detailed thermal balance was calculated for each building (see detailed_thermal_balance_to_tsd)
+    t_thermal_balance = np.zeros(len(bprs), dtype=int) - 1
+
+    if representative_days is None:
+        hours = thermal_loads.get_hours(bprs[0])
+    else:
+        representative_days.initialize_periods(batch, T_ext, rh_ext)
+        hours = representative_days.get_hours()
+
+    # end-use demand calculation (comparisons with NaN set points are False, as in the per-building procedure)
+    with np.errstate(invalid='ignore'):
+        for t in hours:
+
+            # heat flows in [W]
+            calc_Qgain_sen_batch(t, batch, inputs, prop, T_ext, T_sky)
+
+            # ventilation air flows [kg/s]
+            is_mechanical_ventilation_active, is_night_flushing_active = calc_air_mass_flows_batch(
+                t, batch, inputs, prop, T_ext, rh_ext, m_ve_required_max)
+
+            # ventilation air temperature and humidity
+            is_heat_recovery_active = is_mechanical_ventilation_active & prop['has_heat_recovery'] & (
+                prop['heating_season'][t] | (prop['cooling_season'][t] & (batch['T_int'][t - 1] < T_ext[t])))
+            batch['theta_ve_mech'][t] = np.where(is_heat_recovery_active,
+                                                 T_ext[t] + ETA_REC * (batch['T_int'][t - 1] - T_ext[t]), T_ext[t])
+            batch['x_ve_inf'][t] = x_ve[t]
+            batch['x_ve_mech'][t] = x_ve[t]
+
+            # heating / cooling demand of buildings
+            is_thermal_balance = calc_heating_cooling_loads_batch(t, batch, inputs, prop, T_ext)
+            t_thermal_balance[is_thermal_balance] = t
+
+    unstack_timestep_data(batch, tsds, TSD_KEYS_BATCH_OUTPUTS)
+    for b, tsd in enumerate(tsds):
+        if t_thermal_balance[b] >= 0:
+            # same as `detailed_thermal_balance_to_tsd`, which overwrites the whole array at each time step
+            tsd['Q_loss_sen_ref'] = -tsd['Qcre_sys'][t_thermal_balance[b]]
+        if representative_days is not None:
+            representative_days.expand(tsd)
+    return tsds
+
+
+def get_batch_properties(bprs):
+    """
+    Collect the building properties used in the hourly procedure as arrays with one value per building
+    (struct of arrays).
+
+    :param bprs: building properties of the buildings
+    :type bprs: list[cea.demand.building_properties.BuildingPropertiesRow]
+    :return: dict of arrays of length ``len(bprs)``, season masks are of shape (8760, len(bprs))
+    :rtype: dict
+    """
+    def rc_model(key):
+        return np.array([bpr.rc_model[key] for bpr in bprs], dtype=float)
+
+    def hvac(key):
+        return np.array([bpr.hvac[key] for bpr in bprs], dtype=float)
+
+    def flag(key):
+        return np.array([bool(bpr.hvac[key]) for bpr in bprs])
+
+    def architecture(key):
+        return np.array([getattr(bpr.architecture, key) for bpr in bprs], dtype=float)
+
+    has_heating_system = np.array([control_heating_cooling_systems.has_heating_system(bpr) for bpr in bprs])
+    has_cooling_system = np.array([control_heating_cooling_systems.has_cooling_system(bpr) for bpr in bprs])
+
+    prop = {key: rc_model(key) for key in ['Af', 'Htr_op', 'Htr_w', 'Atot', 'Am', 'Aw', 'Cm', 'U_win', 'U_roof',
+                                           'U_wall', 'U_base', 'Aroof', 'Aop_sup', 'Aop_bel']}
+    prop.update({key: architecture(key) for key in ['e_win', 'e_roof', 'e_wall']})
+    prop['c_m'] = prop['Cm'] / 3600  # (Wh/K) SIA 2044 unit is Wh/K, ISO unit is J/K
+    prop['q_hs_max'] = hvac('Qhsmax_Wm2') * prop['Af']
+    prop['q_cs_max'] = -hvac('Qcsmax_Wm2') * prop['Af']
+    prop['Tc_sup_air_max'] = np.array([np.max([bpr.hvac['Tc_sup_air_ahu_C'], bpr.hvac['Tc_sup_air_aru_C']])
+                                       for bpr in bprs], dtype=float)
+    prop['has_mechanical_ventilation'] = flag('MECH_VENT')
+    prop['has_window_ventilation'] = flag('WIN_VENT')
+    prop['has_heat_recovery'] = flag('HEAT_REC')
+    prop['has_night_flushing'] = flag('NIGHT_FLSH')
+    prop['has_economizer'] = flag('ECONOMIZER')
+    prop['rhum_max_pc'] = np.array([bpr.comfort['rhum_max_pc'] for bpr in bprs], dtype=float)
+    prop['has_heating_system'] = has_heating_system
+    prop['has_cooling_system'] = has_cooling_system
+
+    # factors of the emission systems, only used for buildings with a system
+    prop['f_hc_cv_heating'] = np.array([rc_model_SIA.f_hc_cv_heating_system.get(bpr.hvac['type_hs'], 1.0)
+                                        for bpr in bprs], dtype=float)
+    prop['f_hc_cv_cooling'] = np.array([rc_model_SIA.f_hc_cv_cooling_system.get(bpr.hvac['type_cs'], 1.0)
+                                        for bpr in bprs], dtype=float)
+    prop['delta_theta_int_inc_heating'] = np.array(
+        [space_emission_systems.calc_delta_theta_int_inc_heating(bpr) for bpr in bprs], dtype=float)
+    prop['delta_theta_int_inc_cooling'] = np.array(
+        [space_emission_systems.calc_delta_theta_int_inc_cooling(bpr) for bpr in bprs], dtype=float)
+    prop['delta_theta_e_sol'] = np.array(
+        [space_emission_systems.get_delta_theta_e_sol(bpr) if has_cs else np.nan
+         for bpr, has_cs in zip(bprs, has_cooling_system)], dtype=float)
+
+    # seasons
+    control_profiles = [control_heating_cooling_systems.get_control_profile(bpr) for bpr in bprs]
+    prop['heating_season'] = np.stack([profile.heating_season for profile in control_profiles], axis=1)
+    prop['cooling_season'] = np.stack([profile.cooling_season for profile in control_profiles], axis=1)
+
+    prop['names'] = [bpr.name for bpr in bprs]
+    prop['Hs'] = [bpr.architecture.Hs for bpr in bprs]
+    return prop
+
+
+def stack_timestep_data(tsds, keys):
+    """
+    Stack the time series data of several buildings into arrays of shape (8760, number of buildings).
+
+    :param tsds: time series data dicts
+    :type tsds: list[dict]
+    :param keys: keys of the time series data to stack
+    :type keys: list[str]
+    :return: dict of stacked arrays
+    :rtype: dict
+    """
+    stacked = {}
+    for key in keys:
+        if isinstance(tsds[0][key], np.chararray):
+            stacked[key] = np.chararray((thermal_loads.HOURS_IN_YEAR, len(tsds)), itemsize=20)
+            for b, tsd in enumerate(tsds):
+                stacked[key][:, b] = tsd[key]
+        else:
+            stacked[key] = np.stack([tsd[key] for tsd in tsds], axis=1).astype(float)
+    return stacked
+
+
+def unstack_timestep_data(stacked, tsds, keys):
+    """
+    Write stacked time series data (see :py:func:`stack_timestep_data`) back to the time series data dicts of the
+    buildings. The arrays in the dicts are updated in place.
+    """
+    for key in keys:
+        for b, tsd in enumerate(tsds):
+            tsd[key][:] = stacked[key][:, b]
+
+
+def calc_Qgain_sen_batch(t, batch, inputs, prop, T_ext, T_sky):
+    """
+    Batched version of :py:func:`cea.demand.sensible_loads.calc_Qgain_sen` (net solar radiation, ISO 13790 Eq. 43)
+    """
+    temp_s_prev = batch['theta_c'][t - 1]
+    temp_s_prev = np.where(np.isnan(temp_s_prev), T_ext[t - 1], temp_s_prev)
+
+    # theta_ss is the is the arithmetic average of the surface temperature and the sky temperature, in °C.
+    theta_ss = 0.5 * (T_sky[t] + temp_s_prev)  # [see 11.4.6 in ISO 13790]
+
+    # delta_theta_er is the average difference between outdoor air temperature and sky temperature
+    delta_theta_er = T_ext[t] - T_sky[t]  # [see 11.3.5 in ISO 13790]
+
+    Fform_wall, Fform_win, Fform_roof = 0.5, 0.5, 1  # 50% re-irradiated by vertical surfaces and 100% by horizontal
+    I_rad_win = RSE * prop['U_win'] * sensible_loads.calc_hr(prop['e_win'], theta_ss) * prop['Aw'] * delta_theta_er
+    I_rad_roof = RSE * prop['U_roof'] * sensible_loads.calc_hr(prop['e_roof'], theta_ss) * prop[
+        'Aroof'] * delta_theta_er
+    I_rad_wall = RSE * prop['U_wall'] * sensible_loads.calc_hr(prop['e_wall'], theta_ss) * prop[
+        'Aop_sup'] * delta_theta_er
+    I_rad = Fform_wall * I_rad_wall + Fform_win * I_rad_win + Fform_roof * I_rad_roof
+
+    I_sol_gross = inputs['I_sol_gross'][t]
+    batch['I_sol_and_I_rad'][t] = I_sol_gross - I_rad
+    batch['I_rad'][t] = I_rad
+    batch['I_sol'][t] = I_sol_gross
+
+
+def calc_air_mass_flows_batch(t, batch, inputs, prop, T_ext, rh_ext, m_ve_required_max):
+    """
+    Batched version of :py:func:`cea.demand.ventilation_air_flows_simple.calc_air_mass_flow_mechanical_ventilation`
+    and :py:func:`cea.demand.ventilation_air_flows_simple.calc_air_mass_flow_window_ventilation`
+
+    :return: masks of buildings with active mechanical ventilation and active night flushing
+    """
+    T_int_t_1 = batch['T_int'][t - 1]
+    m_ve_required = inputs['m_ve_required'][t]
+    m_ve_inf = inputs['m_ve_inf'][t]
+    is_cooling_season = prop['cooling_season'][t]
+    is_night_time = control_ventilation_systems.is_night_time(t)
+
+    is_night_flushing_active = prop['has_night_flushing'] & is_cooling_season & is_night_time \
+        & (T_int_t_1 > TEMPERATURE_ZONE_CONTROL_NIGHT_FLUSHING) \
+        & (T_int_t_1 > T_ext[t] + DELTA_T_NIGHT_FLUSHING) & (rh_ext[t] < prop['rhum_max_pc'])
+    is_mechanical_ventilation_active = prop['has_mechanical_ventilation'] & (
+        (m_ve_required > 0) | is_night_flushing_active)
+    ta_cs_set = inputs['ta_cs_set'][t]
+    is_economizer_active = prop['has_economizer'] & is_cooling_season & (T_int_t_1 > ta_cs_set) & (
+        ta_cs_set >= T_ext[t])
+    is_window_ventilation_active = prop['has_window_ventilation'] & ~is_mechanical_ventilation_active
+
+    m_ve_demand = np.maximum(m_ve_required - m_ve_inf, 0)
+    batch['m_ve_mech'][t] = np.where(
+        is_mechanical_ventilation_active & ~is_night_flushing_active & ~is_economizer_active, m_ve_demand,
+        np.where(prop['has_mechanical_ventilation'] & (is_night_flushing_active | is_economizer_active),
+                 m_ve_required_max, 0.0))
+    batch['m_ve_window'][t] = np.where(
+        is_window_ventilation_active & ~is_night_flushing_active, m_ve_demand,
+        np.where(is_window_ventilation_active & is_night_flushing_active, m_ve_required_max, 0.0))
+
+    return is_mechanical_ventilation_active, is_night_flushing_active
+
+
+def calc_heating_cooling_loads_batch(t, batch, inputs, prop, T_ext):
+    """
+    Batched version of :py:func:`cea.demand.hourly_procedure_heating_cooling_system_load.calc_heating_cooling_loads`
+    for radiative heating / cooling systems.
+
+    :return: mask of the buildings for which the detailed thermal balance was calculated
+    """
+    is_heating_season = prop['heating_season'][t]
+    is_cooling_season = prop['cooling_season'][t]
+    is_heating = is_heating_season & ~is_cooling_season
+    is_cooling = is_cooling_season & ~is_heating_season
+
+    ta_hs_set = inputs['ta_hs_set'][t]
+    ta_cs_set = inputs['ta_cs_set'][t]
+    is_heating_system_active = is_heating & prop['has_heating_system'] & ~np.isnan(ta_hs_set)
+    is_cooling_system_active = is_cooling & prop['has_cooling_system'] & ~np.isnan(ta_cs_set) & ~(
+        batch['T_int'][t - 1] <= prop['Tc_sup_air_max'])
+    is_no_loads = ~is_heating_system_active & ~is_cooling_system_active
+
+    # STEP 1 - temperatures with 0 heating / cooling power
+    rc_model_temperatures_0 = calc_rc_model_temperatures_batch(0.0, 0.0, t, batch, inputs, prop, T_ext)
+    check_rc_model_temperatures(rc_model_temperatures_0, np.ones(len(is_no_loads), dtype=bool), t, prop)
+    t_int_0 = rc_model_temperatures_0['T_int']
+
+    # CHECK FOR DEMAND
+    has_heating_demand = is_heating_system_active & (t_int_0 < ta_hs_set - TEMP_TOLERANCE)
+    has_cooling_demand = is_cooling_system_active & (t_int_0 > ta_cs_set + TEMP_TOLERANCE)
+    has_demand = has_heating_demand | has_cooling_demand
+    f_hc_cv = np.where(is_heating_system_active, prop['f_hc_cv_heating'], prop['f_hc_cv_cooling'])
+
+    phi_hc = np.zeros(len(has_demand))
+    if has_demand.any():
+        # STEP 2 - temperatures with 10 W/m2 heating / cooling power
+        phi_hc_10 = 10.0 * prop['Af']
+        rc_model_temperatures_10 = calc_rc_model_temperatures_batch(
+            f_hc_cv * phi_hc_10, (1 - f_hc_cv) * phi_hc_10, t, batch, inputs, prop, T_ext)
+        check_rc_model_temperatures(rc_model_temperatures_10, has_demand, t, prop)
+        t_int_10 = rc_model_temperatures_10['T_int']
+
+        # interpolate heating power
+        # (64) in SIA 2044 / Korrigenda C1 zum Merkblatt SIA 2044:2011 / Korrigenda C2 zum Mekblatt SIA 2044:2011
+        t_int_set = np.where(has_heating_demand, ta_hs_set, ta_cs_set)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            phi_hc_ul = phi_hc_10 * (t_int_set - t_int_0) / (t_int_10 - t_int_0)
+
+        # STEP 3 - check if available power is sufficient
+        if (has_heating_demand & ~(phi_hc_ul > 0.0)).any():
+            raise Exception("Unexpected status in 'calc_rc_heating_demand'")
+        if (has_cooling_demand & ~(phi_hc_ul < 0.0)).any():
+            raise Exception("Unexpected status in 'calc_rc_cooling_demand'")
+        phi_hc[has_heating_demand] = np.minimum(phi_hc_ul, prop['q_hs_max'])[has_heating_demand]
+        phi_hc[has_cooling_demand] = np.maximum(phi_hc_ul, prop['q_cs_max'])[has_cooling_demand]
+
+        # STEP 4
+        rc_model_temperatures = calc_rc_model_temperatures_batch(
+            f_hc_cv * phi_hc, (1 - f_hc_cv) * phi_hc, t, batch, inputs, prop, T_ext)
+        check_rc_model_temperatures(rc_model_temperatures, has_demand, t, prop)
+        for key in rc_model_temperatures:
+            rc_model_temperatures[key] = np.where(has_demand, rc_model_temperatures[key],
+                                                  rc_model_temperatures_0[key])
+    else:
+        rc_model_temperatures = rc_model_temperatures_0
+
+    # A radiative system does not act on humidity
+    batch['g_hu_ld'][t] = 0.0  # no humidification or dehumidification
+    batch['g_dhu_ld'][t] = 0.0
+    calc_moisture_content_in_zone_local_batch(t, batch, inputs, prop)  # moisture balance for zone
+
+    # write temperatures to rc-model
+    batch['T_int'][t] = rc_model_temperatures['T_int']
+    batch['theta_m'][t] = rc_model_temperatures['theta_m']
+    batch['theta_c'][t] = rc_model_temperatures['theta_c']
+    batch['theta_o'][t] = rc_model_temperatures['theta_o']
+
+    # write sensible and latent loads to tsd
+    q_hs_sen = np.where(is_heating_system_active, phi_hc, 0.0)
+    q_cs_sen = np.where(is_cooling_system_active, phi_hc, 0.0)
+    for key in ['Qhs_sen_rc', 'Qhs_sen_shu', 'Qhs_sen_sys']:
+        batch[key][t] = q_hs_sen
+    for key in ['Qcs_sen_rc', 'Qcs_sen_scu', 'Qcs_sen_sys']:
+        batch[key][t] = q_cs_sen
+    for key in ['Qhs_sen_ahu', 'Qhs_sen_aru', 'Qhs_lat_sys', 'Ehs_lat_aux', 'ma_sup_hs_ahu', 'ma_sup_hs_aru',
+                'Qcs_sen_ahu', 'Qcs_sen_aru', 'Qcs_lat_ahu', 'Qcs_lat_aru', 'Qcs_lat_sys', 'ma_sup_cs_ahu',
+                'ma_sup_cs_aru']:
+        batch[key][t] = 0.0
+    for key in ['ta_sup_hs_ahu', 'ta_re_hs_ahu', 'ta_sup_hs_aru', 'ta_re_hs_aru', 'ta_sup_cs_ahu', 'ta_re_cs_ahu',
+                'ta_sup_cs_aru', 'ta_re_cs_aru']:
+        batch[key][t] = np.nan
+    # radiative heating systems do not touch the latent loads of the air handling units
+    for key in ['Qhs_lat_ahu', 'Qhs_lat_aru']:
+        batch[key][t, ~is_heating_system_active] = 0.0
+
+    # emission losses
+    batch['Qhs_em_ls'][t] = np.where(is_heating_system_active, calc_q_em_ls_batch(
+        q_hs_sen, prop['delta_theta_int_inc_heating'], batch['T_int'][t] + prop['delta_theta_int_inc_heating'],
+        T_ext[t], prop['q_hs_max']), 0.0)
+    batch['Qcs_em_ls'][t] = np.where(is_cooling_system_active, calc_q_em_ls_batch(
+        q_cs_sen, prop['delta_theta_int_inc_cooling'], batch['T_int'][t] + prop['delta_theta_int_inc_cooling'],
+        T_ext[t] + prop['delta_theta_e_sol'], prop['q_cs_max']), 0.0)
+
+    # system status
+    for key in ['sys_status_ahu', 'sys_status_aru', 'sys_status_sen']:
+        batch[key][t, is_no_loads] = 'system off'
+    for key in ['sys_status_ahu', 'sys_status_aru']:
+        batch[key][t, ~is_no_loads] = 'no system'
+    batch['sys_status_sen'][t, is_heating_system_active & (phi_hc > 0.0)] = 'On'
+    batch['sys_status_sen'][t, is_cooling_system_active & (phi_hc < 0.0)] = 'On'
+    batch['sys_status_sen'][t, ~is_no_loads & (phi_hc == 0.0)] = 'Off'
+
+    # for dashboard
+    is_thermal_balance = is_heating | is_cooling
+    if is_thermal_balance.any():
+        detailed_thermal_balance_batch(t, batch, inputs, prop, rc_model_temperatures, is_thermal_balance)
+    return is_thermal_balance
+
+
+def calc_rc_model_temperatures_batch(phi_hc_cv, phi_hc_r, t, batch, inputs, prop, T_ext):
+    """
+    Batched version of :py:func:`cea.demand.rc_model_SIA.calc_rc_model_temperatures`: the kernel
+    :py:func:`cea.demand.rc_model_SIA._calc_rc_model_temperatures` is called with arrays (one value per building).
+
+    :return: dict of R-C-Model node temperatures and heat transfer coefficients, one value per building
+    :rtype: dict
+    """
+    theta_m_t_1 = batch['theta_m'][t - 1]
+    theta_m_t_1 = np.where(np.isnan(theta_m_t_1), T_ext[t - 1], theta_m_t_1)
+
+    T_int, theta_c, theta_m, theta_o, theta_ea, theta_ec, theta_em, h_ea, h_ec, h_em, h_op_m \
+        = rc_model_SIA._calc_rc_model_temperatures(inputs['Ea'][t], inputs['El'][t], inputs['Epro'][t],
+                                                   prop['Htr_op'], prop['Htr_w'], batch['I_sol_and_I_rad'][t],
+                                                   inputs['Qs'][t], T_ext[t], prop['Am'], prop['Atot'], prop['Aw'],
+                                                   prop['c_m'], inputs['m_ve_inf'][t], batch['m_ve_mech'][t],
+                                                   batch['m_ve_window'][t], phi_hc_cv, phi_hc_r, theta_m_t_1,
+                                                   batch['theta_ve_mech'][t])
+
+    return {'theta_m': theta_m, 'theta_c': theta_c, 'T_int': T_int, 'theta_o': theta_o, 'theta_ea': theta_ea,
+            'theta_ec': theta_ec, 'theta_em': theta_em, 'h_ea': h_ea, 'h_ec': h_ec, 'h_em': h_em, 'h_op_m': h_op_m}
+
+
+def check_rc_model_temperatures(rc_model_temperatures, mask, t, prop):
+    """
+    Same bounds check as in :py:func:`cea.demand.rc_model_SIA.calc_rc_model_temperatures`, for the buildings in
+    ``mask``.
+    """
+    out_of_bounds = np.zeros(len(mask), dtype=bool)
+    for key in ['T_int', 'theta_c', 'theta_m']:
+        out_of_bounds |= (rc_model_temperatures[key] < T_WARNING_LOW) | (rc_model_temperatures[key] > T_WARNING_HIGH)
+    out_of_bounds &= mask
+    if out_of_bounds.any():
+        b = np.flatnonzero(out_of_bounds)[0]
+        raise Exception("Temperature in RC-Model of building {} out of bounds! First occured at timestep = {}."
+                        " The results were Tint = {}, theta_c = {}, theta_m = {},"
+                        " Check building geometry and internal loads! Building might be too small in size or"
+                        " architecture parameter Hs = {} might be too small for this geometry. Current bounds of range"
+                        " for RC-model temperatures are between {} and {}.".format(
+                            prop['names'][b], t, rc_model_temperatures['T_int'][b],
+                            rc_model_temperatures['theta_c'][b], rc_model_temperatures['theta_m'][b], prop['Hs'][b],
+                            T_WARNING_LOW, T_WARNING_HIGH))
+
+
+def calc_moisture_content_in_zone_local_batch(t, batch, inputs, prop):
+    """
+    Batched version of :py:func:`cea.demand.latent_loads.calc_moisture_content_in_zone_local`
+    (84) in ISO 52016-1:2017
+    """
+    vol_int_a_ztc = prop['Af'] * latent_loads.FLOOR_HEIGHT
+    m_ve_mech = batch['m_ve_mech'][t]
+    m_ve_inf = inputs['m_ve_inf'][t] + batch['m_ve_window'][t]
+    rho_vol = (latent_loads.RHO_A * vol_int_a_ztc) / latent_loads.DELTA_T
+
+    x_int_a_t = (m_ve_mech * batch['x_ve_mech'][t] + m_ve_inf * batch['x_ve_inf'][t] + batch['g_hu_ld'][t] +
+                 batch['g_dhu_ld'][t] + inputs['w_int'][t] + rho_vol * batch['x_int'][t - 1]) / (
+        (m_ve_mech + m_ve_inf) + rho_vol)
+
+    if (x_int_a_t < 0).any():
+        raise Exception("Bug in moisture balance in zone. Negative moisture content detected.")
+    batch['x_int'][t] = x_int_a_t
+
+
+def calc_q_em_ls_batch(q_em_out, delta_theta_int_inc, theta_int_inc, theta_e_comb, q_em_max):
+    """
+    Batched version of :py:func:`cea.demand.space_emission_systems.calc_q_em_ls` (Eq. (8) in [prEN 15316-2:2014])
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        q_em_ls = q_em_out * (delta_theta_int_inc / (theta_int_inc - theta_e_comb))
+
+    # cap emission losses at absolute capacity
+    q_em_ls = np.where(np.abs(q_em_ls + q_em_out) > np.abs(q_em_max), q_em_max - q_em_out, q_em_ls)
+    # prevent form negative emission losses
+    q_em_ls = np.where(np.sign(q_em_ls) == np.sign(q_em_out), q_em_ls, 0.0)
+    # prevent division by zero
+    return np.where(np.abs(theta_int_inc - theta_e_comb) < 1e-6, 0.0, q_em_ls)
+
+
+def detailed_thermal_balance_batch(t, batch, inputs, prop, rc_model_temperatures, mask):
+    """
+    Batched version of
+    :py:func:`cea.demand.hourly_procedure_heating_cooling_system_load.detailed_thermal_balance_to_tsd`
+    for the buildings in ``mask``
+    """
+    El = inputs['El'][t]
+    Ea = inputs['Ea'][t]
+    Epro = inputs['Epro'][t]
+
+    h_em = rc_model_temperatures['h_em']
+    h_op_m = rc_model_temperatures['h_op_m']
+    theta_em_m = rc_model_temperatures['theta_em'] - rc_model_temperatures['theta_m']
+
+    # backwards calculate individual heat transfer coefficient
+    h_wall_em = h_em * prop['Aop_sup'] * prop['U_wall'] / h_op_m
+    h_base_em = h_em * prop['Aop_bel'] * B_F * prop['U_base'] / h_op_m
+    h_roof_em = h_em * prop['Aroof'] * prop['U_roof'] / h_op_m
+
+    balance = {
+        'Q_gain_sen_light': rc_model_SIA.calc_phi_i_l(El),
+        'Q_gain_sen_app': (rc_model_SIA.calc_phi_i_a(Ea, Epro) - 0.9 * Epro) / 0.9,
+        'Q_gain_sen_pro': Epro,
+        'Q_gain_sen_data': inputs['Qcdata_sys'][t],
+        'Q_gain_sen_peop': rc_model_SIA.calc_phi_i_p(inputs['Qs'][t]),
+        'Q_gain_sen_wall': h_wall_em * theta_em_m,
+        'Q_gain_sen_base': h_base_em * theta_em_m,
+        'Q_gain_sen_roof': h_roof_em * theta_em_m,
+        'Q_gain_sen_wind': rc_model_temperatures['h_ec'] * (
+            rc_model_temperatures['theta_ec'] - rc_model_temperatures['theta_c']),
+        'Q_gain_sen_vent': rc_model_temperatures['h_ea'] * (
+            rc_model_temperatures['theta_ea'] - rc_model_temperatures['T_int'])}
+    for key, value in balance.items():
+        batch[key][t, mask] = np.broadcast_to(value, mask.shape)[mask]
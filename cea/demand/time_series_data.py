@@ -0,0 +1,160 @@
+"""
+Time series data (``tsd``) of the demand calculation of a building, stored as the rows of 2-D float arrays.
+
+:py:class:`TimeSeriesData` is a ``dict``, like the dict of separate ndarrays it replaces, so the demand modules keep
+reading and writing ``tsd['T_int'][t]``. The difference is in the storage: each float time series is a row of a 2-D
+array (``(variables, hours)``, C-ordered), so ``tsd[key]`` is a contiguous view (found with a plain dict lookup in the
+hourly loop) and :py:meth:`TimeSeriesData.get_array` hands a whole set of variables to the writers as one array.
+
+Assigning a float time series to a key copies the values into its row (``tsd[key] = values`` behaves like
+``tsd[key][:] = values``), so references to ``tsd[key]`` stay valid for the lifetime of the ``tsd``. Values that are
+not float time series of the right length (scalars, strings, ``np.chararray``, ``pd.Series`` ...) are kept as they
+are, like in a dict.
+"""
+from __future__ import division
+
+import numpy as np
+
+__author__ = "Daren Thomas"
+__copyright__ = "Copyright 2019, Architecture and Building Systems - ETH Zurich"
+__credits__ = ["Daren Thomas"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Daren Thomas"
+__email__ = "cea@arch.ethz.ch"
+__status__ = "Production"
+
+# number of rows allocated at once when the preallocated rows are used up (existing rows are never moved)
+BLOCK_SIZE = 64
+
+
+class TimeSeriesData(dict):
+    """
+    Dict of the time series data of a building, with the float time series stored as the rows of 2-D arrays (see
+    module docstring). The values of the dict are views of the rows, so reading ``tsd[key]`` is a plain dict lookup.
+
+    :param hours: length of the time series (8760 for a year)
+    :type hours: int
+    :param keys: the keys to preallocate rows for (initialized with ``nan``), in the order of the rows
+    :type keys: list[str]
+    """
+
+    def __init__(self, hours, keys=()):
+        super(TimeSeriesData, self).__init__()
+        self.hours = hours
+        self._rows = {}  # key -> (block number, row number)
+        self._blocks = []
+        self._free_rows = 0
+        self._allocate(len(keys) + BLOCK_SIZE)
+        for key in keys:
+            self._add_row(key)
+
+    @property
+    def default_block(self):
+        """The first (preallocated) block: the rows of the keys passed to the constructor, in the same order."""
+        return self._blocks[0]
+
+    def _allocate(self, num_rows):
+        self._blocks.append(np.full((num_rows, self.hours), np.nan))
+        self._free_rows = num_rows
+
+    def _add_row(self, key):
+        if not self._free_rows:
+            self._allocate(BLOCK_SIZE)
+        block = len(self._blocks) - 1
+        row = len(self._blocks[block]) - self._free_rows
+        self._free_rows -= 1
+        self._rows[key] = (block, row)
+        column = self._blocks[block][row]
+        dict.__setitem__(self, key, column)
+        return column
+
+    def is_time_series(self, value):
+        """True, if ``value`` is stored as a row (a float ndarray with one value per hour)"""
+        return type(value) is np.ndarray and value.dtype.kind == 'f' and value.shape == (self.hours,)
+
+    def __setitem__(self, key, value):
+        if self.is_time_series(value):
+            if key in self._rows:
+                column = dict.__getitem__(self, key)
+                if column is value:
+                    return
+            else:
+                column = self._add_row(key)
+            column[:] = value
+        else:
+            self._rows.pop(key, None)
+            dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._rows.pop(key, None)
+
+    def pop(self, key, *default):
+        self._rows.pop(key, None)
+        return dict.pop(self, key, *default)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __reduce__(self):
+        # the values are views of the blocks: pickle (or copy) the blocks and rebuild the views
+        other = dict((key, value) for key, value in self.items() if key not in self._rows)
+        return _rebuild_time_series_data, (self.hours, self._blocks, self._rows, self._free_rows, other)
+
+    def get_array(self, keys):
+        """
+        The time series of ``keys`` as a 2-D array of shape ``(len(keys), hours)``. If the keys are consecutive rows of
+        a block (e.g. all the keys passed to the constructor, in the same order), this is a view of the block, without
+        copying. Otherwise (or if one of the keys is not a float time series) the rows are copied into a new array.
+
+        Do not modify the returned array, as it may be a view of the time series data.
+
+        :param keys: the keys of the time series
+        :type keys: list[str]
+        :rtype: np.ndarray
+        """
+        if not keys:
+            return np.empty((0, self.hours))
+        if all(key in self._rows for key in keys):
+            blocks, rows = zip(*[self._rows[key] for key in keys])
+            if len(set(blocks)) == 1:
+                block = self._blocks[blocks[0]]
+                if list(rows) == list(range(rows[0], rows[0] + len(rows))):
+                    return block[rows[0]:rows[0] + len(rows)]
+                return block.take(rows, axis=0)
+        array = np.empty((len(keys), self.hours))
+        for i, key in enumerate(keys):
+            array[i] = self[key]
+        return array
+
+
+def _rebuild_time_series_data(hours, blocks, rows, free_rows, other):
+    tsd = TimeSeriesData.__new__(TimeSeriesData)
+    dict.__init__(tsd, other)
+    tsd.hours = hours
+    tsd._blocks = blocks
+    tsd._rows = dict(rows)
+    tsd._free_rows = free_rows
+    for key, (block, row) in rows.items():
+        dict.__setitem__(tsd, key, blocks[block][row])
+    return tsd
+
+
+def get_array(tsd, keys):
+    """
+    The time series ``keys`` of ``tsd`` as a 2-D array of shape ``(len(keys), hours)``. Uses
+    :py:meth:`TimeSeriesData.get_array` if possible, but also works for a plain dict of time series. Do not modify the
+    returned array.
+    """
+    if isinstance(tsd, TimeSeriesData):
+        return tsd.get_array(keys)
+    columns = [np.asarray(tsd[key], dtype=float) for key in keys]
+    hours = max([column.size for column in columns] or [0])
+    return np.array([np.broadcast_to(column, (hours,)) for column in columns])
@@ -97,6 +97,125 @@ def calc_air_flows(temp_zone, u_wind, temp_ext, dict_props_nat_vent):
     return qm_sum_in, qm_sum_out
 
 
+def get_air_flow_paths(dict_props_nat_vent):
+    """
+    Collect the leakage paths and ventilation openings of the zone in arrays (one element per path), for the mass
+    balance of :py:func:`calc_air_flows_root`. Paths without flow coefficient (e.g. the default ventilation openings,
+    as long as the area of ventilation openings is zero) are left out.
+
+    :param dict_props_nat_vent: dictionary containing natural ventilation properties of zone (see
+        :py:func:`get_properties_natural_ventilation`)
+
+    :returns: dictionary with the flow coefficient, flow exponent, height and wind pressure coefficient of each path
+    """
+    # flow exponents, B.1.3.15 and B.1.2.2 in [1] (see `calc_qv_lea_path` and `calc_qv_vent_path`)
+    n_lea = 0.667
+    n_vent = 0.5
+
+    coeff_path = np.concatenate([dict_props_nat_vent['coeff_lea_path'], dict_props_nat_vent['coeff_vent_path']])
+    n_path = np.concatenate([np.full(len(dict_props_nat_vent['coeff_lea_path']), n_lea),
+                             np.full(len(dict_props_nat_vent['coeff_vent_path']), n_vent)])
+    height_path = np.concatenate([dict_props_nat_vent['height_lea_path'], dict_props_nat_vent['height_vent_path']])
+    coeff_wind_pressure_path = np.concatenate([dict_props_nat_vent['coeff_wind_pressure_path_lea'],
+                                               dict_props_nat_vent['coeff_wind_pressure_path_vent']])
+    used = coeff_path > 0
+    return {'coeff_path': coeff_path[used],
+            'n_path': n_path[used],
+            'height_path': height_path[used],
+            'coeff_wind_pressure_path': coeff_wind_pressure_path[used]}
+
+
+def calc_air_flows_root(temp_zone, u_wind, temp_ext, air_flow_paths, p_zone_start=None, xtol=1e-6, max_iter=100):
+    """
+    Solve the air flow mass balance of the zone (see :py:func:`calc_air_flow_mass_balance`) for the zone reference
+    pressure by root finding, instead of the minimization of :py:func:`calc_air_flows`.
+
+    The flow through each path decreases with the zone pressure and is zero at the pressure where the path is in
+    equilibrium with the exterior, so the mass balance is monotone and its root lies between the lowest and the highest
+    of these equilibrium pressures. The root is found with Newton steps, falling back to bisection of this bracket when
+    a step leaves it. All inputs can be arrays (e.g. one value per hour), in which case all mass balances are solved at
+    once.
+
+    :param temp_zone: zone indoor air temperature (°C)
+    :param u_wind: wind velocity (m/s)
+    :param temp_ext: exterior air temperature (°C)
+    :param air_flow_paths: air flow paths of the zone (see :py:func:`get_air_flow_paths`)
+    :param p_zone_start: initial guess of the zone reference pressure (Pa), e.g. the solution of the previous hour
+    :param xtol: tolerance of the zone reference pressure (Pa)
+    :param max_iter: maximum number of iterations
+
+    :returns: - qm_sum_in : total air mass flow rates into zone (kg/h)
+              - qm_sum_out : total air mass flow rates out of zone (kg/h)
+              - p_zone : zone reference pressure (Pa)
+    """
+    # constants from Table 12 in [1] (see `calc_delta_p_path`)
+    g = 9.81  # (m/s2)
+    rho_air_ref = 1.23  # (kg/m3)
+    temp_ext_ref = 283  # (K)
+
+    scalar = np.ndim(temp_zone) == 0 and np.ndim(u_wind) == 0 and np.ndim(temp_ext) == 0
+    temp_zone, u_wind, temp_ext = np.broadcast_arrays(*[np.atleast_1d(np.asarray(x, dtype=float))
+                                                        for x in (temp_zone, u_wind, temp_ext)])
+    coeff_path = air_flow_paths['coeff_path']
+    n_path = air_flow_paths['n_path']
+    height_path = air_flow_paths['height_path']
+
+    # zone pressure at which each path is in equilibrium, Eq. (3) to (5) in [1]: delta_p_path = p_eq_path - p_zone_ref
+    u_wind_site = calc_u_wind_site(u_wind)
+    p_eq_path = rho_air_ref * (0.5 * air_flow_paths['coeff_wind_pressure_path'] * u_wind_site[:, None] ** 2
+                               - height_path * g * temp_ext_ref / (temp_ext[:, None] + 273)
+                               + height_path * g * temp_ext_ref / (temp_zone[:, None] + 273))
+    rho_air_ext = calc_rho_air(temp_ext)[:, None]
+    rho_air_zone = calc_rho_air(temp_zone)[:, None]
+
+    def air_flows(p_zone):
+        delta_p_path = p_eq_path - p_zone[:, None]
+        abs_delta_p_path = np.abs(delta_p_path)
+        rho_air = np.where(delta_p_path > 0, rho_air_ext, rho_air_zone)
+        # Equation (60) and (64) in [1], converted to mass flows with Eq. (67) and (68)
+        qm_path = coeff_path * np.sign(delta_p_path) * abs_delta_p_path ** n_path * rho_air
+        with np.errstate(divide='ignore'):
+            dqm_dp_path = coeff_path * n_path * abs_delta_p_path ** (n_path - 1) * rho_air
+        return qm_path, qm_path.sum(axis=1), -dqm_dp_path.sum(axis=1)
+
+    if len(coeff_path):
+        p_low = p_eq_path.min(axis=1)  # all paths flow into the zone: mass balance >= 0
+        p_high = p_eq_path.max(axis=1)  # all paths flow out of the zone: mass balance <= 0
+    else:
+        p_low = p_high = np.zeros(len(temp_zone))
+    if p_zone_start is None:
+        p_zone = (p_low + p_high) / 2
+    else:
+        p_zone = np.clip(np.broadcast_to(p_zone_start, p_low.shape), p_low, p_high)
+
+    for _ in range(max_iter):
+        qm_path, qm_balance, dqm_balance_dp = air_flows(p_zone)
+        # narrow the bracket with the new evaluation
+        p_low = np.where(qm_balance > 0, p_zone, p_low)
+        p_high = np.where(qm_balance < 0, p_zone, p_high)
+        converged = (qm_balance == 0) | (p_high - p_low < xtol)
+        if converged.all():
+            break
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p_newton = p_zone - qm_balance / dqm_balance_dp
+        # the derivative is infinite where the zone pressure equals the equilibrium pressure of a path
+        in_bracket = np.isfinite(dqm_balance_dp) & (p_newton > p_low) & (p_newton < p_high)
+        p_next = np.where(in_bracket, p_newton, (p_low + p_high) / 2)
+        converged |= np.abs(p_next - p_zone) < xtol
+        p_zone = np.where(converged, p_zone, p_next)
+        if converged.all():
+            break
+    qm_path = air_flows(p_zone)[0]
+
+    # Eq. (62), (63), (65) and (66) in [1]: sum of the air flows entering and leaving the zone
+    qm_sum_in = np.where(qm_path > 0, qm_path, 0.0).sum(axis=1)
+    qm_sum_out = np.where(qm_path < 0, qm_path, 0.0).sum(axis=1)
+
+    if scalar:
+        return qm_sum_in[0], qm_sum_out[0], p_zone[0]
+    return qm_sum_in, qm_sum_out, p_zone
+
+
 def get_properties_natural_ventilation(bpr):
     """
     gdf_geometry_building : GeoDataFrame containing geometry properties of single building
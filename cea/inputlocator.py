@@ -17,6 +17,10 @@ __email__ = "cea@arch.ethz.ch"
 __status__ = "Production"
 
 
+# file extensions of the demand:format-output choices
+DEMAND_RESULTS_EXTENSIONS = {'csv': 'csv', 'hdf5': 'hdf', 'columnar': 'h5'}
+
+
 class InputLocator(object):
     """The InputLocator locates files and folders for input to the scripts. This works, because we
     have a convention for the folder structure of a scenario.
@@ -319,6 +323,14 @@ class InputLocator(object):
         return os.path.join(self.get_optimization_network_results_folder(),
                             network_type + '_' + str(generation) + "_individuals.csv")
 
+    def get_optimization_network_evaluation_cache_file(self, network_type, network_key):
+        """scenario/outputs/data/optimization/network/cache/DC_{network_key}.csv
+        Results of a network evaluated by the thermal network optimization, stored under the fingerprint of the network
+        and its inputs, see :py:mod:`cea.technologies.thermal_network.network_evaluation`
+        """
+        return os.path.join(self._ensure_folder(self.get_optimization_network_results_folder(), 'cache'),
+                            network_type + "_" + network_key + ".csv")
+
     def get_optimization_network_all_individuals_results_file(self, network_type):
         """scenario/outputs/data/optimization/network/layout/DH_T_Return.csv or DC_T_Return.csv
         Folder to results file of this generation
@@ -549,6 +561,23 @@ class InputLocator(object):
         to the scenario if they are not yet present, based on the configured region for the scenario."""
         return self._get_region_specific_db_file(region, 'archetypes', 'occupancy_schedules.xlsx')
 
+    def get_cache_folder(self):
+        """~/.cea/cache - cached intermediate results that are expensive to calculate and only depend on the content of
+        their inputs (e.g. the yearly archetype schedules), shared by all scenarios"""
+        return self._ensure_folder(os.path.expanduser('~'), '.cea', 'cache')
+
+    def get_archetype_schedules_cache(self, region, year, key):
+        """~/.cea/cache/schedules/schedules_{region}_{year}_{key}.npz - yearly archetype schedules, see
+        :py:func:`cea.demand.occupancy_model.schedule_maker`"""
+        return os.path.join(self._ensure_folder(self.get_cache_folder(), 'schedules'),
+                            'schedules_%(region)s_%(year)i_%(key)s.npz' % locals())
+
+    def get_building_properties_cache(self, table, key):
+        """~/.cea/cache/building-properties/{table}_{key}.pickle - resolved tables of the building properties, see
+        :py:class:`cea.demand.building_properties.BuildingProperties`"""
+        return os.path.join(self._ensure_folder(self.get_cache_folder(), 'building-properties'),
+                            '%(table)s_%(key)s.pickle' % locals())
+
     def get_archetypes_system_controls(self, region):
         """ Returns the database of region-specific system control parameters. These are copied
         to the scenario if they are not yet present, based on the configured region for the scenario.
@@ -784,6 +813,13 @@ class InputLocator(object):
         """scenario/outputs/data/solar-radiation/${building_name}_insolation_Whm2.json"""
         return os.path.join(self.get_solar_radiation_folder(), '%s_insolation_Whm2.json' % building_name)
 
+    def get_radiation_building_sensors(self, building_name):
+        """scenario/outputs/data/solar-radiation/${building_name}_insolation_Whm2.npy
+
+        hourly radiation of each sensor (rows in the order of :py:meth:`get_radiation_metadata`), see
+        :py:mod:`cea.resources.radiation_daysim.radiation_store`"""
+        return os.path.join(self.get_solar_radiation_folder(), '%s_insolation_Whm2.npy' % building_name)
+
     def get_radiation_metadata(self, building_name):
         """scenario/outputs/data/solar-radiation/{building_name}_geometrgy.csv"""
         return os.path.join(self.get_solar_radiation_folder(), '%s_geometry.csv' % building_name)
@@ -883,8 +919,43 @@ class InputLocator(object):
         """scenario/outputs/data/demand/Total_demand.csv"""
         return os.path.join(self.get_demand_results_folder(), 'Total_demand.%(format)s' % locals())
 
+    def get_total_demand_hourly(self, format='csv'):
+        """scenario/outputs/data/demand/Total_demand_hourly.csv
+
+        The hourly loads summed up over the buildings of the last demand calculation (``format`` as in
+        :py:meth:`get_demand_results_file`)"""
+        format = DEMAND_RESULTS_EXTENSIONS.get(format, format)
+        return os.path.join(self.get_demand_results_folder(), 'Total_demand_hourly.%(format)s' % locals())
+
+    def get_demand_manifest(self):
+        """scenario/outputs/data/demand/demand_manifest.pickle - fingerprints of the inputs and totals of the last
+        demand calculation, see :py:mod:`cea.demand.demand_manifest`"""
+        return os.path.join(self.get_demand_results_folder(), 'demand_manifest.pickle')
+
+    def get_demand_hourly_loads_folder(self):
+        """scenario/outputs/data/demand/hourly-loads (not created, it only exists for incremental calculations)"""
+        return os.path.join(self.get_demand_results_folder(), 'hourly-loads')
+
+    def get_demand_hourly_loads(self, building_name):
+        """scenario/outputs/data/demand/hourly-loads/{building_name}.npy - the hourly loads of the building (as summed
+        up in ``Total_demand_hourly``) at full precision, see :py:mod:`cea.demand.demand_manifest`"""
+        return os.path.join(self._ensure_folder(self.get_demand_hourly_loads_folder()), '%s.npy' % building_name)
+
+    def get_demand_report(self):
+        """scenario/outputs/data/demand/demand_report.csv"""
+        return os.path.join(self.get_demand_results_folder(), 'demand_report.csv')
+
+    def get_demand_timing(self):
+        """scenario/outputs/data/demand/demand_timing.csv - time spent in each phase of the demand calculation of
+        each building, see :py:mod:`cea.demand.demand_timing`"""
+        return os.path.join(self.get_demand_results_folder(), 'demand_timing.csv')
+
     def get_demand_results_file(self, building_name, format='csv'):
-        """scenario/outputs/data/demand/{building_name}.csv"""
+        """scenario/outputs/data/demand/{building_name}.csv
+
+        ``format`` is either a file extension or one of the ``demand:format-output`` choices (``hdf5`` is stored as
+        ``.hdf``, ``columnar`` as ``.h5``)"""
+        format = DEMAND_RESULTS_EXTENSIONS.get(format, format)
         return os.path.join(self.get_demand_results_folder(), '%(building_name)s.%(format)s' % locals())
 
     def get_predefined_hourly_setpoints_folder(self, type_of_district_network):
@@ -264,11 +264,12 @@ def demand_graph_fields(scenario):
     """Lists the available fields for the demand graphs - these are fields that are present in both the
     building demand results files as well as the totals file (albeit with different units)."""
     import pandas as pd
+    from cea.demand import demand_reader
     locator = cea.inputlocator.InputLocator(scenario)
     df_total_demand = pd.read_csv(locator.get_total_demand())
     total_fields = set(df_total_demand.columns.tolist())
     first_building = df_total_demand['Name'][0]
-    df_building = pd.read_csv(locator.get_demand_results_file(first_building))
+    df_building = demand_reader.read_hourly_demand(locator, first_building)
     fields = set(df_building.columns.tolist())
     fields.remove('DATE')
     fields.remove('Name')
@@ -13,6 +13,7 @@ import ConfigParser
 import cea.config
 import cea.scripts
 import cea.datamanagement.copy_default_databases
+import cea.utilities.jit
 
 
 __author__ = "Daren Thomas"
@@ -43,9 +44,13 @@ def main(config=None):
         sys.exit(1)
     script_name = args.pop(0)
     cea_script = cea.scripts.by_name(script_name)
+
     config.restrict_to(cea_script.parameters)
     config.apply_command_line_args(args, cea_script.parameters)
 
+    # switch JIT compilation of the numerical kernels on or off (also for the worker processes started by the script)
+    cea.utilities.jit.configure(config.get('general:use-jit'))
+
     # save the updates to the configuration file (re-running the same tool will result in the
     # same parameters being set)
     config.save(cea.config.CEA_CONFIG)
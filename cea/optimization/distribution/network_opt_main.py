@@ -4,6 +4,7 @@ Network optimization
 from __future__ import division
 import pandas as pd
 import numpy as np
+from cea.utilities.database_catalog import read_database
 
 __author__ = "Sreepathi Bhargava Krishna"
 __copyright__ = "Copyright 2015, Architecture and Building Systems - ETH Zurich"
@@ -60,7 +61,7 @@ class network_opt_main(object):
             pipe_length = edges_file['pipe length'].values
 
             for i in range(len(internal_diameter)):
-                piping_cost_data = pd.read_excel(locator.get_supply_systems(config.region), sheetname="Piping")
+                piping_cost_data = read_database(locator.get_supply_systems(config.region), "Piping")
                 piping_cost_data = piping_cost_data[
                     (piping_cost_data['Diameter_min'] <= internal_diameter[i]) & (
                                 piping_cost_data['Diameter_max'] > internal_diameter[i])]
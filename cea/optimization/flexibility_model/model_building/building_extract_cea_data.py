@@ -30,7 +30,9 @@ import numpy as np
 import pandas as pd
 import xlrd
 from geopandas import GeoDataFrame as Gdf
+from cea.demand import demand_reader
 from cea.utilities.dbf import dbf_to_dataframe
+from cea.utilities.database_catalog import read_database
 
 __author__ = "Sebastian Troitzsch"
 __copyright__ = "Copyright 2019, Architecture and Building Systems - ETH Zurich"
@@ -209,19 +211,19 @@ def extract_cea_databases_files(locator,
                                 region
                                 ):
     # Get data
-    internal_loads_df = pd.read_excel(locator.get_archetypes_properties(region), 'INTERNAL_LOADS')
-    indoor_comfort_df = pd.read_excel(locator.get_archetypes_properties(region), 'INDOOR_COMFORT')
-    construction_envelope_systems_df = pd.read_excel(locator.get_envelope_systems(region), 'CONSTRUCTION')
-    leakage_envelope_systems_df = pd.read_excel(locator.get_envelope_systems(region), 'LEAKAGE')
-    window_envelope_systems_df = pd.read_excel(locator.get_envelope_systems(region), 'WINDOW')
-    roofs_envelope_systems_df = pd.read_excel(locator.get_envelope_systems(region), 'ROOF')
-    wall_envelope_systems_df = pd.read_excel(locator.get_envelope_systems(region), 'WALL')
-    shading_envelope_systems_df = pd.read_excel(locator.get_envelope_systems(region), 'SHADING')
-    emission_systems_heating_df = pd.read_excel(locator.get_technical_emission_systems(region), 'heating')
-    emission_systems_cooling_df = pd.read_excel(locator.get_technical_emission_systems(region), 'cooling')
-    emission_systems_controller_df = pd.read_excel(locator.get_technical_emission_systems(region), 'controller')
+    internal_loads_df = read_database(locator.get_archetypes_properties(region), 'INTERNAL_LOADS')
+    indoor_comfort_df = read_database(locator.get_archetypes_properties(region), 'INDOOR_COMFORT')
+    construction_envelope_systems_df = read_database(locator.get_envelope_systems(region), 'CONSTRUCTION')
+    leakage_envelope_systems_df = read_database(locator.get_envelope_systems(region), 'LEAKAGE')
+    window_envelope_systems_df = read_database(locator.get_envelope_systems(region), 'WINDOW')
+    roofs_envelope_systems_df = read_database(locator.get_envelope_systems(region), 'ROOF')
+    wall_envelope_systems_df = read_database(locator.get_envelope_systems(region), 'WALL')
+    shading_envelope_systems_df = read_database(locator.get_envelope_systems(region), 'SHADING')
+    emission_systems_heating_df = read_database(locator.get_technical_emission_systems(region), 'heating')
+    emission_systems_cooling_df = read_database(locator.get_technical_emission_systems(region), 'cooling')
+    emission_systems_controller_df = read_database(locator.get_technical_emission_systems(region), 'controller')
     system_controls_ini_df = pd.read_excel(locator.get_archetypes_system_controls(region), 'heating_cooling')
-    cooling_generation_df = pd.read_excel(locator.get_life_cycle_inventory_supply_systems(region), 'COOLING')
+    cooling_generation_df = read_database(locator.get_life_cycle_inventory_supply_systems(region), 'COOLING')
 
     # Set index
     internal_loads_df.set_index('Code', inplace=True)
@@ -689,7 +691,7 @@ def get_temperatures(
     T_int_cea_dic = {}
     for building in buildings_names:
         # Get data
-        building_demand_cea_build_df = pd.read_csv(locator.get_demand_results_file(building))
+        building_demand_cea_build_df = demand_reader.read_hourly_demand(locator, building)
         building_demand_cea_build_df.set_index('DATE', inplace=True)
         building_demand_cea_build_df.index = pd.to_datetime(building_demand_cea_build_df.index)
 
@@ -8,6 +8,7 @@ import networkx as nx
 import pandas as pd
 import shapely
 
+from cea.demand import demand_reader
 from cea.technologies.thermal_network.network_layout.substations_location import \
     calc_substation_location as substation_location
 
@@ -176,8 +177,7 @@ def get_hourly_power_demand_per_building(locator, points_on_line):
     for idx_node, node in points_on_line.iterrows():
         if node['Building'] != None:
             building_name = node['Building']
-            hourly_power_demand_per_building[building_name] = pd.read_csv(locator.get_demand_results_file(building_name)
-            )
+            hourly_power_demand_per_building[building_name] = demand_reader.read_hourly_demand(locator, building_name)
 
     return hourly_power_demand_per_building
 
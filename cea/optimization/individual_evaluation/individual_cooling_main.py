@@ -28,6 +28,7 @@ from cea.optimization.constants import  SIZING_MARGIN, PUMP_ETA, DELTA_U, \
 import cea.technologies.pumps as pumps
 from math import log, ceil
 from cea.optimization.lca_calculations import LcaCalculations
+from cea.utilities.database_catalog import read_database
 
 
 __author__ = "Sreepathi Bhargava Krishna"
@@ -150,7 +151,7 @@ def coolingMain(locator, master_to_slave_vars, ntwFeat, prices, config):
         UA_HEX_tank_charge_WperK = 0
         V_tank_m3 = 0
 
-    VCC_cost_data = pd.read_excel(locator.get_supply_systems(config.region), sheetname="Chiller")
+    VCC_cost_data = read_database(locator.get_supply_systems(config.region), "Chiller")
     VCC_cost_data = VCC_cost_data[VCC_cost_data['code'] == 'CH3']
     max_VCC_chiller_size = max(VCC_cost_data['cap_max'].values)
 
@@ -9,6 +9,7 @@ import numpy as np
 import pandas as pd
 
 from cea.optimization.constants import *
+from cea.utilities.database_catalog import read_database
 
 __author__ = "Sreepathi Bhargava Krishna"
 __copyright__ = "Copyright 2017, Architecture and Building Systems - ETH Zurich"
@@ -22,12 +23,11 @@ __status__ = "Production"
 
 class LcaCalculations(object):
     def __init__(self, locator, region, detailed_electricity_pricing):
-        heating_lca = pd.read_excel(locator.get_life_cycle_inventory_supply_systems(region), sheet_name="HEATING")
-        cooling_lca = pd.read_excel(locator.get_life_cycle_inventory_supply_systems(region), sheet_name="COOLING")
+        heating_lca = read_database(locator.get_life_cycle_inventory_supply_systems(region), "HEATING")
+        cooling_lca = read_database(locator.get_life_cycle_inventory_supply_systems(region), "COOLING")
         electricity_costs = pd.read_excel(locator.get_electricity_costs(region), sheet_name="ELECTRICITY")
-        dhw_lca = pd.read_excel(locator.get_life_cycle_inventory_supply_systems(region), sheet_name="DHW")
-        resources_lca = pd.read_excel(locator.get_life_cycle_inventory_supply_systems(region),
-                                      sheet_name="RESOURCES")
+        dhw_lca = read_database(locator.get_life_cycle_inventory_supply_systems(region), "DHW")
+        resources_lca = read_database(locator.get_life_cycle_inventory_supply_systems(region), "RESOURCES")
 
         self.ETA_FINAL_TO_USEFUL = 0.9  # assume 90% system efficiency in terms of CO2 emissions and overhead emissions (\
         self.CC_SIGMA = 4 / 5
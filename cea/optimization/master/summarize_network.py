@@ -14,6 +14,7 @@ from cea.optimization.constants import K_DH, ZERO_DEGREES_CELSIUS_IN_KELVIN
 from cea.resources.geothermal import calc_ground_temperature
 from cea.constants import HEAT_CAPACITY_OF_WATER_JPERKGK
 from cea.utilities import epwreader
+from cea.demand import demand_reader
 
 
 __author__ = "Jimeno A. Fonseca"
@@ -94,8 +95,8 @@ def network_main(locator, total_demand, building_names, config, gv, key):
     iteration = 0
 
     for building_name in building_names:
-        buildings.append(pd.read_csv(locator.get_demand_results_file(building_name),
-                                     usecols=['DATE', 'mcpcdata_sys_kWperC', 'Qcdata_sys_kWh']))
+        buildings.append(demand_reader.read_hourly_demand(locator, building_name,
+                                                          columns=['DATE', 'mcpcdata_sys_kWperC', 'Qcdata_sys_kWh']))
         substations.append(pd.read_csv(locator.get_optimization_substations_results_file(building_name),
                                        usecols=['Electr_array_all_flat_W', 'mdot_DH_result_kgpers',
                                                 'mdot_space_cooling_and_refrigeration_result_kgpers',
@@ -225,7 +226,7 @@ def network_main(locator, total_demand, building_names, config, gv, key):
         if T_DCN_space_cooling_and_refrigeration_sup_K[i] > T_DCN_space_cooling_and_refrigeration_re_K[i]:
             print (i)
 
-    date = pd.read_csv(locator.get_demand_results_file(building_names[0])).DATE.values
+    date = demand_reader.read_hourly_demand(locator, building_names[0], columns=['DATE']).DATE.values
     results = pd.DataFrame({"DATE": date,
                             "mdot_DH_netw_total_kgpers": mdot_heat_netw_all_kgpers,
                             "mdot_cool_space_cooling_and_refrigeration_netw_all_kgpers": mdot_cool_space_cooling_and_refrigeration_netw_all_kgpers,
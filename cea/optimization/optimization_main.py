@@ -8,6 +8,7 @@ import pandas as pd
 import cea.config
 import cea.globalvar
 import cea.inputlocator
+from cea.demand import demand_reader
 from cea.optimization.prices import Prices as Prices
 from cea.optimization.distribution import network_opt_main
 from cea.optimization.master import master_main
@@ -137,7 +138,7 @@ def main(config):
 
 def demand_files_exist(config, locator):
     # verify that the necessary demand files exist
-    return all(os.path.exists(locator.get_demand_results_file(building_name)) for building_name in locator.get_zone_building_names())
+    return all(demand_reader.demand_results_exist(locator, building_name) for building_name in locator.get_zone_building_names())
 
 if __name__ == '__main__':
     main(cea.config.Configuration())
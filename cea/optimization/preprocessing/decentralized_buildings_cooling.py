@@ -24,6 +24,7 @@ import cea.technologies.substation as substation
 import cea.technologies.solar.solar_collector as solar_collector
 from cea.technologies.thermal_network.thermal_network import calculate_ground_temperature
 from math import ceil
+from cea.utilities.database_catalog import read_database
 
 
 def disconnected_buildings_cooling_main(locator, building_names, config, prices, lca):
@@ -232,12 +233,11 @@ def disconnected_buildings_cooling_main(locator, building_names, config, prices,
         T_re_boiler_FP_to_single_ACH_to_AHU_K = np.zeros(8760)
         T_re_boiler_ET_to_single_ACH_to_AHU_K = np.zeros(8760)
 
-        VCC_cost_data = pd.read_excel(locator.get_supply_systems(config.region), sheetname="Chiller")
+        VCC_cost_data = read_database(locator.get_supply_systems(config.region), "Chiller")
         VCC_cost_data = VCC_cost_data[VCC_cost_data['code'] == 'CH3']
         max_VCC_chiller_size = max(VCC_cost_data['cap_max'].values)
 
-        Absorption_chiller_cost_data = pd.read_excel(locator.get_supply_systems(config.region),
-                                                     sheetname="Absorption_chiller")
+        Absorption_chiller_cost_data = read_database(locator.get_supply_systems(config.region), "Absorption_chiller")
         Absorption_chiller_cost_data = Absorption_chiller_cost_data[
             Absorption_chiller_cost_data['type'] == ACH_TYPE_SINGLE]
         max_ACH_chiller_size = max(Absorption_chiller_cost_data['cap_max'].values)
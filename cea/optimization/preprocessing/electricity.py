@@ -10,6 +10,7 @@ from the hour in the day / the day in the year)
 import os
 import numpy as np
 import pandas as pd
+from cea.demand import demand_reader
 from cea.optimization.constants import *
 
 
@@ -32,7 +33,7 @@ def calc_pareto_electricity(locator, lca, config, building_names):
     if config.detailed_electricity_pricing:
         elecCosts = 0
         for name in building_names:
-            df = pd.read_csv(locator.get_demand_results_file(name), usecols=["E_sys_kWh"])
+            df = demand_reader.read_hourly_demand(locator, name, columns=["E_sys_kWh"])
             array_individual = np.array(df) * 1000  # [Wh]
 
             for i in range(len(array_individual)):
@@ -8,6 +8,7 @@ It is considered that whenever the case, the most competitive alternative is to
 """
 from __future__ import division
 import pandas as pd
+from cea.demand import demand_reader
 from cea.technologies import boiler
 from cea.optimization.constants import BOILER_ETA_HP, SIZING_MARGIN
 
@@ -36,7 +37,7 @@ def calc_pareto_Qhp(locator, total_demand, prices, lca, config):
 
         for name in df.Name :
             # Extract process heat needs
-            Qhpro_sys = pd.read_csv(locator.get_demand_results_file(name), usecols=["Qhpro_sys_kWh"]).Qhpro_sys_kWh.values
+            Qhpro_sys = demand_reader.read_hourly_demand(locator, name, columns=["Qhpro_sys_kWh"]).Qhpro_sys_kWh.values
 
             Qnom = 0
             Qannual = 0
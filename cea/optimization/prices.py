@@ -5,6 +5,7 @@ of the corresponding values in individual files.
 """
 from __future__ import division
 import pandas as pd
+from cea.utilities.database_catalog import read_database
 
 __author__ = "Sreepathi Bhargava Krishna"
 __copyright__ = "Copyright 2017, Architecture and Building Systems - ETH Zurich"
@@ -18,7 +19,7 @@ __status__ = "Production"
 
 class Prices(object):
     def __init__(self, locator, config):
-        pricing = pd.read_excel(locator.get_supply_systems(config.region), sheetname="Pricing")
+        pricing = read_database(locator.get_supply_systems(config.region), "Pricing")
         self.NG_PRICE = pricing[pricing['Description'] == 'ng_price'].iloc[0]['value']
         self.BG_PRICE = pricing[pricing['Description'] == 'bg_price'].iloc[0]['value']
         self.CPUMP = pricing[pricing['Description'] == 'cpump'].iloc[0]['value']
@@ -24,6 +24,7 @@ from cea.optimization.constants import SIZING_MARGIN, PUMP_ETA, DELTA_U, \
     ACH_T_IN_FROM_CHP, ACH_TYPE_DOUBLE, T_TANK_FULLY_CHARGED_K, T_TANK_FULLY_DISCHARGED_K, PIPEINTERESTRATE, PIPELIFETIME
 import cea.technologies.pumps as pumps
 from math import log, ceil
+from cea.utilities.database_catalog import read_database
 
 
 __author__ = "Sreepathi Bhargava Krishna"
@@ -144,12 +145,11 @@ def cooling_calculations_of_DC_buildings(locator, master_to_slave_vars, ntwFeat,
         UA_HEX_tank_charge_WperK = 0
         V_tank_m3 = 0
 
-    VCC_cost_data = pd.read_excel(locator.get_supply_systems(config.region), sheetname="Chiller")
+    VCC_cost_data = read_database(locator.get_supply_systems(config.region), "Chiller")
     VCC_cost_data = VCC_cost_data[VCC_cost_data['code'] == 'CH3']
     max_VCC_chiller_size = max(VCC_cost_data['cap_max'].values)
 
-    Absorption_chiller_cost_data = pd.read_excel(locator.get_supply_systems(config.region),
-                                                 sheetname="Absorption_chiller")
+    Absorption_chiller_cost_data = read_database(locator.get_supply_systems(config.region), "Absorption_chiller")
     Absorption_chiller_cost_data = Absorption_chiller_cost_data[Absorption_chiller_cost_data['type'] == ACH_TYPE_DOUBLE]
     max_ACH_chiller_size = max(Absorption_chiller_cost_data['cap_max'].values)
 
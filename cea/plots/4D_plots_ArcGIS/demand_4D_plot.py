@@ -3,6 +3,7 @@ import os
 from cea.utilities import dbf
 import cea.globalvar
 import cea.inputlocator
+from cea.demand import demand_reader
 
 __author__ = "Jimeno A. Fonseca"
 __copyright__ = "Copyright 2017, Architecture and Building Systems - ETH Zurich"
@@ -27,7 +28,7 @@ def calc_spatio_temporal_visuals(locator, period, variables_to_plot, list_of_bui
 
     for i, building in enumerate(building_names):
         # importing corresponding variables of each building and then slicing it to take just a single period value i.e a time step
-        data = pd.read_csv(locator.get_demand_results_file(building))[variables_to_plot][period[0]: period[1]]
+        data = demand_reader.read_hourly_demand(locator, building)[variables_to_plot][period[0]: period[1]]
         data['date'] = time
         data['Name'] = building
 
@@ -7,6 +7,7 @@ from cea.utilities import dbf
 import cea.inputlocator
 import cea.config
 from cea.utilities import epwreader
+from cea.resources.radiation_daysim import radiation_store
 
 
 __author__ = "Sreepathi Bhargava Krishna"
@@ -32,8 +33,9 @@ def calc_spatio_temporal_visuals(locator, list_of_buildings, initial_date, confi
 
     for i, building in enumerate(building_names):
 
-        sensors_rad = pd.read_json(locator.get_radiation_building(building_name=building))
         sensors_metadata = pd.read_csv(locator.get_radiation_metadata(building_name= building))
+        sensors_rad = radiation_store.read_radiation_dataframe(radiation_store.get_radiation_path(locator, building),
+                                                               sensors_metadata.SURFACE)
 
         sensors_metadata_roof = sensors_metadata[sensors_metadata.TYPE == 'roofs']
         sensors_metadata_walls = sensors_metadata[sensors_metadata.TYPE == 'walls']
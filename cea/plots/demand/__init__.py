@@ -7,6 +7,7 @@ import pandas as pd
 import os
 import cea.config
 import cea.inputlocator
+from cea.demand import demand_reader
 
 """
 Implements py:class:`cea.plots.DemandPlotBase` as a base class for all plots in the category "demand" and also
@@ -112,6 +113,14 @@ class DemandPlotBase(cea.plots.PlotBase):
 
         # no cached result - calculate from scratch and cache for further use
         print('no cache found for', buildings_key, m_time)
+        if (demand_reader.total_hourly_demand_exists(self.locator)
+                and set(self.buildings) == set(self.yearly_loads.Name)):
+            # the demand script already summed up the hourly loads of these buildings
+            result = demand_reader.read_total_hourly_demand(
+                self.locator, ['DATE'] + self.demand_analysis_fields).set_index('DATE')
+            self._cache[buildings_key] = (m_time, result)
+            return result
+
         def add_fields(df1, df2):
             """Add the demand analysis fields together - use this in reduce to sum up the summable parts of the dfs"""
             df1[self.demand_analysis_fields] += df2[self.demand_analysis_fields]
@@ -119,7 +128,7 @@ class DemandPlotBase(cea.plots.PlotBase):
 
         # cache these results for later
         result = functools.reduce(add_fields,
-                                 (pd.read_csv(self.locator.get_demand_results_file(building)) for building in
+                                 (demand_reader.read_hourly_demand(self.locator, building) for building in
                                   self.buildings)).set_index('DATE')
         self._cache[buildings_key] = (m_time, result)
         return result
@@ -11,6 +11,7 @@ import pandas as pd
 
 import cea.config
 import cea.inputlocator
+from cea.demand import demand_reader
 from cea.plots.demand.comfort_chart import comfort_chart
 from cea.plots.demand.energy_balance import energy_balance
 from cea.plots.demand.energy_demand import energy_demand_district
@@ -157,9 +158,9 @@ class Plots(object):
     def preprocessing_building_demand(self):
         for i, building in enumerate(self.buildings):
             if i == 0:
-                df = pd.read_csv(self.locator.get_demand_results_file(building))
+                df = demand_reader.read_hourly_demand(self.locator, building)
             else:
-                df2 = pd.read_csv(self.locator.get_demand_results_file(building))
+                df2 = demand_reader.read_hourly_demand(self.locator, building, self.demand_analysis_fields)
                 for field in self.demand_analysis_fields:
                     df[field] = df[field].values + df2[field].values
 
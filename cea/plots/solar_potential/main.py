@@ -14,6 +14,7 @@ import cea.inputlocator
 from cea.plots.solar_potential.solar_radiation import solar_radiation_district
 from cea.plots.solar_potential.solar_radiation_curve import solar_radiation_curve
 from cea.plots.solar_potential.solar_radiation_monthly import solar_radiation_district_monthly
+from cea.resources.radiation_daysim import radiation_store
 from cea.utilities import epwreader
 
 __author__ = "Jimeno A. Fonseca"
@@ -101,15 +102,12 @@ class Plots(object):
         input_data_not_aggregated_MW = []
         dict_not_aggregated = {}
         for i, building in enumerate(buildings):
-            geometry = pd.read_csv(locator.get_radiation_metadata(building))
+            geometry, insolation = radiation_store.read_sensors(locator, building)
             geometry['code'] = geometry['TYPE'] + '_' + geometry['orientation']
-            insolation = pd.read_json(locator.get_radiation_building(building))
             if i == 0:
                 for field in analysis_fields:
-                    select_sensors = geometry.loc[geometry['code'] == field].set_index('SURFACE')
-                    array_field = np.array(
-                        [select_sensors.ix[surface, 'AREA_m2'] * insolation[surface] for surface in
-                         select_sensors.index]).sum(axis=0)  #
+                    select_sensors = (geometry['code'] == field).values
+                    array_field = np.dot(geometry['AREA_m2'].values[select_sensors], insolation[select_sensors])
                     dict_not_aggregated[field] = array_field
 
                 # add date and resample into months
@@ -121,10 +119,8 @@ class Plots(object):
             else:
                 dict_not_aggregated_2 = {}
                 for field in analysis_fields:
-                    select_sensors = geometry.loc[geometry['code'] == field].set_index('SURFACE')
-                    array_field = np.array(
-                        [select_sensors.ix[surface, 'AREA_m2'] * insolation[surface] for surface in
-                         select_sensors.index]).sum(axis=0)
+                    select_sensors = (geometry['code'] == field).values
+                    array_field = np.dot(geometry['AREA_m2'].values[select_sensors], insolation[select_sensors])
                     dict_not_aggregated_2[field] = array_field  # W
                     dict_not_aggregated[field] = dict_not_aggregated[field] + array_field
 
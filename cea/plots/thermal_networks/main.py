@@ -13,6 +13,7 @@ import pandas as pd
 
 import cea.config
 import cea.inputlocator
+from cea.demand import demand_reader
 from cea.plots.thermal_networks.Supply_Return_Outdoor import supply_return_ambient_temp_plot
 from cea.plots.thermal_networks.annual_energy_consumption import annual_energy_consumption_plot
 from cea.plots.thermal_networks.energy_loss_bar import energy_loss_bar_plot
@@ -135,7 +136,7 @@ class Plots(object):
     def get_date_from_file(self):
         # get date
         buildings = self.locator.get_zone_building_names()
-        df_date = pd.read_csv(self.locator.get_demand_results_file(buildings[0]))
+        df_date = demand_reader.read_hourly_demand(self.locator, buildings[0], columns=['DATE'])
         return df_date["DATE"]
 
     def preprocessing_building_demand(self):
@@ -163,7 +164,7 @@ class Plots(object):
         '''
         building_names = self.locator.get_zone_building_names()
         building_name = building_names[0]  # read in first building name
-        demand_file = pd.read_csv(self.locator.get_demand_results_file(building_name))
+        demand_file = demand_reader.read_hourly_demand(self.locator, building_name, columns=['T_ext_C'])
         ambient_temp = demand_file["T_ext_C"].values  # read in amb temp
         return pd.DataFrame(ambient_temp)
 
@@ -1,13 +1,14 @@
 from __future__ import division
 import os
+import numpy as np
 import pandas as pd
 import py4design.py3dmodel.calculate as calculate
 from py4design import py3dmodel
 import py4design.py2radiance as py2radiance
-import json
 import shutil
 
 from cea.utilities import epwreader
+from cea.resources.radiation_daysim import radiation_store
 
 __author__ = "Jimeno A. Fonseca"
 __copyright__ = "Copyright 2017, Architecture and Building Systems - ETH Zurich"
@@ -163,15 +164,14 @@ def isolation_daysim(chunk_n, rad, geometry_3D_zone, locator, weather_path, sett
     # check inconsistencies and replace by max value of weather file
     weatherfile = epwreader.epw_reader(weather_path)['glohorrad_Whm2'].values
     max_global = weatherfile.max()
-    for i, value in enumerate(solar_res):
-        solar_res[i] =  [0 if x > max_global else x for x in value]
+    solar_res = np.array(solar_res, dtype=radiation_store.RADIATION_DTYPE)
+    solar_res[solar_res > max_global] = 0
 
     print "Writing results to disk"
     index = 0
-    for building_name, sensors_number_building, sensor_code_building in zip(names_zone, sensors_number_zone, sensors_code_zone):
-        selection_of_results = solar_res[index:index+sensors_number_building]
-        items_sensor_name_and_result = dict(zip(sensor_code_building, selection_of_results))
-        with open(locator.get_radiation_building(building_name), 'w') as outfile:
-            json.dump(items_sensor_name_and_result, outfile)
+    for building_name, sensors_number_building in zip(names_zone, sensors_number_zone):
+        # the rows are in the order of the sensors in the metadata (see `calc_sensors_zone`)
+        radiation_store.write_radiation(locator.get_radiation_building_sensors(building_name),
+                                        solar_res[index:index + sensors_number_building])
         index = index + sensors_number_building
 
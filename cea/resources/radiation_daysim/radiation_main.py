@@ -14,6 +14,7 @@ from cea.datamanagement.databases_verification import verify_input_geometry_zone
 from geopandas import GeoDataFrame as gpdf
 import cea.inputlocator
 import cea.config
+from cea.utilities.database_catalog import read_database
 
 __author__ = "Paul Neitzel, Kian Wee Chen"
 __copyright__ = "Copyright 2016, Architecture and Building Systems - ETH Zurich"
@@ -134,9 +135,9 @@ def reader_surface_properties(locator, input_shp, region):
 
     # local variables
     architectural_properties = gpdf.from_file(input_shp).drop('geometry', axis=1)
-    surface_database_windows = pd.read_excel(locator.get_envelope_systems(region), "WINDOW")
-    surface_database_roof = pd.read_excel(locator.get_envelope_systems(region), "ROOF")
-    surface_database_walls = pd.read_excel(locator.get_envelope_systems(region), "WALL")
+    surface_database_windows = read_database(locator.get_envelope_systems(region), "WINDOW")
+    surface_database_roof = read_database(locator.get_envelope_systems(region), "ROOF")
+    surface_database_walls = read_database(locator.get_envelope_systems(region), "WALL")
 
     # querry data
     df = architectural_properties.merge(surface_database_windows, left_on='type_win', right_on='code')
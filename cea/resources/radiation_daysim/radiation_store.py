@@ -0,0 +1,125 @@
+"""
+Binary store of the hourly solar radiation on the sensors of a building (the results of the radiation script).
+
+The radiation of a building is stored as one ``float32`` matrix of shape ``(sensors, hours)`` in a ``.npy`` file
+(:py:meth:`cea.inputlocator.InputLocator.get_radiation_building_sensors`), which is memory-mapped when read. Row ``i``
+of the matrix is the sensor in row ``i`` of the sensor metadata
+(:py:meth:`cea.inputlocator.InputLocator.get_radiation_metadata`, with the columns ``SURFACE``, ``TYPE``,
+``orientation``, ``AREA_m2`` ...), so the metadata is the index of the matrix: readers select the sensors they need
+(e.g. by ``TYPE`` and ``orientation``) in the metadata and only these rows are read from disk.
+
+The JSON files written by earlier versions of the radiation script (``{building}_insolation_Whm2.json``, mapping each
+``SURFACE`` to its hourly values) are still read if a building has no binary store.
+"""
+from __future__ import division
+
+import os
+
+import numpy as np
+import pandas as pd
+
+__author__ = "Daren Thomas"
+__copyright__ = "Copyright 2019, Architecture and Building Systems - ETH Zurich"
+__credits__ = ["Daren Thomas"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Daren Thomas"
+__email__ = "cea@arch.ethz.ch"
+__status__ = "Production"
+
+RADIATION_DTYPE = np.float32
+
+
+def get_radiation_path(locator, building_name):
+    """
+    :return: the path to the radiation of the building: the binary store, or the JSON file of earlier versions of the
+             radiation script if only that exists
+    :rtype: str
+    """
+    path = locator.get_radiation_building_sensors(building_name)
+    if not os.path.exists(path) and os.path.exists(locator.get_radiation_building(building_name)):
+        return locator.get_radiation_building(building_name)
+    return path
+
+
+def radiation_exists(locator, building_name):
+    """True, if the sensor metadata and the radiation (in one of the readable formats) of the building exist"""
+    return (os.path.exists(locator.get_radiation_metadata(building_name))
+            and os.path.exists(get_radiation_path(locator, building_name)))
+
+
+def write_radiation(path, radiation):
+    """
+    Write the radiation of the sensors of a building to the binary store.
+
+    :param path: path to the store (see :py:meth:`cea.inputlocator.InputLocator.get_radiation_building_sensors`)
+    :type path: str
+    :param radiation: hourly radiation of each sensor in [Wh/m2], in the order of the sensor metadata
+    :type radiation: np.ndarray
+    """
+    np.save(path, np.asarray(radiation, dtype=RADIATION_DTYPE))
+
+
+def read_radiation(radiation_path, surfaces, sensors=None):
+    """
+    Read the radiation of (some of) the sensors of a building.
+
+    :param radiation_path: path to the radiation of the building (see :py:func:`get_radiation_path`)
+    :type radiation_path: str
+    :param surfaces: the ``SURFACE`` column of the sensor metadata (only used to read the JSON files)
+    :type surfaces: list[str]
+    :param sensors: the rows of the sensor metadata to read (integer positions or a boolean mask), default: all
+    :type sensors: np.ndarray
+    :return: hourly radiation in [Wh/m2], shape ``(sensors, hours)``. Do not modify the returned array, as it may be a
+             memory-mapped view of the store.
+    :rtype: np.ndarray
+    """
+    if radiation_path.endswith('.json'):
+        radiation = pd.read_json(radiation_path)[list(surfaces)].values.T.astype(RADIATION_DTYPE)
+    else:
+        radiation = np.load(radiation_path, mmap_mode='r')
+    if sensors is None:
+        return radiation
+    return radiation[sensors]
+
+
+def read_radiation_dataframe(radiation_path, surfaces):
+    """
+    The radiation of the sensors of a building as a DataFrame with one column per ``SURFACE`` (in the layout of the
+    JSON files of earlier versions of the radiation script).
+
+    :param radiation_path: path to the radiation of the building (see :py:func:`get_radiation_path`)
+    :type radiation_path: str
+    :param surfaces: the ``SURFACE`` column of the sensor metadata
+    :type surfaces: list[str]
+    :rtype: pd.DataFrame
+    """
+    return pd.DataFrame(np.asarray(read_radiation(radiation_path, surfaces), dtype=np.float64).T,
+                        columns=list(surfaces))
+
+
+def read_sensors(locator, building_name, types=None, orientations=None):
+    """
+    Read the metadata and radiation of the sensors of a building, selected by type and orientation.
+
+    :param locator: the locator of the scenario
+    :type locator: cea.inputlocator.InputLocator
+    :param building_name: name of the building
+    :type building_name: str
+    :param types: the ``TYPE`` of the sensors to read (``roofs``, ``walls``, ``windows``), default: all
+    :type types: list[str]
+    :param orientations: the ``orientation`` of the sensors to read (``north``, ``east``, ...), default: all
+    :type orientations: list[str]
+    :return: the metadata of the selected sensors (indexed by ``SURFACE``) and their hourly radiation in [Wh/m2], in
+             the same order
+    :rtype: (pd.DataFrame, np.ndarray)
+    """
+    metadata = pd.read_csv(locator.get_radiation_metadata(building_name))
+    selected = np.ones(len(metadata), dtype=bool)
+    if types is not None:
+        selected &= metadata['TYPE'].isin(types).values
+    if orientations is not None:
+        selected &= metadata['orientation'].isin(orientations).values
+    radiation = read_radiation(get_radiation_path(locator, building_name), metadata['SURFACE'],
+                               np.flatnonzero(selected))
+    return metadata[selected].set_index('SURFACE'), radiation
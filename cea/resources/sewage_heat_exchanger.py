@@ -10,6 +10,7 @@ from cea.constants import HEX_WIDTH_M,VEL_FLOW_MPERS, HEAT_CAPACITY_OF_WATER_JPE
 import cea.config
 import cea.globalvar
 import cea.inputlocator
+from cea.demand import demand_reader
 
 __author__ = "Jimeno A. Fonseca"
 __copyright__ = "Copyright 2015, Architecture and Building Systems - ETH Zurich"
@@ -42,7 +43,7 @@ def calc_sewage_heat_exchanger(locator, config):
     heat_exchanger_length = config.sewage.heat_exchanger_length
 
     for building_name in names:
-        building = pd.read_csv(locator.get_demand_results_file(building_name))
+        building = demand_reader.read_hourly_demand(locator, building_name)
         mcp_combi, t_to_sewage = np.vectorize(calc_Sewagetemperature)(building.Qww_sys_kWh, building.Qww_kWh, building.Tww_sys_sup_C,
                                                      building.Tww_sys_re_C, building.mcptw_kWperC, building.mcpww_sys_kWperC, sewage_water_ratio)
         mcpwaste.append(mcp_combi)
@@ -13,6 +13,7 @@ import json
 import cea.config
 import cea.globalvar
 import cea.inputlocator
+from cea.demand import demand_reader
 from cea.optimization.prices import Prices
 from cea.optimization.slave import heating_main
 from cea.optimization.distribution import network_opt_main
@@ -550,7 +551,7 @@ def main(config):
 
 def demand_files_exist(config, locator):
     # verify that the necessary demand files exist
-    return all(os.path.exists(locator.get_demand_results_file(building_name)) for building_name in
+    return all(demand_reader.demand_results_exist(locator, building_name) for building_name in
                locator.get_zone_building_names())
 
 
@@ -4,17 +4,17 @@ blinds
 """
 from __future__ import division
 
+import numpy as np
+
 
 def calc_blinds_activation(radiation, g_gl, Rf_sh):
     """
     This function calculates the blind operation according to ISO 13790.
 
-    :param radiation: radiation in [W/m2]
+    :param radiation: radiation in [W/m2] (a float or an array, e.g. the hourly radiation of each sensor)
     :param g_gl: window g value
     :param Rf_sh: shading factor
+    :return: the g value of the window, with the same shape as ``radiation``
     """
     # activate blinds when I =300 W/m2
-    if radiation > 300:  # in w/m2
-        return g_gl * Rf_sh
-    else:
-        return g_gl
+    return np.where(radiation > 300, g_gl * Rf_sh, g_gl)  # in w/m2
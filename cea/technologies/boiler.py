@@ -8,6 +8,7 @@ from scipy.interpolate import interp1d
 from math import log, ceil
 import pandas as pd
 from cea.optimization.constants import BOILER_P_AUX
+from cea.utilities.database_catalog import read_database
 
 __author__ = "Thuy-An Nguyen"
 __copyright__ = "Copyright 2015, Architecture and Building Systems - ETH Zurich"
@@ -190,7 +191,7 @@ def calc_Cinv_boiler(Q_design_W, locator, config, technology_type):
 
     if Q_design_W > 0:
 
-        boiler_cost_data = pd.read_excel(locator.get_supply_systems(config.region), sheetname="Boiler")
+        boiler_cost_data = read_database(locator.get_supply_systems(config.region), "Boiler")
         boiler_cost_data = boiler_cost_data[boiler_cost_data['code'] == technology_type]
         # if the Q_design is below the lowest capacity available for the technology, then it is replaced by the least
         # capacity for the corresponding technology from the database
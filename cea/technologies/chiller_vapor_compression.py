@@ -12,6 +12,7 @@ from cea.constants import HEAT_CAPACITY_OF_WATER_JPERKGK
 from cea.technologies.constants import G_VALUE_CENTRALIZED, G_VALUE_DECENTRALIZED, CHILLER_DELTA_T_HEX_CT, \
     CHILLER_DELTA_T_APPROACH, T_EVAP_AHU, T_EVAP_ARU, T_EVAP_SCU, DT_NETWORK_CENTRALIZED, CENTRALIZED_AUX_PERCENTAGE, \
     DECENTRALIZED_AUX_PERCENTAGE
+from cea.utilities.database_catalog import read_database
 
 __author__ = "Thuy-An Nguyen"
 __copyright__ = "Copyright 2015, Architecture and Building Systems - ETH Zurich"
@@ -114,7 +115,7 @@ def calc_Cinv_VCC(qcold_W, locator, config, technology_type):
     Capex_VCC_USD = 0
 
     if qcold_W > 0:
-        VCC_cost_data = pd.read_excel(locator.get_supply_systems(config.region), sheetname="Chiller")
+        VCC_cost_data = read_database(locator.get_supply_systems(config.region), "Chiller")
         VCC_cost_data = VCC_cost_data[VCC_cost_data['code'] == technology_type]
         max_chiller_size = max(VCC_cost_data['cap_max'].values)
         # if the Q_design is below the lowest capacity available for the technology, then it is replaced by the least
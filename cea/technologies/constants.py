@@ -29,6 +29,9 @@ NETWORK_DEPTH = 1  # m
 REDUCED_TIME_STEPS = 50 # number of time steps of maximum demand which are evaluated as an initial guess of the edge diameters
 MAX_INITIAL_DIAMETER_ITERATIONS = 20 #number of initial guess iterations for pipe diameters
 
+# Thermal network calculation
+TIME_BLOCKS_PER_PROCESS = 4  # blocks of contiguous time steps solved by each worker process
+
 # Cogeneration (CCGT)
 SPEC_VOLUME_STEAM = 0.0010  # m3/kg
 
@@ -5,6 +5,7 @@ from __future__ import division
 import pandas as pd
 from math import ceil, log
 from cea.optimization.constants import CT_MAX_SIZE
+from cea.utilities.database_catalog import read_database
 
 __author__ = "Thuy-An Nguyen"
 __copyright__ = "Copyright 2015, Architecture and Building Systems - ETH Zurich"
@@ -94,7 +95,7 @@ def calc_Cinv_CT(CT_size_W, locator, config, technology_type):
     Capex_CT_USD = 0.0
 
     if CT_size_W > 0:
-        CT_cost_data = pd.read_excel(locator.get_supply_systems(config.region), sheetname="CT")
+        CT_cost_data = read_database(locator.get_supply_systems(config.region), "CT")
         CT_cost_data = CT_cost_data[CT_cost_data['code'] == technology_type]
         max_chiller_size = max(CT_cost_data['cap_max'].values)
 
@@ -6,6 +6,7 @@ from __future__ import division
 import pandas as pd
 from math import log
 from cea.optimization.constants import FURNACE_FUEL_COST_WET, FURNACE_FUEL_COST_DRY
+from cea.utilities.database_catalog import read_database
 
 __author__ = "Thuy-An Nguyen"
 __copyright__ = "Copyright 2015, Architecture and Building Systems - ETH Zurich"
@@ -210,7 +211,7 @@ def calc_Cinv_furnace(Q_design_W, Q_annual_W, config, locator, technology_type):
     :returns InvCa: annualized investment costs in [CHF] including O&M
         
     """
-    furnace_cost_data = pd.read_excel(locator.get_supply_systems(config.region), sheetname="Furnace")
+    furnace_cost_data = read_database(locator.get_supply_systems(config.region), "Furnace")
     furnace_cost_data = furnace_cost_data[furnace_cost_data['code'] == technology_type]
     # if the Q_design is below the lowest capacity available for the technology, then it is replaced by the least
     # capacity for the corresponding technology from the database
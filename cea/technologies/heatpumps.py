@@ -10,6 +10,7 @@ from cea.optimization.constants import HP_DELTA_T_COND, HP_DELTA_T_EVAP, HP_ETA_
     GHP_AUXRATIO, HP_MAX_T_COND, GHP_ETA_EX, GHP_CMAX_SIZE_TH, HP_MAX_SIZE, HP_COP_MAX, HP_COP_MIN
 from cea.constants import HEAT_CAPACITY_OF_WATER_JPERKGK
 import numpy as np
+from cea.utilities.database_catalog import read_database
 
 __author__ = "Thuy-An Nguyen"
 __copyright__ = "Copyright 2015, Architecture and Building Systems - ETH Zurich"
@@ -354,7 +355,7 @@ def calc_Cinv_HP(HP_Size, locator, config, technology_type):
     Capex_HP_USD = 0
 
     if HP_Size > 0:
-        HP_cost_data = pd.read_excel(locator.get_supply_systems(config.region), sheetname="HP")
+        HP_cost_data = read_database(locator.get_supply_systems(config.region), "HP")
         HP_cost_data = HP_cost_data[HP_cost_data['code'] == technology_type]
         # if the Q_design is below the lowest capacity available for the technology, then it is replaced by the least
         # capacity for the corresponding technology from the database
@@ -420,7 +421,7 @@ def calc_Cinv_GHP(GHP_Size_W, locator, config, technology=0):
         annualized investment costs in EUROS/a
     """
 
-    GHP_cost_data = pd.read_excel(locator.get_supply_systems(config.region), sheetname="HP")
+    GHP_cost_data = read_database(locator.get_supply_systems(config.region), "HP")
     technology_code = list(set(GHP_cost_data['code']))
     GHP_cost_data[GHP_cost_data['code'] == technology_code[technology]]
     # if the Q_design is below the lowest capacity available for the technology, then it is replaced by the least
@@ -444,7 +445,7 @@ def calc_Cinv_GHP(GHP_Size_W, locator, config, technology=0):
     Capex_a_GHP_USD = InvC_GHP * (Inv_IR) * (1 + Inv_IR) ** Inv_LT / ((1 + Inv_IR) ** Inv_LT - 1)
     Opex_fixed_GHP_USD = Capex_a_GHP_USD * Inv_OM
 
-    BH_cost_data = pd.read_excel(locator.get_supply_systems(config.region), sheetname="BH")
+    BH_cost_data = read_database(locator.get_supply_systems(config.region), "BH")
     technology_code = list(set(BH_cost_data['code']))
     BH_cost_data[BH_cost_data['code'] == technology_code[technology]]
     # if the Q_design is below the lowest capacity available for the technology, then it is replaced by the least
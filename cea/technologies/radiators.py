@@ -6,6 +6,7 @@ from __future__ import division
 from scipy.optimize import newton
 import math
 import numpy as np
+from cea.utilities.jit import kernel
 
 
 __author__ = "Jimeno A. Fonseca"
@@ -56,6 +57,7 @@ def calc_radiator(Qh, tair, Qh0, tair0, tsh0, trh0):
     # return floats with numpy function. Needed when np.vectorize is use to call this function
     return np.float(tsh), np.float(trh), np.float(mCw) # C, C, W/C
 
+@kernel('f8(f8, f8, f8, f8, f8, f8, f8)')
 def fh(x, delta_t, Qh0, Qh, tair, LMRT0, nh):
     '''
     Static radiator heat balance equation from Holst (1996), eq. 6.
@@ -74,6 +76,7 @@ def fh(x, delta_t, Qh0, Qh, tair, LMRT0, nh):
     Eq = Qh - Qh0 * (LMRT / LMRT0) ** (nh + 1)
     return Eq
 
+@kernel('f8(f8, f8, f8)')
 def lmrt(tair, trh, tsh):
     '''
     Logarithmic temperature difference (Eq. 3 in Holst, 1996)
@@ -85,12 +88,3 @@ def lmrt(tair, trh, tsh):
     LMRT = (tsh - trh) / math.log((tsh - tair) / (trh - tair))
     return LMRT
 
-
-
-try:
-    # import Numba AOT versions of the functions above, overwriting them
-    from calc_radiator import fh, lmrt
-except ImportError:
-    # fall back to using the python version
-    # print('failed to import from calc_radiator.pyd, falling back to pure python functions')
-    pass
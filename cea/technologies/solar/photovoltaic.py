@@ -16,8 +16,10 @@ import cea.inputlocator
 from math import *
 from cea.utilities import epwreader
 from cea.utilities import solar_equations
+from cea.resources.radiation_daysim import radiation_store
 from cea.technologies.solar import constants
 import cea.config
+from cea.utilities.database_catalog import read_database
 
 __author__ = "Jimeno A. Fonseca"
 __copyright__ = "Copyright 2016, Architecture and Building Systems - ETH Zurich"
@@ -691,7 +693,7 @@ def calc_Cinv_pv(total_module_area_m2, locator, region, technology=0):
     :param P_peak: installed capacity of PV module [kW]
     :return InvCa: capital cost of the installed PV module [CHF/Y]
     """
-    PV_cost_data = pd.read_excel(locator.get_supply_systems(region), sheet_name="PV")
+    PV_cost_data = read_database(locator.get_supply_systems(region), "PV")
     technology_code = list(set(PV_cost_data['code']))
     PV_cost_data[PV_cost_data['code'] == technology_code[technology]]
     nominal_efficiency = PV_cost_data[PV_cost_data['code'] == technology_code[technology]]['PV_n'].max()
@@ -766,7 +768,7 @@ def main(config):
 
     # list_buildings_names =['B026', 'B036', 'B039', 'B043', 'B050'] for missing buildings
     for building in list_buildings_names:
-        radiation_path = locator.get_radiation_building(building_name=building)
+        radiation_path = radiation_store.get_radiation_path(locator, building)
         radiation_metadata = locator.get_radiation_metadata(building_name=building)
         calc_PV(locator=locator, config=config, radiation_path=radiation_path, metadata_csv=radiation_metadata,
                 latitude=latitude, longitude=longitude, weather_path=config.weather, building_name=building)
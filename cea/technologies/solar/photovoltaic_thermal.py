@@ -23,7 +23,9 @@ from cea.technologies.solar.solar_collector import (calc_properties_SC_db, calc_
 from cea.technologies.solar import constants
 from cea.utilities import epwreader
 from cea.utilities import solar_equations
+from cea.resources.radiation_daysim import radiation_store
 from cea.utilities.standardize_coordinates import get_lat_lon_projected_shapefile
+from cea.utilities.database_catalog import read_database
 
 __author__ = "Jimeno A. Fonseca"
 __copyright__ = "Copyright 2015, Architecture and Building Systems - ETH Zurich"
@@ -48,8 +50,8 @@ def calc_PVT(locator, config, latitude, longitude, weather_data, date_local, bui
 
     :param locator: An InputLocator to locate input files
     :type locator: cea.inputlocator.InputLocator
-    :param radiation_json_path: path to solar insulation data on all surfaces of each building
-    :type radiation_json_path: string
+    :param radiation_path: path to solar insulation data on all surfaces of each building
+    :type radiation_path: string
     :param metadata_csv_path: path to data of sensor points measuring solar insulation of each building
     :type metadata_csv_path: string
     :param latitude: latitude of the case study location
@@ -67,7 +69,7 @@ def calc_PVT(locator, config, latitude, longitude, weather_data, date_local, bui
 
     t0 = time.clock()
 
-    radiation_json_path = locator.get_radiation_building(building_name)
+    radiation_path = radiation_store.get_radiation_path(locator, building_name)
     metadata_csv_path = locator.get_radiation_metadata(building_name)
 
     # solar properties
@@ -81,7 +83,7 @@ def calc_PVT(locator, config, latitude, longitude, weather_data, date_local, bui
 
     # select sensor point with sufficient solar radiation
     max_annual_radiation, annual_radiation_threshold, sensors_rad_clean, sensors_metadata_clean = \
-        solar_equations.filter_low_potential(radiation_json_path, metadata_csv_path, config)
+        solar_equations.filter_low_potential(radiation_path, metadata_csv_path, config)
 
     print('filtering low potential sensor points done for building %s' % building_name)
 
@@ -620,7 +622,7 @@ def calc_Cinv_PVT(PVT_peak_kW, locator, config, technology=0):
     FIXME: handle multiple technologies when cost calculations are done
     """
     PVT_peak_W = PVT_peak_kW * 1000  # converting to W from kW
-    PVT_cost_data = pd.read_excel(locator.get_supply_systems(config.region), sheetname="PV")
+    PVT_cost_data = read_database(locator.get_supply_systems(config.region), "PV")
     technology_code = list(set(PVT_cost_data['code']))
     PVT_cost_data[PVT_cost_data['code'] == technology_code[technology]]
     # if the Q_design is below the lowest capacity available for the technology, then it is replaced by the least
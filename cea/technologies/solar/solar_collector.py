@@ -18,10 +18,12 @@ import multiprocessing
 import cea.config
 from cea.utilities import epwreader
 from cea.utilities import solar_equations
+from cea.resources.radiation_daysim import radiation_store
 from cea.technologies.solar import constants
 from geopandas import GeoDataFrame as gdf
 from numba import jit
 from itertools import izip, repeat
+from cea.utilities.database_catalog import read_database
 
 __author__ = "Jimeno A. Fonseca"
 __copyright__ = "Copyright 2015, Architecture and Building Systems - ETH Zurich"
@@ -64,7 +66,7 @@ def calc_SC(locator, config, latitude, longitude, weather_data, date_local, buil
 
     t0 = time.clock()
 
-    radiation_csv = locator.get_radiation_building(building_name=building_name)
+    radiation_path = radiation_store.get_radiation_path(locator, building_name)
     metadata_csv = locator.get_radiation_metadata(building_name=building_name)
 
     # solar properties
@@ -77,7 +79,7 @@ def calc_SC(locator, config, latitude, longitude, weather_data, date_local, buil
 
     # select sensor point with sufficient solar radiation
     max_annual_radiation, annual_radiation_threshold, sensors_rad_clean, sensors_metadata_clean = \
-        solar_equations.filter_low_potential(radiation_csv, metadata_csv, config)
+        solar_equations.filter_low_potential(radiation_path, metadata_csv, config)
 
     print('filtering low potential sensor points done for building %s' % building_name)
 
@@ -911,7 +913,7 @@ def calc_Cinv_SC(Area_m2, locator, config, technology):
     Lifetime 35 years
     """
 
-    SC_cost_data = pd.read_excel(locator.get_supply_systems(config.region), sheet_name="SC")
+    SC_cost_data = read_database(locator.get_supply_systems(config.region), "SC")
     SC_cost_data[SC_cost_data['type'] == technology]
     # if the Q_design is below the lowest capacity available for the technology, then it is replaced by the least
     # capacity for the corresponding technology from the database
@@ -1,11 +1,16 @@
 """
 Sensible Heat Storage - Fully Mixed tank
+
+The heat flows of the tank are evaluated at the start of each (hourly) time step and held constant over the step, so
+the energy balance (:py:func:`ode_hot_water_tank`, :py:func:`ode_cold_water_tank`) has a constant right hand side and
+is integrated exactly with :py:func:`calc_tank_temperature_step`. :py:func:`calc_dhw_tank` runs the hot water tanks of
+one or many buildings over the whole year in one call.
 """
 
 from __future__ import division
 import numpy as np
-from scipy.integrate import odeint
 import math
+from cea.utilities.jit import kernel
 from cea.technologies.thermal_network.substation_matrix import calc_area_HEX, calc_dTm_HEX
 from cea.demand.constants import TWW_SETPOINT, B_F
 from cea.constants import ASPECT_RATIO, HEAT_CAPACITY_OF_WATER_JPERKGK, P_WATER_KGPERM3, WH_TO_J
@@ -106,6 +111,7 @@ def calc_tank_surface_area(V_tank_m3):
     return A_tank_m2
 
 
+@kernel('f8(f8[:], f8, f8, f8, f8, f8)')
 def ode_hot_water_tank(y, t, q_loss_W, q_discharged_W, q_charged_W, V_tank_m3):
     """
     This algorithm describe the energy balance of the dhw tank with a differential equation.
@@ -135,6 +141,7 @@ def ode_hot_water_tank(y, t, q_loss_W, q_discharged_W, q_charged_W, V_tank_m3):
     return dydt
 
 
+@kernel('f8(f8[:], f8, f8, f8, f8, f8)')
 def ode_cold_water_tank(y, t, q_gain_W, q_discharged_W, q_charged_W, V_tank_m3):
     """
     This algorithm describe the energy balance of the dhw tank with a differential equation.
@@ -164,12 +171,30 @@ def ode_cold_water_tank(y, t, q_gain_W, q_discharged_W, q_charged_W, V_tank_m3):
     return dydt
 
 
+@kernel('f8(f8, f8, f8)')
+def calc_tank_temperature_step(T_start_C, q_net_W, V_tank_m3):
+    """
+    Advance the temperature of a fully mixed tank by one hour. The net heat flow into the tank is constant over the
+    time step, so this is the exact solution of the energy balance.
+
+    :param T_start_C: tank temperature at the beginning of the time step in [C]
+    :param q_net_W: net heat flow into the tank (charged - discharged - losses for a hot water tank) in [W]
+    :param V_tank_m3: tank size in [m3]
+    :return: tank temperature at the end of the time step in [C]
+    """
+    if V_tank_m3 == 0:
+        return T_start_C
+    mcp_tank_JperK = P_WATER_KGPERM3 * V_tank_m3 * HEAT_CAPACITY_OF_WATER_JPERKGK
+    return T_start_C + q_net_W * WH_TO_J / mcp_tank_JperK
+
+
 def calc_tank_temperature(T_start_C, q_loss_W, q_discharged_W, q_charged_W, V_tank_m3, tank_type):
     """
-    This algorithm solves the differential equation, ode.
+    This algorithm solves the energy balance of the tank (see :py:func:`ode_hot_water_tank` and
+    :py:func:`ode_cold_water_tank`) over one time step.
 
     :param T_start_C: initial tank temperature in [C]
-    :param q_loss_W: storage tank sensible heat loss in Wh.
+    :param q_loss_W: storage tank sensible heat loss in Wh (heat gain for cold water tanks).
     :param q_discharged_W: heat discharged from the tank in Wh.
     :param q_charged_W: heat charged into the tank in Wh.
     :param V_tank_m3: DHW tank size in [m3]
@@ -183,27 +208,81 @@ def calc_tank_temperature(T_start_C, q_loss_W, q_discharged_W, q_charged_W, V_ta
     :returns T_tank_C: tank temperature after the energy balance
     :rtype T_tank_C: float
     """
-    t = np.linspace(0, 1, 2)
     if tank_type == 'hot_water':
-        y = odeint(ode_hot_water_tank, T_start_C, t, args=(
-            q_loss_W, q_discharged_W, q_charged_W, V_tank_m3))
+        q_net_W = q_charged_W - q_loss_W - q_discharged_W
     elif tank_type == 'cold_water':
-        y = odeint(ode_cold_water_tank, T_start_C, t, args=(
-            q_loss_W, q_discharged_W, q_charged_W, V_tank_m3))
+        q_net_W = q_loss_W + q_discharged_W - q_charged_W
     else:
         raise ValueError('Please specified the tank type, it should be either cold_water or hot_water.')
-    T_tank_C = y[1]
-    return T_tank_C[0]
-
-
-# use the optimized (numba_cc) versions of the ode function in this module if available
-try:
-    # import Numba AOT versions of the functions above, overwriting them
-    from storagetank_cc import (ode)
-except ImportError:
-    # fall back to using the python version
-    # print('failed to import from storagetank_cc.pyd, falling back to pure python functions')
-    pass
+    return calc_tank_temperature_step(T_start_C, q_net_W, V_tank_m3)
+
+
+@kernel('void(f8[:], f8[:, :], f8[:, :], f8[:], f8[:], f8[:, :], f8[:, :], f8[:, :])')
+def _calc_dhw_tanks(T_start_C, T_basement_C, q_discharged_W, V_tank_m3, area_tank_surface_m2, T_tank_C, q_loss_W,
+                    q_charged_W):
+    buildings, hours = q_discharged_W.shape
+    for b in range(buildings):
+        if V_tank_m3[b] > 0:
+            T_C = T_start_C[b]
+            for k in range(hours):
+                # same heat balance as `calc_dhw_tank_heat_balance`
+                q_loss = U_DHWTANK * area_tank_surface_m2[b] * (T_C - T_basement_C[b, k])
+                if q_discharged_W[b, k] <= 0:
+                    q_charged = 0.0
+                else:
+                    q_charged = q_discharged_W[b, k] + q_loss + P_WATER_KGPERM3 * V_tank_m3[b] * (
+                        HEAT_CAPACITY_OF_WATER_JPERKGK / 1000) * (TWW_SETPOINT - T_C) / 3.6
+                T_C = calc_tank_temperature_step(T_C, q_charged - q_loss - q_discharged_W[b, k], V_tank_m3[b])
+                q_loss_W[b, k] = q_loss
+                q_charged_W[b, k] = q_charged
+                T_tank_C[b, k] = T_C
+        else:
+            for k in range(hours):
+                T_tank_C[b, k] = np.nan
+
+
+def calc_dhw_tank(T_int_C, T_ext_C, q_tank_discharged_W, V_tank_m3, T_start_C=TWW_SETPOINT):
+    """
+    Calculate the heat flows and the temperature of fully mixed DHW storage tanks for all time steps, using the heat
+    balance of :py:func:`calc_dhw_tank_heat_balance`. The time series are 1-D arrays (one building) or 2-D arrays of
+    shape ``(buildings, hours)``, with one tank size per building. Tanks of size 0 have a temperature of ``nan`` and
+    no heat flows.
+
+    :param T_int_C: room temperature in [C]
+    :param T_ext_C: ambient temperature in [C]
+    :param q_tank_discharged_W: heat discharged from the tank in [Wh], including dhw heating demand and distribution
+                                heat loss.
+    :param V_tank_m3: DHW tank size in [m3]
+    :param T_start_C: tank temperature at the beginning of the first time step in [C]
+    :type T_int_C: np.ndarray
+    :type T_ext_C: np.ndarray
+    :type q_tank_discharged_W: np.ndarray
+    :type V_tank_m3: float | np.ndarray
+    :type T_start_C: float | np.ndarray
+
+    :return T_tank_C: tank temperature at the end of each time step in [C]
+    :return q_loss_W: storage sensible heat loss in [Wh]
+    :return q_charged_W: heat charged into the tank in [Wh]
+    :rtype: (np.ndarray, np.ndarray, np.ndarray)
+    """
+    q_discharged_W = np.asarray(q_tank_discharged_W, dtype=float)
+    shape = q_discharged_W.shape
+    q_discharged_W = np.atleast_2d(q_discharged_W)
+    buildings = len(q_discharged_W)
+    T_int_C = np.atleast_2d(np.asarray(T_int_C, dtype=float))
+    T_ext_C = np.atleast_2d(np.asarray(T_ext_C, dtype=float))
+    T_basement_C = np.ascontiguousarray(
+        np.broadcast_to(T_int_C - B_F * (T_int_C - T_ext_C), q_discharged_W.shape))  # according to EN
+    V_tank_m3 = np.broadcast_to(np.asarray(V_tank_m3, dtype=float), (buildings,)).copy()
+    area_tank_surface_m2 = np.array([calc_tank_surface_area(V) for V in V_tank_m3])
+    T_start_C = np.broadcast_to(np.asarray(T_start_C, dtype=float), (buildings,)).copy()
+
+    T_tank_C = np.zeros(q_discharged_W.shape)
+    q_loss_W = np.zeros(q_discharged_W.shape)
+    q_charged_W = np.zeros(q_discharged_W.shape)
+    _calc_dhw_tanks(T_start_C, T_basement_C, np.ascontiguousarray(q_discharged_W), V_tank_m3, area_tank_surface_m2,
+                    T_tank_C, q_loss_W, q_charged_W)
+    return T_tank_C.reshape(shape), q_loss_W.reshape(shape), q_charged_W.reshape(shape)
 
 
 # ================================
@@ -0,0 +1,182 @@
+"""
+Evaluation of the networks of the thermal network optimization
+(:py:mod:`cea.technologies.thermal_network.thermal_network_optimization`).
+
+The costs of an individual only depend on the network it describes: the plant buildings, the disconnected buildings,
+whether loops are allowed and the loads supplied by the network. The results of each network are stored in the
+scenario (:py:meth:`cea.inputlocator.InputLocator.get_optimization_network_evaluation_cache_file`) under a
+fingerprint of the network and of the inputs of the evaluation: the demand results of the buildings, the parameters
+of the network layout, thermal network and optimization scripts, the weather file, the geometry of the zone and
+streets and the databases used. The results are kept between runs of the optimization and are only used while the
+fingerprint matches (delete the cache folder to force the evaluation of all networks).
+
+The networks that are not in the cache are evaluated by a pool of worker processes. Each worker generates and
+simulates its networks in its own working folder (:py:class:`WorkerLocator`), so the network files of the individuals
+evaluated at the same time don't overwrite each other.
+"""
+from __future__ import division
+from __future__ import print_function
+
+import hashlib
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+
+import cea.inputlocator
+from cea.demand import demand_reader
+from cea.utilities.file_cache import new_key, update_key_with_file, write_atomically
+
+__author__ = "Daren Thomas"
+__copyright__ = "Copyright 2019, Architecture and Building Systems - ETH Zurich"
+__credits__ = ["Daren Thomas"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Daren Thomas"
+__email__ = "cea@arch.ethz.ch"
+__status__ = "Production"
+
+# increase when changing the evaluation of the networks in a way that changes the results
+NETWORK_EVALUATION_VERSION = 1
+
+# parameters of the scripts evaluating a network, excluding the parameters set for each individual (they are part of
+# the fingerprint of the network) and the parameters of the genetic algorithm
+SECTIONS_WITH_EFFECT = ['network-layout', 'thermal-network', 'thermal-network-optimization']
+PARAMETERS_WITHOUT_EFFECT = {'allow-looped-networks', 'disconnected-buildings', 'substation-cooling-systems',
+                             'substation-heating-systems', 'possible-plant-sites', 'min-number-of-plants',
+                             'max-number-of-plants', 'number-of-individuals', 'chance-of-mutation',
+                             'number-of-generations', 'lucky-few', 'optimize-loop-branch', 'optimize-network-loads',
+                             'optimize-building-connections'}
+
+_worker_inputs = {}
+
+
+class WorkerLocator(cea.inputlocator.InputLocator):
+    """
+    An InputLocator keeping the files of the network being evaluated (network layout, thermal network results and
+    temporary files) in the working folder of a worker process. All other files are those of the scenario.
+    """
+
+    def __init__(self, scenario, working_folder):
+        super(WorkerLocator, self).__init__(scenario)
+        self.working_folder = working_folder
+
+    def get_input_network_folder(self, network_type, network_name):
+        if network_name == '':  # in case there is no specific network name (default case)
+            return self._ensure_folder(self.working_folder, 'networks', network_type)
+        else:
+            return self._ensure_folder(self.working_folder, 'networks', network_type, network_name)
+
+    def get_optimization_network_layout_folder(self):
+        return self._ensure_folder(self.working_folder, 'layout')
+
+    def get_temporary_folder(self):
+        return self._ensure_folder(self.working_folder, 'temp')
+
+
+def calc_settings_key(locator, config, building_names):
+    """
+    :return: fingerprint of the inputs common to all networks: the demand results of the buildings, the parameters of
+        the scripts evaluating a network, the weather file, the geometry of the zone and streets and the databases
+    :rtype: str
+    """
+    key = new_key(NETWORK_EVALUATION_VERSION, config.region)
+    for section in SECTIONS_WITH_EFFECT:
+        parameters = config.sections[section].parameters
+        for name in sorted(parameters.keys()):
+            if name not in PARAMETERS_WITHOUT_EFFECT:
+                key.update(('|%s:%s=%r' % (section, name, parameters[name].get())).encode('utf-8'))
+
+    update_key_with_file(key, locator.get_total_demand())
+    for building in building_names:
+        format = demand_reader.get_demand_results_format(locator, building) or 'csv'
+        update_key_with_file(key, locator.get_demand_results_file(building, format))
+
+    shapefiles = [locator.get_zone_geometry(), locator.get_street_network()]
+    databases = [locator.get_thermal_networks(config.region),
+                 locator.get_supply_systems(config.region),
+                 locator.get_life_cycle_inventory_supply_systems(config.region),
+                 locator.get_electricity_costs(config.region)]
+    for path in [config.weather] + databases + shapefiles + [os.path.splitext(s)[0] + '.dbf' for s in shapefiles]:
+        update_key_with_file(key, path)
+    return key.hexdigest()
+
+
+def calc_network_key(settings_key, plant_building_names, disconnected_building_names, allow_looped_networks,
+                     supplied_loads):
+    """
+    :param settings_key: fingerprint of the inputs common to all networks (see :py:func:`calc_settings_key`)
+    :return: fingerprint of a network and its inputs, the name of its results in the cache
+    :rtype: str
+    """
+    key = hashlib.sha1(settings_key.encode('utf-8'))
+    key.update(repr((sorted(str(name) for name in plant_building_names),
+                     sorted(str(name) for name in disconnected_building_names),
+                     bool(allow_looped_networks),
+                     sorted(str(load) for load in supplied_loads))).encode('utf-8'))
+    return key.hexdigest()
+
+
+def read_cached_results(locator, network_type, network_key):
+    """:return: the results of the network stored in the cache or None if the network was not evaluated yet"""
+    cache_file = locator.get_optimization_network_evaluation_cache_file(network_type, network_key)
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        return pd.read_csv(cache_file, index_col=0)
+    except Exception as e:
+        print('Ignoring corrupt network results %s: %s' % (cache_file, e))
+        return None
+
+
+def write_cached_results(locator, network_type, network_key, results):
+    """Write the results of the network to the cache (see :py:func:`cea.utilities.file_cache.write_atomically`)"""
+    write_atomically(locator.get_optimization_network_evaluation_cache_file(network_type, network_key),
+                     results.to_csv)
+
+
+def evaluate_networks_multiprocessing(evaluate_individual, network_info, individuals, number_of_processes):
+    """
+    Evaluate the individuals with a pool of worker processes, each working in its own folder.
+
+    :param evaluate_individual: function ``evaluate_individual(network_info, individual)`` returning the results of
+        an individual (a module level function, so it can be sent to the worker processes)
+    :param network_info: the network information of the optimization (copied to each worker process)
+    :param individuals: the individuals to evaluate
+    :return: the results of the individuals, in the order of ``individuals``
+    :rtype: list
+    """
+    working_folder = tempfile.mkdtemp(prefix='cea-network-evaluation-')
+    pool = multiprocessing.Pool(number_of_processes, initializer=initialize_worker,
+                                initargs=({'evaluate_individual': evaluate_individual,
+                                           'network_info': network_info,
+                                           'working_folder': working_folder},))
+    try:
+        return pool.map(evaluate_individual_worker, individuals, chunksize=1)
+    finally:
+        pool.terminate()
+        pool.join()
+        shutil.rmtree(working_folder, ignore_errors=True)
+
+
+def initialize_worker(worker_inputs):
+    """
+    Initializer of the worker processes of :py:func:`evaluate_networks_multiprocessing`: redirect the network files to
+    the working folder of this process.
+
+    :type worker_inputs: dict
+    """
+    network_info = worker_inputs['network_info']
+    working_folder = os.path.join(worker_inputs['working_folder'], str(os.getpid()))
+    network_info.locator = WorkerLocator(network_info.locator.scenario, working_folder)
+    # worker processes can't start a pool of their own, the network simulation runs in this process
+    network_info.config.multiprocessing = False
+    _worker_inputs.clear()
+    _worker_inputs.update(worker_inputs)
+
+
+def evaluate_individual_worker(individual):
+    """Evaluate an individual in a worker process of :py:func:`evaluate_networks_multiprocessing`"""
+    return _worker_inputs['evaluate_individual'](_worker_inputs['network_info'], individual)
@@ -0,0 +1,220 @@
+"""
+Sparse linear algebra of the hydraulic calculation of a thermal network.
+
+The hydraulic calculation (:py:func:`cea.technologies.thermal_network.thermal_network.calc_mass_flow_edges` and
+:py:func:`cea.technologies.thermal_network.thermal_network.calc_pressure_nodes`) solves the same network (node-edge
+incidence matrix) for every time step. :py:class:`NetworkHydraulics` holds everything that only depends on the
+incidence matrix:
+
+- the incidence matrix as a sparse matrix
+- the fundamental loops of the network and the sign of each edge in each loop (the Hardy-Cross correction of all loops
+  is a product with this sparse matrix)
+- the sparse LU factorizations of the reduced incidence matrix (networks without loops) and of the reduced Laplacian
+  of the network (networks with loops and node pressures), calculated once and reused
+- the edges entering and leaving each node and the order of the nodes along the direction of the edges, used to solve
+  the node temperatures of radial networks in a single sweep
+
+:py:func:`get_network_hydraulics` caches the objects per incidence matrix, so the matrix of a network is analysed only
+once per process.
+"""
+from __future__ import division
+
+import collections
+
+import networkx as nx
+import numpy as np
+import scipy.sparse
+import scipy.sparse.linalg
+
+__author__ = "Daren Thomas"
+__copyright__ = "Copyright 2019, Architecture and Building Systems - ETH Zurich"
+__credits__ = ["Daren Thomas"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Daren Thomas"
+__email__ = "cea@arch.ethz.ch"
+__status__ = "Production"
+
+CACHE_SIZE = 8  # number of incidence matrices kept by get_network_hydraulics (edge directions change over time)
+
+_cache = collections.OrderedDict()
+
+
+class NetworkHydraulics(object):
+    """
+    The hydraulic properties of a network that only depend on its node-edge incidence matrix.
+
+    :param edge_node: the node-edge incidence matrix: 1 if edge e points to node n, -1 if it leaves node n, else 0
+    :type edge_node: ndarray (n x e)
+    """
+
+    def __init__(self, edge_node):
+        edge_node = np.asarray(edge_node, dtype=np.float64)
+        self.number_of_nodes, self.number_of_edges = edge_node.shape
+        self.incidence = scipy.sparse.csr_matrix(edge_node)
+        self.end_nodes = np.argmax(edge_node == 1, axis=0)  # the node each edge points to
+        self.start_nodes = np.argmax(edge_node == -1, axis=0)  # the node each edge leaves
+
+        self.graph = nx.Graph()
+        for edge in range(self.number_of_edges):
+            # edge number necessary to later identify which edges are in loop since graph is a dictionary
+            self.graph.add_edge(self.end_nodes[edge], self.start_nodes[edge], edge_number=edge)
+        self.loops = nx.cycle_basis(self.graph, 0)  # identifies all linear independent loops
+        self.loop_signs = self.calc_loop_signs(edge_node)
+        self.loop_edges = abs(self.loop_signs)
+        self.edges_in = group_edges_by_node(self.end_nodes, self.number_of_nodes)
+        self.edges_out = group_edges_by_node(self.start_nodes, self.number_of_nodes)
+        self.flow_order = self.calc_flow_order()
+        self._factorizations = {}
+
+    def calc_loop_signs(self, edge_node):
+        """
+        :return: the sign of each edge in each fundamental loop: 1 if the edge is defined in the direction of the loop
+            (clockwise), -1 if not, 0 if the edge is not part of the loop
+        :rtype: scipy.sparse.csr_matrix (loops x e)
+        """
+        rows, columns, signs = [], [], []
+        for i, loop in enumerate(self.loops):
+            for j, node in enumerate(loop):
+                next_node = loop[(j + 1) % len(loop)]
+                edge = self.graph.get_edge_data(node, next_node)['edge_number']
+                clockwise = edge_node[node, edge] == 1 and edge_node[next_node, edge] == -1
+                rows.append(i)
+                columns.append(edge)
+                signs.append(1.0 if clockwise else -1.0)
+        return scipy.sparse.csr_matrix((signs, (rows, columns)), shape=(len(self.loops), self.number_of_edges))
+
+    def calc_flow_order(self):
+        """
+        :return: the nodes in topological order: each node comes after the start nodes of the edges pointing to it.
+            None if the edges form a directed cycle.
+        :rtype: list[int]
+        """
+        graph = nx.DiGraph()
+        graph.add_nodes_from(range(self.number_of_nodes))
+        graph.add_edges_from(zip(self.start_nodes, self.end_nodes))
+        try:
+            return list(nx.topological_sort(graph))
+        except nx.NetworkXUnfeasible:
+            return None
+
+    def get_reduced_incidence(self, removed_node):
+        """:return: the incidence matrix without the (redundant) equation of ``removed_node``"""
+        kept_nodes = np.delete(np.arange(self.number_of_nodes), removed_node)
+        return self.incidence[kept_nodes]
+
+    def get_factorization(self, kind, removed_node):
+        """
+        :param kind: 'incidence' for the reduced incidence matrix (square for networks without loops) or 'laplacian'
+            for the reduced Laplacian of the network (the reduced incidence matrix times its transpose)
+        :return: the sparse LU factorization of the matrix, calculated on the first call
+        """
+        key = (kind, removed_node)
+        if key not in self._factorizations:
+            reduced_incidence = self.get_reduced_incidence(removed_node)
+            if kind == 'incidence':
+                matrix = reduced_incidence
+            else:
+                matrix = reduced_incidence.dot(reduced_incidence.T)
+            try:
+                self._factorizations[key] = scipy.sparse.linalg.splu(scipy.sparse.csc_matrix(matrix))
+            except RuntimeError:
+                # singular matrix (e.g. the network is not connected), solved with least squares instead
+                self._factorizations[key] = None
+        return self._factorizations[key]
+
+    def solve_edge_flows(self, node_flows, removed_node):
+        """
+        Solve the mass balance of the nodes (without the node ``removed_node``) for the flows in the edges. For
+        networks with loops, the balance has more unknowns than equations: the solution with the smallest norm is
+        returned (the initial guess of the Hardy-Cross iterations).
+
+        :param node_flows: the mass flow leaving the network at each node                                    (n)
+        :type node_flows: ndarray
+        :return: the mass flow in each edge                                                                  (e)
+        :rtype: ndarray
+        """
+        b = np.delete(node_flows, removed_node)
+        if self.loops:
+            factorization = self.get_factorization('laplacian', removed_node)
+            if factorization is not None:
+                return self.get_reduced_incidence(removed_node).T.dot(factorization.solve(b))
+        else:
+            factorization = self.get_factorization('incidence', removed_node)
+            if factorization is not None:
+                return factorization.solve(b)
+        return scipy.sparse.linalg.lsqr(self.get_reduced_incidence(removed_node), b, atol=1e-12, btol=1e-12)[0]
+
+    def calc_node_flows(self, edge_flows):
+        """:return: the mass flow leaving the network at each node for the flows in the edges       (n)"""
+        return self.incidence.dot(edge_flows)
+
+    def calc_loop_sums(self, edge_values):
+        """:return: the sum of the values of the edges along each loop (with the sign of the edges in the loop)"""
+        return self.loop_signs.dot(edge_values)
+
+    def calc_loop_correction(self, pressure_loss_edges, pressure_loss_derivative_edges):
+        """
+        Hardy-Cross correction of the edge mass flows: the correction of each loop is the sum of the (signed) pressure
+        losses along the loop divided by the sum of the derivatives of the pressure losses. The corrections of all
+        loops are calculated from the same edge values, so they are calculated (and applied) at once.
+
+        :param pressure_loss_edges: pressure loss of each edge in the direction of its mass flow             (e)
+        :param pressure_loss_derivative_edges: absolute derivative of the pressure loss of each edge         (e)
+        :return: the correction of the mass flow of each edge and the sum of the pressure losses of each loop
+        :rtype: (ndarray, ndarray)
+        """
+        sum_delta_m_num = self.calc_loop_sums(pressure_loss_edges)
+        sum_delta_m_den = self.loop_edges.dot(pressure_loss_derivative_edges)
+        delta_m = np.zeros(len(self.loops))
+        non_zero = ~np.isclose(sum_delta_m_den, 0)
+        delta_m[non_zero] = -sum_delta_m_num[non_zero] / sum_delta_m_den[non_zero]
+        return self.loop_signs.T.dot(delta_m), sum_delta_m_num
+
+    def calc_node_pressures(self, edge_pressure_differences):
+        """
+        Solve ``incidence.T * pressure_nodes = edge_pressure_differences`` in the least squares sense. The pressures
+        are only defined up to a constant: like ``np.linalg.lstsq``, the solution with the smallest norm is returned
+        (the mean of the node pressures is 0).
+
+        :param edge_pressure_differences: pressure at the end node minus the pressure at the start node of each edge
+        :type edge_pressure_differences: ndarray (e)
+        :return: the pressure at each node                                                                   (n)
+        :rtype: ndarray
+        """
+        rhs = self.incidence.dot(edge_pressure_differences)
+        factorization = self.get_factorization('laplacian', 0)
+        if factorization is None:
+            return scipy.sparse.linalg.lsqr(self.incidence.T, edge_pressure_differences, atol=1e-12, btol=1e-12)[0]
+        pressure_nodes = np.zeros(self.number_of_nodes)
+        pressure_nodes[1:] = factorization.solve(rhs[1:])
+        return pressure_nodes - pressure_nodes.mean()
+
+
+def group_edges_by_node(nodes, number_of_nodes):
+    """
+    :param nodes: a node of each edge (e.g. the end node)
+    :return: the edges of each node
+    :rtype: list[ndarray]
+    """
+    edges = np.argsort(nodes, kind='mergesort')
+    return np.split(edges, np.cumsum(np.bincount(nodes, minlength=number_of_nodes))[:-1])
+
+
+def get_network_hydraulics(edge_node):
+    """
+    :param edge_node: the node-edge incidence matrix of the network
+    :type edge_node: ndarray or pandas.DataFrame (n x e)
+    :return: the (cached) hydraulic properties of the network
+    :rtype: NetworkHydraulics
+    """
+    edge_node = np.asarray(edge_node, dtype=np.float64)
+    key = (edge_node.shape, np.argmax(edge_node == 1, axis=0).tobytes(), np.argmax(edge_node == -1, axis=0).tobytes())
+    if key in _cache:
+        hydraulics = _cache.pop(key)
+    else:
+        hydraulics = NetworkHydraulics(edge_node)
+        if len(_cache) >= CACHE_SIZE:
+            _cache.popitem(last=False)
+    _cache[key] = hydraulics
+    return hydraulics
@@ -0,0 +1,241 @@
+"""
+Thermo-physical properties of the water and the pipes of a thermal network.
+
+The functions of this module evaluate the properties of the flow (reynolds, prandtl and nusselt numbers, darcy friction
+factor, pressure losses) and the aggregated heat conduction coefficients of the pipes for arrays of mass flows and
+temperatures in a single call: an array of the edges of a time step (e), of several time steps (t x e) or anything else
+that broadcasts against the pipe data. The regimes of the flow are selected element-wise instead of in a Python loop.
+
+:py:class:`PipeProperties` binds the data of the pipes of a network (diameters, lengths, insulation) and the thermal
+resistances that don't depend on the flow, so only the terms depending on the mass flow and the temperature are
+evaluated for each call.
+
+The functions of :py:mod:`cea.technologies.thermal_network.thermal_network` (``calc_reynolds``, ``calc_darcy``,
+``calc_pressure_loss_pipe``, ``calc_aggregated_heat_conduction_coefficient`` etc.) use these kernels.
+"""
+from __future__ import division
+
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from cea.constants import HEAT_CAPACITY_OF_WATER_JPERKGK, P_WATER_KGPERM3
+from cea.technologies.constants import ROUGHNESS, NETWORK_DEPTH
+
+__author__ = "Daren Thomas"
+__copyright__ = "Copyright 2019, Architecture and Building Systems - ETH Zurich"
+__credits__ = ["Daren Thomas"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Daren Thomas"
+__email__ = "cea@arch.ethz.ch"
+__status__ = "Production"
+
+EXTRA_HEAT_TRANSFER_COEF = 0.2  # _[Wang et al, 2016] to represent heat losses from valves and other attachments
+R_CONV_NO_FLOW = 0.2  # [m*K/W] convection resistance of pipes without mass flow, avoids divide by 0 error
+
+_material_properties = {}
+
+
+def calc_kinematic_viscosity(temperature__k):
+    """
+    Calculates the kinematic viscosity of water as a function of temperature based on a simple fit from data from the
+    engineering toolbox.
+
+    :param temperature__k: temperature of the water in K
+    :return: kinematic viscosity in m2/s
+    """
+    return 2.652623e-8 * np.exp(557.5447 / (np.asarray(temperature__k, dtype=np.float64) - 140))
+
+
+def calc_thermal_conductivity(temperature__k):
+    """
+    Calculates the thermal conductivity of water as a function of temperature based on a fit proposed in:
+
+    ... Standard Reference Data for the Thermal Conductivity of Water
+    Ramires, Nagasaka, et al.
+    1994
+
+    :param temperature__k: temperature of the water in K
+    :return: thermal conductivity in W/(m*K)
+    """
+    temperature__k = np.asarray(temperature__k, dtype=np.float64)
+    return 0.6065 * (-1.48445 + 4.12292 * temperature__k / 298.15 - 1.63866 * (temperature__k / 298.15) ** 2)
+
+
+def calc_prandtl(temperature__k):
+    """:return: the prandtl number of water at the temperature ``temperature__k`` (in K)"""
+    kinematic_viscosity_m2s = calc_kinematic_viscosity(temperature__k)  # m2/s
+    thermal_conductivity = calc_thermal_conductivity(temperature__k)  # W/(m*K)
+    return np.nan_to_num(
+        kinematic_viscosity_m2s * P_WATER_KGPERM3 * HEAT_CAPACITY_OF_WATER_JPERKGK / thermal_conductivity)
+
+
+def calc_reynolds(mass_flow_rate_kgs, temperature__k, pipe_diameter_m):
+    """
+    :param mass_flow_rate_kgs: mass flow rate in each edge (the direction of the flow doesn't matter)
+    :param temperature__k: temperature of the water in each edge
+    :param pipe_diameter_m: inner diameter of the pipe of each edge
+    :return: the reynolds number of the flow in each edge (0 instead of nan)
+    """
+    kinematic_viscosity_m2s = calc_kinematic_viscosity(temperature__k)  # m2/s
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.nan_to_num(4 * (abs(np.asarray(mass_flow_rate_kgs, dtype=np.float64)) / P_WATER_KGPERM3) / (
+                math.pi * kinematic_viscosity_m2s * np.asarray(pipe_diameter_m, dtype=np.float64)))
+
+
+def calc_darcy(pipe_diameter_m, reynolds, pipe_roughness_m=ROUGHNESS):
+    """
+    Calculates the Darcy friction factor [Oppelt et al., 2016].
+
+    :param pipe_diameter_m: inner diameter of the pipe of each edge
+    :param reynolds: reynolds number of the flow in each edge
+    :param pipe_roughness_m: pipe roughness
+    :return: the darcy friction factor of the flow in each edge (0 without flow)
+
+    ..[Oppelt, T., et al., 2016] Oppelt, T., et al. Dynamic thermo-hydraulic model of district cooling networks.
+      Applied Thermal Engineering, 2016.
+    """
+    reynolds = np.asarray(reynolds, dtype=np.float64)
+    pipe_diameter_m = np.asarray(pipe_diameter_m, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # laminar flow
+        laminar = 64 / reynolds
+        # transient flow (for pipe roughness of e/D=0.0002, @low reynolds numbers lines for smooth pipe nearly identical
+        # in Moody Diagram) so smooth pipe approximation used
+        transient = 0.316 * reynolds ** -0.25
+        # Swamee-Jain equation, applicable for Reynolds= 5000 - 10E8; pipe_roughness=10E-6 - 0.05
+        turbulent = 1.325 * np.log(pipe_roughness_m / (3.7 * pipe_diameter_m) + 5.74 / reynolds ** 0.9) ** (-2)
+    return np.select([reynolds <= 1, reynolds <= 2300, reynolds <= 5000], [0.0, laminar, transient], turbulent)
+
+
+def calc_nusselt(reynolds, prandtl, darcy, network_type):
+    """
+    Calculates the nusselt number of the internal flow inside the pipes.
+
+    :param reynolds: reynolds number of the flow in each edge
+    :param prandtl: prandtl number of the flow in each edge
+    :param darcy: darcy friction factor of the flow in each edge
+    :param network_type: 'DH' (the ground cools the water in the pipes) or 'DC' (the ground heats the water)
+    :return: the nusselt number of the flow in each edge (0 without flow)
+
+    .. Incropera, F. P., DeWitt, D. P., Bergman, T. L., & Lavine, A. S. (2007).
+        Fundamentals of Heat and Mass Transfer. Fundamentals of Heat and Mass Transfer.
+        https://doi.org/10.1016/j.applthermaleng.2011.03.022
+    """
+    reynolds = np.asarray(reynolds, dtype=np.float64)
+    prandtl = np.asarray(prandtl, dtype=np.float64)
+    darcy = np.asarray(darcy, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        transient = darcy / 8 * (reynolds - 1000) * prandtl / (1 + 12.7 * (darcy / 8) ** 0.5 * (prandtl ** 0.67 - 1))
+        turbulent = 0.023 * reynolds ** 0.8 * prandtl ** (0.3 if network_type == 'DH' else 0.4)
+    return np.select([reynolds <= 1, reynolds <= 2300, reynolds <= 10000], [0.0, 3.66, transient], turbulent)
+
+
+def calc_pressure_loss(pipe_diameter_m, pipe_length_m, mass_flow_rate_kgs, temperature__k):
+    """
+    Calculates the pressure losses throughout the pipes based on the Darcy-Weisbach equation and the Swamee-Jain
+    solution for the Darcy friction factor [Oppelt et al., 2016] and their derivatives to the mass flow (used by the
+    Hardy-Cross correction of looped networks).
+
+    :param pipe_diameter_m: inner diameter of the pipe of each edge
+    :param pipe_length_m: length of each edge
+    :param mass_flow_rate_kgs: mass flow rate in each edge
+    :param temperature__k: temperature of the water in each edge
+    :return: the pressure loss in Pa and its partial derivative dp/dm in each edge
+    :rtype: (ndarray, ndarray)
+
+    ..[Oppelt, T., et al., 2016] Oppelt, T., et al. Dynamic thermo-hydraulic model of district cooling networks.
+      Applied Thermal Engineering, 2016.
+    """
+    mass_flow_rate_kgs = np.asarray(mass_flow_rate_kgs, dtype=np.float64)
+    pipe_diameter_m = np.asarray(pipe_diameter_m, dtype=np.float64)
+    reynolds = calc_reynolds(mass_flow_rate_kgs, temperature__k, pipe_diameter_m)
+    darcy = calc_darcy(pipe_diameter_m, reynolds)
+    coefficient = darcy * 8 * np.asarray(pipe_length_m, dtype=np.float64) / (
+            math.pi ** 2 * pipe_diameter_m ** 5 * P_WATER_KGPERM3)
+    return coefficient * mass_flow_rate_kgs ** 2, 2 * coefficient * mass_flow_rate_kgs
+
+
+def read_material_conductivities(thermal_networks_database):
+    """
+    :param thermal_networks_database: path to the thermal networks database (see
+        :py:meth:`cea.inputlocator.InputLocator.get_thermal_networks`)
+    :return: the thermal conductivities in W/(m*K) of the pipe (steel), the insulation (PUR) and the ground (soil),
+        read once per database file _[A. Kecebas et al., 2011]
+    :rtype: (float, float, float)
+    """
+    key = (thermal_networks_database, os.path.getmtime(thermal_networks_database))
+    if key not in _material_properties:
+        material_properties = pd.read_excel(thermal_networks_database, sheetname=['MATERIAL PROPERTIES'])[
+            'MATERIAL PROPERTIES']
+        material_properties = material_properties.set_index(material_properties['material'].values)
+        _material_properties[key] = tuple(material_properties.ix[material, 'lambda_WmK']
+                                          for material in ['Steel', 'PUR', 'Soil'])
+    return _material_properties[key]
+
+
+class PipeProperties(object):
+    """
+    The pipes of the edges of a network with the thermal resistances that don't depend on the flow, equation (3) in
+    [Wang et al., 2016]. The methods evaluate the pipes for arrays of mass flows and temperatures ending with the
+    edges (e or t x e).
+
+    :param pipe_properties_df: the pipe catalogue data of each edge (rows ``D_int_m``, ``D_ext_m``, ``D_ins_m``, a
+        column per edge)
+    :type pipe_properties_df: DataFrame
+    :param pipe_length_m: the length of each edge (indexed by the edges)
+    :type pipe_length_m: Series
+    :param material_conductivities: the conductivities of the pipe, insulation and ground (see
+        :py:func:`read_material_conductivities`)
+    :param network_type: 'DH' or 'DC'
+
+    ..[Wang et al, 2016] Wang J., Zhou, Z., Zhao, J. (2016). A method for the steady-state thermal simulation of
+      district heating systems and model parameters calibration. Eenergy Conversion and Management, 120, 294-305.
+    """
+
+    def __init__(self, pipe_properties_df, pipe_length_m, material_conductivities, network_type):
+        pipe_properties_df = pipe_properties_df[pipe_length_m.index]
+        self.network_type = network_type
+        self.pipe_length_m = pipe_length_m.values.astype(np.float64)
+        self.pipe_diameter_m = pipe_properties_df.loc['D_int_m'].values.astype(np.float64)
+        outer_diameter_m = pipe_properties_df.loc['D_ext_m'].values.astype(np.float64)
+        insulation_diameter_m = pipe_properties_df.loc['D_ins_m'].values.astype(np.float64)
+        conductivity_pipe, conductivity_insulation, conductivity_ground = material_conductivities
+
+        r_pipe = np.log(outer_diameter_m / self.pipe_diameter_m) / (2 * math.pi * conductivity_pipe)  # [m*K/W]
+        if network_type == 'DC':
+            # approximation based on COOLMANT CLM 2.0 Pipe catalogue
+            insulation_thickness_m = 0.25 * insulation_diameter_m
+        else:
+            insulation_thickness_m = insulation_diameter_m
+        r_insulation = np.log((insulation_thickness_m + outer_diameter_m) / outer_diameter_m) / (
+                2 * math.pi * conductivity_insulation)  # [m*K/W]
+        a = 2 * NETWORK_DEPTH / insulation_diameter_m
+        r_ground = np.log(a + (a ** 2 - 1) ** 0.5) / (2 * math.pi * conductivity_ground)  # [m*K/W]
+        self.resistance_without_flow = r_pipe + r_insulation + r_ground  # [m*K/W]
+
+    def calc_pressure_loss(self, mass_flow_rate_kgs, temperature__k):
+        """:return: the pressure loss in Pa and its derivative to the mass flow (see :py:func:`calc_pressure_loss`)"""
+        return calc_pressure_loss(self.pipe_diameter_m, self.pipe_length_m, mass_flow_rate_kgs, temperature__k)
+
+    def calc_heat_conduction_coefficient(self, mass_flow_rate_kgs, temperature__k):
+        """
+        Calculates the aggregated heat conduction coefficients of the pipes, equation (4) in [Wang et al., 2016].
+
+        :param mass_flow_rate_kgs: mass flow rate in each edge
+        :param temperature__k: temperature of the water in each edge
+        :return: the aggregated heat conduction coefficient of each edge in kW/K
+        :rtype: ndarray
+        """
+        reynolds = calc_reynolds(mass_flow_rate_kgs, temperature__k, self.pipe_diameter_m)
+        prandtl = calc_prandtl(temperature__k)
+        darcy = calc_darcy(self.pipe_diameter_m, reynolds)
+        nusselt = calc_nusselt(reynolds, prandtl, darcy, self.network_type)
+        alpha_th = calc_thermal_conductivity(temperature__k) * nusselt / self.pipe_diameter_m  # W/(m^2 * K)
+        no_flow = np.isclose(alpha_th, 0)
+        r_conv = np.where(no_flow, R_CONV_NO_FLOW,
+                          1 / (np.where(no_flow, 1, alpha_th) * math.pi * self.pipe_diameter_m))  # [m*K/W]
+        return abs(self.pipe_length_m * (1 + EXTRA_HEAT_TRANSFER_COEF) / (self.resistance_without_flow + r_conv) / 1000)
@@ -7,6 +7,7 @@ import time
 import numpy as np
 import scipy
 import cea.config
+from cea.demand import demand_reader
 from math import ceil
 from cea.constants import HEAT_CAPACITY_OF_WATER_JPERKGK
 from cea.technologies.constants import DT_COOL, DT_HEAT, U_COOL, U_HEAT, \
@@ -83,8 +84,8 @@ def determine_building_supply_temperatures(building_names, locator, substation_s
     buildings_demands = {}
     for name in building_names:
         name = str(name)
-        buildings_demands[name] = pd.read_csv(locator.get_demand_results_file(name),
-                                              usecols=(BUILDINGS_DEMANDS_COLUMNS))
+        buildings_demands[name] = demand_reader.read_hourly_demand(locator, name,
+                                                                   columns=BUILDINGS_DEMANDS_COLUMNS)
         Q_substation_heating = 0
         T_supply_heating_C = np.nan
         for system in substation_systems['heating']:
@@ -9,6 +9,8 @@ import time
 import numpy as np
 import pandas as pd
 import cea.technologies.thermal_network.substation_matrix as substation_matrix
+import cea.technologies.thermal_network.network_hydraulics as network_hydraulics
+import cea.technologies.thermal_network.network_properties as network_properties
 import math
 from cea.utilities import epwreader
 from cea.resources import geothermal
@@ -17,16 +19,15 @@ import geopandas as gpd
 import cea.config
 import cea.globalvar
 import cea.inputlocator
+import cea.utilities.jit
 import os
 import random
-import networkx as nx
-from itertools import repeat, izip
 import multiprocessing
 from math import ceil
 
 from cea.constants import HEAT_CAPACITY_OF_WATER_JPERKGK, P_WATER_KGPERM3, HOURS_IN_YEAR
 from cea.technologies.constants import ROUGHNESS, NETWORK_DEPTH, REDUCED_TIME_STEPS, MAX_INITIAL_DIAMETER_ITERATIONS, \
-    MAX_NODE_FLOW
+    MAX_NODE_FLOW, TIME_BLOCKS_PER_PROCESS
 from cea.optimization.constants import PUMP_ETA
 
 __author__ = "Martin Mosteiro Romero, Shanshan Hsieh, Lennart Rogenhofer"
@@ -74,6 +75,7 @@ class ThermalNetwork(object):
         self.node_mass_flow_df = None
         self.thermal_demand = None
         self.pipe_properties = None
+        self.pipes = None  # network_properties.PipeProperties of the edges, set with the pipe properties
 
         # get the thermal network description from either csv files or shapefile
         self.edge_node_df = None
@@ -112,6 +114,7 @@ class ThermalNetwork(object):
         mini_me.node_mass_flow_df = self.node_mass_flow_df
         mini_me.thermal_demand = self.thermal_demand
         mini_me.pipe_properties = self.pipe_properties
+        mini_me.pipes = self.pipes
 
         # get the thermal network description from either csv files or shapefile
         mini_me.edge_node_df = self.edge_node_df.copy()
@@ -478,6 +481,12 @@ def thermal_network_main(locator, network_type, network_name, file_type, set_dia
 
     # assign pipe id/od according to maximum edge mass flow
     thermal_network.pipe_properties = assign_pipes_to_edges(thermal_network, set_diameter)
+    # the thermal resistances of the pipes that don't depend on the flow, for the heat losses of every time step
+    material_conductivities = network_properties.read_material_conductivities(
+        locator.get_thermal_networks(config.region))
+    thermal_network.pipes = network_properties.PipeProperties(thermal_network.pipe_properties,
+                                                              thermal_network.edge_df['pipe length'],
+                                                              material_conductivities, network_type)
 
     # merge pipe properties to edge_df and then output as .csv
     thermal_network.edge_df = thermal_network.edge_df.merge(thermal_network.pipe_properties.T, left_index=True,
@@ -501,22 +510,20 @@ def thermal_network_main(locator, network_type, network_name, file_type, set_dia
     number_of_processes = config.get_number_of_processes()
     if number_of_processes > 1:
         print("Using %i CPU's" % number_of_processes)
-        pool = multiprocessing.Pool(number_of_processes)
-        hourly_thermal_results = pool.map(hourly_thermal_calculation_wrapper,
-                                          izip(range(start_t, stop_t),
-                                               repeat(thermal_network, times=(stop_t - start_t)),
-                                               repeat(thermal_network.config.region, times=(stop_t - start_t))))
+        # the network is sent to each worker once, the tasks are blocks of contiguous time steps
+        pool = multiprocessing.Pool(number_of_processes, initializer=initialize_worker,
+                                    initargs=({'thermal_network': thermal_network},))
+        blocks = split_into_time_blocks(start_t, stop_t, number_of_processes * TIME_BLOCKS_PER_PROCESS)
+        block_results = pool.map(thermal_calculation_block_worker, blocks)
         pool.close()
         pool.join()
     else:
-        hourly_thermal_results = map(hourly_thermal_calculation, range(start_t, stop_t),
-                                     repeat(thermal_network, times=(stop_t - start_t)),
-                                     repeat(thermal_network.config.region, times=(stop_t - start_t)))
+        blocks = [(start_t, stop_t)]
+        block_results = [thermal_calculation_block(blocks[0], thermal_network)]
 
     # save results of hourly values over full year, write to csv
     # edge flow rates (flow direction corresponding to edge_node_df)
-    csv_outputs = {field: [getattr(htr, field) for htr in hourly_thermal_results]
-                   for field in HourlyThermalResults._fields}
+    csv_outputs = merge_time_blocks(blocks, block_results, start_t, stop_t)
     save_all_results_to_csv(csv_outputs, thermal_network)
 
     # identify all plants
@@ -529,10 +536,7 @@ def thermal_network_main(locator, network_type, network_name, file_type, set_dia
     all_nodes_df_output = all_nodes_df_output.assign(Q_hex_plant_kW=pd.Series(np.zeros(len(all_nodes_df_output.index))))
     # calculate maximum plant heat demand
     for index_number, plant_index in enumerate(plant_indexes):
-        if len(plant_indexes) > 1:
-            max_demand = abs(max(csv_outputs['plant_heat_requirement'][index_number]))
-        else:
-            max_demand = abs(max(csv_outputs['plant_heat_requirement'], key=abs))
+        max_demand = np.nanmax(np.abs(csv_outputs['plant_heat_requirement'][:, index_number]))
         # add plant heat demand to node.csv file
         ID = np.where(all_nodes_df_output['Name'] == 'NODE' + str(plant_index))[0][0]
         all_nodes_df_output['Q_hex_plant_kW'][ID] = max_demand
@@ -823,10 +827,73 @@ def calculate_ground_temperature(locator, config):
     return T_ground_K
 
 
-def hourly_thermal_calculation_wrapper(args):
-    """Wrap hourly_thermal_calculation to accept a tuple of args because multiprocessing.Pool.map only accepts one
-    argument for the function."""
-    return hourly_thermal_calculation(*args)
+# inputs common to all time steps (the thermal network...), set in each worker process by `initialize_worker`
+_worker_inputs = {}
+
+
+def initialize_worker(worker_inputs):
+    """
+    Initializer of the worker processes of :py:func:`thermal_network_main` and :py:func:`calc_max_edge_flowrate`: keep
+    the thermal network (and the other inputs common to all time steps) for the blocks of time steps run by this
+    worker, so the network is only sent once to each worker.
+
+    :type worker_inputs: dict
+    """
+    _worker_inputs.clear()
+    _worker_inputs.update(worker_inputs)
+
+
+def split_into_time_blocks(start_t, stop_t, number_of_blocks):
+    """
+    :return: the time steps from ``start_t`` to (one-past) ``stop_t`` as blocks of contiguous time steps (start, stop)
+    :rtype: list[(int, int)]
+    """
+    number_of_blocks = max(1, min(number_of_blocks, stop_t - start_t))
+    bounds = [start_t + (stop_t - start_t) * i // number_of_blocks for i in range(number_of_blocks + 1)]
+    return [(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def merge_time_blocks(blocks, block_results, start_t, stop_t):
+    """
+    Collect the results of the blocks of time steps into a single array per result.
+
+    :param block_results: the results of each block, as returned by :py:func:`thermal_calculation_block`
+    :return: an array per result with a row per time step from ``start_t`` to ``stop_t``
+    :rtype: dict[str, ndarray]
+    """
+    results = {}
+    for (start, stop), block_result in zip(blocks, block_results):
+        for field, values in block_result.items():
+            if field not in results:
+                results[field] = np.empty((stop_t - start_t, values.shape[1]))
+            results[field][start - start_t:stop - start_t] = values
+    return results
+
+
+def thermal_calculation_block_worker(block):
+    """Run :py:func:`thermal_calculation_block` in a worker process (see :py:func:`initialize_worker`)"""
+    return thermal_calculation_block(block, _worker_inputs['thermal_network'])
+
+
+def thermal_calculation_block(block, thermal_network):
+    """
+    Run :py:func:`hourly_thermal_calculation` for a block of contiguous time steps.
+
+    :param block: the first and (one-past) last time step of the block
+    :type block: (int, int)
+    :return: the results of the block: an array per field of :py:class:`HourlyThermalResults` with a row per time step
+    :rtype: dict[str, ndarray]
+    """
+    start, stop = block
+    results = {}
+    for i, t in enumerate(range(start, stop)):
+        hourly_thermal_results = hourly_thermal_calculation(t, thermal_network, thermal_network.config.region)
+        for field in HourlyThermalResults._fields:
+            values = np.ravel(getattr(hourly_thermal_results, field))
+            if field not in results:
+                results[field] = np.empty((stop - start, len(values)))
+            results[field][i] = values
+    return results
 
 
 def hourly_thermal_calculation(t, thermal_network, region):
@@ -935,20 +1002,19 @@ def calc_mass_flow_edges(edge_node_df, mass_flow_substation_df, all_nodes_df, pi
     .. [Oppelt, T., et al., 2016] Oppelt, T., et al. Dynamic thermo-hydraulic model of district cooling networks.
        Applied Thermal Engineering, 2016.
     """
-    edge_node_df = edge_node_df.copy()
-    loops, graph = find_loops(edge_node_df)  # identifies all linear independent loops
+    hydraulics = network_hydraulics.get_network_hydraulics(edge_node_df)
+    node_flows = np.nan_to_num(np.asarray(mass_flow_substation_df, dtype=np.float64).ravel())
+    plant_index = np.where(all_nodes_df['Type'] == 'PLANT')[0][0]  # find index of the first plant node
+    loops = hydraulics.loops  # identifies all linear independent loops
     if loops:
         # print('Fundamental loops in the network:', loops) #returns nodes that define loop, useful for visiual verification in testing phase,
 
-        sum_delta_m_num = np.zeros((1, len(loops)))[0]
+        sum_delta_m_num = np.zeros(len(loops))
 
         # if loops exist:
         # 1. calculate initial guess solution of matrix A
-        # delete first plant on an edge of matrix and solution space b as these are redundant
-        A = edge_node_df.drop(edge_node_df.index[0], 0)  # solution matrix A without loop equations (kirchhoff 2)
-        b_init = np.nan_to_num(mass_flow_substation_df.drop(mass_flow_substation_df.columns[0], 1).transpose())
-        # solution vector b of node demands
-        mass_flow_edge = np.linalg.lstsq(A, b_init)[0].transpose()[0]  # solve system
+        # delete first node of matrix and solution space b as these are redundant (kirchhoff 2 without loop equations)
+        mass_flow_edge = hydraulics.solve_edge_flows(node_flows, 0)
 
         # setup iterations for implicit matrix solver
         tolerance = 0.01  # tolerance for mass flow convergence
@@ -961,54 +1027,16 @@ def calc_mass_flow_edges(edge_node_df, mass_flow_substation_df, all_nodes_df, pi
 
             # calculate value similar to Hardy Cross correction factor
             # uses Hardy Cross method but a different variation for calculating the mass flow
-            delta_m_num = calc_pressure_loss_pipe(pipe_diameter_m, pipe_length_m, m_old, T_edge_K,
-                                                  2) * np.sign(m_old)  # calculate pressure losses
-            delta_m_den = abs(calc_pressure_loss_pipe(pipe_diameter_m, pipe_length_m, m_old, T_edge_K,
-                                                      1))  # calculate derivatives of pressure losses
-            delta_m_num = delta_m_num.transpose()
-
-            sum_delta_m_num = np.zeros((1, len(loops)))[0]
-            sum_delta_m_den = np.zeros((1, len(loops)))[0]
-
-            for i in range(len(loops)):
-                # calculate the mass flow correction for each loop
-                # iterate over loops
-                # save the edge number connecting the nodes of the loops into the variable index
-                for j in range(len(loops[i])):
-                    if j == len(loops[i]) - 1:
-                        value = loops[i][0]
-                    else:
-                        value = loops[i][j + 1]
-                    index = graph.get_edge_data(loops[i][j], value)
-                    # check if nodes  defined in clockwise loop, to keep sign convention for Hardy Cross Method
-                    if not (edge_node_df.iloc[loops[i][j]][index['edge_number']] == 1) & \
-                           (edge_node_df.iloc[value][index['edge_number']] == -1):
-                        clockwise = -1
-                    else:
-                        clockwise = 1
-                    sum_delta_m_num[i] = sum_delta_m_num[i] + delta_m_num[index["edge_number"]] * clockwise
-                    sum_delta_m_den[i] = sum_delta_m_den[i] + delta_m_den[index["edge_number"]]
-                # calculate flow correction for each loop
-                if np.isclose(sum_delta_m_den[i], 0):
-                    delta_m = 0
-                else:
-                    delta_m = -sum_delta_m_num[i] / sum_delta_m_den[i]
-
-                # apply mass flow correction to all edges of each loop
-                for j in range(len(loops[i])):
-                    if j == len(loops[i]) - 1:
-                        value = loops[i][0]
-                    else:
-                        value = loops[i][j + 1]
-                    index = graph.get_edge_data(loops[i][j], value)
-                    # check if nodes  defined in clockwise loop
-                    if not (edge_node_df.iloc[loops[i][j]][index['edge_number']] == 1) & \
-                           (edge_node_df.iloc[value][index['edge_number']] == -1):
-                        clockwise = -1
-                    else:
-                        clockwise = 1
-                    # apply loop correction
-                    mass_flow_edge[index["edge_number"]] = mass_flow_edge[index["edge_number"]] + delta_m * clockwise
+            # calculate pressure losses and their derivatives
+            pressure_loss_edges, pressure_loss_derivative_edges = network_properties.calc_pressure_loss(
+                pipe_diameter_m, pipe_length_m, m_old, T_edge_K)
+            delta_m_num = pressure_loss_edges * np.sign(m_old)
+            delta_m_den = abs(pressure_loss_derivative_edges)
+
+            # calculate the mass flow correction for each loop and apply it to all edges of each loop
+            delta_m_edges, sum_delta_m_num = hydraulics.calc_loop_correction(np.ravel(delta_m_num),
+                                                                             np.ravel(delta_m_den))
+            mass_flow_edge = mass_flow_edge + delta_m_edges
             iterations = iterations + 1
 
             # adapt tolerance to reduce total amount of iterations
@@ -1027,18 +1055,11 @@ def calc_mass_flow_edges(edge_node_df, mass_flow_substation_df, all_nodes_df, pi
 
     else:  # no loops
         ## remove one equation (at plant node) to build a well-determined matrix, A.
-        plant_index = np.where(all_nodes_df['Type'] == 'PLANT')[0][0]  # find index of the first plant node
-        A = edge_node_df.drop(edge_node_df.index[plant_index])
-        b = np.nan_to_num(mass_flow_substation_df.T)
-        b = np.delete(b, plant_index)
-        mass_flow_edge = np.linalg.solve(A.values, b)
+        mass_flow_edge = hydraulics.solve_edge_flows(node_flows, plant_index)
 
     # verify calculated solution
-    plant_index = np.where(all_nodes_df['Type'] == 'PLANT')[0][0]  # find index of the first plant node
-    A = edge_node_df.drop(edge_node_df.index[plant_index])
-    b_verification = A.dot(mass_flow_edge)
-    b_original = np.nan_to_num(mass_flow_substation_df.T)
-    b_original = np.delete(b_original, plant_index)
+    b_verification = np.delete(hydraulics.calc_node_flows(mass_flow_edge), plant_index)
+    b_original = np.delete(node_flows, plant_index)
     if max(abs(b_original - b_verification)) > 0.01:
         print('Error in the defined mass flows, deviation of ', max(abs(b_original - b_verification)),
               ' from node demands.')
@@ -1070,21 +1091,9 @@ def find_loops(edge_node_df):
     :rtype: loops: list
     :rtype: graph: dictionary
     """
-    edge_node_df_t = np.transpose(edge_node_df)  # transpose matrix to more intuitively setup graph
-
-    graph = nx.Graph()  # set up networkx type graph
-
-    for i in range(edge_node_df_t.shape[0]):
-        new_edge = [0, 0]
-        for j in range(0, edge_node_df_t.shape[1]):
-            if edge_node_df_t.iloc[i][edge_node_df_t.columns[j]] == 1:
-                new_edge[0] = j
-            elif edge_node_df_t.iloc[i][edge_node_df_t.columns[j]] == -1:
-                new_edge[1] = j
-        graph.add_edge(new_edge[0], new_edge[1], edge_number=i)  # add edges to graph
-        # edge number necessary to later identify which edges are in loop since graph is a dictionary
-
-    loops = nx.cycle_basis(graph, 0)  # identifies all linear independent loops
+    hydraulics = network_hydraulics.get_network_hydraulics(edge_node_df)
+    loops = hydraulics.loops  # identifies all linear independent loops
+    graph = hydraulics.graph
 
     return loops, graph
 
@@ -1254,13 +1263,12 @@ def calc_pressure_nodes(t_supply_node__k, t_return_node__k, thermal_network, t):
     # A12 * H + F(Q) = -A10 * H0 = 0
     # edge_node_transpose * pressure_nodes = - (pressure_loss_pipe) (Ax = b)
     # ToDo: does not apply for looped networks
-    edge_node_transpose = np.transpose(edge_node_df.values)
+    hydraulics = network_hydraulics.get_network_hydraulics(edge_node_df)
     pressure_nodes_supply__pa = np.round(
-        np.transpose(np.linalg.lstsq(edge_node_transpose, np.transpose(pressure_loss_pipe_supply__pa) * (-1))[0]),
-        decimals=5)
+        hydraulics.calc_node_pressures(-np.ravel(pressure_loss_pipe_supply__pa)).reshape(1, -1), decimals=5)
+    # the return network is the supply network with all edges reversed
     pressure_nodes_return__pa = np.round(
-        np.transpose(np.linalg.lstsq(-edge_node_transpose, np.transpose(pressure_loss_pipe_return__pa) * (-1))[0]),
-        decimals=5)
+        hydraulics.calc_node_pressures(np.ravel(pressure_loss_pipe_return__pa)).reshape(1, -1), decimals=5)
     return pressure_nodes_supply__pa, pressure_nodes_return__pa, pressure_loss_system__pa, \
            pressure_loss_total_kw, pressure_loss_pipes_kW[0], pressure_loss_substations_kW
 
@@ -1452,18 +1460,13 @@ def calc_pressure_loss_pipe(pipe_diameter_m, pipe_length_m, mass_flow_rate_kgs,
     mass_flow_rate_kgs = np.array(mass_flow_rate_kgs)
     pipe_length_m = np.array(pipe_length_m)
     pipe_diameter_m = np.array(pipe_diameter_m)
-    reynolds = calc_reynolds(mass_flow_rate_kgs, t_edge__k, pipe_diameter_m)
-
-    darcy = calc_darcy(pipe_diameter_m, reynolds, ROUGHNESS)
+    pressure_loss_edge_Pa, pressure_loss_derivative_edge = network_properties.calc_pressure_loss(
+        pipe_diameter_m, pipe_length_m, mass_flow_rate_kgs, t_edge__k)
 
     if loop_type == 1:  # dp/dm parital derivative of edge pressure loss equation
-        pressure_loss_edge_Pa = darcy * 16 * mass_flow_rate_kgs * pipe_length_m / (
-                math.pi ** 2 * pipe_diameter_m ** 5 * P_WATER_KGPERM3)
-    else:
-        # calculate the pressure losses through a pipe using the Darcy-Weisbach equation
-        pressure_loss_edge_Pa = darcy * 8 * mass_flow_rate_kgs ** 2 * pipe_length_m / (
-                math.pi ** 2 * pipe_diameter_m ** 5 * P_WATER_KGPERM3)
-    return pressure_loss_edge_Pa
+        pressure_loss_edge_Pa = pressure_loss_derivative_edge
+    # the shape of the result follows the mass flows and the pipe data, as the temperatures may be given as (1 x e)
+    return pressure_loss_edge_Pa.reshape(np.broadcast(mass_flow_rate_kgs, pipe_length_m, pipe_diameter_m).shape)
 
 
 def calc_pressure_loss_system(pressure_loss_pipe_supply, pressure_loss_pipe_return, pressure_loss_substation):
@@ -1496,26 +1499,8 @@ def calc_darcy(pipe_diameter_m, reynolds, pipe_roughness_m):
        Fundamentals of Heat and Mass Transfer. https://doi.org/10.1016/j.applthermaleng.2011.03.022
     """
 
-    darcy = np.zeros(reynolds.size)
     # necessary to make sure pipe_diameter is 1D vector as input formats can vary
-    if hasattr(pipe_diameter_m[0], '__len__'):
-        pipe_diameter_m = pipe_diameter_m[0]
-    for rey in range(reynolds.size):
-        if reynolds[rey] <= 1:
-            darcy[rey] = 0
-        elif reynolds[rey] <= 2300:
-            # calculate the Darcy-Weisbach friction factor for laminar flow
-            darcy[rey] = 64 / reynolds[rey]
-        elif reynolds[rey] <= 5000:
-            # calculate the Darcy-Weisbach friction factor for transient flow (for pipe roughness of e/D=0.0002,
-            # @low reynolds numbers lines for smooth pipe nearl identical in Moody Diagram) so smooth pipe approximation used
-            darcy[rey] = 0.316 * reynolds[rey] ** -0.25
-        else:
-            # calculate the Darcy-Weisbach friction factor using the Swamee-Jain equation, applicable for Reynolds= 5000 - 10E8; pipe_roughness=10E-6 - 0.05
-            darcy[rey] = 1.325 * np.log(
-                pipe_roughness_m / (3.7 * pipe_diameter_m[rey]) + 5.74 / reynolds[rey] ** 0.9) ** (-2)
-
-    return darcy
+    return network_properties.calc_darcy(np.ravel(pipe_diameter_m), np.ravel(reynolds), pipe_roughness_m)
 
 
 def calc_reynolds(mass_flow_rate_kgs, temperature__k, pipe_diameter_m):
@@ -1529,10 +1514,7 @@ def calc_reynolds(mass_flow_rate_kgs, temperature__k, pipe_diameter_m):
     :type mass_flow_rate_kgs: ndarray
     :type temperature__k: list
     """
-    kinematic_viscosity_m2s = calc_kinematic_viscosity(temperature__k)  # m2/s
-
-    reynolds = np.nan_to_num(
-        4 * (abs(mass_flow_rate_kgs) / P_WATER_KGPERM3) / (math.pi * kinematic_viscosity_m2s * pipe_diameter_m))
+    reynolds = network_properties.calc_reynolds(mass_flow_rate_kgs, temperature__k, pipe_diameter_m)
     # necessary if statement to make sure ouput is an array type, as input formats of files can vary
     if hasattr(reynolds[0], '__len__'):
         reynolds = reynolds[0]
@@ -1546,11 +1528,7 @@ def calc_prandtl(temperature__k):
     :param temperature__k: matrix containing the temperature of the water in each edge e at time t             (t x e)
     :type temperature__k: list
     """
-    kinematic_viscosity_m2s = calc_kinematic_viscosity(temperature__k)  # m2/s
-    thermal_conductivity = calc_thermal_conductivity(temperature__k)  # W/(m*K)
-
-    return np.nan_to_num(
-        kinematic_viscosity_m2s * P_WATER_KGPERM3 * HEAT_CAPACITY_OF_WATER_JPERKGK / thermal_conductivity)
+    return network_properties.calc_prandtl(temperature__k)
 
 
 def calc_kinematic_viscosity(temperature):
@@ -1561,10 +1539,7 @@ def calc_kinematic_viscosity(temperature):
     :param temperature: in K
     :return: kinematic viscosity in m2/s
     """
-    # check if list type, this can cause problems
-    if isinstance(temperature, (list,)):
-        temperature = np.array(temperature)
-    return 2.652623e-8 * math.e ** (557.5447 * (temperature - 140) ** -1)
+    return network_properties.calc_kinematic_viscosity(temperature)
 
 
 def calc_thermal_conductivity(temperature):
@@ -1580,7 +1555,7 @@ def calc_thermal_conductivity(temperature):
 
     """
 
-    return 0.6065 * (-1.48445 + 4.12292 * temperature / 298.15 - 1.63866 * (temperature / 298.15) ** 2)
+    return network_properties.calc_thermal_conductivity(temperature)
 
 
 def calc_max_edge_flowrate(thermal_network, set_diameter, start_t, stop_t, substation_systems, config,
@@ -1666,26 +1641,27 @@ def calc_max_edge_flowrate(thermal_network, set_diameter, start_t, stop_t, subst
         print('\n Diameter iteration number ', iterations)
         diameter_guess_old = diameter_guess
 
-        # hourly_mass_flow_calculation
-        t = range(start_t, stop_t)
-        nhours = stop_t - start_t
-
+        # hourly_mass_flow_calculation, in blocks of time steps
         number_of_processes = config.get_number_of_processes()
         if number_of_processes > 1:
             print("Using %i CPU's" % number_of_processes)
-            pool = multiprocessing.Pool(number_of_processes)
-            mass_flows = pool.map(hourly_mass_flow_calculation_wrapper,
-                                  izip(t, repeat(diameter_guess, nhours), repeat(thermal_network, nhours)))
+            # the network is sent to each worker once, the tasks are blocks of contiguous time steps
+            pool = multiprocessing.Pool(number_of_processes, initializer=initialize_worker,
+                                        initargs=({'thermal_network': thermal_network,
+                                                   'diameter_guess': diameter_guess},))
+            blocks = split_into_time_blocks(start_t, stop_t, number_of_processes * TIME_BLOCKS_PER_PROCESS)
+            block_results = pool.map(mass_flow_calculation_block_worker, blocks)
             pool.close()
             pool.join()
         else:
-            mass_flows = map(hourly_mass_flow_calculation, t,
-                             repeat(diameter_guess, nhours), repeat(thermal_network, nhours))
+            blocks = [(start_t, stop_t)]
+            block_results = [mass_flow_calculation_block(blocks[0], diameter_guess, thermal_network)]
+        mass_flows = merge_time_blocks(blocks, block_results, start_t, stop_t)
 
         # write mass flows to the dataframes
-        thermal_network.edge_mass_flow_df.iloc[range(start_t, stop_t)] = [mfe[0] for mfe in mass_flows]
-        thermal_network.node_mass_flow_df.iloc[range(start_t, stop_t)] = [mfe[1] for mfe in mass_flows]
-        thermal_network.thermal_demand.iloc[range(start_t, stop_t)] = [mfe[2] for mfe in mass_flows]
+        thermal_network.edge_mass_flow_df.iloc[start_t:stop_t] = mass_flows['edge_mass_flows']
+        thermal_network.node_mass_flow_df.iloc[start_t:stop_t] = mass_flows['node_mass_flows']
+        thermal_network.thermal_demand.iloc[start_t:stop_t] = mass_flows['thermal_demand']
 
         # update diameter guess for iteration
         pipe_properties_df = assign_pipes_to_edges(thermal_network, set_diameter)
@@ -1790,9 +1766,29 @@ def read_in_diameters_from_shapefile(thermal_network):
     return diameter_guess
 
 
-def hourly_mass_flow_calculation_wrapper(args):
-    """A wrapper around hourly_mass_flow_calculation because multiprocessing.Pool.map only allows one argument"""
-    return hourly_mass_flow_calculation(*args)
+def mass_flow_calculation_block_worker(block):
+    """Run :py:func:`mass_flow_calculation_block` in a worker process (see :py:func:`initialize_worker`)"""
+    return mass_flow_calculation_block(block, _worker_inputs['diameter_guess'], _worker_inputs['thermal_network'])
+
+
+def mass_flow_calculation_block(block, diameter_guess, thermal_network):
+    """
+    Run :py:func:`hourly_mass_flow_calculation` for a block of contiguous time steps.
+
+    :param block: the first and (one-past) last time step of the block
+    :type block: (int, int)
+    :return: the edge mass flows, node mass flows and thermal demand of the buildings with a row per time step
+    :rtype: dict[str, ndarray]
+    """
+    start, stop = block
+    results = {'edge_mass_flows': np.empty((stop - start, thermal_network.edge_node_df.shape[1])),
+               'node_mass_flows': np.empty((stop - start, thermal_network.edge_node_df.shape[0])),
+               'thermal_demand': np.empty((stop - start, len(thermal_network.building_names)))}
+    for i, t in enumerate(range(start, stop)):
+        results['edge_mass_flows'][i], \
+        results['node_mass_flows'][i], \
+        results['thermal_demand'][i] = hourly_mass_flow_calculation(t, diameter_guess, thermal_network)
+    return results
 
 
 def hourly_mass_flow_calculation(t, diameter_guess, thermal_network):
@@ -2277,11 +2273,8 @@ def solve_network_temperatures(thermal_network, t):
         t_edge__k = calc_edge_temperatures(initial_guess_temp, edge_node_df.copy())
 
         # initialization of K_value
-        k = calc_aggregated_heat_conduction_coefficient(edge_mass_flow_df,
-                                                        thermal_network.locator, thermal_network.edge_df,
-                                                        thermal_network.pipe_properties, t_edge__k,
-                                                        thermal_network.network_type,
-                                                        thermal_network.config.region)  # [kW/K]
+        k = calc_aggregated_heat_conduction_coefficient(edge_mass_flow_df, thermal_network.pipes,
+                                                        t_edge__k)  # [kW/K]
 
         ## calculate node temperatures on the supply network accounting losses in the network.
         t_supply_nodes__k, \
@@ -2335,11 +2328,8 @@ def solve_network_temperatures(thermal_network, t):
                                                               edge_mass_flow_df_2_kgs, min_iteration, t)
 
                 # calculate updated pipe aggregated heat conduction coefficient with new mass flows
-                k = calc_aggregated_heat_conduction_coefficient(edge_mass_flow_df_2_kgs, thermal_network.locator,
-                                                                thermal_network.edge_df,
-                                                                thermal_network.pipe_properties, t_edge__k,
-                                                                thermal_network.network_type,
-                                                                thermal_network.config.region)  # [kW/K]
+                k = calc_aggregated_heat_conduction_coefficient(edge_mass_flow_df_2_kgs, thermal_network.pipes,
+                                                                t_edge__k)  # [kW/K]
 
             # calculate updated node temperatures on the supply network with updated edge mass flow
             t_supply_nodes_2__k, plant_node, q_loss_edges_2_supply_kW = calc_supply_temperatures(
@@ -2400,12 +2390,8 @@ def solve_network_temperatures(thermal_network, t):
                 # calculate node temperatures on the return network
                 # calculate final edge temperature and heat transfer coefficient
                 # todo: suboptimal because using supply temperatures (limited effect since effects only water conductivity). Could be solved by iteration.
-                k = calc_aggregated_heat_conduction_coefficient(edge_mass_flow_df_2_kgs,
-                                                                thermal_network.locator,
-                                                                thermal_network.edge_df,
-                                                                thermal_network.pipe_properties, t_edge__k,
-                                                                thermal_network.network_type,
-                                                                thermal_network.config.region)  # [kW/K]
+                k = calc_aggregated_heat_conduction_coefficient(edge_mass_flow_df_2_kgs, thermal_network.pipes,
+                                                                t_edge__k)  # [kW/K]
 
                 t_return_nodes_2__k, \
                 q_loss_edges_2_return_kW = calc_return_temperatures(thermal_network.T_ground_K[t],
@@ -2536,18 +2522,10 @@ def calc_supply_temperatures(t_ground__k, edge_node_df, mass_flow_df, k, t_targe
     :rtype plant_node: numpy array
 
     """
-    z = np.asarray(edge_node_df.copy())  # (nxe) edge-node matrix
-    z_pipe_out = z.clip(min=0)  # pipe outlet matrix
-    z_pipe_in = z.clip(max=0)  # pipe inlet matrix
-
-    m_d = np.zeros((z.shape[1], z.shape[1]))  # (exe) pipe mass flow rate matrix
-    np.fill_diagonal(m_d, mass_flow_df)
-
-    # matrices to store results
-    t_e_out = z_pipe_out.copy()
-    t_e_in = z_pipe_in.copy().dot(-1)
-    t_node = np.zeros(z.shape[0])
-    z_note = z.copy()  # matrix to store information of solved nodes
+    is_plant = np.asarray(all_nodes_df['Type'] == 'PLANT')
+    plant_node = np.where(is_plant)[0]  # the node indices of the plant nodes in the edge-node index
+    # radial networks are solved in a single pass along the flow, looped networks by iteration
+    radial_flow = calc_radial_flow(edge_node_df, mass_flow_df)
 
     # start node temperature calculation
     flag = 0
@@ -2555,96 +2533,20 @@ def calc_supply_temperatures(t_ground__k, edge_node_df, mass_flow_df, k, t_targe
     t_plant_sup_0 = 273.15 + t_target_supply__c.max() if network_type == 'DH' else 273.15 + t_target_supply__c.min()
     t_plant_sup = t_plant_sup_0
     iteration = 0
+    z = m_d = None  # the dense matrices of the iterative solution, only built for looped networks
     while flag == 0:
-        # not_stuck variable is necessary because of looped networks. Here it is possible that we have only a closed
-        # loop remaining and no obvious place to start. In this case, iteration with an initial value is necessary
-        not_stuck = np.array([True] * z.shape[0])
-        # count number of iterations
-        temp_iter = 0
-        # tolerance for convergence of temperature
-        temp_tolerance = 1
-        # initialize delta to some value above the tolerance
-        delta_temp_0 = 2
-        # iterate over temperatures for loop networks
-        while delta_temp_0 >= temp_tolerance:
-            t_e_out_old = np.array(t_e_out)
-            # reset_matrixes
-            z_note = z.copy()
-            t_e_out = z_pipe_out.copy()
-            t_e_in = z_pipe_in.copy().dot(-1)
-            t_node = np.zeros(z.shape[0])
-
-            # # calculate the pipe outlet temperature from the plant node
-            for i in range(z.shape[0]):
-                if all_nodes_df.iloc[i]['Type'] == 'PLANT':  # find plant node
-                    # write plant inlet temperature
-                    t_node[i] = t_plant_sup  # assume plant inlet temperature
-                    edge = np.where(t_e_in[i] != 0)[0]  # find edge index
-                    t_e_in[i] = t_e_in[i] * t_node[i]
-                    # calculate pipe outlet temperature
-                    calc_t_out(i, edge, k, m_d, z, t_e_in, t_e_out, t_ground__k, z_note, thermal_network)
-            plant_node = t_node.nonzero()[0]  # the node indices of the plant nodes in the edge-node index
-
-
-            # Identify all nodes with no in or outflows and delete those values from the z matrixes
-            # This is necessary to avoid getting stuck in a loop network with no mass flows inside the loop
-            for i in range(z_note.shape[0]):
-                if np.isclose(sum(np.dot(m_d, z_pipe_out[i])),0) and np.isclose(sum(np.dot(m_d, z_pipe_in[i])),0):
-                    t_node[i] = np.nan
-                    # no in our outflows, clear in and outflows at this node
-                    # and clear node incoming flows from the corresponding edges
-                    outflowing_edges = [a for a, x in enumerate(z_note[i]) if np.isclose(x, 1.0)]
-                    if outflowing_edges:
-                        for edge in outflowing_edges:  # delete values where we were supposed to flow to
-                            target_node = np.where(z_note[:, edge] == -1)[0]
-                            z_note[target_node, edge] = 0.0
-                            z_pipe_in[target_node, edge] = 0.0
-                            t_e_in[target_node, edge] = 0.0
-                    outflowing_edges = [a for a, x in enumerate(z_note[i]) if np.isclose(x, -1.0)]
-                    if outflowing_edges:
-                        for edge in outflowing_edges:  # delete values where we were supposed to flow to
-                            target_node = np.where(z_note[:, edge] == 1)[0]
-                            z_note[target_node, edge] = 0.0
-                            z_pipe_out[target_node, edge] = 0.0
-                            t_e_out[target_node, edge] = 0.0
-                    target_edges = [a for a, x in enumerate(z_note[i]) if not np.isclose(x, 0.0)]
-                    if target_edges:
-                        for target_edge in target_edges:
-                            z_note[i, target_edge] = 0.0
-                            z_pipe_in[i, target_edge] = 0.0
-                            z_pipe_out[i, target_edge] = 0.0
-                            t_e_in[i, target_edge] = 0.0
-                            t_e_out[i, target_edge] = 0.0
-
-            # # calculate pipe outlet temperature and node temperature for the rest
-            while np.count_nonzero(np.isclose(t_node, 0)) > 0:
-                if not_stuck.any():  # if there are no changes for all elements but we have not yet solved the system
-                    z, z_note, m_d, t_e_out, z_pipe_out, t_node, t_e_in, t_ground__k, not_stuck = calculate_outflow_temp(
-                        z,
-                        z_note,
-                        m_d,
-                        t_e_out,
-                        z_pipe_out,
-                        t_node,
-                        t_e_in,
-                        t_ground__k,
-                        not_stuck,
-                        k, thermal_network)
-                else:  # stuck! this can happen with loops
-                    for i in range(np.shape(t_e_out)[1]):
-                        #check if we have a mass flow on this edge
-                        if np.any(t_e_out[:, i] == 1):
-                            z_note[np.where(t_e_out[:, i] == 1), i] = 0  # remove inflow value from z_note
-                            if temp_iter < 1:  # do this in first iteration only, since there is no previous value
-                                t_e_out[np.where(t_e_out[:, i] == 1), i] = t_node[
-                                    t_node.nonzero()].mean()  # assume some node temperature
-                            else:
-                                t_e_out[np.where(t_e_out[:, i] == 1), i] = t_e_out_old[np.where(t_e_out[:, i] == 1), i]
-                            break
-                    not_stuck = np.array([True] * z.shape[0])
-
-            delta_temp_0 = np.max(abs(t_e_out_old - t_e_out))
-            temp_iter = temp_iter + 1
+        solution = None
+        if radial_flow is not None:
+            solution = calc_supply_temperatures_radial(t_ground__k, radial_flow, k, t_plant_sup, is_plant,
+                                                       thermal_network)
+        if solution is None:
+            if m_d is None:
+                z = np.asarray(edge_node_df.copy())  # (nxe) edge-node matrix
+                m_d = np.zeros((z.shape[1], z.shape[1]))  # (exe) pipe mass flow rate matrix
+                np.fill_diagonal(m_d, mass_flow_df)
+            solution = calc_supply_temperatures_iterative(t_ground__k, z, m_d, k, t_plant_sup, is_plant,
+                                                          thermal_network)
+        t_node, q_loss_edges_kw = solution
 
         # # iterate the plant supply temperature until all the node temperature reaches the target temperatures
         if network_type == 'DH':
@@ -2658,12 +2560,6 @@ def calc_supply_temperatures(t_ground__k, edge_node_df, mass_flow_df, k, t_targe
                 # increase by the maximum amount of temperature deficit at nodes
                 t_plant_sup = t_plant_sup + abs(d_t.min())
                 # check if this term is positive, looping causes t_e_out to sink instead of rise.
-
-                # reset the matrices for supply network temperature calculation
-                z_note = z.copy()
-                t_e_out = z_pipe_out.copy()
-                t_e_in = z_pipe_in.copy().dot(-1)
-                t_node = np.zeros(z.shape[0])
                 iteration += 1
 
             elif all(d_t > -0.1) == False and iteration > 30:
@@ -2690,10 +2586,6 @@ def calc_supply_temperatures(t_ground__k, edge_node_df, mass_flow_df, k, t_targe
                 # increase plant supply temperature and re-iterate the node supply temperature calculation
                 # increase by the maximum amount of temperature deficit at nodes
                 t_plant_sup = t_plant_sup - abs(d_t.max())
-                z_note = z.copy()
-                t_e_out = z_pipe_out.copy()
-                t_e_in = z_pipe_in.copy().dot(-1)
-                t_node = np.zeros(z.shape[0])
                 iteration += 1
             elif all(d_t < 0.1) == False and iteration > 30:
                 # end iteration if too many iterations
@@ -2709,6 +2601,193 @@ def calc_supply_temperatures(t_ground__k, edge_node_df, mass_flow_df, k, t_targe
             else:
                 flag = 1
 
+    return t_node.T, plant_node, q_loss_edges_kw
+
+
+def calc_radial_flow(edge_node_df, mass_flow_df):
+    """
+    Prepare the solution of the node temperatures of a radial network in a single pass along the flow: in a network
+    without loops where all the mass flows follow the direction of the edges, the temperatures of the nodes can be
+    calculated in the topological order of the nodes. The order only depends on the edge-node matrix, so it is
+    calculated once per flow pattern (see :py:func:`network_hydraulics.get_network_hydraulics`).
+
+    :param edge_node_df: edge-node matrix with the direction of the flow in each edge (n x e)
+    :param mass_flow_df: mass flow rate of each edge (1 x e)
+    :return: the hydraulics of the network, the mass flows of the edges (e), the edges with flow (e) and the nodes
+        without in- or outflows (n), or None if the network can't be solved in a single pass
+    :rtype: tuple
+    """
+    mass_flow = np.ravel(np.asarray(mass_flow_df, dtype=np.float64))
+    if (mass_flow < 0).any():
+        return None
+    hydraulics = network_hydraulics.get_network_hydraulics(edge_node_df)
+    if hydraulics.loops or hydraulics.flow_order is None:
+        return None
+
+    # nodes with no in or outflows are left out, together with their edges (as in the iterative calculation)
+    inflow = np.bincount(hydraulics.end_nodes, weights=mass_flow, minlength=hydraulics.number_of_nodes)
+    outflow = np.bincount(hydraulics.start_nodes, weights=mass_flow, minlength=hydraulics.number_of_nodes)
+    no_flow_nodes = np.isclose(inflow, 0) & np.isclose(outflow, 0)
+    active_edges = ~(no_flow_nodes[hydraulics.start_nodes] | no_flow_nodes[hydraulics.end_nodes])
+    return hydraulics, mass_flow, active_edges, no_flow_nodes
+
+
+def calc_supply_temperatures_radial(t_ground__k, radial_flow, k, t_plant_sup, is_plant, thermal_network):
+    """
+    Calculate the node temperatures of the supply network of a radial network in a single pass along the flow,
+    starting from the plants (see :py:func:`calc_supply_temperatures`).
+
+    :param radial_flow: the flow in the network (see :py:func:`calc_radial_flow`)
+    :param t_plant_sup: supply temperature of the plants [K]
+    :param is_plant: True for the plant nodes (n)
+    :return: the node temperatures (n) and the heat losses of the edges (e), or None if the flow does not start at the
+        plants
+    :rtype: (ndarray, ndarray)
+    """
+    hydraulics, mass_flow, active_edges, no_flow_nodes = radial_flow
+    edges_in = [edges[active_edges[edges]] for edges in hydraulics.edges_in]
+    edges_out = [edges[active_edges[edges]] for edges in hydraulics.edges_out]
+    first_nodes = ~no_flow_nodes & (np.bincount(hydraulics.end_nodes[active_edges],
+                                                minlength=hydraulics.number_of_nodes) == 0)
+    if (first_nodes & ~is_plant).any() or (no_flow_nodes & is_plant).any():
+        return None
+
+    m_rounded = np.round(mass_flow, decimals=5)  # round to avoid errors at very very low massflows
+    t_node = np.zeros(hydraulics.number_of_nodes)
+    t_node[no_flow_nodes] = np.nan
+    t_e_in = np.zeros(hydraulics.number_of_edges)
+    t_e_out = np.zeros(hydraulics.number_of_edges)
+    for node in hydraulics.flow_order:
+        if no_flow_nodes[node]:
+            continue
+        if is_plant[node]:
+            t_node[node] = t_plant_sup
+        elif edges_out[node].size:
+            # calculate node temperature with merging flows from pipes
+            m_in = mass_flow[edges_in[node]]
+            t_node[node] = np.dot(m_in, np.nan_to_num(t_e_out[edges_in[node]])) / m_in.sum()
+            if np.isnan(t_node[node]):
+                raise ValueError('There are no flow entering/existing node', node,
+                                 '. Please check if the edge_node_df make sense.')
+        else:
+            # nodes at network branch ends
+            t_in = t_e_out[edges_in[node]]
+            t_node[node] = np.nan if np.isnan(t_in).any() else t_in.max()
+        for edge in edges_out[node]:
+            t_e_in[edge] = t_node[node]
+            t_e_out[edge] = calc_edge_outlet_temperature(edge, t_node[node], k[edge, edge], m_rounded[edge],
+                                                         t_ground__k, thermal_network)
+
+    return t_node, calc_edge_heat_losses(mass_flow, t_e_in, t_e_out)
+
+
+def calc_supply_temperatures_iterative(t_ground__k, z, m_d, k, t_plant_sup, is_plant, thermal_network):
+    """
+    Calculate the node temperatures of the supply network by going through the edge-node matrix until all nodes are
+    solved, iterating with an initial guess of the temperatures in looped networks (see
+    :py:func:`calc_supply_temperatures`).
+
+    :param z: edge-node matrix (n x e)
+    :param m_d: pipe mass flow rate matrix (e x e)
+    :param t_plant_sup: supply temperature of the plants [K]
+    :param is_plant: True for the plant nodes (n)
+    :return: the node temperatures (n) and the heat losses of the edges (e)
+    :rtype: (ndarray, ndarray)
+    """
+    z_pipe_out = z.clip(min=0)  # pipe outlet matrix
+    z_pipe_in = z.clip(max=0)  # pipe inlet matrix
+
+    # matrices to store results
+    t_e_out = z_pipe_out.copy()
+
+    # not_stuck variable is necessary because of looped networks. Here it is possible that we have only a closed
+    # loop remaining and no obvious place to start. In this case, iteration with an initial value is necessary
+    not_stuck = np.array([True] * z.shape[0])
+    # count number of iterations
+    temp_iter = 0
+    # tolerance for convergence of temperature
+    temp_tolerance = 1
+    # initialize delta to some value above the tolerance
+    delta_temp_0 = 2
+    # iterate over temperatures for loop networks
+    while delta_temp_0 >= temp_tolerance:
+        t_e_out_old = np.array(t_e_out)
+        # reset_matrixes
+        z_note = z.copy()
+        t_e_out = z_pipe_out.copy()
+        t_e_in = z_pipe_in.copy().dot(-1)
+        t_node = np.zeros(z.shape[0])
+
+        # # calculate the pipe outlet temperature from the plant node
+        for i in range(z.shape[0]):
+            if is_plant[i]:  # find plant node
+                # write plant inlet temperature
+                t_node[i] = t_plant_sup  # assume plant inlet temperature
+                edge = np.where(t_e_in[i] != 0)[0]  # find edge index
+                t_e_in[i] = t_e_in[i] * t_node[i]
+                # calculate pipe outlet temperature
+                calc_t_out(i, edge, k, m_d, z, t_e_in, t_e_out, t_ground__k, z_note, thermal_network)
+
+        # Identify all nodes with no in or outflows and delete those values from the z matrixes
+        # This is necessary to avoid getting stuck in a loop network with no mass flows inside the loop
+        for i in range(z_note.shape[0]):
+            if np.isclose(sum(np.dot(m_d, z_pipe_out[i])),0) and np.isclose(sum(np.dot(m_d, z_pipe_in[i])),0):
+                t_node[i] = np.nan
+                # no in our outflows, clear in and outflows at this node
+                # and clear node incoming flows from the corresponding edges
+                outflowing_edges = [a for a, x in enumerate(z_note[i]) if np.isclose(x, 1.0)]
+                if outflowing_edges:
+                    for edge in outflowing_edges:  # delete values where we were supposed to flow to
+                        target_node = np.where(z_note[:, edge] == -1)[0]
+                        z_note[target_node, edge] = 0.0
+                        z_pipe_in[target_node, edge] = 0.0
+                        t_e_in[target_node, edge] = 0.0
+                outflowing_edges = [a for a, x in enumerate(z_note[i]) if np.isclose(x, -1.0)]
+                if outflowing_edges:
+                    for edge in outflowing_edges:  # delete values where we were supposed to flow to
+                        target_node = np.where(z_note[:, edge] == 1)[0]
+                        z_note[target_node, edge] = 0.0
+                        z_pipe_out[target_node, edge] = 0.0
+                        t_e_out[target_node, edge] = 0.0
+                target_edges = [a for a, x in enumerate(z_note[i]) if not np.isclose(x, 0.0)]
+                if target_edges:
+                    for target_edge in target_edges:
+                        z_note[i, target_edge] = 0.0
+                        z_pipe_in[i, target_edge] = 0.0
+                        z_pipe_out[i, target_edge] = 0.0
+                        t_e_in[i, target_edge] = 0.0
+                        t_e_out[i, target_edge] = 0.0
+
+        # # calculate pipe outlet temperature and node temperature for the rest
+        while np.count_nonzero(np.isclose(t_node, 0)) > 0:
+            if not_stuck.any():  # if there are no changes for all elements but we have not yet solved the system
+                z, z_note, m_d, t_e_out, z_pipe_out, t_node, t_e_in, t_ground__k, not_stuck = calculate_outflow_temp(
+                    z,
+                    z_note,
+                    m_d,
+                    t_e_out,
+                    z_pipe_out,
+                    t_node,
+                    t_e_in,
+                    t_ground__k,
+                    not_stuck,
+                    k, thermal_network)
+            else:  # stuck! this can happen with loops
+                for i in range(np.shape(t_e_out)[1]):
+                    #check if we have a mass flow on this edge
+                    if np.any(t_e_out[:, i] == 1):
+                        z_note[np.where(t_e_out[:, i] == 1), i] = 0  # remove inflow value from z_note
+                        if temp_iter < 1:  # do this in first iteration only, since there is no previous value
+                            t_e_out[np.where(t_e_out[:, i] == 1), i] = t_node[
+                                t_node.nonzero()].mean()  # assume some node temperature
+                        else:
+                            t_e_out[np.where(t_e_out[:, i] == 1), i] = t_e_out_old[np.where(t_e_out[:, i] == 1), i]
+                        break
+                not_stuck = np.array([True] * z.shape[0])
+
+        delta_temp_0 = np.max(abs(t_e_out_old - t_e_out))
+        temp_iter = temp_iter + 1
+
     # calculate pipe heat losses
     q_loss_edges_kw = np.zeros(z_note.shape[1])
     for edge in range(z_note.shape[1]):
@@ -2716,7 +2795,7 @@ def calc_supply_temperatures(t_ground__k, edge_node_df, mass_flow_df, k, t_targe
             dT_edge = np.nanmax(t_e_in[:, edge]) - np.nanmax(t_e_out[:, edge])
             q_loss_edges_kw[edge] = m_d[edge, edge] * HEAT_CAPACITY_OF_WATER_JPERKGK / 1000 * dT_edge  # kW
 
-    return t_node.T, plant_node, q_loss_edges_kw
+    return t_node, q_loss_edges_kw
 
 
 def calculate_outflow_temp(z, z_note, m_d, t_e_out, z_pipe_out, t_node, t_e_in, t_ground_k, not_stuck, k,
@@ -2823,6 +2902,13 @@ def calc_return_temperatures(t_ground, edge_node_df, mass_flow_df, mass_flow_sub
     :rtype t_node.T: list
 
     """
+    # radial networks are solved in a single pass against the flow of the supply network
+    radial_flow = calc_radial_flow(edge_node_df, mass_flow_df)
+    if radial_flow is not None:
+        solution = calc_return_temperatures_radial(t_ground, radial_flow, mass_flow_substation_df, k, t_return,
+                                                   thermal_network)
+        if solution is not None:
+            return solution
 
     z = np.asarray(edge_node_df.copy()) * (-1)  # (n x e) edge-node matrix
     z_pipe_out = z.clip(min=0)  # pipe outlet matrix
@@ -2955,6 +3041,73 @@ def calc_return_temperatures(t_ground, edge_node_df, mass_flow_df, mass_flow_sub
     return t_node, q_loss_edges_kW
 
 
+def calc_return_temperatures_radial(t_ground, radial_flow, mass_flow_substation_df, k, t_return, thermal_network):
+    """
+    Calculate the node temperatures of the return network of a radial network in a single pass against the flow of the
+    supply network, starting from the substations at the end of the branches (see :py:func:`calc_return_temperatures`).
+
+    :param radial_flow: the flow in the supply network (see :py:func:`calc_radial_flow`)
+    :param mass_flow_substation_df: mass flow rate of each substation node (1 x n)
+    :param t_return: return temperatures at the substation nodes (1 x n)
+    :return: the node temperatures (n) and the heat losses of the edges (e), or None if a branch ends at a node without
+        return temperature
+    :rtype: (ndarray, ndarray)
+    """
+    hydraulics, mass_flow, active_edges, no_flow_nodes = radial_flow
+    # the return flow enters a node through the edges leaving it in the supply network and vice versa
+    edges_in = [edges[active_edges[edges]] for edges in hydraulics.edges_out]
+    edges_out = [edges[active_edges[edges]] for edges in hydraulics.edges_in]
+    m_sub = np.ravel(np.asarray(mass_flow_substation_df, dtype=np.float64)).clip(min=0)
+    t_return = np.ravel(np.asarray(t_return, dtype=np.float64))
+    first_nodes = ~no_flow_nodes & (np.bincount(hydraulics.start_nodes[active_edges],
+                                                minlength=hydraulics.number_of_nodes) == 0)
+    if np.isnan(t_return[first_nodes]).any():
+        return None
+
+    m_rounded = np.round(mass_flow, decimals=5)  # round to avoid errors at very very low massflows
+    t_node = np.zeros(hydraulics.number_of_nodes)
+    t_node[no_flow_nodes] = np.nan
+    t_e_in = np.zeros(hydraulics.number_of_edges)
+    t_e_out = np.zeros(hydraulics.number_of_edges)
+    for node in reversed(hydraulics.flow_order):
+        if no_flow_nodes[node]:
+            continue
+        if first_nodes[node]:
+            # substations at the end of the branches
+            t_node[node] = t_return[node]
+        else:
+            # calculate node temperature with merging flows from pipes and substation (see calc_return_node_temperature)
+            m_in = mass_flow[edges_in[node]]
+            total_mass_flow_to_node = m_in.sum() + m_sub[node]
+            if np.isclose(total_mass_flow_to_node, 0):
+                t_node[node] = np.nan
+            else:
+                total_mcp_from_edges = np.dot(m_in, np.nan_to_num(t_e_out[edges_in[node]]))
+                total_mcp_from_substation = 0 if np.isclose(m_sub[node], 0) else m_sub[node] * t_return[node]
+                t_node[node] = (total_mcp_from_edges + total_mcp_from_substation) / total_mass_flow_to_node
+        for edge in edges_out[node]:
+            t_e_in[edge] = t_node[node]
+            t_e_out[edge] = calc_edge_outlet_temperature(edge, t_node[node], k[edge, edge], m_rounded[edge], t_ground,
+                                                         thermal_network)
+
+    return t_node, calc_edge_heat_losses(mass_flow, t_e_in, t_e_out)
+
+
+def calc_edge_heat_losses(mass_flow, t_e_in, t_e_out):
+    """
+    :param mass_flow: mass flow rate of each edge (e)
+    :param t_e_in: pipe inlet temperature of each edge [K] (e)
+    :param t_e_out: pipe outlet temperature of each edge [K] (e)
+    :return: the heat losses of the edges with flow [kW] (e)
+    :rtype: ndarray
+    """
+    q_loss_edges_kw = np.zeros(mass_flow.size)
+    flowing = mass_flow > 0
+    dT_edges = np.fmax(t_e_in[flowing], 0) - np.fmax(t_e_out[flowing], 0)  # edges without temperatures count as 0
+    q_loss_edges_kw[flowing] = mass_flow[flowing] * HEAT_CAPACITY_OF_WATER_JPERKGK / 1000 * dT_edges  # kW
+    return q_loss_edges_kw
+
+
 def calc_return_node_temperature(index, m_d, t_e_out, t_return, z_pipe_out, m_sub):
     """
     The function calculates the node temperature with merging flows from pipes in the return line.
@@ -3027,45 +3180,58 @@ def calc_t_out(node, edge, k_old, m_d, z, t_e_in, t_e_out, t_ground, z_note, the
 
     for i in range(edge.size):
         e = edge[i]
-        k = k_old[e, e]
-        m = m_d[e, e]
-        out_node_index = np.where(z[:, e] == 1)[0].max()
-        if np.isclose(abs(m), 0) and np.isclose(z_note[node, e], -1):
-            # set outlet temperature to nan if no flow is going out from node to connected edges
-            t_e_out[out_node_index, e] = np.nan
-            z_note[:, e] = 0
-
-        elif np.isclose(z_note[node, e], -1):
+        if np.isclose(z_note[node, e], -1):
             # calculate outlet temperature if flow goes from node to out_node through edge
-            t_e_out[out_node_index, e] = (t_e_in[node, e] * (
-                    k / 2 - m * HEAT_CAPACITY_OF_WATER_JPERKGK / 1000) - k * t_ground) / (
-                                                 -m * HEAT_CAPACITY_OF_WATER_JPERKGK / 1000 - k / 2)  # [K]
-            dT = t_e_in[node, e] - t_e_out[out_node_index, e]
-            if abs(dT) > 30:
-                print('High temperature loss on edge', e, '. Loss:', abs(dT))
-                #Store value
-                if not str(
-                        e) in thermal_network.problematic_edges.keys():  # add problematic edge and corresponding mass flow to the dictionary
-                    thermal_network.problematic_edges[str(e)] = m
-                elif thermal_network.problematic_edges[str(
-                            e)] > m:  # if the mass flow saved at this edge is smaller than the current mass flow, save the smaller value
-                        thermal_network.problematic_edges[str(e)] = m
-
-                if (k / 2 - m * HEAT_CAPACITY_OF_WATER_JPERKGK / 1000) > 0:
-                    print(
-                        'Exit temperature decreasing at entry temperature increase. Possible at low massflows. Massflow:',
-                        m, ' on edge: ', e)
-                if thermal_network.network_type == 'DH':
-                    t_e_out[out_node_index, e] = t_e_in[node, e] - 30  # assumes maximum 30 K temperature loss
-                else:
-                    t_e_out[out_node_index, e] = t_e_in[node, e] + 30  # assumes maximum 30 K temperature loss
-                # Induces some error but necessary to avoid spiraling to negative temperatures
-                # Todo: find better method which allows loss calculation at low massflows
+            out_node_index = np.where(z[:, e] == 1)[0].max()
+            t_e_out[out_node_index, e] = calc_edge_outlet_temperature(e, t_e_in[node, e], k_old[e, e], m_d[e, e],
+                                                                      t_ground, thermal_network)
             z_note[:, e] = 0.0
 
 
-def calc_aggregated_heat_conduction_coefficient(mass_flow, locator, edge_df, pipe_properties_df, temperature__k,
-                                                network_type, region):
+def calc_edge_outlet_temperature(edge, t_in, k, m, t_ground, thermal_network):
+    """
+    Calculate the outlet temperature of a pipe from its inlet temperature, following [Wang et al., 2016]_ (see
+    :py:func:`calc_t_out`).
+
+    :param edge: edge index
+    :param t_in: pipe inlet temperature [K]
+    :param k: aggregated heat conduction coefficient of the pipe [kW/K]
+    :param m: mass flow rate of the pipe (rounded) [kg/s]
+    :param t_ground: ground temperature [K]
+    :return: the pipe outlet temperature [K], nan if there is no flow in the pipe
+    :rtype: float
+    """
+    if np.isclose(abs(m), 0):
+        # set outlet temperature to nan if no flow is going out from node to connected edges
+        return np.nan
+
+    t_out = (t_in * (k / 2 - m * HEAT_CAPACITY_OF_WATER_JPERKGK / 1000) - k * t_ground) / (
+            -m * HEAT_CAPACITY_OF_WATER_JPERKGK / 1000 - k / 2)  # [K]
+    dT = t_in - t_out
+    if abs(dT) > 30:
+        print('High temperature loss on edge', edge, '. Loss:', abs(dT))
+        #Store value
+        if not str(
+                edge) in thermal_network.problematic_edges.keys():  # add problematic edge and corresponding mass flow to the dictionary
+            thermal_network.problematic_edges[str(edge)] = m
+        elif thermal_network.problematic_edges[str(
+                edge)] > m:  # if the mass flow saved at this edge is smaller than the current mass flow, save the smaller value
+            thermal_network.problematic_edges[str(edge)] = m
+
+        if (k / 2 - m * HEAT_CAPACITY_OF_WATER_JPERKGK / 1000) > 0:
+            print(
+                'Exit temperature decreasing at entry temperature increase. Possible at low massflows. Massflow:',
+                m, ' on edge: ', edge)
+        if thermal_network.network_type == 'DH':
+            t_out = t_in - 30  # assumes maximum 30 K temperature loss
+        else:
+            t_out = t_in + 30  # assumes maximum 30 K temperature loss
+        # Induces some error but necessary to avoid spiraling to negative temperatures
+        # Todo: find better method which allows loss calculation at low massflows
+    return t_out
+
+
+def calc_aggregated_heat_conduction_coefficient(mass_flow, pipes, temperature__k):
     """
     This function calculates the aggregated heat conduction coefficients of all the pipes.
     Following the reference from [Wang et al., 2016].
@@ -3073,19 +3239,13 @@ def calc_aggregated_heat_conduction_coefficient(mass_flow, locator, edge_df, pip
     from _[J.A. Fonseca et al., 2016] and _[isoplus].
 
     :param mass_flow: Vector with mass flows of each edge                           (e x 1)
-    :param locator: an InputLocator instance set to the scenario to work on
-    :param pipe_properties_df: DataFrame containing the pipe properties for each edge in the network
+    :param pipes: the pipes of the edges of the network (built once per network and set of pipe diameters, see
+        ``ThermalNetwork.pipes``)
     :param temperature__k: matrix containing the temperature of the water in each edge e at time t             (t x e)
-    :param network_type: a string that defines whether the network is a district heating ('DH') or cooling ('DC')
-                         network
-    :param edge_df: list of edges and their corresponding lengths and start and end nodes
 
     :type temperature__k: list
-    :type network_type: str
     :type mass_flow: DataFrame
-    :type locator: InputLocator
-    :type pipe_properties_df: DataFrame
-    :type edge_df: DataFrame
+    :type pipes: cea.technologies.thermal_network.network_properties.PipeProperties
 
     :return k_all: DataFrame of aggregated heat conduction coefficients (1 x e) for all edges
 
@@ -3103,50 +3263,8 @@ def calc_aggregated_heat_conduction_coefficient(mass_flow, locator, edge_df, pip
     .. Incropera, F. P., DeWitt, D. P., Bergman, T. L., & Lavine, A. S. (2007). Fundamentals of Heat and Mass
        Transfer. Fundamentals of Heat and Mass Transfer. https://doi.org/10.1016/j.applthermaleng.2011.03.022
     """
-
-    L_pipe = edge_df['pipe length']
-    material_properties = pd.read_excel(locator.get_thermal_networks(region), sheetname=['MATERIAL PROPERTIES'])[
-        'MATERIAL PROPERTIES']
-    material_properties = material_properties.set_index(material_properties['material'].values)
-    conductivity_pipe = material_properties.ix['Steel', 'lambda_WmK']  # _[A. Kecebas et al., 2011]
-    conductivity_insulation = material_properties.ix['PUR', 'lambda_WmK']  # _[A. Kecebas et al., 2011]
-    conductivity_ground = material_properties.ix['Soil', 'lambda_WmK']  # _[A. Kecebas et al., 2011]
-    network_depth = NETWORK_DEPTH  # [m]
-    extra_heat_transfer_coef = 0.2  # _[Wang et al, 2016] to represent heat losses from valves and other attachments
-
-    # calculate nusselt number
-    nusselt = calc_nusselt(mass_flow, temperature__k, pipe_properties_df[:]['D_int_m':'D_int_m'].values[0],
-                           network_type)
-    # calculate thermal conductivity of water
-    thermal_conductivity = calc_thermal_conductivity(temperature__k)
-    # evaluate thermal heat transfer coefficient
-    alpha_th = thermal_conductivity * nusselt / pipe_properties_df[:]['D_int_m':'D_int_m'].values[0]  # W/(m^2 * K)
-
-    k_all = []
-    for pipe_number, pipe in enumerate(L_pipe.index):
-        # calculate heat resistances, equation (3) in Wang et al., 2016
-        R_pipe = np.log(pipe_properties_df.loc['D_ext_m', pipe] / pipe_properties_df.loc['D_int_m', pipe]) / (
-                2 * math.pi * conductivity_pipe)  # [m*K/W]
-        if network_type == 'DC':
-            D_ins = 0.25 * pipe_properties_df.loc[
-                'D_ins_m', pipe]  # approximation based on COOLMANT CLM 2.0 Pipe catalogue
-        else:
-            D_ins = pipe_properties_df.loc['D_ins_m', pipe]
-        R_insulation = np.log((D_ins+pipe_properties_df.loc['D_ext_m', pipe]) / pipe_properties_df.loc['D_ext_m', pipe]) / (
-                2 * math.pi * conductivity_insulation)  # [m*K/W]
-        a = 2 * network_depth / (pipe_properties_df.loc['D_ins_m', pipe])
-        R_ground = np.log(a + (a ** 2 - 1) ** 0.5) / (2 * math.pi * conductivity_ground)  # [m*K/W]
-        # calculate convection heat transfer resistance
-        if np.isclose(alpha_th[pipe_number], 0):
-            R_conv = 0.2  # case with no massflow, avoids divide by 0 error
-        else:
-            R_conv = 1 / (
-                    alpha_th[pipe_number] * math.pi * pipe_properties_df[:]['D_int_m':'D_int_m'].values[0][pipe_number])
-        # calculate the aggregated heat conduction coefficient, equation (4) in Wang et al., 2016
-        k = L_pipe[pipe] * (1 + extra_heat_transfer_coef) / (R_pipe + R_insulation + R_ground + R_conv) / 1000  # [kW/K]
-        k_all.append(k)
-    k_all = abs(np.diag(k_all))
-    return k_all
+    k_all = pipes.calc_heat_conduction_coefficient(np.ravel(mass_flow), np.ravel(temperature__k))  # [kW/K]
+    return np.diag(k_all)
 
 
 def calc_nusselt(mass_flow_rate_kgs, temperature_K, pipe_diameter_m, network_type):
@@ -3173,31 +3291,9 @@ def calc_nusselt(mass_flow_rate_kgs, temperature_K, pipe_diameter_m, network_typ
 
     # calculate variable values necessary for nusselt number evaluation
     reynolds = calc_reynolds(mass_flow_rate_kgs, temperature_K, pipe_diameter_m)
-    prandtl = calc_prandtl(temperature_K)
+    prandtl = np.ravel(calc_prandtl(temperature_K))
     darcy = calc_darcy(pipe_diameter_m, reynolds, ROUGHNESS)
-
-    nusselt = np.zeros(reynolds.size)
-    for rey in range(reynolds.size):
-        if reynolds[rey] <= 1:
-            # calculate nusselt number only if mass is flowing
-            nusselt[rey] = 0
-        elif reynolds[rey] <= 2300:
-            # calculate the Nusselt number for laminar flow
-            nusselt[rey] = 3.66
-        elif reynolds[rey] <= 10000:
-            # calculate the Nusselt for transient flow
-            nusselt[rey] = darcy[rey] / 8 * (reynolds[rey] - 1000) * prandtl[rey] / (
-                    1 + 12.7 * (darcy[rey] / 8) ** 0.5 * (prandtl[rey] ** 0.67 - 1))
-        else:
-            # calculate the Nusselt number for turbulent flow
-            # identify if heating or cooling case
-            if network_type == 'DH':  # warm fluid, so ground is cooling fluid in pipe, cooling case from view of thermodynamic flow
-                nusselt[rey] = 0.023 * reynolds[rey] ** 0.8 * prandtl[rey] ** 0.3
-            else:
-                # cold fluid, so ground is heating fluid in pipe, heating case from view of thermodynamic flow
-                nusselt[rey] = 0.023 * reynolds[rey] ** 0.8 * prandtl[rey] ** 0.4
-
-    return nusselt
+    return network_properties.calc_nusselt(reynolds, prandtl, darcy, network_type)
 
 
 # ============================
@@ -3403,8 +3499,21 @@ def main(config):
     run the whole network summary routine
     """
     start = time.time()
+    cea.utilities.jit.configure(config.use_jit)
     locator = cea.inputlocator.InputLocator(scenario=config.scenario)
+    run_thermal_networks(locator, config)
+    print('test thermal_network_main() succeeded')
+    print('total time: ', time.time() - start)
+
+
+def run_thermal_networks(locator, config):
+    """
+    Run the thermal network calculation of the networks of the configuration, reading and writing the network files
+    with ``locator`` (see :py:func:`thermal_network_main`).
 
+    :type locator: cea.inputlocator.InputLocator
+    :type config: cea.config.Configuration
+    """
     # add options for data sources: heating or cooling network, csv or shp
     network_type = config.thermal_network.network_type  # set to either 'DH' or 'DC'
     file_type = config.thermal_network.file_type  # set to csv or shp
@@ -3443,9 +3552,6 @@ def main(config):
     for network_name in network_names:
         thermal_network_main(locator, network_type, network_name, file_type, set_diameter, config, substation_systems)
 
-    print('test thermal_network_main() succeeded')
-    print('total time: ', time.time() - start)
-
 
 if __name__ == '__main__':
     main(cea.config.Configuration())
@@ -5,6 +5,7 @@ import pandas as pd
 import cea.config
 import cea.globalvar
 import cea.inputlocator
+from cea.demand import demand_reader
 
 from cea.optimization.prices import Prices as Prices
 import cea.optimization.distribution.network_opt_main as network_opt
@@ -146,8 +147,7 @@ def calc_Ctot_cooling_plants(network_info):
         # Read in building demand
         building_demand = {}
         for building in network_info.building_names:
-            building_demand[building] = pd.read_csv(
-                network_info.locator.get_demand_results_file(building))
+            building_demand[building] = demand_reader.read_hourly_demand(network_info.locator, building)
 
         Capex_a_chiller_USD = 0.0
         Opex_fixed_chiller = 0.0
@@ -238,7 +238,7 @@ def calc_Ctot_cs_disconnected_loads(network_info):
                 if building_index not in network_info.disconnected_buildings_index:
                     # if this building is disconnected it will be calculated separately
                     # Read in building demand
-                    building_demand = pd.read_csv(network_info.locator.get_demand_results_file(building))
+                    building_demand = demand_reader.read_hourly_demand(network_info.locator, building)
                     if not system_string:
                         # this means there are no disconnected loads. Shouldn't happen but is a fail-safe
                         peak_demand_kW = 0.0
@@ -374,7 +374,7 @@ def calc_Ctot_cs_disconnected_buildings(network_info):
             Opex_var_system = 0.0
             if building_index in network_info.disconnected_buildings_index:  # disconnected building
                 # Read in demand of building
-                building_demand = pd.read_csv(network_info.locator.get_demand_results_file(building))
+                building_demand = demand_reader.read_hourly_demand(network_info.locator, building)
                 # sum up demand of all loads
                 demand_hourly_kWh = building_demand['Qcs_sys_scu_kWh'].abs() + \
                                     building_demand['Qcs_sys_ahu_kWh'].abs() + \
@@ -10,6 +10,8 @@ import cea.technologies.thermal_network.thermal_network_costs
 from cea.technologies.thermal_network import thermal_network as thermal_network
 from cea.technologies.thermal_network.network_layout.main import network_layout as network_layout
 import cea.technologies.thermal_network.thermal_network_costs as network_costs
+from cea.technologies.thermal_network import network_evaluation
+import collections
 import os
 import pandas as pd
 import numpy as np
@@ -60,6 +62,8 @@ class Network_info(object):
         self.generation_number = 0
         self.plant_building_index = []
         self.disconnected_buildings_index = []
+        # fingerprint of the inputs common to all networks, see network_evaluation.calc_settings_key
+        self.settings_key = None
         # list of all possible heating or cooling systems. used to compare which ones are centralized / decentralized
         self.full_heating_systems = ['ahu', 'aru', 'shu', 'ww']
         self.full_cooling_systems = ['ahu', 'aru',
@@ -83,6 +87,8 @@ def thermal_network_optimization(config, gv, locator):
     if not config.thermal_network_optimization.possible_plant_sites:
         # if there is no input from the config file as to which sites are potential plant locations, set all as possible locations
         config.thermal_network_optimization.possible_plant_sites = network_info.building_names
+    # networks evaluated in previous runs with the same inputs are read from the cache
+    network_info.settings_key = network_evaluation.calc_settings_key(locator, config, network_info.building_names)
 
     ## create initial population
     print 'Creating initial population.'
@@ -139,85 +145,56 @@ def network_cost_calculation(newMutadedGen, network_info, config):
     :param network_info: Object storing network information.
     :return: List of sorted tuples, lowest cost first. Each tuple consists of the cost, followed by the individual as a string.
     """
-    # initialize data storage and counter
+    # initialize data storage
     population_performance = {}
-    individual_number = 0
+    network_type = config.network_layout.network_type
     # prepare data storage for generation_outputs_df
     generation_outputs_df = pd.DataFrame(index=list(range(config.thermal_network_optimization.number_of_individuals)),
                                          columns=network_info.generation_info + network_info.cost_info)
 
-    # iterate through all individuals
-    for individual in newMutadedGen:
-        # verify that we have not previously evaluated this individual, saves time!
-        if not os.path.exists(network_info.locator.get_optimization_network_individual_results_file(config.network_layout.network_type, individual)):
-            # initialize a dataframe for this individual
-            individual_outputs_df = pd.DataFrame(index=[0], columns=generation_outputs_df.columns)
-            # translate barcode individual
-            building_plants, disconnected_buildings = translate_individual(network_info, individual)
-            # evaluate fitness function
-            capex_total, opex_total, total_cost, cost_storage_df = objective_function(network_info)
-
-            # calculate network total network_length_m and average diameter
-            network_length_m, average_pipe_diameter_m = calc_network_size(network_info)
-
-            # save total cost to dictionary
-            population_performance[total_cost] = individual
-            print 'population performance', population_performance
-
-            # list supplied loads
-            if network_info.config.thermal_network.network_type == 'DH':
-                list_of_supplied_loads = network_info.config.thermal_network.substation_heating_systems
-            else:
-                list_of_supplied_loads = network_info.config.thermal_network.substation_cooling_systems
-
-            # store values
-            individual_outputs_df['total'] = total_cost
-            individual_outputs_df['capex'] = capex_total
-            individual_outputs_df['opex'] = opex_total
-            individual_outputs_df['el_network_MWh'] = cost_storage_df.ix['el_network_MWh'][0]
-            individual_outputs_df['opex_plant'] = cost_storage_df.ix['opex_plant'][0]
-            individual_outputs_df['opex_pump'] = cost_storage_df.ix['opex_pump'][0]
-            individual_outputs_df['opex_hex'] = cost_storage_df.ix['opex_hex'][0]
-            individual_outputs_df['opex_dis_loads'] = cost_storage_df.ix['opex_dis_loads'][0]
-            individual_outputs_df['opex_dis_build'] = cost_storage_df.ix['opex_dis_build'][0]
-            individual_outputs_df['capex_network'] = cost_storage_df.ix['capex_network'][0]
-            individual_outputs_df['capex_pump'] = cost_storage_df.ix['capex_pump'][0]
-            individual_outputs_df['capex_hex'] = cost_storage_df.ix['capex_hex'][0]
-            individual_outputs_df['capex_dis_loads'] = cost_storage_df.ix['capex_dis_loads'][0]
-            individual_outputs_df['capex_dis_build'] = cost_storage_df.ix['capex_dis_build'][0]
-            individual_outputs_df['capex_chiller'] = cost_storage_df.ix['capex_chiller'][0]
-            individual_outputs_df['capex_CT'] = cost_storage_df.ix['capex_CT'][0]
-            individual_outputs_df['individual'] = str(individual)
-            individual_outputs_df['number_of_plants'] = individual[6:].count(1.0)
-            individual_outputs_df['has_loops'] = individual[5]
-            individual_outputs_df['plant_buildings'] = str(building_plants)
-            individual_outputs_df['disconnected_buildings'] = str(disconnected_buildings) if disconnected_buildings != [] else 0
-            individual_outputs_df['supplied_loads'] = ', '.join(list_of_supplied_loads)
-            individual_outputs_df['network_length_m'] = network_length_m
-            individual_outputs_df['avg_diam_m'] = average_pipe_diameter_m
-            individual_outputs_df['number_of_plants'] = individual[6:].count(1.0)
-            individual_outputs_df['has_loops'] = individual[5]
-
-            # save results of an unique individual
-            individual_outputs_df.to_csv(
-                network_info.locator.get_optimization_network_individual_results_file(
-                    config.network_layout.network_type, individual))
-            # add unique individual and its total costs to the populations
-            network_info.populations[str(individual)] = total_cost
+    # individuals describing the same network have the same costs, read the networks evaluated before from the cache
+    network_keys = [calc_individual_network_key(network_info, individual) for individual in newMutadedGen]
+    network_outputs = {}
+    new_networks = collections.OrderedDict()  # networks to evaluate and the first individual with the network
+    for network_key, individual in zip(network_keys, newMutadedGen):
+        if network_key in network_outputs or network_key in new_networks:
+            continue
+        cached_outputs_df = network_evaluation.read_cached_results(network_info.locator, network_type, network_key)
+        if cached_outputs_df is not None:
+            network_outputs[network_key] = cached_outputs_df
         else:
-            # read total cost of the individual that has been evaluated
-            individual_outputs_df = pd.read_csv(network_info.locator.get_optimization_network_individual_results_file(config.network_layout.network_type, individual))
-            total_cost = individual_outputs_df['total'][0]
-            while total_cost in population_performance.keys():  # make sure we keep correct number of individuals in the extremely unlikely event that two individuals have the same cost
-                total_cost = total_cost + 0.01
-            population_performance[total_cost] = individual
-            if str(individual) not in network_info.populations.keys():
-                network_info.populations[str(individual)] = total_cost
+            new_networks[network_key] = individual
+
+    # evaluate the new networks, in parallel if possible
+    number_of_processes = min(config.get_number_of_processes(), len(new_networks))
+    if number_of_processes > 1:
+        print 'Evaluating ', len(new_networks), ' networks with ', number_of_processes, ' processes.'
+        new_outputs = network_evaluation.evaluate_networks_multiprocessing(evaluate_individual, network_info,
+                                                                           list(new_networks.values()),
+                                                                           number_of_processes)
+    else:
+        new_outputs = [evaluate_individual(network_info, individual) for individual in new_networks.values()]
+    for network_key, individual_outputs_df in zip(new_networks.keys(), new_outputs):
+        network_evaluation.write_cached_results(network_info.locator, network_type, network_key, individual_outputs_df)
+        network_outputs[network_key] = individual_outputs_df
+
+    for individual_number, (individual, network_key) in enumerate(zip(newMutadedGen, network_keys)):
+        individual_outputs_df = network_outputs[network_key].copy()
+        individual_outputs_df['individual'] = str(individual)
+        individual_outputs_df['has_loops'] = individual[5]
+        # save results of an unique individual
+        individual_outputs_df.to_csv(
+            network_info.locator.get_optimization_network_individual_results_file(network_type, individual))
+        total_cost = individual_outputs_df['total'][0]
+        while total_cost in population_performance.keys():  # make sure we keep correct number of individuals in the extremely unlikely event that two individuals have the same cost
+            total_cost = total_cost + 0.01
+        population_performance[total_cost] = individual
+        # add unique individual and its total costs to the populations
+        if str(individual) not in network_info.populations.keys():
+            network_info.populations[str(individual)] = total_cost
 
         for column in generation_outputs_df.columns:
             generation_outputs_df.ix[individual_number][column] = individual_outputs_df[column][0]
-        # iterate to next individual
-        individual_number += 1
     generation_outputs_df.to_csv(network_info.locator.get_optimization_network_generation_individuals_results_file(
         config.network_layout.network_type, network_info.generation_number))
     network_info.generation_number += 1
@@ -225,6 +202,81 @@ def network_cost_calculation(newMutadedGen, network_info, config):
     return sorted(population_performance.items(), key=operator.itemgetter(0))
 
 
+def calc_individual_network_key(network_info, individual):
+    """
+    Find the network described by an individual, like translate_individual and objective_function do.
+    :param network_info: Object storing network information.
+    :return: the fingerprint of the network and its inputs (see network_evaluation.calc_network_key)
+    """
+    plant_building_names = [network_info.building_names[i] for i, x in enumerate(individual[6:]) if x == 1]
+    disconnected_building_names = [network_info.building_names[i] for i, x in enumerate(individual[6:]) if x == 2]
+    if network_info.config.thermal_network_optimization.optimize_loop_branch:
+        allow_looped_networks = individual[5] == 1
+    else:
+        allow_looped_networks = network_info.config.network_layout.allow_looped_networks
+    if network_info.config.thermal_network.network_type == 'DH':
+        supplied_loads = network_info.config.thermal_network.substation_heating_systems
+    elif network_info.config.thermal_network_optimization.optimize_network_loads:
+        supplied_loads = [network_info.full_cooling_systems[index] for index in range(5) if individual[index] == 1.0]
+    else:
+        supplied_loads = network_info.config.thermal_network.substation_cooling_systems
+    return network_evaluation.calc_network_key(network_info.settings_key, plant_building_names,
+                                               disconnected_building_names, allow_looped_networks, supplied_loads)
+
+
+def evaluate_individual(network_info, individual):
+    """
+    Generate and simulate the network of an individual and calculate its costs
+    :param network_info: Object storing network information.
+    :return: the results of the individual (one row with the generation_info and cost_info columns)
+    """
+    # initialize a dataframe for this individual
+    individual_outputs_df = pd.DataFrame(index=[0], columns=network_info.generation_info + network_info.cost_info)
+    # translate barcode individual
+    building_plants, disconnected_buildings = translate_individual(network_info, individual)
+    # evaluate fitness function
+    capex_total, opex_total, total_cost, cost_storage_df = objective_function(network_info)
+
+    # calculate network total network_length_m and average diameter
+    network_length_m, average_pipe_diameter_m = calc_network_size(network_info)
+
+    # list supplied loads
+    if network_info.config.thermal_network.network_type == 'DH':
+        list_of_supplied_loads = network_info.config.thermal_network.substation_heating_systems
+    else:
+        list_of_supplied_loads = network_info.config.thermal_network.substation_cooling_systems
+
+    # store values
+    individual_outputs_df['total'] = total_cost
+    individual_outputs_df['capex'] = capex_total
+    individual_outputs_df['opex'] = opex_total
+    individual_outputs_df['el_network_MWh'] = cost_storage_df.ix['el_network_MWh'][0]
+    individual_outputs_df['opex_plant'] = cost_storage_df.ix['opex_plant'][0]
+    individual_outputs_df['opex_pump'] = cost_storage_df.ix['opex_pump'][0]
+    individual_outputs_df['opex_hex'] = cost_storage_df.ix['opex_hex'][0]
+    individual_outputs_df['opex_dis_loads'] = cost_storage_df.ix['opex_dis_loads'][0]
+    individual_outputs_df['opex_dis_build'] = cost_storage_df.ix['opex_dis_build'][0]
+    individual_outputs_df['capex_network'] = cost_storage_df.ix['capex_network'][0]
+    individual_outputs_df['capex_pump'] = cost_storage_df.ix['capex_pump'][0]
+    individual_outputs_df['capex_hex'] = cost_storage_df.ix['capex_hex'][0]
+    individual_outputs_df['capex_dis_loads'] = cost_storage_df.ix['capex_dis_loads'][0]
+    individual_outputs_df['capex_dis_build'] = cost_storage_df.ix['capex_dis_build'][0]
+    individual_outputs_df['capex_chiller'] = cost_storage_df.ix['capex_chiller'][0]
+    individual_outputs_df['capex_CT'] = cost_storage_df.ix['capex_CT'][0]
+    individual_outputs_df['individual'] = str(individual)
+    individual_outputs_df['number_of_plants'] = individual[6:].count(1.0)
+    individual_outputs_df['has_loops'] = individual[5]
+    individual_outputs_df['plant_buildings'] = str(building_plants)
+    individual_outputs_df['disconnected_buildings'] = str(disconnected_buildings) if disconnected_buildings != [] else 0
+    individual_outputs_df['supplied_loads'] = ', '.join(list_of_supplied_loads)
+    individual_outputs_df['network_length_m'] = network_length_m
+    individual_outputs_df['avg_diam_m'] = average_pipe_diameter_m
+    individual_outputs_df['number_of_plants'] = individual[6:].count(1.0)
+    individual_outputs_df['has_loops'] = individual[5]
+
+    return individual_outputs_df
+
+
 def translate_individual(network_info, individual):
     """
     Translates individual to prepare cost evaluation
@@ -311,7 +363,7 @@ def objective_function(network_info):
         network_layout(network_info.config, network_info.locator, network_info.building_names,
                        optimization_flag=True)
         # simulate the network with 0 loads, very fast, 0 cost, but necessary to generate the excel output files
-        thermal_network.main(network_info.config)
+        thermal_network.run_thermal_networks(network_info.locator, network_info.config)
         # set all buildings to disconnected
         network_info.config.thermal_network.disconnected_buildings = network_info.building_names
         # set all indexes as disconnected
@@ -327,7 +379,7 @@ def objective_function(network_info):
         network_layout(network_info.config, network_info.locator, plant_building_names,
                        optimization_flag=True)
         # run the thermal_network simulation with the generated network
-        thermal_network.main(network_info.config)
+        thermal_network.run_thermal_networks(network_info.locator, network_info.config)
 
     ## Cost calculations
     Capex_total, Opex_total, Costs_total, cost_storage = network_costs.calc_Ctot_cs_district(network_info)
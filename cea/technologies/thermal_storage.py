@@ -5,6 +5,7 @@ thermal storage
 from __future__ import division
 import pandas as pd
 from math import log
+from cea.utilities.database_catalog import read_database
 
 __author__ = "Thuy-An Nguyen"
 __copyright__ = "Copyright 2015, Architecture and Building Systems - ETH Zurich"
@@ -29,7 +30,7 @@ def calc_Cinv_storage(V_tank_m3, locator, config, technology_type):
 
     """
     if V_tank_m3 > 0:
-        storage_cost_data = pd.read_excel(locator.get_supply_systems(config.region), sheetname="TES")
+        storage_cost_data = read_database(locator.get_supply_systems(config.region), "TES")
         storage_cost_data = storage_cost_data[storage_cost_data['code'] == technology_type]
 
         # if the Q_design is below the lowest capacity available for the technology, then it is replaced by the least
@@ -14,6 +14,7 @@ import ConfigParser
 import json
 import pandas as pd
 
+from cea.demand import demand_reader
 from cea.demand.thermal_loads import calc_thermal_loads
 from cea.demand.demand_main import properties_and_schedule
 from cea.globalvar import GlobalVariables
@@ -62,7 +63,7 @@ def main(output_file):
                                 debug)
 
     # test the building csv file
-    df = pd.read_csv(locator.get_demand_results_file('B01'))
+    df = demand_reader.read_hourly_demand(locator, 'B01')
 
     expected_columns = list(df.columns)
     print("expected_columns = %s" % repr(expected_columns))
@@ -113,7 +114,7 @@ def run_for_single_building(building, bpr, weather_data, usage_schedules, date,
     calc_thermal_loads(building, bpr, weather_data, usage_schedules, date, locator, use_stochastic_occupancy,
                        use_dynamic_infiltration_calculation, resolution_outputs, loads_output, massflows_output,
                        temperatures_output, format_output, config, region, write_detailed_output, debug)
-    df = pd.read_csv(locator.get_demand_results_file(building))
+    df = demand_reader.read_hourly_demand(locator, building)
     return building, float(df['Qhs_sys_kWh'].sum()), df['Qcs_sys_kWh'].sum(), float(df['Qww_sys_kWh'].sum())
 
 
@@ -0,0 +1,79 @@
+"""
+Test the cache of the building properties (:py:func:`cea.demand.building_properties.read_or_calculate_building_properties`).
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+import cea.inputlocator
+from cea.demand.building_properties import calc_building_properties_cache_key, read_or_calculate_building_properties
+
+
+class CacheLocator(cea.inputlocator.InputLocator):
+    """Keep the cache inside the test scenario instead of ~/.cea/cache"""
+
+    def get_cache_folder(self):
+        return self._ensure_folder(self.scenario, 'cache')
+
+
+class TestBuildingPropertiesCache(unittest.TestCase):
+    def setUp(self):
+        self.scenario = tempfile.mkdtemp()
+        self.locator = CacheLocator(self.scenario)
+        self.input_file = os.path.join(self.scenario, 'input.csv')
+        with open(self.input_file, 'w') as f:
+            f.write('Name,value\nB01,1.0\n')
+        self.calculations = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.scenario)
+
+    def calculate(self):
+        self.calculations += 1
+        return pd.read_csv(self.input_file).set_index('Name')
+
+    def read(self, use_cache=True):
+        key = calc_building_properties_cache_key(paths=[self.input_file], dependencies=['CH'])
+        return read_or_calculate_building_properties(self.locator, 'table', key, self.calculate, use_cache)
+
+    def test_key(self):
+        key = calc_building_properties_cache_key(paths=[self.input_file], dependencies=['CH'])
+        self.assertEqual(key, calc_building_properties_cache_key(paths=[self.input_file], dependencies=['CH']))
+        self.assertNotEqual(key, calc_building_properties_cache_key(paths=[self.input_file], dependencies=['SG']))
+        self.assertNotEqual(key, calc_building_properties_cache_key(paths=[self.input_file, self.input_file],
+                                                                    dependencies=['CH']))
+        self.assertNotEqual(key, calc_building_properties_cache_key(dependencies=['CH'],
+                                                                    stat_paths=[self.input_file]))
+
+    def test_read_or_calculate(self):
+        expected = self.read()
+        self.assertEqual(self.calculations, 1)
+        pd.testing.assert_frame_equal(self.read(), expected)
+        self.assertEqual(self.calculations, 1)
+
+        # changing the input file invalidates the table
+        with open(self.input_file, 'w') as f:
+            f.write('Name,value\nB01,2.0\n')
+        self.assertEqual(self.read().loc['B01', 'value'], 2.0)
+        self.assertEqual(self.calculations, 2)
+
+        self.read(use_cache=False)
+        self.assertEqual(self.calculations, 3)
+
+    def test_corrupt_cache(self):
+        expected = self.read()
+        cache_file = self.locator.get_building_properties_cache(
+            'table', calc_building_properties_cache_key(paths=[self.input_file], dependencies=['CH']))
+        with open(cache_file, 'wb') as f:
+            f.write(b'not a pickle')
+        pd.testing.assert_frame_equal(self.read(), expected)
+        self.assertEqual(self.calculations, 2)
+        pd.testing.assert_frame_equal(self.read(), expected)
+        self.assertEqual(self.calculations, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 import ConfigParser
 import os
+import shutil
+import tempfile
 import unittest
 import json
 
@@ -9,8 +11,13 @@ import cea.config
 import cea.inputlocator
 from cea.demand.demand_main import properties_and_schedule
 from cea.demand.thermal_loads import calc_thermal_loads
+from cea.demand.representative_days import calc_errors
 from cea.utilities import epwreader
 
+# largest relative error of the yearly totals and the peaks of the representative days against a full calculation
+MAX_TOTAL_ERROR = 0.1
+MAX_PEAK_ERROR = 0.2
+
 
 class TestCalcThermalLoads(unittest.TestCase):
     """
@@ -60,10 +67,8 @@ class TestCalcThermalLoads(unittest.TestCase):
                                     self.use_dynamic_infiltration_calculation, self.resolution_output,
                                     self.loads_output, self.massflows_output, self.temperatures_output,
                                     self.format_output, self.config, self.region, self.write_detailed_output, self.config)
-        self.assertIsNone(result)
+        self.assertEqual(result.yearly.keys(), ['B01'], 'Building totals not returned')
         self.assertTrue(os.path.exists(self.locator.get_demand_results_file('B01',self.format_output)), 'Building csv not produced')
-        self.assertTrue(os.path.exists(self.locator.get_temporary_file('B01T.csv')),
-                        'Building temp file not produced')
 
         # test the building csv file (output of the `calc_thermal_loads` call above)
         df = pd.read_csv(self.locator.get_demand_results_file('B01', self.format_output))
@@ -106,6 +111,43 @@ class TestCalcThermalLoads(unittest.TestCase):
                                    msg="qww_sys_kwh for %(b)s should be: %(qww_sys_kwh).5f, was %(expected_qww_sys_kwh).5f" % locals(),
                                    places=3)
 
+    def test_calc_thermal_loads_representative_days(self):
+        """Compare the representative days to a full calculation of the reference case"""
+        columns = ['QH_sys_kWh', 'QC_sys_kWh', 'Qhs_sys_kWh', 'Qcs_sys_kWh', 'E_sys_kWh']
+        # the results file of B01 is checked by the other tests, restore it afterwards
+        results_file = self.locator.get_demand_results_file('B01', self.format_output)
+        backup_folder = tempfile.mkdtemp()
+        backup_file = os.path.join(backup_folder, os.path.basename(results_file))
+        if os.path.exists(results_file):
+            shutil.copy(results_file, backup_file)
+        results = {}
+        try:
+            for representative_days in [False, True]:
+                self.config.demand.representative_days = representative_days
+                calc_thermal_loads('B01', self.building_properties['B01'], self.weather_data, self.usage_schedules,
+                                   self.date, self.locator, self.use_stochastic_occupancy,
+                                   self.use_dynamic_infiltration_calculation, self.resolution_output,
+                                   self.loads_output, self.massflows_output, self.temperatures_output,
+                                   self.format_output, self.config, self.region, self.write_detailed_output,
+                                   self.debug)
+                results[representative_days] = pd.read_csv(results_file)
+        finally:
+            self.config.demand.representative_days = False
+            if os.path.exists(backup_file):
+                shutil.copy(backup_file, results_file)
+            elif os.path.exists(results_file):
+                os.remove(results_file)
+            shutil.rmtree(backup_folder)
+
+        self.assertEqual(len(results[True]), len(results[False]))
+        self.assertFalse(results[True][columns].isnull().any().any(), 'Missing hours in the results')
+        errors = calc_errors(results[False], results[True], columns)
+        for column in columns:
+            self.assertLessEqual(abs(errors.loc[column, 'total_error']), MAX_TOTAL_ERROR,
+                                 'Error of the yearly total of %s: %s' % (column, errors.loc[column].to_dict()))
+            self.assertLessEqual(abs(errors.loc[column, 'peak_error']), MAX_PEAK_ERROR,
+                                 'Error of the peak of %s: %s' % (column, errors.loc[column].to_dict()))
+
 
 def run_for_single_building(building, bpr, weather_data, usage_schedules, date, locator, use_stochastic_occupancy,
                             use_dynamic_infiltration_calculation, resolution_output, loads_output,
@@ -0,0 +1,69 @@
+"""
+Test the columnar demand output format (:py:mod:`cea.utilities.columnar` and :py:mod:`cea.demand.demand_reader`).
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import cea.inputlocator
+from cea.demand import demand_reader
+from cea.demand.demand_writers import HourlyDemandWriter
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+
+@unittest.skipIf(h5py is None, 'h5py is not installed')
+class TestColumnarDemandResults(unittest.TestCase):
+    def setUp(self):
+        self.scenario = tempfile.mkdtemp()
+        self.locator = cea.inputlocator.InputLocator(self.scenario)
+
+    def tearDown(self):
+        shutil.rmtree(self.scenario)
+
+    def write_results(self, format):
+        writer = HourlyDemandWriter(['Qhs_sys', 'E_sys'], ['mcphs_sys'], ['T_int'])
+        date = pd.date_range('2017/01/01', periods=8760, freq='H')
+        random = np.random.RandomState(42)
+        tsd = dict((key, random.rand(8760) * 1000) for key in
+                   ['Qhs_sys', 'E_sys', 'mcphs_sys', 'T_int', 'people', 'x_int'] + writer.load_plotting_vars)
+        columns, hourly_data = writer.calc_hourly_dataframe('B01', date, tsd)
+        if format == 'csv':
+            writer.write_to_csv('B01', columns, hourly_data, self.locator)
+        else:
+            writer.write_to_columnar('B01', columns, hourly_data, self.locator)
+
+    def test_columnar_equals_csv(self):
+        self.write_results('csv')
+        csv = demand_reader.read_hourly_demand(self.locator, 'B01')
+        self.write_results('columnar')
+        # the most recent results are read
+        os.utime(self.locator.get_demand_results_file('B01', 'csv'), (0, 0))
+        self.assertEqual(demand_reader.get_demand_results_format(self.locator, 'B01'), 'columnar')
+        columnar = demand_reader.read_hourly_demand(self.locator, 'B01')
+
+        self.assertEqual(list(columnar.columns), list(csv.columns))
+        self.assertTrue((pd.to_datetime(csv.DATE) == columnar.DATE).all())
+        self.assertTrue((csv.Name == columnar.Name).all())
+        for column in csv.columns.drop(['DATE', 'Name']):
+            # the csv file is rounded to 3 decimals
+            np.testing.assert_allclose(columnar[column], csv[column], atol=1e-3, err_msg=column)
+        self.assertTrue(os.path.exists(self.locator.get_demand_results_file('B01', 'h5')))
+
+    def test_read_columns(self):
+        self.write_results('columnar')
+        df = demand_reader.read_hourly_demand(self.locator, 'B01', columns=['Qhs_sys_kWh', 'T_int_C'])
+        self.assertEqual(list(df.columns), ['Qhs_sys_kWh', 'T_int_C'])
+        self.assertEqual(len(df), 8760)
+        self.assertRaises(KeyError, demand_reader.read_hourly_demand, self.locator, 'B01', ['missing_kWh'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Test the binary catalog of the Excel databases (:py:mod:`cea.utilities.database_catalog`).
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from cea.utilities import database_catalog
+
+
+class TestDatabaseCatalog(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.database = os.path.join(self.folder, 'supply_systems.xls')
+        self.write_database(1000.0)
+        database_catalog._catalogs.clear()
+
+    def tearDown(self):
+        database_catalog._catalogs.clear()
+        shutil.rmtree(self.folder)
+
+    def write_database(self, cost):
+        writer = pd.ExcelWriter(self.database)
+        pd.DataFrame({'code': ['BO1', 'BO2'], 'cost': [cost, 2 * cost]}).to_excel(writer, 'Boiler', index=False)
+        pd.DataFrame({'code': ['HP1'], 'cost': [3 * cost]}).to_excel(writer, 'HP', index=False)
+        writer.save()
+
+    def test_read_database(self):
+        for sheet_name in ['Boiler', 'HP']:
+            pd.testing.assert_frame_equal(database_catalog.read_database(self.database, sheet_name),
+                                          pd.read_excel(self.database, sheet_name))
+        self.assertTrue(os.path.exists(database_catalog.get_catalog_path(self.database)))
+        self.assertRaises(ValueError, database_catalog.read_database, self.database, 'Chiller')
+
+        # the sheets returned are copies
+        database_catalog.read_database(self.database, 'HP')['cost'] = 0.0
+        self.assertEqual(database_catalog.read_database(self.database, 'HP')['cost'].values[0], 3000.0)
+
+    def test_catalog_file(self):
+        database_catalog.compile_database(self.database)
+        database_catalog._catalogs.clear()
+        catalog = database_catalog.get_catalog(self.database)
+        self.assertEqual(sorted(catalog['sheets'].keys()), ['Boiler', 'HP'])
+
+        # a corrupt catalog file is compiled again
+        database_catalog._catalogs.clear()
+        with open(database_catalog.get_catalog_path(self.database), 'wb') as f:
+            f.write(b'not a pickle')
+        self.assertEqual(database_catalog.read_database(self.database, 'Boiler')['cost'].values[0], 1000.0)
+
+    def test_modified_database(self):
+        self.assertEqual(database_catalog.read_database(self.database, 'Boiler')['cost'].values[0], 1000.0)
+        self.write_database(500.0)
+        modified = os.path.getmtime(self.database) + 10
+        os.utime(self.database, (modified, modified))
+        self.assertEqual(database_catalog.read_database(self.database, 'Boiler')['cost'].values[0], 500.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Test the manifest of the incremental demand calculation (:py:mod:`cea.demand.demand_manifest`).
+"""
+import collections
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import cea.inputlocator
+from cea.demand import demand_manifest
+from cea.demand.demand_writers import DemandTotals
+
+HOURLY_COLUMNS = ['QH_sys_kWh', 'E_sys_kWh']
+
+
+class TestDemandManifest(unittest.TestCase):
+    def setUp(self):
+        self.scenario = tempfile.mkdtemp()
+        self.locator = cea.inputlocator.InputLocator(self.scenario)
+        self.totals = DemandTotals(HOURLY_COLUMNS)
+        for i, building in enumerate(['B01', 'B02', 'B03']):
+            hourly_loads = np.arange(2 * 24, dtype=np.float64).reshape(2, 24) * (i + 1)
+            self.totals.add_building(building, ['Name', 'QH_sys_MWhyr'], [building, i + 1.0], hourly_loads)
+            pd.DataFrame(dict(zip(HOURLY_COLUMNS, hourly_loads)), columns=HOURLY_COLUMNS).to_csv(
+                self.locator.get_demand_results_file(building, 'csv'), index=False, float_format='%.3f')
+            np.save(self.locator.get_demand_hourly_loads(building), hourly_loads)
+        self.building_keys = collections.OrderedDict([('B01', 'a'), ('B02', 'b'), ('B03', 'c')])
+        self.manifest = demand_manifest.DemandManifest('settings', self.building_keys, self.totals)
+
+    def tearDown(self):
+        shutil.rmtree(self.scenario)
+
+    def test_changed_buildings(self):
+        self.assertEqual(self.manifest.get_changed_buildings('settings', self.building_keys), [])
+        building_keys = collections.OrderedDict(self.building_keys, B02='x')
+        self.assertEqual(self.manifest.get_changed_buildings('settings', building_keys), ['B02'])
+
+        # changing the common inputs or the list of buildings calculates all buildings again
+        self.assertIsNone(self.manifest.get_changed_buildings('other settings', self.building_keys))
+        building_keys = collections.OrderedDict([('B01', 'a'), ('B02', 'b')])
+        self.assertIsNone(self.manifest.get_changed_buildings('settings', building_keys))
+
+    def test_unchanged_totals(self):
+        unchanged_totals = self.manifest.get_unchanged_totals(['B02'], self.locator, 'csv')
+        self.assertEqual(sorted(unchanged_totals.yearly.keys()), ['B01', 'B03'])
+        np.testing.assert_allclose(unchanged_totals.hourly,
+                                   np.arange(2 * 24, dtype=np.float64).reshape(2, 24) * (1 + 3))
+
+        # the totals of the manifest are left untouched
+        np.testing.assert_allclose(self.totals.hourly, np.arange(2 * 24, dtype=np.float64).reshape(2, 24) * 6)
+
+        # the loads are subtracted at full precision, not as rounded in the csv files
+        totals = DemandTotals(HOURLY_COLUMNS)
+        hourly_loads = np.full((2, 24), 1.0 / 3)
+        totals.add_building('B01', ['Name', 'QH_sys_MWhyr'], ['B01', 1.0], hourly_loads)
+        np.save(self.locator.get_demand_hourly_loads('B01'), hourly_loads)
+        manifest = demand_manifest.DemandManifest('settings', self.building_keys, totals)
+        self.assertTrue((manifest.get_unchanged_totals(['B01'], self.locator, 'csv').hourly == 0.0).all())
+
+        # without the previous results, the totals can't be patched
+        self.assertIsNone(self.manifest.get_unchanged_totals(['B04'], self.locator, 'csv'))
+
+    def test_remove_stale_hourly_loads(self):
+        demand_manifest.remove_stale_hourly_loads(self.locator, ['B01', 'B03'])
+        self.assertEqual(sorted(os.listdir(self.locator.get_demand_hourly_loads_folder())), ['B01.npy', 'B03.npy'])
+        demand_manifest.remove_stale_hourly_loads(self.locator, [])
+        self.assertEqual(os.listdir(self.locator.get_demand_hourly_loads_folder()), [])
+
+    def test_read_and_write(self):
+        self.assertIsNone(demand_manifest.read_demand_manifest(self.locator))
+        demand_manifest.write_demand_manifest(self.locator, self.manifest)
+        manifest = demand_manifest.read_demand_manifest(self.locator)
+        self.assertEqual(manifest.get_changed_buildings('settings', self.building_keys), [])
+
+        with open(self.locator.get_demand_manifest(), 'wb') as f:
+            f.write(b'not a pickle')
+        self.assertIsNone(demand_manifest.read_demand_manifest(self.locator))
+
+
+if __name__ == '__main__':
+    unittest.main()
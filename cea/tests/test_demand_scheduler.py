@@ -0,0 +1,53 @@
+"""
+Test the load-balanced scheduling of the demand calculation (:py:mod:`cea.demand.demand_scheduler`) with a dummy
+calculation instead of the demand calculation.
+"""
+import multiprocessing as mp
+import os
+import tempfile
+import time
+import unittest
+
+from cea.demand import demand_scheduler
+
+
+def calc_chunk(chunk, hourly_procedure):
+    """fail building B03 on its first attempt (marked by a file) and never finish building B04"""
+    for building in chunk:
+        if building == 'B03':
+            marker = os.path.join(tempfile.gettempdir(), 'cea-test-demand-scheduler-%i' % os.getppid())
+            if not os.path.exists(marker):
+                open(marker, 'w').close()
+                raise ValueError('first attempt of B03 fails')
+            os.remove(marker)
+        elif building == 'B04':
+            time.sleep(10)
+    return chunk
+
+
+class TestDemandScheduler(unittest.TestCase):
+    def test_next_chunk(self):
+        costs = {'B01': 8.0, 'B02': 4.0, 'B03': 1.0, 'B04': 1.0, 'B05': 1.0, 'B06': 1.0}
+        buildings = ['B01', 'B02', 'B03', 'B04', 'B05', 'B06']
+        chunks = []
+        while buildings:
+            chunks.append(demand_scheduler.next_chunk(buildings, costs, 1, 3))
+        self.assertEqual(chunks, [['B01'], ['B02'], ['B03', 'B04'], ['B05'], ['B06']])
+
+    def test_schedule_demand(self):
+        buildings = ['B01', 'B02', 'B03', 'B04', 'B05']
+        costs = {'B01': 1.0, 'B02': 1.0, 'B03': 2.0, 'B04': 3.0, 'B05': 1.0}
+        reduced = []
+        report = demand_scheduler.schedule_demand(mp.Pool(2), 2, calc_chunk, buildings, costs, 'building',
+                                                  max_chunk_size=10, timeout_per_building=1, max_retries=1,
+                                                  reduce_result=reduced.extend)
+        self.assertEqual(list(report.index), buildings)
+        self.assertEqual(list(report.status), ['completed', 'completed', 'completed', 'timeout', 'completed'])
+        self.assertEqual(list(report.attempts), [1, 1, 2, 2, 1])
+        self.assertEqual(report.loc['B03', 'error'], '')
+        # the results of completed chunks only (B03 failed once, B04 timed out twice)
+        self.assertEqual(sorted(reduced), ['B01', 'B02', 'B03', 'B05'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Test the timing of the phases of the demand calculation (:py:mod:`cea.demand.demand_timing`).
+"""
+import unittest
+
+import numpy as np
+
+from cea.demand import demand_timing
+from cea.demand.demand_writers import DemandTotals
+
+
+class TestDemandTiming(unittest.TestCase):
+    def tearDown(self):
+        demand_timing.enable(False)
+
+    def test_disabled(self):
+        demand_timing.enable(False)
+        self.assertIs(demand_timing.phase('B01', 'schedules'), demand_timing.NO_TIMING)
+        with demand_timing.phase('B01', 'schedules'):
+            pass
+        demand_timing.add_time('B01', 'hourly procedure', 1.0)
+        self.assertIsNone(demand_timing.pop_timings('B01'))
+
+    def test_phases(self):
+        demand_timing.enable()
+        for _ in range(2):
+            with demand_timing.phase('B01', 'schedules'):
+                pass
+        with demand_timing.phase('B02', 'hourly procedure'):
+            pass
+        demand_timing.add_time('B01', 'hourly procedure', 1.5)
+
+        # an exception in a phase is passed on, the time is still recorded
+        with self.assertRaises(ValueError):
+            with demand_timing.phase('B01', 'write results'):
+                raise ValueError('error')
+
+        timings = demand_timing.pop_timings('B01')
+        self.assertEqual(list(timings.keys()), ['schedules', 'hourly procedure', 'write results'])
+        self.assertGreaterEqual(timings['hourly procedure'], 1.5)
+        self.assertIsNone(demand_timing.pop_timings('B01'))
+        self.assertEqual(list(demand_timing.pop_timings('B02').keys()), ['hourly procedure'])
+
+    def test_timings_to_dataframe(self):
+        timings = {'B01': {'schedules': 1.0, 'hourly procedure': 3.0},
+                   'B02': {'schedules': 2.0},
+                   demand_timing.ZONE: {'weather': 0.5}}
+        table = demand_timing.timings_to_dataframe(timings, ['B02', 'B01', 'B03', demand_timing.ZONE])
+        self.assertEqual(list(table.index), ['B02', 'B01', demand_timing.ZONE])
+        self.assertEqual(table.loc['B02', 'hourly procedure'], 0.0)
+        np.testing.assert_allclose(table['total'].values, [2.0, 4.0, 0.5])
+
+    def test_demand_totals(self):
+        """the timings travel back from the worker processes with the totals of the buildings"""
+        totals = DemandTotals(['QH_sys_kWh'])
+        for building in ['B01', 'B02']:
+            building_totals = DemandTotals(['QH_sys_kWh'])
+            building_totals.add_building(building, ['Name'], [building], np.ones((1, 24)))
+            building_totals.timings[building] = {'schedules': 1.0}
+            totals.update(building_totals)
+        self.assertEqual(sorted(totals.timings.keys()), ['B01', 'B02'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Test the reduction of the yearly totals returned by the building calculations (:py:class:`DemandTotals`) to the
+``Total_demand`` and ``Total_demand_hourly`` files.
+"""
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import cea.inputlocator
+from cea.demand import demand_reader
+from cea.demand.demand_writers import HourlyDemandWriter, YearlyDemandWriter, DemandTotals
+
+LOADS = ['Qhs_sys', 'E_sys']
+
+
+class BuildingPropertiesRowStub(object):
+    def __init__(self, af):
+        self.rc_model = {'Af': af, 'Aroof': 100.0, 'GFA_m2': af * 1.2, 'NFA_m2': af * 1.1}
+
+
+class TestDemandTotals(unittest.TestCase):
+    def setUp(self):
+        self.scenario = tempfile.mkdtemp()
+        self.locator = cea.inputlocator.InputLocator(self.scenario)
+        self.date = pd.date_range('2017/01/01', periods=8760, freq='H')
+
+    def tearDown(self):
+        shutil.rmtree(self.scenario)
+
+    def calc_building(self, building_name, seed):
+        writer = HourlyDemandWriter(LOADS, ['mcphs_sys'], ['T_int'])
+        random = np.random.RandomState(seed)
+        tsd = dict((key, random.rand(8760) * 1000) for key in
+                   LOADS + ['mcphs_sys', 'T_int', 'people', 'x_int'] + writer.load_plotting_vars)
+        return writer.results_to_csv(tsd, BuildingPropertiesRowStub(100.0 * seed), self.locator, self.date,
+                                     building_name), tsd
+
+    def test_write_totals(self):
+        buildings = ['B01', 'B02', 'B03']
+        results = [self.calc_building(building, seed) for seed, building in enumerate(buildings, 1)]
+
+        # reduce in a different order than the buildings (as the chunks complete)
+        demand_totals = DemandTotals()
+        chunk = DemandTotals()
+        chunk.update(results[2][0])
+        chunk.update(results[0][0])
+        demand_totals.update(chunk)
+        demand_totals.update(results[1][0])
+
+        writer = YearlyDemandWriter(LOADS, ['mcphs_sys'], ['T_int'])
+        totals = writer.write_to_csv(demand_totals, buildings, self.date, self.locator)
+
+        total_demand = pd.read_csv(self.locator.get_total_demand())
+        self.assertEqual(list(total_demand.Name), buildings)
+        self.assertEqual(list(total_demand.columns[:6]), ['Name', 'Af_m2', 'Aroof_m2', 'GFA_m2', 'NFA_m2', 'people0'])
+        for building, (_, tsd) in zip(buildings, results):
+            row = total_demand.set_index('Name').loc[building]
+            self.assertAlmostEqual(row['Qhs_sys_MWhyr'], tsd['Qhs_sys'].sum() / 1000000, places=3)
+            self.assertAlmostEqual(row['E_sys0_kW'], tsd['E_sys'].max() / 1000, places=3)
+        self.assertEqual(list(totals.Name), buildings)
+
+        hourly = demand_reader.read_total_hourly_demand(self.locator, ['DATE', 'Qhs_sys_kWh', 'I_sol_kWh'])
+        self.assertEqual(len(hourly), 8760)
+        np.testing.assert_allclose(hourly.Qhs_sys_kWh, sum(tsd['Qhs_sys'] for _, tsd in results) / 1000, atol=1e-3)
+        np.testing.assert_allclose(hourly.I_sol_kWh, sum(tsd['I_sol'] for _, tsd in results) / 1000, atol=1e-3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Test the fingerprints and atomic writes of the cached files (:py:mod:`cea.utilities.file_cache`).
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import cea
+from cea.utilities import file_cache
+
+
+class TestFileCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, 'cache.txt')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def calc_key(self, *components):
+        key = file_cache.new_key(*components)
+        file_cache.update_key_with_file(key, self.path)
+        return key.hexdigest()
+
+    def test_key(self):
+        missing = self.calc_key(1, 'CH')
+        with open(self.path, 'w') as f:
+            f.write('content')
+        key = self.calc_key(1, 'CH')
+        self.assertNotEqual(key, missing)
+        self.assertEqual(key, self.calc_key(1, 'CH'))
+        self.assertNotEqual(key, self.calc_key(2, 'CH'))
+
+        # a new version of CEA invalidates all caches
+        version = cea.__version__
+        cea.__version__ = version + '-upgraded'
+        try:
+            self.assertNotEqual(key, self.calc_key(1, 'CH'))
+        finally:
+            cea.__version__ = version
+
+    def test_write_atomically(self):
+        def write(path):
+            with open(path, 'w') as f:
+                f.write('content')
+
+        file_cache.write_atomically(self.path, write)
+        file_cache.write_atomically(self.path, write)  # replacing an existing file is possible
+        with open(self.path) as f:
+            self.assertEqual(f.read(), 'content')
+
+        def fail(path):
+            raise IOError('disk full')
+
+        # a failed write leaves no temporary file behind and is reported unless the file was written by someone else
+        file_cache.write_atomically(self.path, fail)
+        os.remove(self.path)
+        self.assertRaises(IOError, file_cache.write_atomically, self.path, fail)
+        self.assertEqual(os.listdir(self.folder), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
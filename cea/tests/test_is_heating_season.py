@@ -15,6 +15,11 @@ import unittest
 
 import datetime
 
+import numpy as np
+import pandas as pd
+
+from cea.demand import control_heating_cooling_systems
+
 
 class TestIsHeatingSeasonReplacement(unittest.TestCase):
     def setUp(self):
@@ -53,3 +58,52 @@ class TestIsHeatingSeasonReplacement(unittest.TestCase):
             return False
         else:
             return True
+
+
+class TestSeasonMasks(unittest.TestCase):
+    """The season masks of :py:class:`cea.demand.control_heating_cooling_systems.ControlProfile` are calculated for
+    the whole year at once - check them against the hour-by-hour logic they replace."""
+
+    def test_calc_season(self):
+        for start, end in [('10-01', '05-15'), ('05-15', '10-01'), ('01-01', '12-31'), ('12-31', '01-01')]:
+            season = control_heating_cooling_systems.calc_season(True, start, end)
+            for t in range(8760):
+                self.assertEqual(season[t], self.is_season_hourly(t, start, end), '%s - %s, hour %i' % (start, end, t))
+
+    def test_no_season(self):
+        self.assertFalse(control_heating_cooling_systems.calc_season(False, '10-01', '05-15').any())
+
+    def is_season_hourly(self, t, season_start, season_end):
+        start = control_heating_cooling_systems.convert_date_to_hour(season_start)
+        end = control_heating_cooling_systems.convert_date_to_hour(season_end) + 23
+        if start < end:
+            return start <= t <= end
+        return start <= t <= 8760 or 0 <= t <= end
+
+
+class TestSetPoints(unittest.TestCase):
+    """The set points of :py:func:`cea.demand.control_heating_cooling_systems.calc_simple_temp_control` are calculated
+    for the whole year at once - check them against the hour-by-hour functions they replace."""
+
+    def test_calc_set_points(self):
+        class ControlProfile(object):
+            heating_season = control_heating_cooling_systems.calc_season(True, '09-16', '05-14')
+            cooling_season = control_heating_cooling_systems.calc_season(True, '05-15', '09-15')
+
+        class BuildingPropertiesRow(object):
+            control_profile = ControlProfile()
+            comfort = {'Ths_set_C': 21.0, 'Ths_setb_C': 12.0, 'Tcs_set_C': 26.0, 'Tcs_setb_C': 28.0}
+
+        bpr = BuildingPropertiesRow()
+        hours = np.arange(8760)
+        people = np.where((hours % 24 >= 8) & (hours % 24 <= 18), 12.0, 0.0)
+        weekday = pd.date_range('2017/01/01', periods=8760, freq='H').dayofweek
+
+        ta_hs_set, ta_cs_set = control_heating_cooling_systems.calc_set_points(people, bpr, weekday)
+        np.testing.assert_array_equal(ta_hs_set, [
+            control_heating_cooling_systems.get_heating_system_set_point(people[t], t, bpr, weekday[t])
+            for t in hours])
+        np.testing.assert_array_equal(ta_cs_set, [
+            control_heating_cooling_systems.get_cooling_system_set_point(people[t], t, bpr, weekday[t])
+            for t in hours])
+        self.assertTrue(np.isnan(ta_hs_set).any() and not np.isnan(ta_hs_set).all())
@@ -0,0 +1,55 @@
+"""
+Test that the JIT-compiled kernels (:py:mod:`cea.utilities.jit`) yield the same results as the pure python versions.
+"""
+import unittest
+
+import numpy as np
+
+import cea.utilities.jit
+from cea.demand import rc_model_SIA
+from cea.technologies import radiators, storage_tank
+
+
+RC_MODEL_ARGS = (4000.0, 2500.0, 0.0, 120.0, 150.0, 8000.0, 3500.0, 5.0, 1250.0, 2250.0, 75.0, 22916.7, 0.05, 0.3,
+                 0.0, 500.0, 500.0, 19.5, 16.0)
+
+
+@unittest.skipIf(not cea.utilities.jit.is_available(), 'numba is not installed')
+class TestJitKernels(unittest.TestCase):
+    def tearDown(self):
+        cea.utilities.jit.configure(True)
+
+    def test_kernels_are_registered(self):
+        cea.utilities.jit.import_kernel_modules()
+        for name in ['cea.demand.rc_model_SIA._calc_rc_model_temperatures', 'cea.technologies.radiators.fh',
+                     'cea.technologies.storage_tank.ode_hot_water_tank']:
+            self.assertIn(name, cea.utilities.jit.KERNELS)
+
+    def test_configure(self):
+        kernel = cea.utilities.jit.KERNELS['cea.demand.rc_model_SIA._calc_rc_model_temperatures']
+        cea.utilities.jit.configure(False)
+        self.assertIs(rc_model_SIA._calc_rc_model_temperatures, kernel.py_func)
+        self.assertFalse(kernel.is_accelerated())
+        cea.utilities.jit.configure(True)
+        self.assertIs(rc_model_SIA._calc_rc_model_temperatures, kernel.dispatcher)
+        self.assertTrue(kernel.is_accelerated())
+
+    def test_jit_equals_python(self):
+        cea.utilities.jit.configure(True)
+        jit_results = self.calc_kernels()
+        cea.utilities.jit.configure(False)
+        python_results = self.calc_kernels()
+        np.testing.assert_allclose(jit_results, python_results, rtol=1e-10)
+
+    def calc_kernels(self):
+        results = list(rc_model_SIA._calc_rc_model_temperatures(*RC_MODEL_ARGS))
+        results.extend(radiators.calc_radiator(5000.0, 21.0, 10000.0, 20.0, 70.0, 55.0))
+        results.append(storage_tank.calc_tank_temperature(60.0, 100.0, 2000.0, 3000.0, 0.5, 'hot_water'))
+        results.append(storage_tank.calc_tank_temperature(10.0, 100.0, 2000.0, 3000.0, 0.5, 'cold_water'))
+        q_discharged_W = np.tile([0.0, 0.0, 3000.0, 500.0], 6)
+        results.extend(np.concatenate(storage_tank.calc_dhw_tank(21.0, np.linspace(0.0, 10.0, 24), q_discharged_W, 0.1)))
+        return results
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Test the cache and the working folders of the evaluation of the networks of the thermal network optimization
+(:py:mod:`cea.technologies.thermal_network.network_evaluation`).
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+import cea.inputlocator
+from cea.technologies.thermal_network import network_evaluation
+
+
+class TestNetworkEvaluation(unittest.TestCase):
+    def setUp(self):
+        self.scenario = tempfile.mkdtemp()
+        self.locator = cea.inputlocator.InputLocator(self.scenario)
+
+    def tearDown(self):
+        shutil.rmtree(self.scenario)
+
+    def test_calc_network_key(self):
+        key = network_evaluation.calc_network_key('settings', ['B01'], ['B03', 'B02'], False, ['aru', 'ahu'])
+        # the order of the buildings and loads doesn't matter
+        self.assertEqual(key, network_evaluation.calc_network_key('settings', ['B01'], ['B02', 'B03'], False,
+                                                                  ['ahu', 'aru']))
+        self.assertNotEqual(key, network_evaluation.calc_network_key('settings', ['B01'], ['B02', 'B03'], True,
+                                                                     ['ahu', 'aru']))
+        self.assertNotEqual(key, network_evaluation.calc_network_key('settings', ['B02'], ['B01', 'B03'], False,
+                                                                     ['ahu', 'aru']))
+        self.assertNotEqual(key, network_evaluation.calc_network_key('other settings', ['B01'], ['B02', 'B03'], False,
+                                                                     ['ahu', 'aru']))
+
+    def test_cached_results(self):
+        self.assertIsNone(network_evaluation.read_cached_results(self.locator, 'DC', 'abc'))
+        results = pd.DataFrame({'individual': ['[1, 0, 1]'], 'total': [12.5]}, index=[0])
+        network_evaluation.write_cached_results(self.locator, 'DC', 'abc', results)
+        network_evaluation.write_cached_results(self.locator, 'DC', 'abc', results)  # overwriting is possible
+        cached = network_evaluation.read_cached_results(self.locator, 'DC', 'abc')
+        self.assertEqual(cached['total'][0], 12.5)
+        self.assertEqual(cached['individual'][0], '[1, 0, 1]')
+
+    def test_worker_locator(self):
+        working_folder = os.path.join(self.scenario, 'worker')
+        locator = network_evaluation.WorkerLocator(self.scenario, working_folder)
+        for path in [locator.get_input_network_folder('DC', ''),
+                     locator.get_optimization_network_edge_list_file('DC', ''),
+                     locator.get_temporary_file('nodes_buildings.shp')]:
+            self.assertTrue(path.startswith(working_folder), path)
+        # the inputs of the scenario are shared
+        self.assertEqual(locator.get_total_demand(), self.locator.get_total_demand())
+        self.assertEqual(locator.get_network_street_folder(), self.locator.get_network_street_folder())
+
+
+if __name__ == '__main__':
+    unittest.main()
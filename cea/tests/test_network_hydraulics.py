@@ -0,0 +1,127 @@
+"""
+Test the sparse hydraulic calculation of the thermal networks
+(:py:mod:`cea.technologies.thermal_network.network_hydraulics`) against the dense solutions.
+"""
+import unittest
+
+import numpy as np
+
+from cea.technologies.thermal_network import network_hydraulics
+
+
+def make_grid_network(rows, columns):
+    """:return: the node-edge incidence matrix of a grid of nodes (a network with loops)"""
+    edges = []
+    for row in range(rows):
+        for column in range(columns):
+            node = row * columns + column
+            if column < columns - 1:
+                edges.append((node, node + 1))
+            if row < rows - 1:
+                edges.append((node + columns, node))  # some edges point "backwards"
+    return make_edge_node(rows * columns, edges)
+
+
+def make_edge_node(number_of_nodes, edges):
+    edge_node = np.zeros((number_of_nodes, len(edges)))
+    for edge, (start_node, end_node) in enumerate(edges):
+        edge_node[start_node, edge] = -1
+        edge_node[end_node, edge] = 1
+    return edge_node
+
+
+def make_node_flows(number_of_nodes):
+    """the plant (node 0) supplies the demand of all other nodes"""
+    node_flows = np.linspace(0.5, 2.0, number_of_nodes)
+    node_flows[0] = -node_flows[1:].sum()
+    return node_flows
+
+
+class TestNetworkHydraulics(unittest.TestCase):
+    def setUp(self):
+        self.edge_node = make_grid_network(4, 5)
+        self.hydraulics = network_hydraulics.NetworkHydraulics(self.edge_node)
+        self.node_flows = make_node_flows(20)
+
+    def test_loops(self):
+        self.assertEqual(len(self.hydraulics.loops), 31 - 20 + 1)
+        # each edge of a loop connects the next two nodes of the loop, in the direction of its sign
+        loop_signs = self.hydraulics.loop_signs.toarray()
+        for loop, signs in zip(self.hydraulics.loops, loop_signs):
+            self.assertEqual(np.count_nonzero(signs), len(loop))
+            node_sums = self.edge_node.dot(signs)
+            np.testing.assert_array_equal(node_sums, 0)
+
+    def test_solve_edge_flows(self):
+        # networks with loops: the solution with the smallest norm, like the dense least squares solution
+        edge_flows = self.hydraulics.solve_edge_flows(self.node_flows, 0)
+        expected = np.linalg.lstsq(self.edge_node[1:], self.node_flows[1:], rcond=None)[0]
+        np.testing.assert_allclose(edge_flows, expected, atol=1e-10)
+
+        # networks without loops: the reduced incidence matrix is square
+        edge_node = make_edge_node(5, [(0, 1), (1, 2), (3, 1), (2, 4)])
+        tree = network_hydraulics.NetworkHydraulics(edge_node)
+        self.assertEqual(tree.loops, [])
+        node_flows = make_node_flows(5)
+        edge_flows = tree.solve_edge_flows(node_flows, 0)
+        np.testing.assert_allclose(edge_flows, np.linalg.solve(edge_node[1:], node_flows[1:]))
+        np.testing.assert_allclose(tree.calc_node_flows(edge_flows), node_flows)
+
+    def test_calc_loop_correction(self):
+        """the correction of all loops at once equals the correction of the loops one after the other"""
+        random = np.random.RandomState(0)
+        edge_flows = random.uniform(-2.0, 2.0, self.edge_node.shape[1])
+        pressure_loss = edge_flows * abs(edge_flows)
+        derivative = abs(2 * edge_flows)
+
+        expected = edge_flows.copy()
+        for loop in self.hydraulics.loops:
+            loop_edges = []
+            for j, node in enumerate(loop):
+                next_node = loop[(j + 1) % len(loop)]
+                edge = self.hydraulics.graph.get_edge_data(node, next_node)['edge_number']
+                clockwise = 1 if self.edge_node[node, edge] == 1 and self.edge_node[next_node, edge] == -1 else -1
+                loop_edges.append((edge, clockwise))
+            sum_num = sum(pressure_loss[edge] * clockwise for edge, clockwise in loop_edges)
+            sum_den = sum(derivative[edge] for edge, _ in loop_edges)
+            for edge, clockwise in loop_edges:
+                expected[edge] -= sum_num / sum_den * clockwise
+
+        correction, _ = self.hydraulics.calc_loop_correction(pressure_loss, derivative)
+        np.testing.assert_allclose(edge_flows + correction, expected)
+
+        # the correction keeps the mass balance of the nodes
+        np.testing.assert_allclose(self.hydraulics.calc_node_flows(correction), 0, atol=1e-12)
+
+    def test_calc_node_pressures(self):
+        random = np.random.RandomState(1)
+        pressure_differences = random.uniform(0.0, 100.0, self.edge_node.shape[1])
+        pressure_nodes = self.hydraulics.calc_node_pressures(pressure_differences)
+        expected = np.linalg.lstsq(self.edge_node.T, pressure_differences, rcond=None)[0]
+        np.testing.assert_allclose(pressure_nodes, expected, atol=1e-8)
+
+    def test_flow_order(self):
+        edge_node = make_edge_node(5, [(3, 1), (0, 3), (1, 2), (1, 4)])
+        tree = network_hydraulics.NetworkHydraulics(edge_node)
+        position = {node: i for i, node in enumerate(tree.flow_order)}
+        for start_node, end_node in zip(tree.start_nodes, tree.end_nodes):
+            self.assertLess(position[start_node], position[end_node])
+        self.assertEqual(list(tree.edges_in[1]), [0])
+        self.assertEqual(list(tree.edges_out[1]), [2, 3])
+
+        # edges pointing around a loop have no order
+        cycle = network_hydraulics.NetworkHydraulics(make_edge_node(3, [(0, 1), (1, 2), (2, 0)]))
+        self.assertIsNone(cycle.flow_order)
+
+    def test_get_network_hydraulics(self):
+        hydraulics = network_hydraulics.get_network_hydraulics(self.edge_node)
+        self.assertIs(network_hydraulics.get_network_hydraulics(self.edge_node.copy()), hydraulics)
+
+        # reversing an edge is a different network
+        edge_node = self.edge_node.copy()
+        edge_node[:, 0] *= -1
+        self.assertIsNot(network_hydraulics.get_network_hydraulics(edge_node), hydraulics)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Test the thermo-physical property kernels of the thermal networks
+(:py:mod:`cea.technologies.thermal_network.network_properties`) against the formulas evaluated edge by edge.
+"""
+import math
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from cea.constants import P_WATER_KGPERM3
+from cea.technologies.constants import ROUGHNESS
+from cea.technologies.thermal_network import network_properties
+
+MATERIAL_CONDUCTIVITIES = (76.0, 0.023, 1.6)  # steel, PUR, soil
+
+
+def calc_darcy_scalar(pipe_diameter_m, reynolds):
+    if reynolds <= 1:
+        return 0.0
+    elif reynolds <= 2300:
+        return 64 / reynolds
+    elif reynolds <= 5000:
+        return 0.316 * reynolds ** -0.25
+    return 1.325 * math.log(ROUGHNESS / (3.7 * pipe_diameter_m) + 5.74 / reynolds ** 0.9) ** -2
+
+
+class TestNetworkProperties(unittest.TestCase):
+    def setUp(self):
+        random = np.random.RandomState(0)
+        self.pipe_diameter_m = random.uniform(0.02, 0.5, 30)
+        # no flow, laminar, transient and turbulent flows in both directions
+        self.mass_flow_kgs = np.concatenate([[0.0, 1e-7], 10 ** random.uniform(-4.5, 2, 28)]) * np.where(
+            random.rand(30) < 0.3, -1, 1)
+        self.temperature__k = random.uniform(280.0, 360.0, 30)
+        pipes = ['PIPE%i' % i for i in range(30)]
+        self.pipe_properties_df = pd.DataFrame([self.pipe_diameter_m, self.pipe_diameter_m * 1.1,
+                                                self.pipe_diameter_m * 1.8],
+                                               index=['D_int_m', 'D_ext_m', 'D_ins_m'], columns=pipes)
+        self.pipe_length_m = pd.Series(random.uniform(5.0, 300.0, 30), index=pipes)
+
+    def test_calc_darcy(self):
+        reynolds = network_properties.calc_reynolds(self.mass_flow_kgs, self.temperature__k, self.pipe_diameter_m)
+        self.assertTrue((reynolds <= 1).any() and (reynolds > 5000).any())
+        expected = [calc_darcy_scalar(d, re) for d, re in zip(self.pipe_diameter_m, reynolds)]
+        np.testing.assert_allclose(network_properties.calc_darcy(self.pipe_diameter_m, reynolds), expected)
+
+    def test_calc_pressure_loss(self):
+        pressure_loss, derivative = network_properties.calc_pressure_loss(
+            self.pipe_diameter_m, self.pipe_length_m.values, self.mass_flow_kgs, self.temperature__k)
+        reynolds = network_properties.calc_reynolds(self.mass_flow_kgs, self.temperature__k, self.pipe_diameter_m)
+        darcy = network_properties.calc_darcy(self.pipe_diameter_m, reynolds)
+        expected = darcy * 8 * self.mass_flow_kgs ** 2 * self.pipe_length_m.values / (
+                math.pi ** 2 * self.pipe_diameter_m ** 5 * P_WATER_KGPERM3)
+        np.testing.assert_allclose(pressure_loss, expected)
+        np.testing.assert_allclose(derivative, 2 * expected / np.where(self.mass_flow_kgs == 0, 1, self.mass_flow_kgs))
+
+    def test_calc_heat_conduction_coefficient(self):
+        for network_type in ['DH', 'DC']:
+            pipes = network_properties.PipeProperties(self.pipe_properties_df, self.pipe_length_m,
+                                                      MATERIAL_CONDUCTIVITIES, network_type)
+            k = pipes.calc_heat_conduction_coefficient(self.mass_flow_kgs, self.temperature__k)
+            self.assertEqual(k.shape, (30,))
+            self.assertTrue((k > 0).all())
+
+            # the pipes without flow only lose heat through the (fixed) convection resistance
+            no_flow = pipes.pipe_length_m[0] * 1.2 / (pipes.resistance_without_flow[0] + 0.2) / 1000
+            self.assertAlmostEqual(k[0], no_flow)
+
+    def test_time_steps(self):
+        """the kernels evaluate several time steps (t x e) at once"""
+        random = np.random.RandomState(1)
+        mass_flow_kgs = random.uniform(-5.0, 5.0, (24, 30))
+        temperature__k = random.uniform(280.0, 360.0, (24, 30))
+        pipes = network_properties.PipeProperties(self.pipe_properties_df, self.pipe_length_m,
+                                                  MATERIAL_CONDUCTIVITIES, 'DH')
+        k = pipes.calc_heat_conduction_coefficient(mass_flow_kgs, temperature__k)
+        pressure_loss, _ = pipes.calc_pressure_loss(mass_flow_kgs, temperature__k)
+        self.assertEqual(k.shape, (24, 30))
+        for t in [0, 11, 23]:
+            np.testing.assert_allclose(k[t], pipes.calc_heat_conduction_coefficient(mass_flow_kgs[t],
+                                                                                    temperature__k[t]))
+            np.testing.assert_allclose(pressure_loss[t], pipes.calc_pressure_loss(mass_flow_kgs[t],
+                                                                                  temperature__k[t])[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Test the binary store of the sensor radiation (:py:mod:`cea.resources.radiation_daysim.radiation_store`).
+"""
+import json
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import cea.inputlocator
+from cea.resources.radiation_daysim import radiation_store
+
+
+class TestRadiationStore(unittest.TestCase):
+    def setUp(self):
+        self.scenario = tempfile.mkdtemp()
+        self.locator = cea.inputlocator.InputLocator(self.scenario)
+        self.metadata = pd.DataFrame({'SURFACE': ['srf0', 'srf1', 'srf2', 'srf3'],
+                                      'TYPE': ['roofs', 'walls', 'windows', 'walls'],
+                                      'orientation': ['top', 'north', 'south', 'south'],
+                                      'AREA_m2': [10.0, 5.0, 2.0, 4.0]})
+        self.metadata.to_csv(self.locator.get_radiation_metadata('B01'), index=None)
+        self.radiation = np.random.RandomState(42).rand(4, 8760).astype(np.float32) * 800
+
+    def tearDown(self):
+        shutil.rmtree(self.scenario)
+
+    def write_json(self):
+        with open(self.locator.get_radiation_building('B01'), 'w') as outfile:
+            json.dump(dict((surface, [float(x) for x in values]) for surface, values in
+                           zip(self.metadata.SURFACE, self.radiation)), outfile)
+
+    def test_read_sensors(self):
+        self.assertFalse(radiation_store.radiation_exists(self.locator, 'B01'))
+        radiation_store.write_radiation(self.locator.get_radiation_building_sensors('B01'), self.radiation)
+        self.assertTrue(radiation_store.radiation_exists(self.locator, 'B01'))
+
+        metadata, radiation = radiation_store.read_sensors(self.locator, 'B01')
+        self.assertEqual(list(metadata.index), ['srf0', 'srf1', 'srf2', 'srf3'])
+        np.testing.assert_array_equal(radiation, self.radiation)
+
+        metadata, radiation = radiation_store.read_sensors(self.locator, 'B01', types=['walls'],
+                                                           orientations=['south'])
+        self.assertEqual(list(metadata.index), ['srf3'])
+        np.testing.assert_array_equal(radiation, self.radiation[[3]])
+
+    def test_json_files_of_earlier_versions(self):
+        self.write_json()
+        self.assertTrue(radiation_store.radiation_exists(self.locator, 'B01'))
+        metadata, radiation = radiation_store.read_sensors(self.locator, 'B01', types=['walls'])
+        self.assertEqual(list(metadata.index), ['srf1', 'srf3'])
+        np.testing.assert_allclose(radiation, self.radiation[[1, 3]])
+
+        # the binary store takes precedence
+        radiation_store.write_radiation(self.locator.get_radiation_building_sensors('B01'), self.radiation * 2)
+        df = radiation_store.read_radiation_dataframe(radiation_store.get_radiation_path(self.locator, 'B01'),
+                                                      self.metadata.SURFACE)
+        self.assertEqual(list(df.columns), ['srf0', 'srf1', 'srf2', 'srf3'])
+        np.testing.assert_allclose(df['srf2'].values, self.radiation[2] * 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Test the selection and expansion of the representative days of the demand calculation
+(:py:mod:`cea.demand.representative_days`).
+"""
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from cea.demand import representative_days
+from cea.demand.representative_days import RepresentativeDays, HOURS_IN_YEAR, WARM_UP_HOURS
+
+
+class Object(object):
+    pass
+
+
+def make_bpr(heating_season, cooling_season, I_sol):
+    """a building properties row with just what is needed to select the representative days"""
+    bpr = Object()
+    bpr.solar = Object()
+    bpr.solar.I_sol = I_sol
+    bpr.control_profile = Object()
+    bpr.control_profile.heating_season = heating_season
+    bpr.control_profile.cooling_season = cooling_season
+    return bpr
+
+
+class TestRepresentativeDays(unittest.TestCase):
+    def setUp(self):
+        self.date = pd.date_range('2017/01/01', periods=HOURS_IN_YEAR, freq='H')
+        hours = np.arange(HOURS_IN_YEAR)
+        T_ext = 10.0 - 10.0 * np.cos(2 * np.pi * hours / HOURS_IN_YEAR) + 5.0 * np.sin(2 * np.pi * hours / 24)
+        T_ext[100 * 24:101 * 24] += 8.0  # a hot day in April
+        self.weather_data = pd.DataFrame({'drybulb_C': T_ext})
+        heating_season = (hours < 120 * 24) | (hours >= 280 * 24)
+        I_sol = np.maximum(np.sin(2 * np.pi * (hours - 6) / 24), 0.0) * 1000.0
+        self.bpr = make_bpr(heating_season, ~heating_season, I_sol)
+
+    def test_select_representative_days(self):
+        days = representative_days.select_representative_days(self.bpr, self.weather_data, self.date)
+        daily_date = self.date[::24]
+        represented = daily_date[days.day_map]
+        self.assertTrue((represented.month == daily_date.month).all())
+        day_type = np.where(daily_date.dayofweek < 5, 0, daily_date.dayofweek)
+        self.assertTrue((day_type[days.day_map] == day_type).all())
+
+        # the coldest and the hottest day represent themselves only
+        daily_mean = self.weather_data['drybulb_C'].values.reshape(365, 24).mean(axis=1)
+        for peak_day in [np.argmin(daily_mean), np.argmax(daily_mean)]:
+            self.assertEqual(days.day_map[peak_day], peak_day)
+            self.assertEqual((days.day_map == peak_day).sum(), 1)
+
+        self.assertEqual(days.get_weights().sum(), 365)
+        self.assertLess(len(days.days), 60)
+
+    def test_periods(self):
+        day_map = np.arange(365)
+        day_map[:] = 10
+        day_map[0] = 0
+        day_map[200:] = 201
+        days = RepresentativeDays(day_map)
+        hours = list(days.get_hours())
+        self.assertEqual(len(hours), len(set(hours)))
+        self.assertEqual(len(hours), 3 * (24 + WARM_UP_HOURS))
+        for day in [0, 10, 201]:
+            for t in range(day * 24 - WARM_UP_HOURS, (day + 1) * 24):
+                self.assertIn(t % HOURS_IN_YEAR, hours)
+
+        # the first day is warmed up with the last hours of the year
+        self.assertEqual(len(days.periods), 3)
+        self.assertEqual(days.periods[-1][0], HOURS_IN_YEAR - WARM_UP_HOURS)
+        self.assertEqual(days.periods[-1][-1], 23)
+
+    def test_expand(self):
+        day_map = np.arange(365) // 7 * 7
+        days = RepresentativeDays(day_map)
+        tsd = {'T_int': np.arange(HOURS_IN_YEAR, dtype=float), 'T_ext': np.arange(HOURS_IN_YEAR, dtype=float)}
+        days.expand(tsd)
+        T_int = tsd['T_int'].reshape(365, 24)
+        for day in [0, 3, 6, 7, 364]:
+            np.testing.assert_array_equal(T_int[day], np.arange(day // 7 * 7 * 24, (day // 7 * 7 + 1) * 24))
+        # inputs of the hourly procedure are left as they are
+        np.testing.assert_array_equal(tsd['T_ext'], np.arange(HOURS_IN_YEAR))
+
+    def test_calc_errors(self):
+        full_year = pd.DataFrame({'QH_sys_kWh': [1.0, 3.0, 0.0], 'QC_sys_kWh': [0.0, 0.0, 0.0]})
+        reduced = pd.DataFrame({'QH_sys_kWh': [1.0, 2.0, 0.0], 'QC_sys_kWh': [0.0, 0.0, 0.0]})
+        errors = representative_days.calc_errors(full_year, reduced, ['QH_sys_kWh', 'QC_sys_kWh'])
+        self.assertAlmostEqual(errors.loc['QH_sys_kWh', 'total_error'], -0.25)
+        self.assertAlmostEqual(errors.loc['QH_sys_kWh', 'peak_error'], -1.0 / 3.0)
+        self.assertEqual(errors.loc['QC_sys_kWh', 'total_error'], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,15 +5,21 @@ test data - you should only do this if you are sure that the new data is correct
 """
 
 import os
+import shutil
+import tempfile
 import unittest
+import numpy as np
 import pandas as pd
 import json
 import ConfigParser
-from cea.inputlocator import ReferenceCaseOpenLocator
+from cea.inputlocator import InputLocator, ReferenceCaseOpenLocator
 from cea.datamanagement.data_helper import calculate_average_multiuse
 from cea.datamanagement.data_helper import correct_archetype_areas
 from cea.datamanagement.data_helper import get_database
 from cea.demand.occupancy_model import calc_schedules
+from cea.demand.occupancy_model import calc_stochastic_occupancy
+from cea.demand.occupancy_model import get_random_state
+from cea.demand.occupancy_model import read_archetype_schedules
 from cea.demand.occupancy_model import schedule_maker
 from cea.globalvar import GlobalVariables
 import cea.config
@@ -86,6 +92,73 @@ class TestScheduleCreation(unittest.TestCase):
                 reference_results[schedule]))
 
 
+class TestStochasticOccupancy(unittest.TestCase):
+    def setUp(self):
+        # an office schedule for a week: occupied from 8:00 to 18:00 on weekdays
+        day = np.array([0.0] * 8 + [0.2, 0.6, 0.9, 0.9, 0.5, 0.8, 0.9, 0.9, 0.6, 0.3] + [0.0] * 6)
+        self.archetype_schedule = np.concatenate([np.tile(day, 5), np.zeros(48)])
+
+    def test_reproducible(self):
+        occupancy = calc_stochastic_occupancy([self.archetype_schedule], [50], get_random_state(42, 'B01'))
+        self.assertTrue((occupancy == calc_stochastic_occupancy([self.archetype_schedule], [50],
+                                                                get_random_state(42, 'B01'))).all())
+        self.assertFalse((occupancy == calc_stochastic_occupancy([self.archetype_schedule], [50],
+                                                                 get_random_state(42, 'B02'))).all())
+
+    def test_presence_follows_archetype_schedule(self):
+        occupants = [2000, 0, 500]
+        occupancy = calc_stochastic_occupancy([self.archetype_schedule, self.archetype_schedule,
+                                               self.archetype_schedule / 2], occupants, get_random_state(1, 'B01'))
+        self.assertEqual(occupancy.shape, (3, len(self.archetype_schedule)))
+        self.assertTrue((occupancy >= 0).all())
+        self.assertTrue((occupancy <= np.array(occupants)[:, np.newaxis]).all())
+        self.assertTrue((occupancy[1] == 0).all())
+        # on average, the share of occupants present follows the archetype schedule
+        expected = self.archetype_schedule.sum()
+        self.assertAlmostEqual(occupancy[0].sum() / 2000, expected, delta=0.05 * expected)
+        self.assertAlmostEqual(occupancy[2].sum() / 500, expected / 2, delta=0.05 * expected)
+
+
+class TemporaryCacheLocator(InputLocator):
+    """Keep the cache of the test out of the user's cache folder"""
+    def get_cache_folder(self):
+        return self._ensure_folder(self.scenario, 'cache')
+
+
+class TestScheduleCache(unittest.TestCase):
+    def setUp(self):
+        self.scenario = tempfile.mkdtemp()
+        self.locator = TemporaryCacheLocator(self.scenario)
+        self.date = pd.date_range('2017/01/01', periods=8760, freq='H')
+        self.list_uses = ['OFFICE', 'INDUSTRIAL']
+
+    def tearDown(self):
+        shutil.rmtree(self.scenario)
+
+    def test_cached_schedules_equal_excel(self):
+        expected_schedules, expected_values = read_archetype_schedules('CH', self.date, self.locator, self.list_uses)
+        schedule_maker('CH', self.date, self.locator, self.list_uses)
+        self.assertEqual(len(os.listdir(os.path.join(self.scenario, 'cache', 'schedules'))), 1)
+
+        archetype_schedules, archetype_values = schedule_maker('CH', self.date, self.locator, self.list_uses)
+        np.testing.assert_array_equal(np.array(archetype_schedules), np.array(expected_schedules, dtype=float))
+        self.assertEqual(sorted(archetype_values.keys()), sorted(expected_values.keys()))
+        for key in expected_values:
+            np.testing.assert_allclose(archetype_values[key], expected_values[key], err_msg=key)
+
+    def test_corrupt_cache_is_replaced(self):
+        schedule_maker('CH', self.date, self.locator, self.list_uses)
+        cache_folder = os.path.join(self.scenario, 'cache', 'schedules')
+        cache_file = os.path.join(cache_folder, os.listdir(cache_folder)[0])
+        with open(cache_file, 'wb') as f:
+            f.write(b'corrupt')
+        messages = []
+        archetype_schedules, _ = schedule_maker('CH', self.date, self.locator, self.list_uses, report=messages.append)
+        self.assertEqual(len(archetype_schedules), 2)
+        self.assertEqual(len(messages), 1)
+        self.assertGreater(os.path.getsize(cache_file), len(b'corrupt'))
+
+
 def get_test_config_path():
     """return the path to the test data configuration file (``cea/tests/test_schedules.config``)"""
     return os.path.join(os.path.dirname(__file__), 'test_schedules.config')
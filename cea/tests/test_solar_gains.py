@@ -0,0 +1,113 @@
+"""
+Test the sensible solar gains of the DaySim sensors (:py:func:`cea.demand.building_properties.calc_Isol_daysim`) and
+the blinds (:py:func:`cea.technologies.blinds.calc_blinds_activation`) against the calculation surface by surface.
+"""
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import cea.inputlocator
+from cea.demand.building_properties import calc_Isol_daysim
+from cea.resources.radiation_daysim import radiation_store
+from cea.technologies.blinds import calc_blinds_activation
+
+THERMAL_RESISTANCE_SURFACE = 0.04
+WINDOW_FRAME_FRACTION = 0.2
+
+
+def calc_blinds_activation_scalar(radiation, g_gl, Rf_sh):
+    """the blinds of a single hour and surface"""
+    if radiation > 300:
+        return g_gl * Rf_sh
+    else:
+        return g_gl
+
+
+def calc_Isol_daysim_by_surface(building_name, locator, prop_envelope, prop_rc_model):
+    """the solar gains summed up surface by surface"""
+    geometry_data = pd.read_csv(locator.get_radiation_metadata(building_name)).set_index('SURFACE')
+    geometry_data_roofs = geometry_data[geometry_data.TYPE == 'roofs']
+    geometry_data_walls = geometry_data[geometry_data.TYPE == 'walls']
+    if 'windows' in geometry_data.TYPE.values:
+        geometry_data_windows = geometry_data[geometry_data.TYPE == 'windows']
+        multiplier_wall = 1
+        multiplier_win = 1
+    else:
+        geometry_data_windows = geometry_data[geometry_data.TYPE == 'walls']
+        multiplier_win = 0.25 * sum(prop_envelope.loc[building_name, 'wwr_%s' % orientation]
+                                    for orientation in ['south', 'east', 'north', 'west'])
+        multiplier_wall = 1 - multiplier_win
+    radiation_data = radiation_store.read_radiation_dataframe(
+        radiation_store.get_radiation_path(locator, building_name), geometry_data.index)
+
+    I_sol_wall = np.array([geometry_data_walls.loc[surface, 'AREA_m2'] * multiplier_wall * radiation_data[surface]
+                           for surface in geometry_data_walls.index]).sum(axis=0)
+    I_sol_wall = I_sol_wall * prop_envelope.loc[building_name, 'a_wall'] * THERMAL_RESISTANCE_SURFACE * \
+                 prop_rc_model.loc[building_name, 'U_wall']
+    I_sol_roof = np.array([geometry_data_roofs.loc[surface, 'AREA_m2'] * radiation_data[surface]
+                           for surface in geometry_data_roofs.index]).sum(axis=0)
+    I_sol_roof = I_sol_roof * prop_envelope.loc[building_name, 'a_roof'] * THERMAL_RESISTANCE_SURFACE * \
+                 prop_rc_model.loc[building_name, 'U_roof']
+    Fsh_win = [np.vectorize(calc_blinds_activation_scalar)(radiation_data[surface],
+                                                           prop_envelope.loc[building_name, 'G_win'],
+                                                           prop_envelope.loc[building_name, 'rf_sh'])
+               for surface in geometry_data_windows.index]
+    I_sol_win = [geometry_data_windows.loc[surface, 'AREA_m2'] * multiplier_win * radiation_data[surface]
+                 for surface in geometry_data_windows.index]
+    I_sol_win = np.array([x * y * (1 - WINDOW_FRAME_FRACTION) for x, y in zip(I_sol_win, Fsh_win)]).sum(axis=0)
+    return I_sol_wall + I_sol_roof + I_sol_win
+
+
+class TestSolarGains(unittest.TestCase):
+    def setUp(self):
+        self.scenario = tempfile.mkdtemp()
+        self.locator = cea.inputlocator.InputLocator(self.scenario)
+        self.prop_envelope = pd.DataFrame({'a_wall': [0.6], 'a_roof': [0.7], 'G_win': [0.6], 'rf_sh': [0.08],
+                                           'wwr_south': [0.4], 'wwr_east': [0.3], 'wwr_north': [0.2],
+                                           'wwr_west': [0.3]}, index=['B01'])
+        self.prop_rc_model = pd.DataFrame({'U_wall': [0.3], 'U_roof': [0.2]}, index=['B01'])
+        # the hourly radiation of the sensors, with and without blinds (above 300 W/m2)
+        self.radiation = np.random.RandomState(42).rand(6, 8760).astype(np.float32) * 800
+        self.radiation[:, :24] = 300.0
+
+    def tearDown(self):
+        shutil.rmtree(self.scenario)
+
+    def write_sensors(self, types):
+        pd.DataFrame({'SURFACE': ['srf%i' % i for i in range(len(types))], 'TYPE': types,
+                      'orientation': ['north'] * len(types),
+                      'AREA_m2': np.linspace(1.0, 12.0, len(types))}).to_csv(
+            self.locator.get_radiation_metadata('B01'), index=None)
+        radiation_store.write_radiation(self.locator.get_radiation_building_sensors('B01'),
+                                        self.radiation[:len(types)])
+
+    def check_solar_gains(self):
+        I_sol = calc_Isol_daysim('B01', self.locator, self.prop_envelope, self.prop_rc_model,
+                                 THERMAL_RESISTANCE_SURFACE, WINDOW_FRAME_FRACTION)
+        expected = calc_Isol_daysim_by_surface('B01', self.locator, self.prop_envelope, self.prop_rc_model)
+        self.assertEqual(I_sol.shape, (8760,))
+        np.testing.assert_allclose(I_sol, expected, rtol=1e-10)
+
+    def test_with_window_sensors(self):
+        self.write_sensors(['roofs', 'walls', 'windows', 'walls', 'windows', 'roofs'])
+        self.check_solar_gains()
+
+    def test_without_window_sensors(self):
+        # the windows are part of the walls (window to wall ratio of the envelope)
+        self.write_sensors(['roofs', 'walls', 'walls', 'roofs', 'walls'])
+        self.check_solar_gains()
+
+    def test_blinds_activation(self):
+        radiation = self.radiation[:2]
+        self.assertTrue((radiation > 300).any() and (radiation <= 300).any())
+        expected = np.vectorize(calc_blinds_activation_scalar)(radiation, 0.6, 0.08)
+        np.testing.assert_array_equal(calc_blinds_activation(radiation, 0.6, 0.08), expected)
+        self.assertEqual(calc_blinds_activation(300.0, 0.6, 0.08), 0.6)
+        self.assertAlmostEqual(calc_blinds_activation(300.1, 0.6, 0.08), 0.6 * 0.08)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Test the fully mixed tank integrator of :py:mod:`cea.technologies.storage_tank` against the hour by hour calculation
+with ``scipy.integrate.odeint``.
+"""
+import unittest
+
+import numpy as np
+from scipy.integrate import odeint
+
+from cea.technologies import storage_tank
+
+
+def calc_dhw_tank_odeint(T_int_C, T_ext_C, q_tank_discharged_W, V_tank_m3):
+    """The hour by hour calculation of `calc_DH_ww_with_tank_losses`, solving the energy balance with odeint"""
+    T_tank_start_C = storage_tank.TWW_SETPOINT
+    area_tank_surface_m2 = storage_tank.calc_tank_surface_area(V_tank_m3)
+    T_tank_C = np.zeros(len(q_tank_discharged_W))
+    q_charged_W = np.zeros(len(q_tank_discharged_W))
+    for k in range(len(q_tank_discharged_W)):
+        q_loss_W, q_discharged_W, q_charged_W[k] = storage_tank.calc_dhw_tank_heat_balance(
+            T_int_C[k], T_ext_C[k], T_tank_start_C, V_tank_m3, q_tank_discharged_W[k], area_tank_surface_m2)
+        T_tank_C[k] = odeint(storage_tank.ode_hot_water_tank, T_tank_start_C, [0.0, 1.0],
+                             args=(q_loss_W, q_discharged_W, q_charged_W[k], V_tank_m3))[1][0]
+        T_tank_start_C = T_tank_C[k]
+    return T_tank_C, q_charged_W
+
+
+class TestStorageTank(unittest.TestCase):
+    def setUp(self):
+        random_state = np.random.RandomState(42)
+        hours = 500
+        self.T_int_C = 20.0 + 2.0 * random_state.rand(hours)
+        self.T_ext_C = 10.0 * random_state.rand(hours)
+        # DHW is drawn in about a third of the hours
+        self.q_discharged_W = np.where(random_state.rand(hours) < 0.3, 5000.0 * random_state.rand(hours), 0.0)
+
+    def test_dhw_tank_equals_odeint(self):
+        T_tank_C, q_loss_W, q_charged_W = storage_tank.calc_dhw_tank(self.T_int_C, self.T_ext_C, self.q_discharged_W,
+                                                                     0.2)
+        expected_T_tank_C, expected_q_charged_W = calc_dhw_tank_odeint(self.T_int_C, self.T_ext_C,
+                                                                       self.q_discharged_W, 0.2)
+        np.testing.assert_allclose(T_tank_C, expected_T_tank_C, rtol=1e-6)
+        np.testing.assert_allclose(q_charged_W, expected_q_charged_W, rtol=1e-6, atol=1e-3)
+
+    def test_dhw_tanks_of_many_buildings(self):
+        V_tank_m3 = np.array([0.2, 0.0, 0.05])
+        q_discharged_W = np.array([self.q_discharged_W, self.q_discharged_W, self.q_discharged_W / 4])
+        T_tank_C, q_loss_W, q_charged_W = storage_tank.calc_dhw_tank(self.T_int_C, self.T_ext_C, q_discharged_W,
+                                                                     V_tank_m3)
+        self.assertEqual(T_tank_C.shape, q_discharged_W.shape)
+        for b in [0, 2]:
+            single = storage_tank.calc_dhw_tank(self.T_int_C, self.T_ext_C, q_discharged_W[b], V_tank_m3[b])
+            np.testing.assert_array_equal(T_tank_C[b], single[0])
+            np.testing.assert_array_equal(q_charged_W[b], single[2])
+        # no tank
+        self.assertTrue(np.isnan(T_tank_C[1]).all())
+        self.assertFalse(q_charged_W[1].any())
+
+    def test_cold_water_tank_equals_odeint(self):
+        T_start_C, q_gain_W, q_discharged_W, q_charged_W, V_tank_m3 = 6.0, 100.0, 20000.0, 5000.0, 50.0
+        expected = odeint(storage_tank.ode_cold_water_tank, T_start_C, [0.0, 1.0],
+                          args=(q_gain_W, q_discharged_W, q_charged_W, V_tank_m3))[1][0]
+        self.assertAlmostEqual(storage_tank.calc_tank_temperature(T_start_C, q_gain_W, q_discharged_W, q_charged_W,
+                                                                  V_tank_m3, 'cold_water'), expected, places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Test that the batched hourly procedure (:py:func:`cea.demand.thermal_loads_batch.calc_Qhs_Qcs_batch`) yields the same
+results as the per-building hourly procedure (:py:func:`cea.demand.thermal_loads.calc_Qhs_Qcs`).
+
+The buildings are synthetic (no reference case needed): a simple weather year and building properties with radiator
+heating, ceiling cooling and different ventilation systems.
+"""
+import copy
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from cea.demand import thermal_loads, thermal_loads_batch, control_heating_cooling_systems, latent_loads
+
+
+class FakeArchitecture(object):
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class FakeSolar(object):
+    def __init__(self, I_sol):
+        self.I_sol = I_sol
+
+
+class FakeBuildingPropertiesRow(object):
+    def __init__(self, name, af, type_hs, type_cs, mech_vent, heat_rec, night_flushing, economizer):
+        hours = np.arange(8760)
+        self.name = name
+        self.rc_model = {'Af': af, 'Atot': 4.5 * af, 'Am': 2.5 * af, 'Aw': 0.15 * af, 'Cm': 165000.0 * af,
+                         'U_win': 2.0, 'U_roof': 0.3, 'U_wall': 0.4, 'U_base': 0.4, 'Aroof': 0.3 * af,
+                         'Aop_sup': 0.8 * af, 'Aop_bel': 0.3 * af}
+        self.rc_model['Htr_w'] = self.rc_model['Aw'] * self.rc_model['U_win']
+        self.rc_model['Htr_op'] = (self.rc_model['Aop_sup'] * 0.4 + self.rc_model['Aroof'] * 0.3 +
+                                   self.rc_model['Aop_bel'] * 0.4 * 0.7)
+        self.hvac = {'type_hs': type_hs, 'type_cs': type_cs, 'Qhsmax_Wm2': 500.0, 'Qcsmax_Wm2': 500.0,
+                     'Tc_sup_air_ahu_C': 16.0, 'Tc_sup_air_aru_C': 16.0, 'dT_Qhs': 1.2, 'dThs_C': 0.9,
+                     'dT_Qcs': 0.5, 'dTcs_C': -0.8,
+                     'MECH_VENT': mech_vent, 'WIN_VENT': not mech_vent, 'HEAT_REC': heat_rec,
+                     'NIGHT_FLSH': night_flushing, 'ECONOMIZER': economizer,
+                     'has-heating-season': True, 'heating-season-start': '09-16', 'heating-season-end': '05-14',
+                     'has-cooling-season': True, 'cooling-season-start': '05-15', 'cooling-season-end': '09-15'}
+        self.comfort = {'Ths_set_C': 21.0, 'Ths_setb_C': 16.0, 'Tcs_set_C': 24.0, 'Tcs_setb_C': 28.0,
+                        'rhum_max_pc': 70.0, 'Ve_lps': 10.0}
+        self.architecture = FakeArchitecture(e_win=0.89, e_roof=0.9, e_wall=0.9, n50=6.0, win_wall=0.3, Hs=0.9)
+        self.solar = FakeSolar(np.maximum(0.0, np.sin(np.pi * (hours % 24 - 6) / 12)) * 20.0 * af)
+
+
+def create_weather_data():
+    hours = np.arange(8760)
+    T_ext = 11.0 - 12.0 * np.cos(2 * np.pi * (hours - 500) / 8760) + 4.0 * np.sin(2 * np.pi * (hours % 24 - 9) / 24)
+    return pd.DataFrame({'drybulb_C': T_ext, 'wetbulb_C': T_ext - 2.0, 'relhum_percent': 65.0 + 0.0 * T_ext,
+                         'skytemp_C': T_ext - 12.0, 'windspd_ms': 2.0 + 0.0 * T_ext})
+
+
+def create_timestep_data(bpr, weather_data):
+    hours = np.arange(8760)
+    occupied = ((hours % 24 >= 8) & (hours % 24 <= 18)).astype(float)
+    af = bpr.rc_model['Af']
+    tsd = thermal_loads.initialize_timestep_data(bpr, weather_data)
+    tsd['people'] = np.floor(occupied * af / 20.0)
+    tsd['ve'] = tsd['people'] * bpr.comfort['Ve_lps'] * 3.6
+    tsd['Qs'] = tsd['people'] * 70.0
+    tsd['w_int'] = tsd['people'] * 80.0 / (1000 * 3600)
+    tsd['El'] = (0.2 + occupied) * 5.0 * af
+    tsd['Ea'] = (0.3 + occupied) * 4.0 * af
+    tsd['Epro'] = np.zeros(8760)
+    tsd['Qcdata_sys'] = np.zeros(8760)
+    tsd['Qcre_sys'] = np.zeros(8760)
+    weekday = pd.date_range('2017/01/01', periods=8760, freq='H').dayofweek
+    tsd = control_heating_cooling_systems.calc_simple_temp_control(tsd, bpr, weekday)
+    t_prev = thermal_loads.get_hours(bpr).next() - 1
+    tsd['T_int'][t_prev] = tsd['T_ext'][t_prev]
+    tsd['x_int'][t_prev] = latent_loads.convert_rh_to_moisture_content(tsd['rh_ext'][t_prev], tsd['T_ext'][t_prev])
+    return tsd
+
+
+class TestCalcQhsQcsBatch(unittest.TestCase):
+    def test_batch_equals_per_building(self):
+        weather_data = create_weather_data()
+        bprs = [FakeBuildingPropertiesRow('B01', 500.0, 'T1', 'T1', True, True, True, True),
+                FakeBuildingPropertiesRow('B02', 1200.0, 'T4', 'T0', False, False, True, False),
+                FakeBuildingPropertiesRow('B03', 300.0, 'T2', 'T1', True, False, False, True),
+                FakeBuildingPropertiesRow('B04', 800.0, 'T0', 'T0', False, False, False, False)]
+        tsds = [create_timestep_data(bpr, weather_data) for bpr in bprs]
+        expected = [thermal_loads.calc_Qhs_Qcs(bpr, copy.deepcopy(tsd), False, 'CH') for bpr, tsd in zip(bprs, tsds)]
+
+        thermal_loads_batch.calc_Qhs_Qcs_batch(bprs, tsds, 'CH')
+
+        for bpr, tsd, expected_tsd in zip(bprs, tsds, expected):
+            for key in thermal_loads_batch.TSD_KEYS_BATCH_OUTPUTS + ['Q_loss_sen_ref']:
+                if key.startswith('sys_status'):
+                    self.assertTrue((tsd[key] == expected_tsd[key]).all(), '%s: %s' % (bpr.name, key))
+                else:
+                    np.testing.assert_allclose(tsd[key], expected_tsd[key], rtol=1e-6, atol=1e-6,
+                                               err_msg='%s: %s' % (bpr.name, key))
+
+    def test_is_batchable(self):
+        self.assertTrue(thermal_loads_batch.is_batchable(
+            FakeBuildingPropertiesRow('B01', 500.0, 'T1', 'T1', True, True, True, True), False))
+        self.assertFalse(thermal_loads_batch.is_batchable(
+            FakeBuildingPropertiesRow('B01', 500.0, 'T1', 'T1', True, True, True, True), True))
+        self.assertFalse(thermal_loads_batch.is_batchable(
+            FakeBuildingPropertiesRow('B01', 500.0, 'T3', 'T0', True, True, True, True), False))
+        self.assertFalse(thermal_loads_batch.is_batchable(
+            FakeBuildingPropertiesRow('B01', 500.0, 'T1', 'T3', True, True, True, True), False))
+
+
+if __name__ == '__main__':
+    unittest.main()
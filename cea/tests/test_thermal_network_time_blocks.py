@@ -0,0 +1,36 @@
+"""
+Test the blocks of time steps solved by the worker processes of the thermal network calculation
+(:py:mod:`cea.technologies.thermal_network.thermal_network`).
+"""
+import unittest
+
+import numpy as np
+
+from cea.technologies.thermal_network import thermal_network
+
+
+class TestTimeBlocks(unittest.TestCase):
+    def test_split_into_time_blocks(self):
+        blocks = thermal_network.split_into_time_blocks(100, 8760, 16)
+        self.assertEqual(len(blocks), 16)
+        self.assertEqual(blocks[0][0], 100)
+        self.assertEqual(blocks[-1][1], 8760)
+        for (_, stop), (start, _) in zip(blocks[:-1], blocks[1:]):
+            self.assertEqual(stop, start)
+        sizes = [stop - start for start, stop in blocks]
+        self.assertLessEqual(max(sizes) - min(sizes), 1)
+
+        # no empty blocks
+        self.assertEqual(thermal_network.split_into_time_blocks(0, 3, 16), [(0, 1), (1, 2), (2, 3)])
+
+    def test_merge_time_blocks(self):
+        blocks = thermal_network.split_into_time_blocks(10, 20, 3)
+        block_results = [{'T_supply_nodes': np.arange(start, stop, dtype=float).reshape(-1, 1) * [1.0, 2.0]}
+                         for start, stop in blocks]
+        results = thermal_network.merge_time_blocks(blocks, block_results, 10, 20)
+        np.testing.assert_array_equal(results['T_supply_nodes'][:, 0], np.arange(10, 20))
+        np.testing.assert_array_equal(results['T_supply_nodes'][:, 1], np.arange(10, 20) * 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Test the time series data container of the demand calculation (:py:class:`TimeSeriesData`).
+"""
+import copy
+import pickle
+import unittest
+
+import numpy as np
+
+from cea.demand.time_series_data import TimeSeriesData, get_array, BLOCK_SIZE
+
+
+class TestTimeSeriesData(unittest.TestCase):
+    def test_dict_interface(self):
+        tsd = TimeSeriesData(24, ['T_int', 'T_ext'])
+        self.assertTrue(np.isnan(tsd['T_int']).all())
+        tsd['T_ext'] = np.arange(24.0)
+        tsd['u_wind'] = 2.0
+        tsd['sys_status_ahu'] = np.chararray(24, itemsize=20)
+        self.assertEqual(sorted(tsd.keys()), ['T_ext', 'T_int', 'sys_status_ahu', 'u_wind'])
+        self.assertEqual(tsd['u_wind'], 2.0)
+        self.assertIsInstance(tsd['sys_status_ahu'], np.chararray)
+        self.assertEqual(tsd.get('x_int', 'missing'), 'missing')
+
+    def test_assignment_copies_into_row(self):
+        tsd = TimeSeriesData(24, ['T_int'])
+        row = tsd['T_int']
+        values = np.arange(24.0)
+        tsd['T_int'] = values
+        self.assertIs(tsd['T_int'], row)
+        np.testing.assert_array_equal(row, values)
+        values[0] = 100.0
+        self.assertEqual(tsd['T_int'][0], 0.0)
+        # replacing a time series by another type of value
+        tsd['T_int'] = 21.0
+        self.assertEqual(tsd['T_int'], 21.0)
+        np.testing.assert_array_equal(get_array(tsd, ['T_int']), np.full((1, 24), 21.0))
+
+    def test_new_keys(self):
+        tsd = TimeSeriesData(24)
+        for i in range(BLOCK_SIZE + 10):
+            tsd['key%i' % i] = np.full(24, float(i))
+        self.assertEqual(len(tsd), BLOCK_SIZE + 10)
+        np.testing.assert_array_equal(get_array(tsd, ['key3', 'key%i' % (BLOCK_SIZE + 5)])[:, 0],
+                                      [3.0, BLOCK_SIZE + 5])
+
+    def test_get_array(self):
+        tsd = TimeSeriesData(24, ['a', 'b', 'c'])
+        tsd.update(a=np.full(24, 1.0), b=np.full(24, 2.0), c=np.full(24, 3.0))
+        # consecutive rows: a view
+        array = tsd.get_array(['a', 'b'])
+        self.assertIs(array.base, tsd.default_block)
+        np.testing.assert_array_equal(array[:, 0], [1.0, 2.0])
+        # other order: a copy
+        array = tsd.get_array(['c', 'a'])
+        self.assertIsNot(array.base, tsd.default_block)
+        np.testing.assert_array_equal(array[:, 0], [3.0, 1.0])
+        # same result for a plain dict
+        np.testing.assert_array_equal(get_array(dict(tsd), ['c', 'a']), array)
+        # like a dict, the values are the time series
+        self.assertEqual(sorted(value[0] for value in tsd.values()), [1.0, 2.0, 3.0])
+
+    def test_copy(self):
+        tsd = TimeSeriesData(24, ['T_int'])
+        tsd['T_int'] = np.arange(24.0)
+        tsd['u_wind'] = 2.0
+        for copied in [copy.deepcopy(tsd), pickle.loads(pickle.dumps(tsd, pickle.HIGHEST_PROTOCOL))]:
+            copied['T_int'][0] = 100.0
+            self.assertEqual(tsd['T_int'][0], 0.0)
+            self.assertEqual(copied.get_array(['T_int'])[0, 0], 100.0)
+            self.assertEqual(copied['u_wind'], 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
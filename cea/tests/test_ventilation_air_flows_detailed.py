@@ -0,0 +1,69 @@
+"""
+Test the root finding solver of the dynamic infiltration calculation
+(:py:func:`cea.demand.ventilation_air_flows_detailed.calc_air_flows_root`) against the minimization of
+:py:func:`cea.demand.ventilation_air_flows_detailed.calc_air_flows`.
+"""
+import unittest
+
+import numpy as np
+
+from cea.demand import ventilation_air_flows_detailed as vafd
+
+
+def get_properties_natural_ventilation(n50, footprint, perimeter, height, area_vent_zone=0):
+    """Same as `vafd.get_properties_natural_ventilation`, without a building properties row"""
+    coeff_lea_path, height_lea_path, orientation_lea_path = vafd.allocate_default_leakage_paths(
+        vafd.calc_coeff_lea_zone(vafd.calc_qv_delta_p_ref(n50, footprint * height)), perimeter * height, footprint,
+        height)
+    coeff_vent_path, height_vent_path, orientation_vent_path = vafd.allocate_default_ventilation_openings(
+        vafd.calc_coeff_vent_zone(area_vent_zone), height)
+    return {'coeff_lea_path': coeff_lea_path,
+            'height_lea_path': height_lea_path,
+            'coeff_wind_pressure_path_lea': vafd.lookup_coeff_wind_pressure(height_lea_path, vafd.SHIELDING_CLASS,
+                                                                            orientation_lea_path, 0, 0),
+            'coeff_vent_path': coeff_vent_path,
+            'height_vent_path': height_vent_path,
+            'coeff_wind_pressure_path_vent': vafd.lookup_coeff_wind_pressure(height_vent_path, vafd.SHIELDING_CLASS,
+                                                                             orientation_vent_path, 0, 0),
+            'factor_cros': 0}
+
+
+class TestDynamicInfiltration(unittest.TestCase):
+    def setUp(self):
+        random_state = np.random.RandomState(42)
+        self.temp_zone = 18.0 + 8.0 * random_state.rand(50)
+        self.temp_ext = -5.0 + 35.0 * random_state.rand(50)
+        self.u_wind = 10.0 * random_state.rand(50)
+
+    def test_mass_balance(self):
+        for area_vent_zone in [0, 200]:
+            dict_props_nat_vent = get_properties_natural_ventilation(3.0, 400.0, 80.0, 12.0, area_vent_zone)
+            air_flow_paths = vafd.get_air_flow_paths(dict_props_nat_vent)
+            qm_sum_in, qm_sum_out, p_zone = vafd.calc_air_flows_root(self.temp_zone, self.u_wind, self.temp_ext,
+                                                                     air_flow_paths)
+            for t in range(len(p_zone)):
+                # same air flows as the mass balance of the minimization, and the mass balance is met
+                expected = vafd.calc_air_flow_mass_balance(p_zone[t], self.temp_zone[t], self.u_wind[t],
+                                                           self.temp_ext[t], dict_props_nat_vent, 'calculate')
+                np.testing.assert_allclose([qm_sum_in[t], qm_sum_out[t]], expected, rtol=1e-10)
+                self.assertLess(abs(qm_sum_in[t] + qm_sum_out[t]), 1e-3 * qm_sum_in[t])
+                # at least as good as the minimization
+                qm_sum_in_cobyla, qm_sum_out_cobyla = vafd.calc_air_flows(self.temp_zone[t], self.u_wind[t],
+                                                                          self.temp_ext[t], dict_props_nat_vent)
+                self.assertLessEqual(abs(qm_sum_in[t] + qm_sum_out[t]),
+                                     abs(qm_sum_in_cobyla + qm_sum_out_cobyla) + 1e-6)
+
+    def test_warm_start(self):
+        air_flow_paths = vafd.get_air_flow_paths(get_properties_natural_ventilation(3.0, 400.0, 80.0, 12.0))
+        qm_sum_in, qm_sum_out, p_zone = vafd.calc_air_flows_root(self.temp_zone, self.u_wind, self.temp_ext,
+                                                                 air_flow_paths)
+        p_zone_previous = 0.0
+        for t in range(len(p_zone)):
+            result = vafd.calc_air_flows_root(self.temp_zone[t], self.u_wind[t], self.temp_ext[t], air_flow_paths,
+                                              p_zone_previous)
+            np.testing.assert_allclose(result, (qm_sum_in[t], qm_sum_out[t], p_zone[t]), rtol=1e-6, atol=1e-6)
+            p_zone_previous = result[2]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Columnar binary storage of DataFrames in HDF5 files (using ``h5py``).
+
+Each column is stored as a separate dataset in the root group of the file, so a reader can load just the columns it
+needs without parsing (or even reading) the rest of the file. A ``DatetimeIndex`` is stored as the ``DATE`` dataset
+(nanoseconds since 1970-01-01). String columns are stored as fixed-length byte strings (compressed, as they are
+usually constant, e.g. the building name).
+
+This is the ``columnar`` option of ``demand:format-output``, see :py:mod:`cea.demand.demand_writers` and
+:py:mod:`cea.demand.demand_reader`.
+"""
+from __future__ import division
+
+import numpy as np
+import pandas as pd
+
+__author__ = "Daren Thomas"
+__copyright__ = "Copyright 2019, Architecture and Building Systems - ETH Zurich"
+__credits__ = ["Daren Thomas"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Daren Thomas"
+__email__ = "cea@arch.ethz.ch"
+__status__ = "Production"
+
+FORMAT_VERSION = 1
+DATE_COLUMN = 'DATE'
+
+
+def write_dataframe(path, df):
+    """
+    Write a DataFrame to ``path`` with one dataset per column. The index is only stored if it is a ``DatetimeIndex``
+    (as the ``DATE`` column).
+
+    :param path: path to the file to (over)write
+    :type path: str
+    :param df: the data to write
+    :type df: pd.DataFrame
+    """
+    import h5py
+    with h5py.File(path, 'w') as h5:
+        h5.attrs['format_version'] = FORMAT_VERSION
+        columns = [str(column) for column in df.columns]
+        if isinstance(df.index, pd.DatetimeIndex):
+            h5.create_dataset(DATE_COLUMN, data=df.index.values.astype('datetime64[ns]').astype(np.int64))
+            columns.insert(0, DATE_COLUMN)
+        h5.attrs['columns'] = np.array(columns, dtype=np.string_)
+        for column in df.columns:
+            values = df[column].values
+            if values.dtype == object:
+                h5.create_dataset(str(column), data=values.astype(np.string_), compression='gzip')
+            else:
+                h5.create_dataset(str(column), data=values)
+
+
+def read_columns(path):
+    """
+    :return: the names of the columns stored in ``path``, in the order they were written
+    :rtype: list[str]
+    """
+    import h5py
+    with h5py.File(path, 'r') as h5:
+        return [column.decode('utf-8') if isinstance(column, bytes) else column for column in h5.attrs['columns']]
+
+
+def read_dataframe(path, columns=None):
+    """
+    Read (some of) the columns of a file written with :py:func:`write_dataframe`. The ``DATE`` column (if stored) is
+    returned as a column of type ``datetime64``, like ``pd.read_csv`` returns it as a column of strings.
+
+    :param path: path to the file
+    :type path: str
+    :param columns: the columns to read (default: all columns, in the order they were written)
+    :type columns: list[str]
+    :return: the data read
+    :rtype: pd.DataFrame
+    """
+    import h5py
+    with h5py.File(path, 'r') as h5:
+        if columns is None:
+            columns = [column.decode('utf-8') if isinstance(column, bytes) else column
+                       for column in h5.attrs['columns']]
+        data = {}
+        for column in columns:
+            if column not in h5:
+                raise KeyError('Column %s not found in %s' % (column, path))
+            values = h5[column][...]
+            if column == DATE_COLUMN:
+                values = values.astype('datetime64[ns]')
+            elif values.dtype.kind == 'S':
+                values = values.astype(str)
+            data[column] = values
+    return pd.DataFrame(data, columns=columns)
@@ -0,0 +1,121 @@
+"""
+Binary catalog of the Excel databases of a region.
+
+Reading a sheet of an Excel workbook with ``pd.read_excel`` parses the whole workbook, and the databases (e.g.
+:py:meth:`cea.inputlocator.InputLocator.get_supply_systems`) are read sheet by sheet, several times per run and once
+per worker process. :py:func:`read_database` parses each workbook once into a catalog of all its sheets, stored as a
+pickle next to the workbook (``{workbook}.catalog.pickle``) and kept in memory for the rest of the process. The
+catalog is rebuilt from the workbook whenever the workbook is modified, so editing a database in Excel just works.
+
+The catalogs of a region can be built in advance with the ``compile-databases`` script
+(:py:mod:`cea.datamanagement.compile_databases`).
+"""
+from __future__ import division
+from __future__ import print_function
+
+import os
+
+import pandas as pd
+
+import cea
+from cea.utilities.file_cache import write_atomically
+
+__author__ = "Daren Thomas"
+__copyright__ = "Copyright 2019, Architecture and Building Systems - ETH Zurich"
+__credits__ = ["Daren Thomas"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Daren Thomas"
+__email__ = "cea@arch.ethz.ch"
+__status__ = "Production"
+
+# increase when changing the format of the catalogs to rebuild them (they are rebuilt for each version of CEA, too)
+CATALOG_VERSION = 1
+
+# the catalogs read by this process: {workbook path: catalog}
+_catalogs = {}
+
+
+def read_database(database_path, sheet_name):
+    """
+    Read a sheet of an Excel database - like ``pd.read_excel(database_path, sheet_name)``, but from the catalog of the
+    workbook.
+
+    :param database_path: path to the Excel workbook
+    :type database_path: str
+    :param sheet_name: name of the sheet
+    :type sheet_name: str
+    :return: a copy of the sheet (callers may modify it)
+    :rtype: pd.DataFrame
+    """
+    sheets = get_catalog(database_path)['sheets']
+    if sheet_name not in sheets:
+        raise ValueError('No sheet named %s in %s' % (sheet_name, database_path))
+    return sheets[sheet_name].copy()
+
+
+def get_catalog(database_path):
+    """
+    :return: the up-to-date catalog of the workbook: ``{'version': (int, str), 'source': (size, mtime), 'sheets':
+             {name: DataFrame}}``, read from memory, the catalog file or - if both are outdated - the workbook
+    :rtype: dict
+    """
+    database_path = os.path.abspath(database_path)
+    source = get_source_signature(database_path)
+    catalog = _catalogs.get(database_path)
+    if not is_current(catalog, source):
+        catalog = read_catalog(get_catalog_path(database_path))
+        if not is_current(catalog, source):
+            catalog = compile_database(database_path)
+        _catalogs[database_path] = catalog
+    return catalog
+
+
+def compile_database(database_path):
+    """Parse all sheets of the workbook and write them to its catalog file.
+
+    :return: the catalog of the workbook (see :py:func:`get_catalog`)
+    :rtype: dict
+    """
+    database_path = os.path.abspath(database_path)
+    source = get_source_signature(database_path)
+    catalog = {'version': (CATALOG_VERSION, cea.__version__),
+               'source': source,
+               'sheets': pd.read_excel(database_path, sheet_name=None)}
+    write_catalog(get_catalog_path(database_path), catalog)
+    _catalogs[database_path] = catalog
+    return catalog
+
+
+def get_catalog_path(database_path):
+    """:return: the path of the catalog file of the workbook"""
+    return database_path + '.catalog.pickle'
+
+
+def get_source_signature(database_path):
+    """:return: size and modification time of the workbook - the catalog is outdated when they change"""
+    stat = os.stat(database_path)
+    return stat.st_size, stat.st_mtime
+
+
+def is_current(catalog, source):
+    """True, if the catalog was compiled (by this version of CEA) from the workbook as it is now"""
+    return (catalog is not None and catalog['version'] == (CATALOG_VERSION, cea.__version__)
+            and catalog['source'] == source)
+
+
+def read_catalog(catalog_path):
+    """:return: the catalog stored in the file, or None if it does not exist or can't be read"""
+    if not os.path.exists(catalog_path):
+        return None
+    try:
+        return pd.read_pickle(catalog_path)
+    except Exception as e:
+        # e.g. a catalog file left incomplete by a crash or written by another version of pandas: compile again
+        print('Ignoring corrupt database catalog %s: %s' % (catalog_path, e))
+        return None
+
+
+def write_catalog(catalog_path, catalog):
+    """Write the catalog file (see :py:func:`cea.utilities.file_cache.write_atomically`)"""
+    write_atomically(catalog_path, lambda path: pd.to_pickle(catalog, path))
@@ -0,0 +1,83 @@
+"""
+Fingerprints and atomic writes of the files cached by CEA between runs.
+
+The caches (building properties, archetype schedules, database catalogs, the demand manifest and the results of the
+thermal network optimization) store their files under a fingerprint of everything they depend on. Every fingerprint
+starts with the version of CEA (:py:func:`new_key`), so an upgrade never serves results of the previous version, and
+includes the content of the input files (:py:func:`update_key_with_file`).
+
+The files are written with :py:func:`write_atomically`: a process (or a concurrent run) reading a cache never sees a
+partial file.
+"""
+from __future__ import division
+
+import hashlib
+import os
+import tempfile
+
+import cea
+
+__author__ = "Daren Thomas"
+__copyright__ = "Copyright 2019, Architecture and Building Systems - ETH Zurich"
+__credits__ = ["Daren Thomas"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Daren Thomas"
+__email__ = "cea@arch.ethz.ch"
+__status__ = "Production"
+
+
+def new_key(*components):
+    """
+    :param components: the version of the cached calculation and the settings it depends on
+    :return: a hash of the version of CEA and the components, to be updated with the inputs of the calculation
+    :rtype: hashlib.sha1
+    """
+    key = hashlib.sha1()
+    key.update(('%s|%s' % (cea.__version__, '|'.join(str(component) for component in components))).encode('utf-8'))
+    return key
+
+
+def update_key_with_file(key, path):
+    """add the content of the file (or the fact that it is missing) to the hash"""
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            content = f.read()
+        key.update(('|%i|' % len(content)).encode('utf-8'))
+        key.update(content)
+    else:
+        key.update(b'|missing|')
+
+
+def update_key_with_file_stat(key, path):
+    """add the path, size and modification time of the file to the hash - for large files that are not worth reading"""
+    if os.path.exists(path):
+        stat = os.stat(path)
+        key.update(('|%s|%i|%r' % (os.path.abspath(path), stat.st_size, stat.st_mtime)).encode('utf-8'))
+    else:
+        key.update(('|%s|missing' % os.path.abspath(path)).encode('utf-8'))
+
+
+def write_atomically(path, write):
+    """
+    Write a file to a temporary file in the same folder first and rename it. An existing file (e.g. a corrupt cache
+    file) is replaced, as renaming over it fails on Windows.
+
+    :param path: the file to write
+    :type path: str
+    :param write: function writing the file to the path it is called with
+    :type write: callable
+    """
+    fd, temporary_file = tempfile.mkstemp(suffix=os.path.splitext(path)[1], dir=os.path.dirname(path))
+    os.close(fd)
+    try:
+        write(temporary_file)
+        if os.path.exists(path):
+            os.remove(path)
+        os.rename(temporary_file, path)
+    except (IOError, OSError):
+        if os.path.exists(temporary_file):
+            os.remove(temporary_file)
+        if not os.path.exists(path):
+            raise
+        # otherwise, another process wrote the file in the meantime
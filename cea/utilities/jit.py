@@ -0,0 +1,171 @@
+"""
+Just-in-time compilation of the numerical kernels of the CEA.
+
+The kernels (small, purely numerical functions called in the hourly loops, e.g. the SIA 2044 RC-model equations in
+:py:mod:`cea.demand.rc_model_SIA`) are marked with the :py:func:`kernel` decorator. If numba is installed and JIT
+compilation is enabled, the decorator replaces the function with a ``numba.jit(nopython=True, cache=True)`` dispatcher:
+the kernel is compiled on first use for the argument types it is called with and the machine code is cached on disk
+(next to the module in ``__pycache__`` or in ``NUMBA_CACHE_DIR``), so subsequent runs skip the compilation.
+
+This replaces the ahead-of-time compiled ``.pyd`` files (``numba.pycc``) which only worked on Windows.
+
+JIT compilation is switched on and off with the ``general:use-jit`` parameter. The setting is stored in the
+environment variable ``CEA_USE_JIT`` so it is inherited by the worker processes of the multiprocessing pool.
+
+Run ``cea compile`` to compile (and cache) all kernels ahead of the first simulation.
+"""
+from __future__ import print_function
+from __future__ import division
+
+import collections
+import importlib
+import os
+import sys
+import time
+
+__author__ = "Daren Thomas"
+__copyright__ = "Copyright 2019, Architecture and Building Systems - ETH Zurich"
+__credits__ = ["Daren Thomas"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "Daren Thomas"
+__email__ = "cea@arch.ethz.ch"
+__status__ = "Production"
+
+ENVIRONMENT_VARIABLE = 'CEA_USE_JIT'
+
+# modules defining kernels - imported by `print_report` and `compile_kernels` to register all kernels
+KERNEL_MODULES = ['cea.demand.rc_model_SIA',
+                  'cea.technologies.radiators',
+                  'cea.technologies.storage_tank']
+
+# registry of all kernels, keyed by "module.function"
+KERNELS = collections.OrderedDict()
+
+
+class Kernel(object):
+    """A numerical function that can be replaced by a numba JIT-compiled version of itself."""
+
+    def __init__(self, py_func, signatures):
+        self.py_func = py_func
+        self.signatures = signatures
+        self._dispatcher = None
+
+    @property
+    def name(self):
+        return '%s.%s' % (self.py_func.__module__, self.py_func.__name__)
+
+    @property
+    def dispatcher(self):
+        """The numba dispatcher of the kernel (created on first access, compiled on first call)"""
+        if self._dispatcher is None:
+            import numba
+            self._dispatcher = numba.jit(nopython=True, cache=True, error_model='numpy')(self.py_func)
+        return self._dispatcher
+
+    def resolve(self):
+        """Return the version of the kernel to use, given the current configuration"""
+        if is_enabled():
+            return self.dispatcher
+        return self.py_func
+
+    def is_accelerated(self):
+        """True, if the function currently bound in the defining module is the JIT-compiled version"""
+        module = sys.modules.get(self.py_func.__module__)
+        return self._dispatcher is not None and getattr(module, self.py_func.__name__, None) is self._dispatcher
+
+    def compile(self):
+        """Compile the kernel for the signatures it was registered with (this also writes them to the disk cache)"""
+        for signature in self.signatures:
+            self.dispatcher.compile(signature)
+
+
+def kernel(*signatures):
+    """
+    Decorator to mark a function as a kernel. The function must be compatible with numba's nopython mode and may only
+    call other kernels.
+
+    :param signatures: numba signatures (e.g. ``'f8(f8, f8)'``) to compile the kernel for with ``cea compile``. At
+                       runtime, the kernel is compiled for the argument types it is actually called with.
+    :return: decorator returning the JIT-compiled kernel if JIT compilation is enabled, else the python function
+    """
+    def decorator(py_func):
+        k = Kernel(py_func, signatures)
+        KERNELS[k.name] = k
+        return k.resolve()
+    return decorator
+
+
+def is_available():
+    """True, if numba can be imported"""
+    try:
+        import numba
+        return True
+    except ImportError:
+        return False
+
+
+def is_enabled():
+    """True, if JIT compilation is switched on (the default when numba is available)"""
+    return os.environ.get(ENVIRONMENT_VARIABLE, '1') == '1' and is_available()
+
+
+def configure(use_jit):
+    """
+    Switch JIT compilation on or off for this process and the processes it starts. Kernels already imported are
+    rebound in their modules.
+
+    :param use_jit: the value of the ``general:use-jit`` parameter
+    :type use_jit: bool
+    """
+    os.environ[ENVIRONMENT_VARIABLE] = '1' if use_jit else '0'
+    for k in KERNELS.values():
+        module = sys.modules.get(k.py_func.__module__)
+        if module is not None:
+            setattr(module, k.py_func.__name__, k.resolve())
+
+
+def import_kernel_modules():
+    for module in KERNEL_MODULES:
+        importlib.import_module(module)
+
+
+def print_report():
+    """Print which kernels are JIT-compiled and which run as pure python"""
+    import_kernel_modules()
+    if not is_available():
+        print('JIT compilation: numba not installed - running all kernels as pure python (slow)')
+    elif not is_enabled():
+        print('JIT compilation: disabled (general:use-jit) - running all kernels as pure python (slow)')
+    else:
+        import numba
+        print('JIT compilation: enabled (numba %s)' % numba.__version__)
+    for module in KERNEL_MODULES:
+        kernels = [k for k in KERNELS.values() if k.py_func.__module__ == module]
+        python_kernels = [k.py_func.__name__ for k in kernels if not k.is_accelerated()]
+        print('  - %s: %i of %i kernels accelerated%s' % (
+            module, len(kernels) - len(python_kernels), len(kernels),
+            ' (python: %s)' % ', '.join(python_kernels) if python_kernels else ''))
+
+
+def compile_kernels():
+    """Compile all kernels for their registered signatures, populating the disk cache"""
+    import_kernel_modules()
+    for k in KERNELS.values():
+        t0 = time.time()
+        k.compile()
+        print('compiled %s (%.2f seconds)' % (k.name, time.time() - t0))
+
+
+def main(config):
+    configure(config.use_jit)
+    if not is_enabled():
+        print('JIT compilation is disabled or numba is not installed - nothing to compile')
+        return
+    compile_kernels()
+    print_report()
+
+
+if __name__ == '__main__':
+    import cea.config
+    main(cea.config.Configuration())
@@ -12,6 +12,8 @@ from math import *
 from timezonefinder import TimezoneFinder
 import pytz
 
+from cea.resources.radiation_daysim import radiation_store
+
 __author__ = "Jimeno A. Fonseca"
 __copyright__ = "Copyright 2015, Architecture and Building Systems - ETH Zurich"
 __credits__ = ["Jimeno A. Fonseca"]
@@ -200,15 +202,16 @@ def get_equation_of_time(day_date):
 
 # filter sensor points with low solar potential
 
-def filter_low_potential(radiation_json_path, metadata_csv_path, config):
+def filter_low_potential(radiation_path, metadata_csv_path, config):
     """
     To filter the sensor points/hours with low radiation potential.
 
     #. keep sensors above min radiation
     #. eliminate points when hourly production < 50 W/m2
 
-    :param radiation_csv: solar insulation data on all surfaces of each building
-    :type radiation_csv: .csv
+    :param radiation_path: solar insulation data on all surfaces of each building (see
+        :py:func:`cea.resources.radiation_daysim.radiation_store.get_radiation_path`)
+    :type radiation_path: str
     :param metadata_csv: solar insulation sensor data of each building
     :type metadata_csv: .csv
     :return max_annual_radiation: yearly horizontal radiation [Wh/m2/year]
@@ -228,15 +231,9 @@ def filter_low_potential(radiation_json_path, metadata_csv_path, config):
     #. No solar panels on windows.
     """
 
-    def f(x):
-        if x <= 50:
-            return 0
-        else:
-            return x
-
     # read radiation file
-    sensors_rad = pd.read_json(radiation_json_path)
     sensors_metadata = pd.read_csv(metadata_csv_path)
+    sensors_rad = radiation_store.read_radiation_dataframe(radiation_path, sensors_metadata['SURFACE'])
 
     # join total radiation to sensor_metadata
 
@@ -260,7 +257,7 @@ def filter_low_potential(radiation_json_path, metadata_csv_path, config):
     sensors_metadata_clean = sensors_metadata[sensors_metadata.total_rad_Whm2 >= annual_radiation_threshold_Whperm2]
     sensors_rad_clean = sensors_rad[sensors_metadata_clean.index.tolist()]  # keep sensors above min radiation
 
-    sensors_rad_clean = sensors_rad_clean.applymap(lambda x: f(x))
+    sensors_rad_clean = sensors_rad_clean.where(sensors_rad_clean > 50, 0)
 
     return max_annual_radiation, annual_radiation_threshold_Whperm2, sensors_rad_clean, sensors_metadata_clean
 
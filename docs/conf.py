@@ -181,7 +181,6 @@ language = None
 exclude_patterns = ['_build', 'Thumbs.db', '.DS_Store',
                     'modules/cea.CH','modules/cea.databases*',  # databases doesn't contain any modules
                     'modules/cea.analysis.sensitivity.sensitivity_optimization.rst',  # TODO: remove when fixed
-                    'modules/cea.utilities.compile_pyd_files*',  # TODO: remove when fixed
                     'modules/cea.api*',
                     'script_dependencies'
                     ]